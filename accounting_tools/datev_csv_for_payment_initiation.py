@@ -1,6 +1,7 @@
 #!/usr/bin/env -S uv run
 from __future__ import annotations
 
+import datetime as _datetime
 import logging as _logging
 import pathlib as _pathlib
 
@@ -15,8 +16,32 @@ def create_argument_parser():
 
     p = argparse.ArgumentParser()
     p.add_argument("--csv-encoding", choices=["cp1252", "utf-8"], default="utf-8")
-    p.add_argument("--limit", type=lambda s: int(s, base=10))
-    p.add_argument("--offset", type=lambda s: int(s, base=10))
+    p.add_argument(
+        "--start-date",
+        type=_datetime.date.fromisoformat,
+        help="Only export pre-notifications collected on or after this date",
+    )
+    p.add_argument(
+        "--end-date",
+        type=_datetime.date.fromisoformat,
+        help="Only export pre-notifications collected on or before this date",
+    )
+    p.add_argument(
+        "--per-pain",
+        action="store_true",
+        default=False,
+        help="Write one file per payment initiation instead of one per fiscal year",
+    )
+    p.add_argument("--limit", type=lambda s: int(s, base=10), help="Implies --per-pain")
+    p.add_argument(
+        "--offset", type=lambda s: int(s, base=10), help="Implies --per-pain"
+    )
+    p.add_argument(
+        "--include-exported",
+        action="store_true",
+        default=False,
+        help="Also export pre-notifications already marked as exported to DATEV",
+    )
     p.add_argument("pain_ids", nargs="*", type=lambda s: int(s, base=10))
     return p
 
@@ -31,15 +56,32 @@ def main(argv=None):
     log_filename = out_base.with_suffix(".log")
     ctx.configure_log_file(log_filename)
 
+    args = ctx.parsed_args
+    per_pain = args.per_pain or args.limit is not None or args.offset is not None
+
     with ctx.psycopg_connect() as conn:
-        for pain_id in ctx.parsed_args.pain_ids:
-            wsjrdp2027.datev.write_datev_csv_for_pain_id(
+        if per_pain:
+            for pain_id in args.pain_ids:
+                wsjrdp2027.datev.write_datev_csv_for_pain_id(
+                    ctx=ctx,
+                    conn=conn,
+                    pain_id=pain_id,
+                    csv_encoding=args.csv_encoding,
+                    limit=args.limit,
+                    offset=args.offset,
+                    include_exported=args.include_exported,
+                    mark_exported=not ctx.dry_run,
+                )
+        else:
+            wsjrdp2027.datev.write_datev_csvs_for_pre_notifications(
                 ctx=ctx,
                 conn=conn,
-                pain_id=pain_id,
-                csv_encoding=ctx.parsed_args.csv_encoding,
-                limit=ctx.parsed_args.limit,
-                offset=ctx.parsed_args.offset,
+                pain_ids=args.pain_ids or None,
+                start_date=args.start_date,
+                end_date=args.end_date,
+                csv_encoding=args.csv_encoding,
+                include_exported=args.include_exported,
+                mark_exported=not ctx.dry_run,
             )
 
 
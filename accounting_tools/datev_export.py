@@ -0,0 +1,102 @@
+#!/usr/bin/env -S uv run
+"""Export bookings to DATEV EXTF Buchungsstapel files.
+
+Sources are the collected pre-notifications of our pain runs, other CAMT
+bank movements and Moss card movements (see
+`wsjrdp2027.datev.DATEV_EXPORT_SOURCES`).  Exported rows are marked in
+their ``additional_info`` so that they are never exported twice, unless
+run with --dry-run.
+
+The pre-notifications (``sammeleinzug``) are only exported when given
+explicitly: the pain runs (``sepa_direct_debit.py``,
+``datev_csv_for_payment_initiation.py``) already write their DATEV files
+and mark them, but pre-notifications exported before the marker existed
+are not marked.
+"""
+
+from __future__ import annotations
+
+import datetime as _datetime
+import logging as _logging
+import pathlib as _pathlib
+import sys as _sys
+
+import wsjrdp2027
+
+
+_SELF_NAME = _pathlib.Path(__file__).stem
+
+_DEFAULT_SOURCES = [
+    name
+    for name in wsjrdp2027.datev.DATEV_EXPORT_SOURCES
+    if name != wsjrdp2027.datev.PRE_NOTIFICATIONS_DATEV_SOURCE.name
+]
+
+_LOGGER = _logging.getLogger(__name__)
+
+
+def create_argument_parser():
+    import argparse
+
+    p = argparse.ArgumentParser()
+    p.add_argument(
+        "sources",
+        nargs="*",
+        choices=list(wsjrdp2027.datev.DATEV_EXPORT_SOURCES),
+        help=f"Sources to export (default: {' '.join(_DEFAULT_SOURCES)})",
+    )
+    p.add_argument("--start-date", type=_datetime.date.fromisoformat)
+    p.add_argument("--end-date", type=_datetime.date.fromisoformat)
+    p.add_argument("--csv-encoding", choices=["cp1252", "utf-8"], default="utf-8")
+    p.add_argument("--page-size", type=int, default=1000)
+    return p
+
+
+def main(argv=None):
+    ctx = wsjrdp2027.WsjRdpContext(
+        argument_parser=create_argument_parser(),
+        argv=argv,
+    )
+    args = ctx.parsed_args
+    out_base = ctx.make_out_path(_SELF_NAME)
+    log_filename = out_base.with_suffix(".log")
+    ctx.configure_log_file(log_filename)
+
+    export_files = []
+    with ctx.psycopg_connect() as conn:
+        if not ctx.dry_run:
+            ctx.require_approval_to_run_in_prod()
+        for source_name in args.sources or _DEFAULT_SOURCES:
+            _LOGGER.info("")
+            _LOGGER.info("DATEV export of %s", source_name)
+            export_files.extend(
+                wsjrdp2027.datev.write_datev_csvs_for_source(
+                    ctx=ctx,
+                    conn=conn,
+                    source=wsjrdp2027.datev.DATEV_EXPORT_SOURCES[source_name],
+                    start_date=args.start_date,
+                    end_date=args.end_date,
+                    mark_exported=not ctx.dry_run,
+                    page_size=args.page_size,
+                    csv_encoding=args.csv_encoding,
+                )
+            )
+
+    _LOGGER.info("")
+    if ctx.dry_run:
+        _LOGGER.info("Dry run, exported rows not marked")
+    _LOGGER.info("Output directory: %s", ctx.out_dir)
+    for export_file in export_files:
+        _LOGGER.info(
+            "  %s %s (%s rows, %s): %s",
+            export_file.source_name,
+            export_file.fiscal_year,
+            export_file.number_of_rows,
+            wsjrdp2027.format_cents_as_eur_de(export_file.sum_cents),
+            export_file.path,
+        )
+    _LOGGER.info("  Log file: %s", log_filename)
+
+
+if __name__ == "__main__":
+    _sys.exit(main())
@@ -0,0 +1,84 @@
+#!/usr/bin/env -S uv run
+"""Insert the booked transactions of many CAMT files into Hitobito.
+
+Parallel variant of ``insert_camt_into_hitobito.py``: the files (or
+directories / glob patterns) are parsed in a process pool, duplicate
+transactions across files are dropped and all new transactions are
+inserted in a single transaction.  pain.008 files given alongside are
+used to link direct debit transactions to their payment initiation.
+"""
+
+from __future__ import annotations
+
+import logging as _logging
+import pathlib as _pathlib
+import sys as _sys
+
+import wsjrdp2027
+
+
+_SELF_NAME = _pathlib.Path(__file__).stem
+
+_LOGGER = _logging.getLogger(__name__)
+
+
+def create_argument_parser():
+    import argparse
+
+    p = argparse.ArgumentParser()
+    p.add_argument(
+        "inputs",
+        nargs="+",
+        metavar="FILE_DIR_OR_GLOB",
+        help="camt.052/053/054 and pain.008 files, directories or glob patterns",
+    )
+    p.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of parser processes (default: number of CPUs)",
+    )
+    return p
+
+
+def main(argv=None):
+    ctx = wsjrdp2027.WsjRdpContext(
+        argument_parser=create_argument_parser(),
+        argv=argv,
+    )
+    out_base = ctx.make_out_path(_SELF_NAME)
+    log_filename = out_base.with_suffix(".log")
+    ctx.configure_log_file(log_filename)
+
+    paths = wsjrdp2027.expand_iso20022_paths(ctx.parsed_args.inputs)
+    if not paths:
+        _LOGGER.error("No files found for %s", ctx.parsed_args.inputs)
+        return 1
+    _LOGGER.info("Ingesting %s file(s)", len(paths))
+
+    with ctx.psycopg_connect() as conn:
+        if not ctx.dry_run:
+            ctx.require_approval_to_run_in_prod()
+        result = wsjrdp2027.ingest_iso20022_files(
+            conn,
+            paths,
+            fin_account_ids=wsjrdp2027.pg_select_fin_account_ids(conn),
+            max_workers=ctx.parsed_args.jobs,
+            dry_run=ctx.dry_run,
+        )
+
+    _LOGGER.info("")
+    result.log_summary(_LOGGER)
+    if ctx.dry_run:
+        _LOGGER.info("Dry run, %s transaction(s) not inserted", len(result.new_rows))
+    else:
+        _LOGGER.info("Inserted %s transaction(s)", len(result.inserted_ids))
+    _LOGGER.info("")
+    _LOGGER.info("Output directory: %s", ctx.out_dir)
+    _LOGGER.info("  Log file: %s", log_filename)
+    return 1 if result.num_errors else 0
+
+
+if __name__ == "__main__":
+    _sys.exit(main())
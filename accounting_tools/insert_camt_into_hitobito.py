@@ -13,13 +13,6 @@ _SELF_NAME = _pathlib.Path(__file__).stem
 _LOGGER = _logging.getLogger(__name__)
 
 
-def _load_fin_accounts(conn, /) -> dict[str, int]:
-    fin_accounts = wsjrdp2027.pg_select_dict_rows(
-        conn, t"""SELECT "id", "account_identification" FROM wsjrdp_fin_accounts;"""
-    )
-    return {row["account_identification"]: row["id"] for row in fin_accounts}
-
-
 def get_fin_account_id(
     ctx,
     conn,
@@ -125,7 +118,9 @@ def main(argv=None):
 
     with ctx.psycopg_connect() as conn:
         ctx.require_approval_to_run_in_prod()
-        account_identification2fin_account_id = _load_fin_accounts(conn)
+        account_identification2fin_account_id = wsjrdp2027.pg_select_fin_account_ids(
+            conn
+        )
 
         for camt_file in ctx.parsed_args.camt_files:
             _LOGGER.info("")
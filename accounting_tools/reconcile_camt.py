@@ -0,0 +1,88 @@
+#!/usr/bin/env -S uv run
+"""Reconcile the CAMT transactions of a period with pre-notifications and
+accounting entries and write the result to an xlsx file.
+
+All data is loaded with three queries and matched in memory, see
+`wsjrdp2027.reconcile_camt_transactions`.
+"""
+
+from __future__ import annotations
+
+import datetime as _datetime
+import logging as _logging
+import pathlib as _pathlib
+import sys as _sys
+
+import wsjrdp2027
+
+
+_SELF_NAME = _pathlib.Path(__file__).stem
+
+_LOGGER = _logging.getLogger(__name__)
+
+
+def create_argument_parser():
+    import argparse
+
+    p = argparse.ArgumentParser()
+    p.add_argument("start_date", type=_datetime.date.fromisoformat)
+    p.add_argument(
+        "end_date",
+        nargs="?",
+        type=_datetime.date.fromisoformat,
+        default=None,
+        help="Last value date (default: today)",
+    )
+    p.add_argument(
+        "--lookback-days",
+        type=int,
+        default=62,
+        help="Also consider pre-notifications up to this many days before"
+        " START_DATE (default: %(default)s)",
+    )
+    return p
+
+
+def main(argv=None):
+    ctx = wsjrdp2027.WsjRdpContext(
+        argument_parser=create_argument_parser(),
+        argv=argv,
+    )
+    args = ctx.parsed_args
+    start_date = args.start_date
+    end_date = args.end_date or _datetime.date.today()
+    out_base = ctx.make_out_path(f"{_SELF_NAME}__{start_date}__{end_date}")
+    log_filename = out_base.with_suffix(".log")
+    xlsx_filename = out_base.with_suffix(".xlsx")
+    ctx.configure_log_file(log_filename)
+
+    with ctx.psycopg_connect() as conn:
+        data = wsjrdp2027.load_camt_reconciliation_data(
+            conn,
+            start_date=start_date,
+            end_date=end_date,
+            lookback_days=args.lookback_days,
+        )
+
+    df = wsjrdp2027.reconcile_camt_transactions(
+        data.camt_transactions, data.pre_notifications, data.accounting_entries
+    )
+    wsjrdp2027.write_camt_reconciliation_to_xlsx(df, xlsx_filename)
+
+    _LOGGER.info("")
+    _LOGGER.info("Reconciled %s CAMT transaction(s)", len(df))
+    for category, group_df in df.groupby("category", sort=False):
+        _LOGGER.info(
+            "  %s: %s (%s)",
+            category,
+            len(group_df),
+            wsjrdp2027.format_cents_as_eur_de(int(group_df["amount_cents"].sum())),
+        )
+    _LOGGER.info("")
+    _LOGGER.info("Output directory: %s", ctx.out_dir)
+    _LOGGER.info("  xlsx file: %s", xlsx_filename)
+    _LOGGER.info("  Log file: %s", log_filename)
+
+
+if __name__ == "__main__":
+    _sys.exit(main())
@@ -75,52 +75,6 @@ def _find_planned_payment_initiation(
     return row
 
 
-def _upsert_payment_initiation_and_df_and_create_payment_infos(
-    conn,
-    *,
-    df: _pandas.DataFrame,
-    pain_id: int | None,
-    pain_message: wsjrdp2027.PainMessage,
-) -> None:
-    pain_updates = dict(
-        status="xml_generated",
-        sepa_schema=pain_message.sepa_schema,
-        message_identification=pain_message.message_identification,
-        number_of_transactions=pain_message.number_of_transactions,
-        control_sum_cents=pain_message.control_sum_cents,
-        initiating_party_name=pain_message.initiating_party_name,
-    )
-    if pain_id is None:
-        pain_id = wsjrdp2027.pg_insert_payment_initiation(conn, **pain_updates)  # type: ignore
-        df["pn_payment_initiation_id"] = pain_id
-        df["sepa_dd_payment_initiation_id"] = pain_id
-        _LOGGER.info("Finished INSERT wsjrdp_payment_initiations id=%s", pain_id)
-    else:
-        wsjrdp2027.pg_update_payment_initiation(conn, id=pain_id, updates=pain_updates)
-        _LOGGER.info("Finished UPDATE wsjrdp_payment_initiations id=%s", pain_id)
-
-    endtoend_id2pmt_inf_id = {}
-    seq_tp2pmt_inf_id = {}
-
-    for pmt_inf in pain_message.payment_infos:
-        insert_pmt_inf_kwargs = {k: getattr(pmt_inf, k) for k in _PMT_INF_UPSERT_COLS}
-        pmt_inf_id = wsjrdp2027.pg_insert_direct_debit_payment_info(
-            conn, payment_initiation_id=pain_id, **insert_pmt_inf_kwargs
-        )
-        seq_tp2pmt_inf_id[pmt_inf.debit_sequence_type] = pmt_inf_id
-        endtoend_id2pmt_inf_id.update(
-            {tx_inf.endtoend_id: pmt_inf_id for tx_inf in pmt_inf.direct_debit_tx_infs}
-        )
-        _LOGGER.info(
-            "Finished INSERT wsjrdp_direct_debit_payment_infos id=%s", pmt_inf_id
-        )
-
-    df["pn_direct_debit_payment_info_id"] = df["sepa_dd_endtoend_id"].map(
-        lambda id: endtoend_id2pmt_inf_id.get(id)
-    )
-    df["sepa_dd_direct_debit_payment_info_id"] = df["pn_direct_debit_payment_info_id"]
-
-
 def _report_pain_message(pain_message):
     _LOGGER.info("")
     _LOGGER.info("Parsed PAIN message:")
@@ -159,7 +113,9 @@ def _report_pain_message(pain_message):
 
 
 def _report_df(
-    df: _pandas.DataFrame, *, pain_message: wsjrdp2027.PainMessage | None = None
+    df: _pandas.DataFrame,
+    *,
+    pain_messages: _typing.Sequence[wsjrdp2027.PainMessage] = (),
 ) -> None:
     import textwrap
 
@@ -201,11 +157,12 @@ def _report_df(
         wsjrdp2027.format_cents_as_eur_de(df_ok["open_amount_cents"].sum()),
     )
     _LOGGER.info("")
-    if pain_message:
+    if pain_messages:
         sum_amounts_df_ok = df_ok["open_amount_cents"].sum()
-        if sum_amounts_df_ok != pain_message.control_sum_cents:
+        pain_sum = sum(m.control_sum_cents for m in pain_messages)
+        if sum_amounts_df_ok != pain_sum:
             err_msg = (
-                f"pain message sum = {pain_message.control_sum_cents}"
+                f"pain message sum = {pain_sum}"
                 f" inconsistent with"
                 f" sum(open_amount_cents) = {sum_amounts_df_ok} (where payment_status == 'ok')"
             )
@@ -213,7 +170,7 @@ def _report_df(
             raise RuntimeError(err_msg)
         else:
             ok_msg = (
-                f"OK: pain message sum = {pain_message.control_sum_cents}"
+                f"OK: pain message sum = {pain_sum}"
                 f" equals"
                 f" sum(open_amount_cents) = {sum_amounts_df_ok} (where payment_status == 'ok')"
             )
@@ -369,9 +326,31 @@ def create_argument_parser():
     p.add_argument("--exclude-id", action="append")
     p.add_argument("--end-to-end-id-suffix", default=None)
     p.add_argument("--rollback-for-testing", action="store_true", default=False)
+    split = p.add_argument_group(
+        "splitting",
+        "Split the direct debit into several files (and payment initiations),"
+        " one per sequence type and collection date, if any limit is given.",
+    )
+    split.add_argument("--max-transactions", type=int, help="per file")
+    split.add_argument("--max-control-sum-cents", type=int, help="per file")
+    split.add_argument("--max-pmt-inf-transactions", type=int, help="per PmtInf")
+    split.add_argument(
+        "-j", "--jobs", type=int, default=None, help="Files rendered in parallel"
+    )
     return p
 
 
+def _split_policy_from_args(args) -> wsjrdp2027.SepaDirectDebitSplitPolicy | None:
+    limits = dict(
+        max_transactions=args.max_transactions,
+        max_control_sum_cents=args.max_control_sum_cents,
+        max_pmt_inf_transactions=args.max_pmt_inf_transactions,
+    )
+    if all(v is None for v in limits.values()):
+        return None
+    return wsjrdp2027.SepaDirectDebitSplitPolicy(**limits)
+
+
 def _excluded_ids_from_parsed_arg(arg: list[str] | None) -> list[int]:
     if arg is None:
         return []
@@ -398,7 +377,6 @@ def main(argv=None):
     log_filename = out_base.with_suffix(".log")
     xml_filename = out_base.with_suffix(".xml")
     xlsx_filename = out_base.with_suffix(".xlsx")
-    mail_txt_filename = out_base.with_suffix(".mail.txt")
 
     ctx.configure_log_file(log_filename)
 
@@ -473,12 +451,15 @@ def main(argv=None):
             "SUM(open_amount_cents): %s", wsjrdp2027.format_cents_as_eur_de(sum_amount)
         )
 
-        wsjrdp2027.write_accounting_dataframe_to_sepa_dd(
+        sepa_dd_files = wsjrdp2027.write_accounting_dataframe_to_sepa_dd_files(
             df,
             xml_filename,
             config=wsjrdp2027.WSJRDP_PAXBANK_ROVERWAY_DIRECT_DEBIT_CONFIG,
             pedantic=True,
+            split_policy=_split_policy_from_args(args),
+            max_workers=args.jobs,
         )
+        pain_ids = [pain_id] if pain_id is not None else []
 
         # ==================================================================================
 
@@ -487,11 +468,16 @@ def main(argv=None):
             _LOGGER.warning("No Direct Debit (sum_amount == 0)")
             _LOGGER.warning("")
         else:
-            pain_message = wsjrdp2027.PainMessage.load(xml_filename)
-            _LOGGER.info("Parsed %s", xml_filename)
-            _write_mail_txt(mail_txt_filename, pain_message)
-            _report_pain_message(pain_message)
-            _report_df(df, pain_message=pain_message)
+            pain_messages = []
+            for sepa_dd_file in sepa_dd_files:
+                pain_message = wsjrdp2027.PainMessage.load(sepa_dd_file.path)
+                _LOGGER.info("Parsed %s", sepa_dd_file.path)
+                _write_mail_txt(
+                    sepa_dd_file.path.with_suffix(".mail.txt"), pain_message
+                )
+                _report_pain_message(pain_message)
+                pain_messages.append(pain_message)
+            _report_df(df, pain_messages=pain_messages)
             wsjrdp2027.report_direct_debit_amount_differences(df, logger=_LOGGER)
 
             #
@@ -503,12 +489,12 @@ def main(argv=None):
             #
 
             if args.accounting:
+                pain_ids = wsjrdp2027.write_payment_initiations_to_db(
+                    conn, df, pain_messages, pain_id=pain_id
+                )
                 wsjrdp2027.write_payment_dataframe_to_db(
                     conn, df, print_progress_message=ctx.print_progress_message
                 )
-                _upsert_payment_initiation_and_df_and_create_payment_infos(
-                    conn, pain_id=pain_id, df=df, pain_message=pain_message
-                )
             else:
                 _LOGGER.info("")
                 _LOGGER.info("SKIP ACCOUNTING (--no-accounting given)")
@@ -525,12 +511,16 @@ def main(argv=None):
             _LOGGER.warning("")
             print(flush=True)
 
-        if pain_id is not None:
-            datev_csv_filename = wsjrdp2027.datev.write_datev_csv_for_pain_id(
-                ctx=ctx, conn=conn, pain_id=pain_id
+        datev_csv_filenames = (
+            wsjrdp2027.datev.write_datev_csvs_for_pre_notifications(
+                ctx=ctx,
+                conn=conn,
+                pain_ids=pain_ids,
+                mark_exported=not ctx.dry_run and not args.rollback_for_testing,
             )
-        else:
-            datev_csv_filename = None
+            if pain_ids
+            else []
+        )
 
     _LOGGER.info("finish writing output")
 
@@ -540,9 +530,11 @@ def main(argv=None):
         _LOGGER.warning("")
     _LOGGER.info("")
     _LOGGER.info("Output directory: %s", ctx.out_dir)
-    _LOGGER.info("  SEPA XML: %s", xml_filename)
+    for sepa_dd_file in sepa_dd_files:
+        _LOGGER.info("  SEPA XML: %s", sepa_dd_file.path)
     _LOGGER.info("  Excel: %s", xlsx_filename)
-    _LOGGER.info("  DATEV CSV: %s", datev_csv_filename)
+    for datev_csv_filename in datev_csv_filenames:
+        _LOGGER.info("  DATEV CSV: %s", datev_csv_filename)
     _LOGGER.info("  Log file: %s", log_filename)
 
 
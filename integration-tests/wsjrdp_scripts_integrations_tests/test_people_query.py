@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import pytest
 import wsjrdp2027
 
 
@@ -75,3 +76,55 @@ class Test_Query_Tags:
             m_f["mailing_to"], m_f["mailing_cc"], m_f["mailing_bcc"], default=[]
         )
         assert set(all_f) < set(all_t)
+
+
+class Test_PeopleWhere_as_mask_parity:
+    @pytest.fixture
+    def all_people_df(self, ctx: wsjrdp2027.WsjRdpContext):
+        with ctx.psycopg_connect() as conn:
+            return wsjrdp2027.load_people_dataframe(
+                conn, where=None, log_resulting_data_frame=False
+            )
+
+    @pytest.mark.parametrize(
+        "where",
+        [
+            wsjrdp2027.PeopleWhere(exclude_deregistered=True),
+            wsjrdp2027.PeopleWhere(exclude_waiting_lists=True),
+            wsjrdp2027.PeopleWhere(status=["registered", "printed"]),
+            wsjrdp2027.PeopleWhere(exclude_status=["confirmed", None]),
+            wsjrdp2027.PeopleWhere(sepa_status="ok"),
+            wsjrdp2027.PeopleWhere(role="YP", early_payer=True),
+            wsjrdp2027.PeopleWhere(role=["UL", "CMT"], early_payer=False),
+            wsjrdp2027.PeopleWhere(unit_code=[None, "000000"]),
+            wsjrdp2027.PeopleWhere(exclude_unit_code=True),
+            wsjrdp2027.PeopleWhere(primary_group_id=[2, 3, 4]),
+            wsjrdp2027.PeopleWhere(exclude_primary_group_id=[2, 3, 4]),
+            wsjrdp2027.PeopleWhere(max_print_at="2025-06-01"),
+            wsjrdp2027.PeopleWhere(tag={"op": "ilike", "expr": "%Warteliste%"}),
+            wsjrdp2027.PeopleWhere(exclude_tag={"op": "ilike", "expr": "%warte%"}),
+            wsjrdp2027.PeopleWhere(note={"op": "~*", "expr": "sepa"}),
+            wsjrdp2027.PeopleWhere(
+                not_=wsjrdp2027.PeopleWhere(status="confirmed", early_payer=True)
+            ),
+            wsjrdp2027.PeopleWhere(
+                or_=[
+                    wsjrdp2027.PeopleWhere(role="IST"),
+                    wsjrdp2027.PeopleWhere(exclude_sepa_status="ok"),
+                ],
+                and_=[wsjrdp2027.PeopleWhere(exclude_deregistered=True)],
+            ),
+        ],
+    )
+    def test__as_mask_agrees_with_sql(
+        self,
+        ctx: wsjrdp2027.WsjRdpContext,
+        all_people_df,
+        where: wsjrdp2027.PeopleWhere,
+    ):
+        from wsjrdp2027 import _people
+
+        with ctx.psycopg_connect() as conn:
+            sql_ids = _people.load_people_ids(conn, where=where)
+        mask_ids = list(all_people_df.loc[where.as_mask(all_people_df), "id"])
+        assert mask_ids == sql_ids
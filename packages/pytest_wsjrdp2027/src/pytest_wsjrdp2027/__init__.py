@@ -7,6 +7,8 @@ import shlex as _shlex
 import subprocess as _subprocess
 
 from .fixtures import (
+    fake_keycloak_server as fake_keycloak_server,
+    fake_mailcow_server as fake_mailcow_server,
     forbid_to_connection as forbid_to_connection,
     mock_execute_query_fetchall_dicts as mock_execute_query_fetchall_dicts,
 )
@@ -0,0 +1,473 @@
+"""In-process HTTP stand-ins for the Keycloak admin and Mailcow APIs.
+
+Both servers run on ``127.0.0.1`` in a background thread, keep their
+data in memory and implement the subset of the APIs used by
+``wsjrdp2027.KeycloakClient`` and ``wsjrdp2027.MailcowClient``.  Every
+request is counted per endpoint (see `FakeServer.request_counts`) and
+can be slowed down with a fixed *latency* to make N+1 request patterns
+visible in benchmarks.
+"""
+
+from __future__ import annotations
+
+import abc as _abc
+import collections as _collections
+import http.server as _http_server
+import json as _json
+import logging as _logging
+import re as _re
+import threading as _threading
+import time as _time
+import typing as _typing
+import urllib.parse as _urllib_parse
+import uuid as _uuid
+
+
+if _typing.TYPE_CHECKING:
+    import collections.abc as _collections_abc
+
+
+_LOGGER = _logging.getLogger(__name__)
+
+_Response = tuple[int, object, dict[str, str]]
+
+
+class FakeServer(_abc.ABC):
+    """Base class of the fake servers, usable as a context manager."""
+
+    latency: float
+
+    def __init__(self, *, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.request_counts: _collections.Counter[str] = _collections.Counter()
+        self._lock = _threading.RLock()
+        self._httpd: _http_server.ThreadingHTTPServer | None = None
+        self._thread: _threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        if self._httpd is None:
+            raise RuntimeError(f"{type(self).__name__} is not running")
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def num_requests(self) -> int:
+        return sum(self.request_counts.values())
+
+    def reset_counts(self) -> None:
+        with self._lock:
+            self.request_counts.clear()
+
+    def start(self) -> _typing.Self:
+        httpd = _http_server.ThreadingHTTPServer(("127.0.0.1", 0), _RequestHandler)
+        httpd.daemon_threads = True
+        httpd.fake_server = self  # type: ignore[attr-defined]
+        self._httpd = httpd
+        self._thread = _threading.Thread(
+            target=httpd.serve_forever,
+            name=f"{type(self).__name__}-{id(self)}",
+            daemon=True,
+        )
+        self._thread.start()
+        _LOGGER.debug(f"Started {type(self).__name__} at {self.url}")
+        return self
+
+    def close(self) -> None:
+        if (httpd := self._httpd) is not None:
+            httpd.shutdown()
+            httpd.server_close()
+            self._httpd = None
+        if (thread := self._thread) is not None:
+            thread.join()
+            self._thread = None
+
+    def __enter__(self) -> _typing.Self:
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def handle(
+        self, method: str, path: str, query: dict[str, str], body: object
+    ) -> _Response:
+        if self.latency:
+            _time.sleep(self.latency)
+        with self._lock:
+            endpoint, response = self._dispatch(method, path, query, body)
+            self.request_counts[f"{method} {endpoint}"] += 1
+            return response
+
+    @_abc.abstractmethod
+    def _dispatch(
+        self, method: str, path: str, query: dict[str, str], body: object
+    ) -> tuple[str, _Response]:
+        """Handle one request and return ``(endpoint, response)``."""
+
+
+class _RequestHandler(_http_server.BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections alive like the real servers do.
+    protocol_version = "HTTP/1.1"
+
+    def __handle(self) -> None:
+        url = _urllib_parse.urlsplit(self.path)
+        query = dict(_urllib_parse.parse_qsl(url.query))
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length) if length else b""
+        content_type = self.headers.get("Content-Type", "")
+        if not raw_body:
+            body = None
+        elif "json" in content_type or raw_body[:1] in (b"{", b"["):
+            body = _json.loads(raw_body)
+        else:
+            body = dict(_urllib_parse.parse_qsl(raw_body.decode("utf-8")))
+        fake_server: FakeServer = self.server.fake_server  # type: ignore[attr-defined]
+        try:
+            status, payload, headers = fake_server.handle(
+                self.command, _urllib_parse.unquote(url.path), query, body
+            )
+        except Exception as exc:
+            _LOGGER.exception(f"{type(fake_server).__name__} failed: {exc}")
+            status, payload, headers = 500, {"error": str(exc)}, {}
+        data = b"" if payload is None else _json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        if data:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = do_DELETE = __handle
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def _paginate(items: list, query: dict[str, str]) -> list:
+    first = int(query.get("first", 0))
+    if (max_ := query.get("max")) is None:
+        return items[first:]
+    return items[first : first + int(max_)]
+
+
+def _not_found(endpoint: str) -> tuple[str, _Response]:
+    return endpoint, (404, {"error": "not found"}, {})
+
+
+# ======================================================================================
+# Keycloak
+# ======================================================================================
+
+
+class FakeKeycloakServer(FakeServer):
+    """Keycloak admin REST API for one realm.
+
+    >>> with FakeKeycloakServer(users=[{"username": "a", "email": "a@x"}]) as kc:
+    ...     import requests
+    ...     r = requests.get(f"{kc.url}/admin/realms/WSJ/users", params={"email": "A@X"})
+    >>> [u["username"] for u in r.json()], dict(kc.request_counts)
+    (['a'], {'GET users': 1})
+    """
+
+    def __init__(
+        self,
+        *,
+        realm: str = "WSJ",
+        users: _collections_abc.Iterable[dict] = (),
+        groups: _collections_abc.Iterable[str] = (),
+        latency: float = 0.0,
+    ) -> None:
+        super().__init__(latency=latency)
+        self.realm = realm
+        self.users: dict[str, dict] = {}
+        self.groups: dict[str, dict] = {}
+        self.group_members: dict[str, set[str]] = {}
+        for user in users:
+            self.add_user(user)
+        for name in groups:
+            self.add_group(name)
+
+    def add_user(self, user: dict) -> dict:
+        user = {"enabled": True, "attributes": {}} | user
+        user.setdefault("id", str(_uuid.uuid4()))
+        user["username"] = user["username"].lower()
+        self.users[user["id"]] = user
+        return user
+
+    def add_group(self, name: str) -> dict:
+        group = {"id": str(_uuid.uuid4()), "name": name, "path": f"/{name}"}
+        group["subGroups"] = []
+        self.groups[group["id"]] = group
+        self.group_members[group["id"]] = set()
+        return group
+
+    def add_group_members(self, name: str, user_ids: _collections_abc.Iterable[str]):
+        group = next(g for g in self.groups.values() if g["name"] == name)
+        self.group_members[group["id"]].update(user_ids)
+
+    def _dispatch(self, method, path, query, body):
+        if _re.fullmatch(r"/realms/[^/]+/protocol/openid-connect/token", path):
+            return "token", (200, _token_response(), {})
+        if path == "/admin/realms":
+            return "realms", (200, [{"realm": "master"}, {"realm": self.realm}], {})
+        prefix = f"/admin/realms/{self.realm}/"
+        if not path.startswith(prefix):
+            return _not_found(path)
+        parts = path.removeprefix(prefix).strip("/").split("/")
+        match method, parts:
+            case "GET", ["users"]:
+                users = _paginate(self.__find_users(query), query)
+                return "users", (200, users, {})
+            case "GET", ["users", "count"]:
+                return "users/count", (200, len(self.__find_users(query)), {})
+            case "POST", ["users"]:
+                if any(
+                    u["username"] == body["username"].lower()
+                    for u in self.users.values()
+                ):
+                    return "users", (409, {"errorMessage": "User exists"}, {})
+                user = self.add_user(dict(body))
+                location = f"{self.url}{prefix}users/{user['id']}"
+                return "users", (201, None, {"Location": location})
+            case "GET", ["users", user_id]:
+                if (user := self.users.get(user_id)) is None:
+                    return _not_found("users/{id}")
+                return "users/{id}", (200, user, {})
+            case "PUT", ["users", user_id]:
+                if (user := self.users.get(user_id)) is None:
+                    return _not_found("users/{id}")
+                user.update(body)
+                return "users/{id}", (204, None, {})
+            case "DELETE", ["users", user_id]:
+                self.users.pop(user_id, None)
+                for members in self.group_members.values():
+                    members.discard(user_id)
+                return "users/{id}", (204, None, {})
+            case "GET", ["users", user_id, "groups"]:
+                groups = [
+                    self.groups[gid]
+                    for gid, members in self.group_members.items()
+                    if user_id in members
+                ]
+                return "users/{id}/groups", (200, groups, {})
+            case "PUT" | "DELETE", ["users", user_id, "groups", group_id]:
+                members = self.group_members.get(group_id)
+                if members is None or user_id not in self.users:
+                    return _not_found("users/{id}/groups/{id}")
+                if method == "PUT":
+                    members.add(user_id)
+                else:
+                    members.discard(user_id)
+                return "users/{id}/groups/{id}", (204, None, {})
+            case "GET", ["groups"]:
+                search = query.get("search", "").lower()
+                groups = [
+                    g for g in self.groups.values() if search in g["name"].lower()
+                ]
+                return "groups", (200, _paginate(groups, query), {})
+            case "POST", ["groups"]:
+                group = self.add_group(body["name"])
+                location = f"{self.url}{prefix}groups/{group['id']}"
+                return "groups", (201, None, {"Location": location})
+            case "GET", ["group-by-path", *names]:
+                path_ = "/" + "/".join(names)
+                for group in self.groups.values():
+                    if group["path"] == path_:
+                        return "group-by-path", (200, group, {})
+                return _not_found("group-by-path")
+            case "GET", ["groups", group_id]:
+                if (group := self.groups.get(group_id)) is None:
+                    return _not_found("groups/{id}")
+                return "groups/{id}", (200, group, {})
+            case "DELETE", ["groups", group_id]:
+                self.groups.pop(group_id, None)
+                self.group_members.pop(group_id, None)
+                return "groups/{id}", (204, None, {})
+            case "GET", ["groups", group_id, "members"]:
+                members = sorted(self.group_members.get(group_id, ()))
+                users = [self.users[uid] for uid in _paginate(members, query)]
+                return "groups/{id}/members", (200, users, {})
+        return _not_found(path)
+
+    def __find_users(self, query: dict[str, str]) -> list[dict]:
+        exact = query.get("exact", "false").lower() == "true"
+
+        def matches(value: str | None, expected: str) -> bool:
+            value = (value or "").lower()
+            expected = expected.lower()
+            return value == expected if exact else expected in value
+
+        users = list(self.users.values())
+        for key in ["username", "email", "firstName", "lastName"]:
+            if key in query:
+                users = [u for u in users if matches(u.get(key), query[key])]
+        if search := query.get("search"):
+            search = search.strip("*").lower()
+            users = [
+                u
+                for u in users
+                if any(
+                    search in (u.get(k) or "").lower()
+                    for k in ["username", "email", "firstName", "lastName"]
+                )
+            ]
+        if q := query.get("q"):
+            for term in q.split():
+                key, _, value = term.partition(":")
+                users = [
+                    u for u in users if value in u.get("attributes", {}).get(key, [])
+                ]
+        return users
+
+
+def _token_response() -> dict:
+    return {
+        "access_token": "fake-access-token",
+        "expires_in": 3600,
+        "refresh_expires_in": 3600,
+        "refresh_token": "fake-refresh-token",
+        "token_type": "Bearer",
+    }
+
+
+# ======================================================================================
+# Mailcow
+# ======================================================================================
+
+
+class FakeMailcowServer(FakeServer):
+    """Mailcow ``/api/v1`` for domains, mailboxes and aliases.
+
+    >>> with FakeMailcowServer(aliases=[{"address": "a@x", "goto": "b@x"}]) as mc:
+    ...     import requests
+    ...     r = requests.get(f"{mc.url}/api/v1/get/alias/all")
+    >>> [a["goto"] for a in r.json()], dict(mc.request_counts)
+    (['b@x'], {'GET get/alias': 1})
+    """
+
+    def __init__(
+        self,
+        *,
+        domains: _collections_abc.Iterable[str] = (),
+        mailboxes: _collections_abc.Iterable[dict] = (),
+        aliases: _collections_abc.Iterable[dict] = (),
+        latency: float = 0.0,
+    ) -> None:
+        super().__init__(latency=latency)
+        self.domains: dict[str, dict] = {}
+        self.mailboxes: dict[str, dict] = {}
+        self.aliases: dict[int, dict] = {}
+        self._next_alias_id = 1
+        for domain in domains:
+            self.add_domain(domain)
+        for mailbox in mailboxes:
+            self.add_mailbox(mailbox)
+        for alias in aliases:
+            self.add_alias(alias)
+
+    def add_domain(self, domain: str) -> dict:
+        self.domains[domain] = {
+            "domain_name": domain,
+            "active": 1,
+            "max_num_aliases_for_domain": 100_000,
+            "max_num_mboxes_for_domain": 100_000,
+            "max_quota_for_domain": 0,
+            "max_quota_for_mbox": 0,
+            "def_quota_for_mbox": 0,
+        }
+        return self.domains[domain]
+
+    def add_mailbox(self, mailbox: dict) -> dict:
+        mailbox = {
+            k: v for k, v in mailbox.items() if k not in ("password", "password2")
+        }
+        if "username" not in mailbox:
+            mailbox["username"] = f"{mailbox['local_part']}@{mailbox['domain']}"
+        local_part, _, domain = mailbox["username"].partition("@")
+        mailbox = {"local_part": local_part, "domain": domain, "active": 1} | mailbox
+        self.mailboxes[mailbox["username"]] = mailbox
+        return mailbox
+
+    def add_alias(self, alias: dict) -> dict:
+        alias = {"active": 1} | alias
+        alias.setdefault("id", self._next_alias_id)
+        self._next_alias_id = max(self._next_alias_id, alias["id"]) + 1
+        self.aliases[alias["id"]] = alias
+        return alias
+
+    def _dispatch(self, method, path, query, body):
+        parts = path.removeprefix("/api/v1/").strip("/").split("/")
+        endpoint = "/".join(parts[:2])
+        objects = {
+            "domain": (self.domains, "domain_name"),
+            "mailbox": (self.mailboxes, "username"),
+            "alias": (self.aliases, "address"),
+        }
+        match method, parts:
+            case "GET", ["get", kind, key] if kind in objects:
+                items, key_attr = objects[kind]
+                if key == "all":
+                    return endpoint, (200, list(items.values()), {})
+                found = [
+                    item
+                    for item_key, item in items.items()
+                    if str(item_key) == key or item.get(key_attr) == key
+                ]
+                return endpoint, (200, found[0] if found else {}, {})
+            case "POST", ["add", "alias"]:
+                notes = []
+                for address in _re.split(r"[ ,;\n]+", body["address"].strip()):
+                    if any(a["address"] == address for a in self.aliases.values()):
+                        notes.append(_note("danger", "is_alias_or_mailbox", address))
+                        continue
+                    self.add_alias(body | {"address": address})
+                    notes.append(_note("success", "alias_added", address))
+                return endpoint, (200, notes, {})
+            case "POST", ["add", "mailbox"]:
+                username = f"{body['local_part']}@{body['domain']}"
+                if username in self.mailboxes:
+                    return endpoint, (
+                        200,
+                        [_note("danger", "object_exists", username)],
+                        {},
+                    )
+                self.add_mailbox(dict(body))
+                return endpoint, (
+                    200,
+                    [_note("success", "mailbox_added", username)],
+                    {},
+                )
+            case "POST", ["edit", kind] if kind in objects:
+                items, _ = objects[kind]
+                notes = []
+                for item_key in body["items"]:
+                    if (item := items.get(item_key)) is None:
+                        notes.append(_note("danger", "access_denied", item_key))
+                        continue
+                    item.update(
+                        (k, v)
+                        for k, v in body["attr"].items()
+                        if k not in ("password", "password2")
+                    )
+                    notes.append(_note("success", f"{kind}_modified", item_key))
+                return endpoint, (200, notes, {})
+            case "POST", ["delete", kind] if kind in objects:
+                items, key_attr = objects[kind]
+                notes = []
+                for item_key in body:
+                    if kind == "alias" and isinstance(item_key, str):
+                        item_key = next(
+                            (i for i, a in items.items() if a[key_attr] == item_key),
+                            None,
+                        )
+                    items.pop(item_key, None)
+                    notes.append(_note("success", f"{kind}_removed", item_key))
+                return endpoint, (200, notes, {})
+        return _not_found(endpoint)
+
+
+def _note(note_type: str, msg: str, obj: object) -> dict:
+    return {"type": note_type, "log": [msg, obj], "msg": [msg, obj]}
@@ -34,3 +34,25 @@ def forbid_to_connection(monkeypatch):
 
     monkeypatch.setattr(_pg, "to_connection", _raise)
     return _raise
+
+
+@_pytest.fixture
+def fake_keycloak_server():
+    """A running, empty `FakeKeycloakServer` for the realm ``WSJ``.
+
+    Add users and groups with ``add_user`` and ``add_group``; the
+    server is stopped after the test.
+    """
+    from .fake_servers import FakeKeycloakServer
+
+    with FakeKeycloakServer() as server:
+        yield server
+
+
+@_pytest.fixture
+def fake_mailcow_server():
+    """A running, empty `FakeMailcowServer`, stopped after the test."""
+    from .fake_servers import FakeMailcowServer
+
+    with FakeMailcowServer() as server:
+        yield server
@@ -23,6 +23,7 @@ from ._payment import (
     write_payment_dataframe_to_db as write_payment_dataframe_to_db,
     write_payment_dataframe_to_html as write_payment_dataframe_to_html,
     write_payment_dataframe_to_xlsx as write_payment_dataframe_to_xlsx,
+    write_payment_initiations_to_db as write_payment_initiations_to_db,
 )
 from ._payment_role import PaymentRole as PaymentRole
 from ._people import (
@@ -35,13 +36,16 @@ from ._pg import (
     PgConnectionLike as PgConnectionLike,
     pg_add_person_tag as pg_add_person_tag,
     pg_insert_camt_transaction_from_tx as pg_insert_camt_transaction_from_tx,
+    pg_insert_camt_transactions as pg_insert_camt_transactions,
     pg_insert_direct_debit_payment_info as pg_insert_direct_debit_payment_info,
     pg_insert_direct_debit_pre_notification as pg_insert_direct_debit_pre_notification,
     pg_insert_fin_account as pg_insert_fin_account,
     pg_insert_payment_initiation as pg_insert_payment_initiation,
+    pg_iter_dict_rows as pg_iter_dict_rows,
     pg_select_camt_tx_unique_db_key2row as pg_select_camt_tx_unique_db_key2row,
     pg_select_dataframe as pg_select_dataframe,
     pg_select_dict_rows as pg_select_dict_rows,
+    pg_select_fin_account_ids as pg_select_fin_account_ids,
     pg_select_group_dict_for_where as pg_select_group_dict_for_where,
     pg_select_groups_dicts_for_where as pg_select_groups_dicts_for_where,
     pg_update_payment_initiation as pg_update_payment_initiation,
@@ -53,8 +57,11 @@ from ._sepa_direct_debit import (
     RevertSepaDirectDebit as RevertSepaDirectDebit,
     RevertSepaDirectDebitResult as RevertSepaDirectDebitResult,
     SepaDirectDebit as SepaDirectDebit,
+    SepaDirectDebitFile as SepaDirectDebitFile,
     SepaDirectDebitPayment as SepaDirectDebitPayment,
+    SepaDirectDebitSplitPolicy as SepaDirectDebitSplitPolicy,
     write_accounting_dataframe_to_sepa_dd as write_accounting_dataframe_to_sepa_dd,
+    write_accounting_dataframe_to_sepa_dd_files as write_accounting_dataframe_to_sepa_dd_files,
 )
 from ._types import (
     SepaDirectDebitConfig as SepaDirectDebitConfig,
@@ -106,14 +113,33 @@ if _typing.TYPE_CHECKING:
     from ._camt import (
         CamtMessage as CamtMessage,
         CamtTransactionDetails as CamtTransactionDetails,
+        CamtTxRecord as CamtTxRecord,
         CamtTxUniqueDbKey as CamtTxUniqueDbKey,
     )
+    from ._camt_reconciliation import (
+        load_camt_reconciliation_data as load_camt_reconciliation_data,
+        reconcile_camt_transactions as reconcile_camt_transactions,
+        write_camt_reconciliation_to_xlsx as write_camt_reconciliation_to_xlsx,
+    )
+    from ._forwarding_graph import ForwardingGraph as ForwardingGraph
+    from ._iban import (
+        IbanBicCheck as IbanBicCheck,
+        IbanInfo as IbanInfo,
+        IbanService as IbanService,
+        get_iban_service as get_iban_service,
+    )
     from ._internal.signatures import (
         EMAIL_SIGNATURE_BMT as EMAIL_SIGNATURE_BMT,
         EMAIL_SIGNATURE_CMT as EMAIL_SIGNATURE_CMT,
         EMAIL_SIGNATURE_HOC as EMAIL_SIGNATURE_HOC,
     )
+    from ._iso20022_ingest import (
+        Iso20022IngestResult as Iso20022IngestResult,
+        expand_iso20022_paths as expand_iso20022_paths,
+        ingest_iso20022_files as ingest_iso20022_files,
+    )
     from ._keycloak_client import KeycloakClient as KeycloakClient
+    from ._keycloak_sync_plan import KeycloakSyncPlan as KeycloakSyncPlan
     from ._keycloak_wsjrdp_adapter import WsjRdpKeycloakAdapter as WsjRdpKeycloakAdapter
     from ._mailcow_client import (
         MailcowClient as MailcowClient,
@@ -160,10 +186,17 @@ __all__ = [
     "BatchConfig",
     "CamtMessage",
     "CamtTransactionDetails",
+    "CamtTxRecord",
     "CamtTxUniqueDbKey",
     "DirectDebitPreNotification",
+    "ForwardingGraph",
     "Group",
+    "IbanBicCheck",
+    "IbanInfo",
+    "IbanService",
+    "Iso20022IngestResult",
     "KeycloakClient",
+    "KeycloakSyncPlan",
     "MailClient",
     "MailcowClient",
     "PainMessage",
@@ -181,7 +214,9 @@ __all__ = [
     "RevertSepaDirectDebitResult",
     "SepaDirectDebit",
     "SepaDirectDebitConfig",
+    "SepaDirectDebitFile",
     "SepaDirectDebitPayment",
+    "SepaDirectDebitSplitPolicy",
     "WsjRdpContext",
     "WsjRdpContextConfig",
     "WsjRdpKeycloakAdapter",
@@ -190,17 +225,21 @@ __all__ = [
     "console_confirm",
     "create_dir",
     "dedup",
+    "expand_iso20022_paths",
     "format_cents_as_eur_de",
     "format_eur_as_eur_de",
     "format_iban",
     "generate_mail_username",
     "generate_password",
     "get_default_email_policy",
+    "get_iban_service",
     "get_typst_font_paths",
     "hitobito_id_from_sepa_mandate_id",
+    "ingest_iso20022_files",
     "insert_direct_debit_pre_notification_from_row",
     "iter_people_dataframe",
     "load_accounting_balance_in_cent",
+    "load_camt_reconciliation_data",
     "load_payment_dataframe",
     "load_payment_dataframe_from_payment_initiation",
     "load_people_dataframe",
@@ -211,16 +250,20 @@ __all__ = [
     "nan_to_none",
     "pg_add_person_tag",
     "pg_insert_camt_transaction_from_tx",
+    "pg_insert_camt_transactions",
     "pg_insert_direct_debit_payment_info",
     "pg_insert_direct_debit_pre_notification",
     "pg_insert_fin_account",
     "pg_insert_payment_initiation",
+    "pg_iter_dict_rows",
     "pg_select_camt_tx_unique_db_key2row",
     "pg_select_dataframe",
     "pg_select_dict_rows",
+    "pg_select_fin_account_ids",
     "pg_select_group_dict_for_where",
     "pg_select_groups_dicts_for_where",
     "pg_update_payment_initiation",
+    "reconcile_camt_transactions",
     "render_template",
     "report_direct_debit_amount_differences",
     "sepa_mandate_id_from_hitobito_id",
@@ -239,10 +282,13 @@ __all__ = [
     "to_yaml_str",
     "typst_compile",
     "write_accounting_dataframe_to_sepa_dd",
+    "write_accounting_dataframe_to_sepa_dd_files",
+    "write_camt_reconciliation_to_xlsx",
     "write_dataframe_to_xlsx",
     "write_payment_dataframe_to_db",
     "write_payment_dataframe_to_html",
     "write_payment_dataframe_to_xlsx",
+    "write_payment_initiations_to_db",
     "write_people_dataframe_to_xlsx",
     #
     "bank_accounts",
@@ -332,13 +378,20 @@ __ALIASES__ = {
     #
     "CamtMessage": (f"._camt", "CamtMessage"),
     "CamtTransactionDetails": (f"._camt", "CamtTransactionDetails"),
+    "CamtTxRecord": (f"._camt", "CamtTxRecord"),
     "CamtTxUniqueDbKey": (f"._camt", "CamtTxUniqueDbKey"),
     "DirectDebitPreNotification": (
         "._models.direct_debit_pre_notification",
         "DirectDebitPreNotification",
     ),
+    "ForwardingGraph": ("._forwarding_graph", "ForwardingGraph"),
     "Group": ("._models.group", "Group"),
+    "IbanBicCheck": ("._iban", "IbanBicCheck"),
+    "IbanInfo": ("._iban", "IbanInfo"),
+    "IbanService": ("._iban", "IbanService"),
+    "Iso20022IngestResult": ("._iso20022_ingest", "Iso20022IngestResult"),
     "KeycloakClient": ("._keycloak_client", "KeycloakClient"),
+    "KeycloakSyncPlan": ("._keycloak_sync_plan", "KeycloakSyncPlan"),
     "MailcowClient": ("._mailcow_client", "MailcowClient"),
     "MailcowConfig": ("._mailcow_client", "MailcowConfig"),
     "MailcowError": ("._mailcow_client", "MailcowError"),
@@ -358,7 +411,14 @@ __ALIASES__ = {
     "build_report_tree_widget": ("._report_tree", "build_report_tree_widget"),
     "datev": ("._datev", ""),
     "dedup": ("._util", "dedup"),
+    "expand_iso20022_paths": ("._iso20022_ingest", "expand_iso20022_paths"),
+    "get_iban_service": ("._iban", "get_iban_service"),
+    "ingest_iso20022_files": ("._iso20022_ingest", "ingest_iso20022_files"),
     "iter_people_dataframe": ("._models.person", "iter_people_dataframe"),
+    "load_camt_reconciliation_data": (
+        "._camt_reconciliation",
+        "load_camt_reconciliation_data",
+    ),
     "keycloak": (".keycloak", ""),
     "load_pre_notifications_for_people": (
         "._models.person",
@@ -371,7 +431,15 @@ __ALIASES__ = {
     "mailbox": (".mailbox", ""),
     "moss": (".moss", ""),
     "pg": ("._pg", ""),
+    "reconcile_camt_transactions": (
+        "._camt_reconciliation",
+        "reconcile_camt_transactions",
+    ),
     "show_report_tree": ("._report_tree", "show_report_tree"),
+    "write_camt_reconciliation_to_xlsx": (
+        "._camt_reconciliation",
+        "write_camt_reconciliation_to_xlsx",
+    ),
 }
 
 
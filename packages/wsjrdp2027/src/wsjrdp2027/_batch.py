@@ -24,6 +24,7 @@ if _typing.TYPE_CHECKING:
 
 __all__ = [
     "BatchConfig",
+    "EmlWriter",
     "PreparedBatch",
     "PreparedEmailMessage",
 ]
@@ -73,12 +74,22 @@ class PreparedEmailMessage:
 
     @property
     def eml(self) -> bytes:
-        if self._eml is None:
-            if self.message is not None:
-                self._eml = self.message.as_bytes()
-            else:
-                self._eml = b""
-        return self._eml
+        """The serialized message.
+
+        Unless set explicitly, the bytes are rendered on each access
+        and not kept, so a large batch does not hold all serialized
+        messages in memory. `EmlWriter` renders them once for the eml
+        output and `MailClient.send_message` once at send time (for
+        both SMTP and IMAP).
+        """
+        if self._eml is not None:
+            return self._eml
+        elif self.message is not None:
+            from . import _mail_client
+
+            return _mail_client.message_as_bytes(self.message)
+        else:
+            return b""
 
     @eml.setter
     def eml(self, value: bytes) -> None:
@@ -97,6 +108,113 @@ class PreparedEmailMessage:
             return None
 
 
+class EmlWriter:
+    """Write eml files of prepared messages to disk as they arrive.
+
+    With *zip_eml* the messages are streamed into ``<out_dir>/<name>.zip``
+    (``ZIP_DEFLATED`` with *compresslevel*), so the archive is never
+    held in memory. Otherwise one file per message is written to
+    *out_dir* using a thread pool with *max_workers* threads.
+
+    Messages without an actual email message are skipped. The zip
+    file is only created once the first message is written.
+    """
+
+    out_dir: _pathlib.Path
+    name: str
+    zip_eml: bool
+    compresslevel: int | None
+    count: int = 0
+
+    def __init__(
+        self,
+        out_dir: _pathlib.Path | str,
+        /,
+        *,
+        name: str,
+        zip_eml: bool = True,
+        compresslevel: int | None = None,
+        max_workers: int | None = None,
+        silent_skip_email: bool | None = None,
+    ) -> None:
+        self.out_dir = _pathlib.Path(out_dir)
+        self.name = name
+        self.zip_eml = zip_eml
+        self.compresslevel = compresslevel
+        self._max_workers = max_workers
+        self._silent_skip_email = silent_skip_email
+        self._zip_file = None
+        self._executor = None
+        self._futures = []
+
+    @property
+    def path(self) -> _pathlib.Path:
+        """Path of the zip file (*zip_eml*) or the output directory."""
+        return self.out_dir / f"{self.name}.zip" if self.zip_eml else self.out_dir
+
+    def __enter__(self) -> _typing.Self:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def write(self, prep_msg: PreparedEmailMessage, /) -> None:
+        if not prep_msg.message:
+            if not self._silent_skip_email:
+                _LOGGER.debug("  skip empty email message - %s", prep_msg.summary)
+            return
+        if self.zip_eml:
+            self.__zip_file().writestr(prep_msg.eml_name, data=prep_msg.eml)
+        else:
+            self._futures.append(
+                self.__executor().submit(
+                    self.__write_eml_file, self.out_dir / prep_msg.eml_name, prep_msg
+                )
+            )
+        self.count += 1
+
+    def close(self) -> None:
+        if (zip_file := self._zip_file) is not None:
+            self._zip_file = None
+            zip_file.close()
+            _LOGGER.info("  wrote eml zip %s (%s messages)", self.path, self.count)
+        if (executor := self._executor) is not None:
+            self._executor = None
+            executor.shutdown(wait=True)
+            futures, self._futures = self._futures, []
+            errors = [exc for f in futures if (exc := f.exception()) is not None]
+            if errors:
+                raise ExceptionGroup("Failed to write eml files", errors)
+
+    def __zip_file(self):
+        import zipfile
+
+        if self._zip_file is None:
+            self.out_dir.mkdir(exist_ok=True, parents=True)
+            self._zip_file = zipfile.ZipFile(
+                self.path,
+                "w",
+                compression=zipfile.ZIP_DEFLATED,
+                compresslevel=self.compresslevel,
+            )
+        return self._zip_file
+
+    def __executor(self):
+        import concurrent.futures
+
+        if self._executor is None:
+            self.out_dir.mkdir(exist_ok=True, parents=True)
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="eml"
+            )
+        return self._executor
+
+    @staticmethod
+    def __write_eml_file(eml_path: _pathlib.Path, prep_msg: PreparedEmailMessage):
+        eml_path.write_bytes(prep_msg.eml)
+        _LOGGER.info("  wrote eml %s", eml_path)
+
+
 @_dataclasses.dataclass(kw_only=True)
 class PreparedBatch:
     name: str = "batch"
@@ -138,6 +256,8 @@ class PreparedBatch:
         out_dir: _pathlib.Path | None = None,
         zip_eml: bool | None = None,
         silent_skip_email: bool | None = None,
+        eml_compresslevel: int | None = None,
+        eml_max_workers: int | None = None,
     ) -> _pathlib.Path:
         from . import _people
 
@@ -155,7 +275,11 @@ class PreparedBatch:
         yml_path = out_dir / f"{self.name}.yml"
 
         self.__write_eml(
-            out_dir=out_dir, zip_eml=zip_eml, silent_skip_email=silent_skip_email
+            out_dir=out_dir,
+            zip_eml=zip_eml,
+            silent_skip_email=silent_skip_email,
+            compresslevel=eml_compresslevel,
+            max_workers=eml_max_workers,
         )
 
         _people.write_people_dataframe_to_xlsx(
@@ -196,34 +320,21 @@ class PreparedBatch:
         out_dir: _pathlib.Path,
         zip_eml: bool,
         silent_skip_email: bool | None = None,
+        compresslevel: int | None = None,
+        max_workers: int | None = None,
     ) -> None:
-        import io
-        import zipfile
-
-        skipped_messages = [pm for pm in self.messages if not pm.message]
-        prepared_messages = [pm for pm in self.messages if pm.message]
-        if not silent_skip_email:
-            for prep_msg in skipped_messages:
-                _LOGGER.debug("  skip empty email message - %s", prep_msg.summary)
-        if not prepared_messages:
-            if not silent_skip_email:
-                _LOGGER.info("  only empty messages - no eml output")
-            return
-
-        if zip_eml:
-            zip_buf = io.BytesIO()
-            with zipfile.ZipFile(zip_buf, "w") as zf:
-                for prep_msg in prepared_messages:
-                    zf.writestr(prep_msg.eml_name, data=prep_msg.eml)
-            eml_zip_path = out_dir / f"{self.name}.zip"
-            with open(eml_zip_path, "wb") as f:
-                f.write(zip_buf.getvalue())
-            _LOGGER.info("  wrote eml zip %s", eml_zip_path)
-        else:
-            for prep_msg in prepared_messages:
-                eml_path = out_dir / prep_msg.eml_name
-                eml_path.write_bytes(prep_msg.eml)
-                _LOGGER.info("  wrote eml %s", eml_path)
+        with EmlWriter(
+            out_dir,
+            name=self.name,
+            zip_eml=zip_eml,
+            compresslevel=compresslevel,
+            max_workers=max_workers,
+            silent_skip_email=silent_skip_email,
+        ) as eml_writer:
+            for prep_msg in self.messages:
+                eml_writer.write(prep_msg)
+        if not eml_writer.count and not silent_skip_email:
+            _LOGGER.info("  only empty messages - no eml output")
 
     def write_results(
         self, *, out_dir: _pathlib.Path | None = None, json_indent: int | None = None
@@ -252,6 +363,8 @@ class PreparedBatch:
         import pprint
         import textwrap
 
+        from . import _mail_scheduler
+
         num_messages = len(self.messages)
         if self.dry_run:
             if self.skip_email:
@@ -265,9 +378,11 @@ class PreparedBatch:
         elif self.skip_email:
             _LOGGER.info("Skip sending %s messages (skip_email is True)", num_messages)
             return
+        scheduler = _mail_scheduler.MailSendScheduler(mail_client)
         for i, prep_msg in enumerate(self.messages, start=1):
-            pcnt = (i / num_messages) * 100.0
-            _LOGGER.info("%s %s", f"{i}/{num_messages} ({pcnt:.1f}%)", prep_msg.summary)
+            _LOGGER.info(
+                "%s %s", scheduler.progress_message(i, num_messages), prep_msg.summary
+            )
             if prep_msg.row is not None:
                 row_d = dict(prep_msg.row)
                 row_d.pop("person_dict", None)
@@ -279,12 +394,24 @@ class PreparedBatch:
                 _LOGGER.debug("  Skip: No actual email message")
             else:
                 try:
-                    mail_client.send_message(prep_msg.message, from_addr=self.from_addr)
+                    scheduler.send(prep_msg, from_addr=self.from_addr)
                 except Exception as exc:
                     _LOGGER.error(
                         "  Exception raised during email sending: %s", str(exc)
                     )
                     raise
+        if scheduler.retries or scheduler.throttled_seconds:
+            _LOGGER.info(
+                "Sent %s messages in %s SMTP transactions "
+                "(%s retries, %s reconnects, throttled for %.0f seconds, "
+                "backoff for %.0f seconds)",
+                scheduler.messages_sent,
+                scheduler.transactions,
+                scheduler.retries,
+                scheduler.reconnects,
+                scheduler.throttled_seconds,
+                scheduler.backoff_seconds,
+            )
 
 
 _DEFAULT_SUMMARY = "{{ row.role_id_name }}; status: {{ row.status }}{% if msg %}; To: {{ msg.to }}; Cc: {{ msg.cc }}{% if msg.bcc %}; Bcc: {{msg.bcc }}{% endif %}{% endif %}"
@@ -787,6 +914,69 @@ class BatchConfig:
 
         return df
 
+    def select_people_dataframe(
+        self,
+        df: _pandas.DataFrame,
+        /,
+        *,
+        conn: _psycopg.Connection,
+    ) -> _pandas.DataFrame:
+        """Select the rows of the people dataframe *df* matching `query`.
+
+        *df* must have been loaded for a superset of `query` (see
+        `load_people_dataframes_for_batch_configs`). The where
+        conditions are evaluated in memory (`PeopleWhere.as_mask`);
+        only conditions that cannot be evaluated in memory fetch the
+        matching ids from the database. The result is a copy and
+        honors ``limit``, ``offset`` and ``email_only_where``.
+        """
+        import pandas as _pandas
+
+        ids = self.__matching_people_ids(df, self.query.where, conn=conn)
+        selected_df = self.__select_people_rows(df, ids)
+        if self.query.email_only_where:
+            found_ids = set(selected_df["id"])
+            email_only_ids = [
+                id
+                for id in self.__matching_people_ids(
+                    df, self.query.email_only_where, conn=conn
+                )
+                if id not in found_ids
+            ]
+            df2 = self.__select_people_rows(df, email_only_ids)
+            if not df2.empty:
+                df2["skip_db_updates"] = True
+                self.__mark_df_for_skip_db_updates(df2)
+                selected_df = _pandas.concat(
+                    [selected_df, df2], axis=0, ignore_index=True, sort=False
+                )
+        return selected_df
+
+    @staticmethod
+    def __matching_people_ids(
+        df: _pandas.DataFrame,
+        where: _people_query.PeopleWhere | None,
+        *,
+        conn: _psycopg.Connection,
+    ) -> list[int]:
+        from . import _people
+
+        if where is None:
+            return list(df["id"])
+        try:
+            return list(df.loc[where.as_mask(df), "id"])
+        except ValueError as exc:
+            _LOGGER.debug("Select people ids in database (%s)", exc)
+            return _people.load_people_ids(conn, where=where)
+
+    def __select_people_rows(
+        self, df: _pandas.DataFrame, ids: _collections_abc.Iterable[int]
+    ) -> _pandas.DataFrame:
+        selected_df = df[df["id"].isin(list(ids))]
+        start = self.query.offset or 0
+        stop = (start + self.query.limit) if self.query.limit is not None else None
+        return selected_df.iloc[start:stop].reset_index(drop=True).copy(deep=True)
+
     @staticmethod
     def __mark_df_for_skip_db_updates(df: _pandas.DataFrame) -> None:
         from ._payment import _skip_payment
@@ -1227,6 +1417,102 @@ def write_data_and_send_mailing(
         mailing.send(mail_client)
 
 
+def load_people_dataframes_for_batch_configs(
+    batch_configs: _collections_abc.Sequence[BatchConfig],
+    /,
+    *,
+    ctx: _context.WsjRdpContext,
+    conn: _psycopg.Connection | None = None,
+    extra_static_df_cols: dict[str, _typing.Any] | None = None,
+    extra_mailing_bcc: str | _collections_abc.Iterable[str] | None = None,
+    log_resulting_data_frame: bool | None = None,
+) -> list[_pandas.DataFrame]:
+    """Load the people dataframes for several batch configs.
+
+    Batch configs whose queries only differ in ``where``,
+    ``email_only_where``, ``limit`` and ``offset`` share a single
+    load of the union of their where conditions. The dataframe of
+    each batch is then selected from the shared dataframe (see
+    `BatchConfig.select_people_dataframe`).
+
+    Returns one dataframe per batch config (in the given order).
+    """
+    import textwrap
+
+    from . import _people, _people_query
+
+    groups: dict[tuple, list[int]] = {}
+    for idx, batch_config in enumerate(batch_configs):
+        query = batch_config.query
+        fee_rules = query.where.fee_rules if query.where else ("active",)
+        key = (
+            query.now,
+            query.collection_date,
+            query.include_sepa_mail_in_mailing_to,
+            fee_rules,
+        )
+        groups.setdefault(key, []).append(idx)
+
+    dfs: list[_pandas.DataFrame | None] = [None] * len(batch_configs)
+    with _contextlib.ExitStack() as exit_stack:
+        if conn is None:
+            conn = exit_stack.enter_context(ctx.psycopg_connect())
+
+        for (now, collection_date, _, fee_rules), indices in groups.items():
+            if len(indices) == 1:
+                [idx] = indices
+                dfs[idx] = batch_configs[idx].load_people_dataframe(
+                    ctx=ctx,
+                    conn=conn,
+                    collection_date=collection_date,
+                    extra_static_df_cols=extra_static_df_cols,
+                    extra_mailing_bcc=extra_mailing_bcc,
+                    log_resulting_data_frame=False,
+                    now=now,
+                )
+                continue
+
+            wheres = []
+            for idx in indices:
+                query = batch_configs[idx].query
+                wheres.append(query.where)
+                if query.email_only_where:
+                    wheres.append(query.email_only_where)
+            if all(w is not None and w.as_where_condition() for w in wheres):
+                union_where = _people_query.PeopleWhere(or_=wheres, fee_rules=fee_rules)
+            else:
+                union_where = _people_query.PeopleWhere(fee_rules=fee_rules)
+            superset_query = batch_configs[indices[0]].query.replace(
+                where=union_where, email_only_where=None, limit=None, offset=None
+            )
+            _LOGGER.info(
+                "Load people for %s batches: %s",
+                len(indices),
+                ", ".join(batch_configs[idx].name for idx in indices),
+            )
+            superset_df = _people.load_people_dataframe(
+                conn,
+                query=superset_query,
+                extra_static_df_cols=extra_static_df_cols,
+                extra_mailing_bcc=extra_mailing_bcc,
+                log_resulting_data_frame=False,
+            )
+            for idx in indices:
+                dfs[idx] = batch_configs[idx].select_people_dataframe(
+                    superset_df, conn=conn
+                )
+
+    result = [df for df in dfs if df is not None]
+    if log_resulting_data_frame or (log_resulting_data_frame is None):
+        for batch_config, df in zip(batch_configs, result, strict=True):
+            _LOGGER.info(
+                "Resulting pandas DataFrame for %s:\n%s",
+                batch_config.name,
+                textwrap.indent(str(df), "  "),
+            )
+    return result
+
+
 def _normalize_query_where_or_none(
     query: _people_query.PeopleQuery | dict | None = None,
     where: _people_query.PeopleWhere | dict | str | None = None,
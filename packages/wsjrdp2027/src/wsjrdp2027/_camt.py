@@ -16,6 +16,8 @@ from ._iso20022 import (
 if _typing.TYPE_CHECKING:
     import io as _io
 
+    import pandas as _pandas
+
     from . import _file
 
 
@@ -26,6 +28,105 @@ class CamtTxUniqueDbKey(_typing.NamedTuple):
     transaction_details_index: int = 0
 
 
+@_dataclasses.dataclass(kw_only=True, frozen=True, slots=True)
+class CamtTxRecord:
+    """Flat copy of the fields of a `CamtTransactionDetails`.
+
+    The properties of `CamtTransactionDetails` walk the nested dicts of
+    the message on every access.  A record computes all fields once (see
+    `CamtTransactionDetails.to_record` and `CamtMessage.iter_records`) and
+    does not reference the message anymore.
+    """
+
+    # message
+    camt_type: str
+    message_identification: str
+    message_creation_date_time: _datetime.datetime
+    # Rpt / Stmt / Ntfctn
+    account_identification: str
+    report_identification: str
+    report_electronic_sequence_number: int | None
+    report_legal_sequence_number: int | None
+    report_page_number: int | None
+    report_creation_date_time: _datetime.datetime
+    # Ntry
+    account_servicer_reference: str
+    credit_debit_indication: str
+    status: str
+    is_booked: bool
+    value_date: _datetime.date | None
+    booking_date: _datetime.date | None
+    additional_entry_info: str | None
+    # TxDtls
+    transaction_details_index: int
+    amount_cents: int
+    amount_currency: str
+    description: str
+    references: dict[str, str]
+    endtoend_id: str | None
+    mandate_id: str | None
+    bank_transaction_code: str
+    bank_transaction_code_dk: str
+    return_reason: str | None
+    cdtr_name: str | None
+    cdtr_iban: str | None
+    cdtr_bic: str | None
+    cdtr_address: str | None
+    dbtr_name: str | None
+    dbtr_iban: str | None
+    dbtr_bic: str | None
+    dbtr_address: str | None
+    # raw data
+    ntry: dict = _dataclasses.field(repr=False, compare=False)
+    tx_dtls: dict = _dataclasses.field(repr=False, compare=False)
+
+    @property
+    def is_credit(self) -> bool:
+        return self.credit_debit_indication == "CRDT"
+
+    @property
+    def is_debit(self) -> bool:
+        return self.credit_debit_indication == "DBIT"
+
+    @property
+    def unique_db_key(self) -> CamtTxUniqueDbKey:
+        return CamtTxUniqueDbKey(
+            camt_type=self.camt_type,
+            account_identification=self.account_identification,
+            account_servicer_reference=self.account_servicer_reference,
+            transaction_details_index=self.transaction_details_index,
+        )
+
+    def asdict(self) -> dict[str, _typing.Any]:
+        """Return the fields as dict (without copying `ntry` and `tx_dtls`)."""
+        return {f.name: getattr(self, f.name) for f in _dataclasses.fields(self)}
+
+
+def camt_records_to_dataframe(
+    records: _typing.Iterable[CamtTxRecord], /
+) -> _pandas.DataFrame:
+    """Return a DataFrame with one row per record and one column per field."""
+    import pandas as _pandas
+
+    columns = [f.name for f in _dataclasses.fields(CamtTxRecord)]
+    return _pandas.DataFrame([r.asdict() for r in records], columns=columns)
+
+
+def _ntry_date_or_none(obj: dict | str | None, /) -> _datetime.date | None:
+    """Return the ``Dt`` of a ``ValDt`` or ``BookgDt`` element.
+
+    Missing or empty elements (converted to ``""``) give `None`.
+
+    >>> _ntry_date_or_none({"Dt": "2026-01-02"}), _ntry_date_or_none("")
+    (datetime.date(2026, 1, 2), None)
+    """
+    from . import _util
+
+    if not isinstance(obj, dict):
+        return None
+    return _util.to_date_or_none(obj.get("Dt") or None)
+
+
 @_dataclasses.dataclass(kw_only=True)
 class CamtTransactionDetails:
     entry_details = _weakref_util.WeakrefAttr["CamtEntryDetails"]()
@@ -34,11 +135,17 @@ class CamtTransactionDetails:
 
     __transaction_details_index: int = _dataclasses.field(default=0, repr=False)
 
+    # Strong references to the parent objects, only set for streamed
+    # transaction details whose parents are not referenced otherwise
+    # (see CamtMessage.stream_transaction_details).
+    _parents: tuple = _dataclasses.field(default=(), repr=False)
+
     def __init__(
         self, *, TxDtls: dict, entry_details: CamtEntryDetails, index: int | None = None
     ) -> None:
         self.entry_details = entry_details
         self._root = TxDtls
+        self._parents = ()
         if index is not None:
             self.__transaction_details_index = index
 
@@ -105,11 +212,11 @@ class CamtTransactionDetails:
         return self.entry.Ntry
 
     @property
-    def value_date(self) -> _datetime.date:
+    def value_date(self) -> _datetime.date | None:
         return self.entry.value_date
 
     @property
-    def booking_date(self) -> _datetime.date:
+    def booking_date(self) -> _datetime.date | None:
         return self.entry.booking_date
 
     @property
@@ -252,6 +359,37 @@ class CamtTransactionDetails:
             transaction_details_index=self.transaction_details_index,
         )
 
+    def to_record(self) -> CamtTxRecord:
+        return CamtTxRecord(
+            **self.report._record_fields(),
+            **self.entry._record_fields(),
+            **self._record_fields(),
+        )
+
+    def _record_fields(self) -> dict[str, _typing.Any]:
+        references = self.references
+        return {
+            "transaction_details_index": self.transaction_details_index,
+            "amount_cents": self.amount_cents,
+            "amount_currency": self.amount_currency,
+            "description": self.description,
+            "references": references,
+            "endtoend_id": references.get("EndToEndId"),
+            "mandate_id": references.get("MndtId"),
+            "bank_transaction_code": self.bank_transaction_code,
+            "bank_transaction_code_dk": self.bank_transaction_code_dk,
+            "return_reason": self.return_reason,
+            "cdtr_name": self.cdtr_name,
+            "cdtr_iban": self.cdtr_iban,
+            "cdtr_bic": self.cdtr_bic,
+            "cdtr_address": self.cdtr_address,
+            "dbtr_name": self.dbtr_name,
+            "dbtr_iban": self.dbtr_iban,
+            "dbtr_bic": self.dbtr_bic,
+            "dbtr_address": self.dbtr_address,
+            "tx_dtls": self._root,
+        }
+
 
 @_dataclasses.dataclass(kw_only=True)
 class CamtEntryDetails:
@@ -387,16 +525,12 @@ class CamtEntry:
         return tx_dtls.references if (tx_dtls := self._tx_dtls) else {}
 
     @property
-    def value_date(self) -> _datetime.date:
-        from . import _util
-
-        return _util.to_date(self.Ntry["ValDt"]["Dt"])
+    def value_date(self) -> _datetime.date | None:
+        return _ntry_date_or_none(self.Ntry.get("ValDt"))
 
     @property
-    def booking_date(self) -> _datetime.date:
-        from . import _util
-
-        return _util.to_date(self.Ntry["BookgDt"]["Dt"])
+    def booking_date(self) -> _datetime.date | None:
+        return _ntry_date_or_none(self.Ntry.get("BookgDt"))
 
     @property
     def additional_entry_info(self) -> str | None:
@@ -450,6 +584,18 @@ class CamtEntry:
     def dbtr_address(self) -> str | None:
         return tx_dtls.dbtr_address if (tx_dtls := self._tx_dtls) else None
 
+    def _record_fields(self) -> dict[str, _typing.Any]:
+        return {
+            "account_servicer_reference": self.account_servicer_reference,
+            "credit_debit_indication": self.credit_debit_indication,
+            "status": self.status,
+            "is_booked": self.is_booked,
+            "value_date": _ntry_date_or_none(self._root.get("ValDt")),
+            "booking_date": _ntry_date_or_none(self._root.get("BookgDt")),
+            "additional_entry_info": self.additional_entry_info,
+            "ntry": self._root,
+        }
+
 
 @_dataclasses.dataclass(kw_only=True)
 class CamtReport:
@@ -515,6 +661,30 @@ class CamtReport:
             CamtEntry(Ntry=d, report=self) for d in _to_list(self.Rpt.get("Ntry", []))
         ]
 
+    def _record_fields(self) -> dict[str, _typing.Any]:
+        """Fields of `CamtTxRecord` shared by all transactions of the report."""
+        message = self.message
+        return {
+            "camt_type": message.camt_type,
+            "message_identification": message.message_identification,
+            "message_creation_date_time": message.creation_date_time,
+            "account_identification": self.account_identification,
+            "report_identification": self.identification,
+            "report_electronic_sequence_number": self.electronic_sequence_number,
+            "report_legal_sequence_number": self.legal_sequence_number,
+            "report_page_number": self.page_number,
+            "report_creation_date_time": self.creation_date_time,
+        }
+
+    def iter_records(
+        self, *, booked_only: bool = False
+    ) -> _typing.Iterator[CamtTxRecord]:
+        report_fields = self._record_fields()
+        for ntry in self.booked_entries if booked_only else self.entries:
+            entry_fields = report_fields | ntry._record_fields()
+            for tx in ntry.transaction_details:
+                yield CamtTxRecord(**entry_fields, **tx._record_fields())
+
     @property
     def booked_entries(self) -> _typing.Iterator[CamtEntry]:
         for ntry in self.entries:
@@ -573,6 +743,107 @@ class CamtMessage:
         d = _iso20022.iso20022_xml_text_to_dict(content, expected_format="camt.052")
         return cls(sepa_schema=d["sepa_schema"], Document=d["Document"])
 
+    @classmethod
+    def stream_transaction_details(
+        cls,
+        file_or_path: _file.PathLike | _io.Reader[bytes],
+        /,
+        *,
+        booked_only: bool = False,
+    ) -> _typing.Iterator[CamtTransactionDetails]:
+        """Parse a camt.052/053/054 file incrementally.
+
+        Yields the same transaction details as
+        ``CamtMessage.load(...).transaction_details`` (or
+        ``booked_transaction_details`` with *booked_only*), entry by
+        entry, while the file is parsed with `lxml.etree.iterparse`.
+        Parsed entries are dropped from the tree, so memory use does not
+        depend on the number of entries.
+
+        The yielded objects keep their entry, report and message alive.
+        Streamed reports only contain the header fields, i.e.
+        ``CamtReport.entries`` is empty.
+        """
+        import os
+
+        import lxml.etree as _lxml_etree
+
+        from . import _iso20022
+
+        def localname(elem: _lxml_etree._Element) -> str:
+            return _lxml_etree.QName(elem).localname
+
+        def header_dict(stmt_elem: _lxml_etree._Element) -> dict:
+            d: dict = {}
+            for child in stmt_elem:
+                if isinstance(child.tag, str) and localname(child) != "Ntry":
+                    d[localname(child)] = _iso20022.iso20022_element_to_dict(child)
+            return d
+
+        source = file_or_path
+        if not hasattr(source, "read"):
+            source = os.fsdecode(_typing.cast(os.PathLike, source))
+
+        sepa_schema: str | None = None
+        message: CamtMessage | None = None
+        report: CamtReport | None = None
+        stmt_tag = None
+        for event, item in _lxml_etree.iterparse(
+            source, events=("start-ns", "start", "end"), huge_tree=True
+        ):
+            if event == "start-ns":
+                _, uri = item
+                sepa_schema = sepa_schema or _iso20022._sepa_schema_from_uri(uri)
+                continue
+            elem = _typing.cast(_lxml_etree._Element, item)
+            parent = elem.getparent()
+            if event == "start":
+                if parent is None and sepa_schema is None:
+                    raise RuntimeError("Cannot check format as no format was found")
+                elif stmt_tag and localname(elem) == stmt_tag:
+                    report = None
+                continue
+            match localname(elem):
+                case "GrpHdr" if message is None:
+                    grp_hdr = _iso20022.iso20022_element_to_dict(elem)
+                    root_tag = localname(_typing.cast(_lxml_etree._Element, parent))
+                    message = cls(
+                        Document={root_tag: {"GrpHdr": grp_hdr}},
+                        sepa_schema=_typing.cast(str, sepa_schema),
+                    )
+                    if root_tag != cls._CAMT_TYPE_TO_ROOT_TAG[message.camt_type]:
+                        raise ValueError(f"Unexpected root element {root_tag!r}")
+                    stmt_tag = cls._CAMT_TYPE_TO_STATEMENT_TAG[message.camt_type]
+                    message.reports = []
+                case "Ntry" if (
+                    message and parent is not None and (localname(parent) == stmt_tag)
+                ):
+                    if report is None:
+                        report = CamtReport(Rpt=header_dict(parent), message=message)
+                        message.reports.append(report)
+                    entry = CamtEntry(
+                        Ntry=_typing.cast(
+                            dict, _iso20022.iso20022_element_to_dict(elem)
+                        ),
+                        report=report,
+                    )
+                    if entry.is_booked or not booked_only:
+                        for tx in entry.transaction_details:
+                            tx._parents = (tx.entry_details, entry, report, message)
+                            yield tx
+                    elem.clear()
+                    while (prev := elem.getprevious()) is not None and (
+                        localname(prev) == "Ntry"
+                    ):
+                        parent.remove(prev)
+                case tag if message and tag == stmt_tag:
+                    if report is None:
+                        report = CamtReport(Rpt=header_dict(elem), message=message)
+                        message.reports.append(report)
+                    else:
+                        report.Rpt.update(header_dict(elem))
+                    elem.clear()
+
     @property
     def GrpHdr(self) -> dict:
         return self._root["GrpHdr"]
@@ -625,3 +896,27 @@ class CamtMessage:
     def booked_transaction_details(self) -> _typing.Iterator[CamtTransactionDetails]:
         for ntry in self.booked_entries:
             yield from ntry.transaction_details
+
+    def iter_records(
+        self, *, booked_only: bool = False
+    ) -> _typing.Iterator[CamtTxRecord]:
+        """Yield a `CamtTxRecord` per (booked) transaction detail.
+
+        Message, report and entry fields are computed once and shared by
+        the records of their transactions.
+        """
+        for rpt in self.reports:
+            yield from rpt.iter_records(booked_only=booked_only)
+
+    @classmethod
+    def stream_records(
+        cls,
+        file_or_path: _file.PathLike | _io.Reader[bytes],
+        /,
+        *,
+        booked_only: bool = False,
+    ) -> _typing.Iterator[CamtTxRecord]:
+        """Like `stream_transaction_details`, but yields records which do not
+        keep any part of the message alive."""
+        for tx in cls.stream_transaction_details(file_or_path, booked_only=booked_only):
+            yield tx.to_record()
@@ -0,0 +1,338 @@
+"""Reconcile CAMT transactions with pre-notifications and accounting entries.
+
+All rows of a time window are loaded once (`load_camt_reconciliation_data`)
+and indexed by end-to-end id, mandate id and (subject, month, amount), so
+that `reconcile_camt_transactions` classifies every transaction in one
+pass instead of querying the database per transaction.
+"""
+
+from __future__ import annotations
+
+import bisect as _bisect
+import dataclasses as _dataclasses
+import datetime as _datetime
+import logging as _logging
+import typing as _typing
+
+
+if _typing.TYPE_CHECKING:
+    import collections.abc as _collections_abc
+    import pathlib as _pathlib
+
+    import pandas as _pandas
+
+    from . import _pg
+
+
+_LOGGER = _logging.getLogger(__name__)
+
+
+MATCHED_DEBIT = "matched_debit"
+"""Direct debit collection matching its pre-notification."""
+RETURN = "return"
+"""Returned direct debit (Rücklastschrift), see ``return_reason``."""
+AMOUNT_MISMATCH = "amount_mismatch"
+"""Direct debit collection with a different amount than pre-notified."""
+UNMATCHED_CREDIT = "unmatched_credit"
+"""Incoming payment without pre-notification (e.g. a bank transfer)."""
+OTHER_DEBIT = "other_debit"
+"""Outgoing payment that is not a direct debit return."""
+
+RECONCILIATION_CATEGORIES = (
+    MATCHED_DEBIT,
+    RETURN,
+    AMOUNT_MISMATCH,
+    UNMATCHED_CREDIT,
+    OTHER_DEBIT,
+)
+
+RECONCILIATION_COLUMNS = [
+    "category",
+    "camt_transaction_id",
+    "value_date",
+    "amount_cents",
+    "credit_debit_indication",
+    "return_reason",
+    "subject_id",
+    "endtoend_id",
+    "mandate_id",
+    "pre_notification_id",
+    "pre_notification_matched_by",
+    "pre_notified_amount_cents",
+    "amount_difference_cents",
+    "accounting_entry_id",
+    "accounting_entry_matched_by",
+    "dbtr_name",
+    "description",
+]
+
+
+@_dataclasses.dataclass(kw_only=True)
+class CamtReconciliationData:
+    camt_transactions: _pandas.DataFrame
+    pre_notifications: _pandas.DataFrame
+    accounting_entries: _pandas.DataFrame
+
+
+def load_camt_reconciliation_data(
+    conn: _pg.PgConnectionLike | None,
+    *,
+    start_date: _datetime.date,
+    end_date: _datetime.date,
+    lookback_days: int = 62,
+) -> CamtReconciliationData:
+    """Load the CAMT transactions with a value date in [*start_date*,
+    *end_date*] and the pre-notifications and accounting entries they can
+    refer to.
+
+    Returns arrive up to about eight weeks after the collection, hence
+    pre-notifications and accounting entries are loaded from
+    *lookback_days* before *start_date*.
+    """
+    from . import _pg
+
+    first_date = start_date - _datetime.timedelta(days=lookback_days)
+    camt_df = _pg.pg_select_dataframe(
+        conn,
+        t"""SELECT
+  id, value_date, amount_cents, credit_debit_indication, return_reason,
+  subject_id, endtoend_id, mandate_id, dbtr_name, description
+FROM wsjrdp_camt_transactions
+WHERE deleted_at IS NULL
+  AND value_date >= {start_date} AND value_date <= {end_date}
+ORDER BY value_date, id""",
+    )
+    pn_df = _pg.pg_select_dataframe(
+        conn,
+        t"""SELECT
+  id, subject_id, amount_cents, collection_date, endtoend_id, mandate_id,
+  payment_status
+FROM wsjrdp_direct_debit_pre_notifications
+WHERE collection_date >= {first_date} AND collection_date <= {end_date}""",
+    )
+    ae_df = _pg.pg_select_dataframe(
+        conn,
+        t"""SELECT
+  id, subject_id, amount_cents, value_date, endtoend_id, mandate_id,
+  camt_transaction_id
+FROM accounting_entries
+WHERE value_date >= {first_date} AND value_date <= {end_date}""",
+    )
+    _LOGGER.info(
+        f"Loaded {len(camt_df)} CAMT transaction(s), {len(pn_df)} pre-notification(s)"
+        f" and {len(ae_df)} accounting entries for {start_date} - {end_date}"
+    )
+    return CamtReconciliationData(
+        camt_transactions=camt_df, pre_notifications=pn_df, accounting_entries=ae_df
+    )
+
+
+def _records(df: _pandas.DataFrame | None, /) -> list[dict[str, _typing.Any]]:
+    import pandas as _pandas
+
+    def to_none(value):
+        is_na = _pandas.api.types.is_scalar(value) and _pandas.isna(value)
+        return None if is_na else value
+
+    if df is None or df.empty:
+        return []
+    return [
+        {k: to_none(v) for k, v in row.items()} for row in df.to_dict(orient="records")
+    ]
+
+
+def _to_date(value, /) -> _datetime.date | None:
+    if value is None:
+        return None
+    elif isinstance(value, _datetime.datetime):
+        return value.date()
+    elif isinstance(value, _datetime.date):
+        return value
+    else:
+        return _datetime.date.fromisoformat(str(value)[:10])
+
+
+def _month(date: _datetime.date | None, /) -> tuple[int, int] | None:
+    return (date.year, date.month) if date else None
+
+
+class _PreNotificationIndex:
+    def __init__(self, rows: list[dict]) -> None:
+        self.by_endtoend_id: dict[str, dict] = {}
+        by_mandate_id: dict[str, list[tuple[_datetime.date, int, dict]]] = {}
+        for row in rows:
+            row["collection_date"] = _to_date(row.get("collection_date"))
+            if endtoend_id := row.get("endtoend_id"):
+                self.by_endtoend_id[endtoend_id] = row
+            if (mandate_id := row.get("mandate_id")) and row["collection_date"]:
+                by_mandate_id.setdefault(mandate_id, []).append(
+                    (row["collection_date"], row["id"], row)
+                )
+        self.by_mandate_id = {
+            k: sorted(v, key=lambda t: t[:2]) for k, v in by_mandate_id.items()
+        }
+
+    def find(self, tx: dict) -> tuple[dict | None, str | None]:
+        if (pn := self.by_endtoend_id.get(tx.get("endtoend_id") or "")) is not None:
+            return pn, "endtoend_id"
+        candidates = self.by_mandate_id.get(tx.get("mandate_id") or "")
+        if candidates and (value_date := tx.get("value_date")):
+            # Latest pre-notification collected on or before the value date.
+            idx = _bisect.bisect_right(candidates, value_date, key=lambda t: t[0])
+            if idx:
+                return candidates[idx - 1][2], "mandate_id"
+        return None, None
+
+
+class _AccountingEntryIndex:
+    def __init__(self, rows: list[dict]) -> None:
+        self.by_camt_transaction_id: dict[int, dict] = {}
+        self.by_subject_month_amount: dict[tuple, list[dict]] = {}
+        for row in rows:
+            if (camt_tx_id := row.get("camt_transaction_id")) is not None:
+                self.by_camt_transaction_id[int(camt_tx_id)] = row
+            key = (
+                row.get("subject_id"),
+                _month(_to_date(row.get("value_date"))),
+                row.get("amount_cents"),
+            )
+            self.by_subject_month_amount.setdefault(key, []).append(row)
+
+    def find(
+        self, tx: dict, *, subject_id: int | None
+    ) -> tuple[dict | None, str | None]:
+        if (tx_id := tx.get("id")) is not None and (
+            ae := self.by_camt_transaction_id.get(int(tx_id))
+        ) is not None:
+            return ae, "camt_transaction_id"
+        if subject_id is not None:
+            key = (subject_id, _month(tx.get("value_date")), tx.get("amount_cents"))
+            if len(candidates := self.by_subject_month_amount.get(key, [])) == 1:
+                return candidates[0], "subject_month_amount"
+        return None, None
+
+
+def reconcile_camt_transactions(
+    camt_transactions: _pandas.DataFrame,
+    pre_notifications: _pandas.DataFrame | None = None,
+    accounting_entries: _pandas.DataFrame | None = None,
+) -> _pandas.DataFrame:
+    """Classify each CAMT transaction, see `RECONCILIATION_CATEGORIES`.
+
+    The frames need the columns selected by `load_camt_reconciliation_data`
+    (missing columns are treated as empty).  CAMT amounts are signed,
+    i.e. collections are positive and returns negative, like accounting
+    entries.  Pre-notifications are matched by end-to-end id, then by
+    mandate id (latest collection before the value date); accounting
+    entries by their ``camt_transaction_id``, then by a unique
+    (subject, value date month, amount).
+
+    >>> import datetime, pandas as pd
+    >>> d = datetime.date(2026, 3, 5)
+    >>> camt = pd.DataFrame([
+    ...     {"id": 1, "value_date": d, "amount_cents": 5000, "endtoend_id": "E1", "credit_debit_indication": "CRDT"},
+    ...     {"id": 2, "value_date": d, "amount_cents": -5300, "mandate_id": "M2", "return_reason": "AM04", "credit_debit_indication": "DBIT"},
+    ...     {"id": 3, "value_date": d, "amount_cents": 100, "credit_debit_indication": "CRDT"},
+    ... ])
+    >>> pn = pd.DataFrame([
+    ...     {"id": 10, "subject_id": 7, "amount_cents": 5000, "collection_date": d, "endtoend_id": "E1", "mandate_id": "M1"},
+    ...     {"id": 11, "subject_id": 8, "amount_cents": 5000, "collection_date": d, "endtoend_id": "E2", "mandate_id": "M2"},
+    ... ])
+    >>> df = reconcile_camt_transactions(camt, pn)
+    >>> df[["category", "subject_id", "pre_notification_id"]].values.tolist()
+    [['matched_debit', 7, 10], ['return', 8, 11], ['unmatched_credit', None, None]]
+    """
+    import pandas as _pandas
+
+    pn_index = _PreNotificationIndex(_records(pre_notifications))
+    ae_index = _AccountingEntryIndex(_records(accounting_entries))
+
+    results = []
+    for tx in _records(camt_transactions):
+        tx["value_date"] = _to_date(tx.get("value_date"))
+        amount_cents = int(tx["amount_cents"])
+        is_credit = (
+            tx.get("credit_debit_indication", "CRDT" if amount_cents >= 0 else "DBIT")
+            == "CRDT"
+        )
+        pn, pn_matched_by = pn_index.find(tx)
+        subject_id = tx.get("subject_id")
+        if subject_id is None and pn is not None:
+            subject_id = pn.get("subject_id")
+        ae, ae_matched_by = ae_index.find(tx, subject_id=subject_id)
+        if subject_id is None and ae is not None:
+            subject_id = ae.get("subject_id")
+
+        pre_notified_amount_cents = pn["amount_cents"] if pn is not None else None
+        amount_difference_cents = None
+        if tx.get("return_reason") or (not is_credit and pn is not None):
+            category = RETURN
+        elif is_credit and pn is not None:
+            amount_difference_cents = amount_cents - int(pre_notified_amount_cents)
+            category = AMOUNT_MISMATCH if amount_difference_cents else MATCHED_DEBIT
+        elif is_credit:
+            category = UNMATCHED_CREDIT
+        else:
+            category = OTHER_DEBIT
+
+        results.append(
+            {
+                "category": category,
+                "camt_transaction_id": tx.get("id"),
+                "value_date": tx["value_date"],
+                "amount_cents": amount_cents,
+                "credit_debit_indication": "CRDT" if is_credit else "DBIT",
+                "return_reason": tx.get("return_reason"),
+                "subject_id": subject_id,
+                "endtoend_id": tx.get("endtoend_id"),
+                "mandate_id": tx.get("mandate_id"),
+                "pre_notification_id": pn["id"] if pn is not None else None,
+                "pre_notification_matched_by": pn_matched_by,
+                "pre_notified_amount_cents": pre_notified_amount_cents,
+                "amount_difference_cents": amount_difference_cents,
+                "accounting_entry_id": ae["id"] if ae is not None else None,
+                "accounting_entry_matched_by": ae_matched_by,
+                "dbtr_name": tx.get("dbtr_name"),
+                "description": tx.get("description"),
+            }
+        )
+    return _pandas.DataFrame(results, columns=RECONCILIATION_COLUMNS, dtype=object)
+
+
+def summarize_camt_reconciliation(df: _pandas.DataFrame, /) -> _pandas.DataFrame:
+    """Return count and sum of ``amount_cents`` per category."""
+    summary = (
+        df.groupby("category")["amount_cents"]
+        .agg(count="count", amount_cents="sum")
+        .reindex(RECONCILIATION_CATEGORIES, fill_value=0)
+    )
+    summary.index.name = "category"
+    return summary.reset_index()
+
+
+def write_camt_reconciliation_to_xlsx(
+    df: _pandas.DataFrame,
+    path: str | _pathlib.Path,
+    *,
+    categories: _collections_abc.Iterable[str] | None = None,
+) -> None:
+    """Write the reconciliation *df* with a summary sheet and one sheet per
+    category to *path*."""
+    import pandas as _pandas
+
+    from . import _util
+
+    categories = RECONCILIATION_CATEGORIES if categories is None else categories
+    _LOGGER.info("Write %s", path)
+    with _pandas.ExcelWriter(
+        path, engine="xlsxwriter", engine_kwargs={"options": {"remove_timezone": True}}
+    ) as writer:
+        sheets = {"summary": summarize_camt_reconciliation(df)}
+        sheets |= {c: df[df["category"] == c] for c in categories}
+        for sheet_name, sheet_df in sheets.items():
+            sheet_df = _util.dataframe_copy_for_xlsx(sheet_df)
+            sheet_df.to_excel(writer, sheet_name=sheet_name, index=False)
+            worksheet = writer.sheets[sheet_name]
+            worksheet.autofilter(0, 0, len(sheet_df), max(len(sheet_df.columns) - 1, 0))
+            worksheet.freeze_panes(1, 0)
+            worksheet.autofit()
@@ -28,6 +28,7 @@ if _typing.TYPE_CHECKING:
     from . import (
         _batch,
         _helpdesk,
+        _keycloak_sync_plan,
         _keycloak_wsjrdp_adapter,
         _mail_client,
         _mail_config,
@@ -35,6 +36,7 @@ if _typing.TYPE_CHECKING:
         _people_query,
         _pg,
         _psycopg_client,
+        _snapshot_cache,
         _ssh_tunnel,
     )
     from ._models import person as _person
@@ -96,6 +98,11 @@ class WsjRdpContextConfig:
     datev_beraternummer: str | None = None
     datev_mandantennummer: str | None = None
 
+    snapshot_cache_dir: str | None = None
+    """Directory for Keycloak/Mailcow cache snapshots, disabled if empty."""
+    snapshot_cache_ttl: float = 900.0
+    """Maximum age of a usable cache snapshot in seconds."""
+
     @classmethod
     def from_file(
         cls,
@@ -203,6 +210,8 @@ class WsjRdpContextConfig:
             helpdesk_fin_request_type_id=config.get("helpdesk_fin_request_type_id", 33),
             datev_beraternummer=config.get("datev_beraternummer"),
             datev_mandantennummer=config.get("datev_mandantennummer"),
+            snapshot_cache_dir=config.get("snapshot_cache_dir") or None,
+            snapshot_cache_ttl=float(config.get("snapshot_cache_ttl", 900.0)),
             **kwargs,  # type: ignore
         )
         return self
@@ -1058,7 +1067,20 @@ class WsjRdpContext:
             server=self._config.mail_api_url, api_key=self._config.mail_api_key
         )
         return _mailcow_client.MailcowClient(
-            config, dry_run=dry_run, audithook=audithook
+            config,
+            dry_run=dry_run,
+            audithook=audithook,
+            snapshot_store=self.snapshot_store(),
+        )
+
+    def snapshot_store(self) -> _snapshot_cache.SnapshotStore | None:
+        """Return the configured store for client cache snapshots, if any."""
+        from . import _snapshot_cache
+
+        if not (directory := self._config.snapshot_cache_dir):
+            return None
+        return _snapshot_cache.SnapshotStore(
+            directory, ttl=self._config.snapshot_cache_ttl
         )
 
     def _hitobito_db_ssh_tunnel(
@@ -1209,6 +1231,30 @@ class WsjRdpContext:
             is_role_change=is_role_change,
         )
 
+    def plan_hitobito_keycloak_sync(
+        self,
+        people_df: _pandas.DataFrame,
+        *,
+        keycloak_groupname: str | None = None,
+        sync_enabled: bool = False,
+        prune_group: bool = False,
+    ) -> _keycloak_sync_plan.KeycloakSyncPlan:
+        """Compute all Keycloak changes for *people_df* at once.
+
+        See `compute_keycloak_sync_plan`. Users missing in Keycloak are
+        only listed in the plan, create them with
+        `sync_hitobito_keycloak_mailcow`.
+        """
+        from ._internal.sync_hitobito_keycloak import plan_sync
+
+        return plan_sync(
+            ctx=self,
+            people_df=people_df,
+            keycloak_groupname=keycloak_groupname,
+            sync_enabled=sync_enabled,
+            prune_group=prune_group,
+        )
+
     def __create_ssh_forwarder(
         self, *, remote_bind_address: tuple[str, int]
     ) -> _sshtunnel.SSHTunnelForwarder:
@@ -1730,6 +1776,33 @@ class WsjRdpContext:
             prepared_batch.out_dir = self.__compute_batch_out_dir(prepared_batch)
         return prepared_batch
 
+    def load_people_dataframes_for_batches(
+        self,
+        batch_configs: _collections_abc.Sequence[_batch.BatchConfig],
+        /,
+        *,
+        extra_static_df_cols: dict[str, _typing.Any] | None = None,
+        extra_mailing_bcc: str | _collections_abc.Iterable[str] | None = None,
+        log_resulting_data_frame: bool | None = None,
+        conn: _pg.PgConnectionLike | None = None,
+    ) -> list[_pandas.DataFrame]:
+        """Load the people dataframes of several batches at once.
+
+        See `load_people_dataframes_for_batch_configs` for how the
+        people are loaded only once for compatible batches.
+        """
+        from . import _batch
+
+        conn = self._to_connection(conn, read_only=True)
+        return _batch.load_people_dataframes_for_batch_configs(
+            batch_configs,
+            ctx=self,
+            conn=conn,
+            extra_static_df_cols=extra_static_df_cols,
+            extra_mailing_bcc=extra_mailing_bcc,
+            log_resulting_data_frame=log_resulting_data_frame,
+        )
+
     def _to_connection(
         self,
         conn: _pg.PgConnectionLike | None,
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import dataclasses as _dataclasses
+import decimal as _decimal
 import logging as _logging
+import operator as _operator
 import pathlib as _pathlib
+import re as _re
 import typing as _typing
 
 
@@ -280,6 +284,29 @@ _EXTF_TYPES = {
 }
 
 
+def _format_extf_text(value, /) -> str:
+    if value is None:
+        return '""'
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def _format_extf_plain(value, /) -> str:
+    if value is None:
+        return ""
+    value = str(value)
+    assert '"' not in value
+    return value
+
+
+_EXTF_TYPE_FORMATTERS: dict[str, _collections_abc.Callable[[_typing.Any], str]] = {
+    "Betrag": _format_extf_plain,
+    "Datum": _format_extf_plain,
+    "Konto": _format_extf_plain,
+    "Text": _format_extf_text,
+    "Zahl": _format_extf_plain,
+}
+
+
 class DatevExtfWriter:
     def __init__(
         self, file, *, fieldnames: _collections_abc.Iterable[str] | None = None
@@ -299,32 +326,33 @@ class DatevExtfWriter:
             raise RuntimeError(
                 f"Unsupported fields: {'\n    '.join(str(f) for f in unsupported_fields)}"
             )
-
-    def _serialize_field(self, field_name: str, value) -> str:
-        field_type = _EXTF_TYPES[field_name]
-        if value is None:
-            value = ""
-        if field_type == "Text":
-            value = '"' + str(value).replace('"', '""') + '"'
-        else:
-            value = str(value)
-            assert '"' not in value
-        return value
+        # Precompiled per-column formatters: most columns of a row are
+        # empty, so only the given fields have to be serialized per row.
+        self._field_index = {name: i for i, name in enumerate(self._fieldnames)}
+        self._formatters = [
+            _EXTF_TYPE_FORMATTERS[_EXTF_TYPES[name]] for name in self._fieldnames
+        ]
+        self._empty_fields = [fmt(None) for fmt in self._formatters]
 
     def writeheader(self) -> None:
         self._file.write(";".join(field_name for field_name in self._fieldnames))
         self._file.write("\n")
 
     def writerow(self, rowdict, /) -> None:
-        d = {field_name: "" for field_name in self._fieldnames}
-        d.update(rowdict)
-        line = ";".join(
-            self._serialize_field(field_name, rowdict.get(field_name, ""))
-            for field_name in self._fieldnames
-        )
-        self._file.write(line)
+        fields = self._empty_fields.copy()
+        field_index = self._field_index
+        formatters = self._formatters
+        for field_name, value in rowdict.items():
+            i = field_index.get(field_name)
+            if i is not None:
+                fields[i] = formatters[i](value)
+        self._file.write(";".join(fields))
         self._file.write("\n")
 
+    def writerows(self, rowdicts: _collections_abc.Iterable, /) -> None:
+        for rowdict in rowdicts:
+            self.writerow(rowdict)
+
 
 def _to_win1252_compatible(string: str) -> str:
     import unicodedata
@@ -360,6 +388,343 @@ def _prepare_description(
     return string
 
 
+@_dataclasses.dataclass(kw_only=True, frozen=True)
+class _DatevBookingAccounts:
+    """Accounts and chart of accounts used for the bookings of a fiscal year."""
+
+    konto: str
+    gegenkonto: str
+    kost1: str | None
+    kost2: str | None
+    transit_konto: str
+    """Geldtransit, for bank movements without a known counter account."""
+    sachkontenlaenge: int
+    sachkontenrahmen: str
+
+
+def _booking_accounts_for_year(year: int, /) -> _DatevBookingAccounts:
+    if year < 2026:
+        return _DatevBookingAccounts(
+            konto="1200",
+            gegenkonto="8116",
+            kost1="9500",
+            kost2=None,
+            transit_konto="1360",
+            sachkontenlaenge=4,
+            sachkontenrahmen="03",
+        )
+    else:
+        return _DatevBookingAccounts(
+            konto="18000",
+            gegenkonto="41030",
+            kost1=None,
+            kost2="9500",
+            transit_konto="14600",
+            sachkontenlaenge=5,
+            sachkontenrahmen="42",
+        )
+
+
+def _resolve_csv_encoding(csv_encoding: str, /) -> tuple[str, str, str]:
+    """Return (encoding, file encoding, filename suffix) for *csv_encoding*."""
+    match csv_encoding.lower():
+        case "cp1252" | "win1252" | "windows-1252":
+            return "cp1252", "cp1252", "cp1252"
+        case "utf-8" | "utf-8-sig":
+            return "utf-8", "utf-8-sig", "utf8"
+        case _:
+            raise RuntimeError(f"Unsupported CSV encoding: {csv_encoding!r}")
+
+
+def _extf_header_line(
+    *,
+    now: _datetime.datetime,
+    beraternummer: str | None,
+    mandantennummer: str | None,
+    accounts: _DatevBookingAccounts,
+    date_from: _datetime.date,
+    date_to: _datetime.date,
+    bezeichnung: str,
+) -> str:
+    datev_header = [
+        '"EXTF"',  # 1 - Kennzeichen
+        700,  # 2 - Versionsnummer
+        21,  # 3 - Formatkategorie
+        '"Buchungsstapel"',  # 4 - Formatname
+        13,  # 5 - Formatversion
+        now.strftime("%Y%m%d%H%M%S%f")[:-3],  # 6 - Erzeugt am YYYYMMDDHHMMSSFFF
+        # 20240130140440439
+        # 20260220024353259
+        None,  # 7 - Importiert
+        '""',  # 8 - Herkunft
+        '"wsjrdp"',  # 9 - Exportiert von
+        '""',  # 10 - Importiert von
+        beraternummer,  # 11 - Beraternummer
+        mandantennummer,  # 12 - Mandantennummer
+        date_from.replace(month=1, day=1).strftime("%Y%m%d"),  # 13 - WJ-Beginn YYYYMMDD
+        accounts.sachkontenlaenge,  # 14 - Sachkontenlänge
+        date_from.strftime("%Y%m%d"),  # 15 - Datum von
+        date_to.strftime("%Y%m%d"),  # 16 - Datum bis
+        f'"{bezeichnung}"',  # 17 - Bezeichnung
+        '""',  # 18 - Diktatkürzel
+        1,  # 19 - Buchungstyp
+        0,  # 20 - Rechungslegungszweck
+        0,  # 21 - Festschreibung
+        '"EUR"',  # 22 - WKZ
+        None,  # 23 - Reserviert
+        '""',  # 24 - Derivatskennzeichen
+        None,  # 25 - Reserviert
+        None,  # 26 - Reserviert
+        f'"{accounts.sachkontenrahmen}"',  # 27 - Sachkontenrahmen
+        None,  # 28 - ID der Branchenlösung
+        None,  # 29 - Reserviert
+        '""',  # 30 - Reserviert
+        '""',  # 31 - Anwendungsinformation
+    ]
+    return ";".join(str(s if s is not None else "") for s in datev_header) + "\n"
+
+
+_BUCHUNGSTEXT_SUBSTITUTIONS = [
+    (
+        _re.compile(r"Beitrag *(?P<descr>.*) +(?P<role>CMT|YP|UL|IST) (?P<id>[0-9]+)"),
+        r"\g<role> \g<id> \g<descr> / Beitrag",
+    ),
+    (
+        _re.compile(r"(?P<role>CMT|YP|UL|IST) Beitrag *(?P<descr>.*) +(?P<id>[0-9]+)"),
+        r"\g<role> \g<id> \g<descr> / Beitrag",
+    ),
+    (
+        _re.compile(
+            r"(?P<installment>[0-9]+. Rate \w+ 202[567]) (?P<role>CMT|YP|UL|IST) *(?P<descr>.*) +\(id (?P<id>[0-9]+)\)"
+        ),
+        r"\g<role> \g<id> \g<descr> / \g<installment>",
+    ),
+]
+
+
+def _rewrite_pre_notification_description(description: str, /) -> str:
+    buchungstext = description.replace(" WSJ 2027 ", " ")
+    buchungstext = buchungstext.removeprefix("WSJ 2027 ")
+    for pattern, repl in _BUCHUNGSTEXT_SUBSTITUTIONS:
+        buchungstext = pattern.sub(repl, buchungstext)
+    return buchungstext
+
+
+def _format_cents_as_datev_amount(amount_cents: int, /) -> str:
+    """Format *amount_cents* as unsigned DATEV amount, e.g. ``1234,5``/``12``."""
+    euros, cents = divmod(abs(amount_cents), 100)
+    return f"{euros},{cents:02d}".replace(",00", "")
+
+
+type _DatevRule = _collections_abc.Callable[
+    [_collections_abc.Mapping[str, _typing.Any]], _typing.Any
+]
+
+
+@_dataclasses.dataclass(kw_only=True, frozen=True)
+class DatevExportSource:
+    """Declarative mapping of a database table to DATEV Buchungsstapel rows.
+
+    Each exported row gets the amount, Soll/Haben-Kennzeichen and
+    Belegdatum from *amount_cents* and *date_column*; *rules* map further
+    `_DATEV_EXTF_BUCHUNGSSTAPEL_COLUMNS` to a callable taking the source
+    row or to a constant.  Rows for which one of the *required* DATEV
+    columns is empty are skipped.
+    """
+
+    name: str
+    table_name: str
+    columns: tuple[str, ...]
+    """Source columns to select (besides ``id`` and *date_column*)."""
+    date_column: str
+    amount_cents: _DatevRule
+    rules: _collections_abc.Mapping[str, _DatevRule | str | None]
+    where: str = "TRUE"
+    """Additional SQL condition for the rows to export."""
+    required: tuple[str, ...] = ("Konto", "Gegenkonto (ohne BU-Schlüssel)")
+    bezeichnung: str
+
+    def to_extf_row(
+        self, row: _collections_abc.Mapping[str, _typing.Any], /, *, encoding: str
+    ) -> dict[str, _typing.Any]:
+        amount_cents = int(round(self.amount_cents(row)))
+        extf_row = {
+            "Umsatz (ohne Soll/Haben-Kz)": _format_cents_as_datev_amount(amount_cents),
+            "Soll/Haben-Kennzeichen": "S" if amount_cents > 0 else "H",
+            "WKZ Umsatz": "EUR",
+            "Belegdatum": row[self.date_column].strftime("%d%m"),
+        }
+        for field_name, rule in self.rules.items():
+            extf_row[field_name] = rule(row) if callable(rule) else rule
+        if belegfeld := extf_row.get("Belegfeld 1"):
+            extf_row["Belegfeld 1"] = str(belegfeld)[:36]
+        if buchungstext := extf_row.get("Buchungstext"):
+            extf_row["Buchungstext"] = _prepare_description(
+                str(buchungstext), encoding=encoding, max_bytes_length=60
+            )
+        return extf_row
+
+    def missing_required(self, extf_row: _collections_abc.Mapping, /) -> list[str]:
+        return [name for name in self.required if not extf_row.get(name)]
+
+
+def _year_account(
+    attr: str, date_column: str
+) -> _collections_abc.Callable[
+    [_collections_abc.Mapping[str, _typing.Any]], str | None
+]:
+    """Rule returning an account of `_booking_accounts_for_year` for the row."""
+
+    def rule(row: _collections_abc.Mapping[str, _typing.Any], /) -> str | None:
+        return getattr(_booking_accounts_for_year(row[date_column].year), attr)
+
+    return rule
+
+
+def _pre_notification_belegfeld(row: _collections_abc.Mapping[str, _typing.Any]) -> str:
+    collection_date = row["collection_date"]
+    return f"Einzug-{collection_date.strftime('%Y-%m')}-{row['debit_sequence_type']}-{row['payment_initiation_id']}-{row['id']}"
+
+
+def _camt_buchungstext(row: _collections_abc.Mapping[str, _typing.Any]) -> str:
+    name = row["dbtr_name"] if row["amount_cents"] > 0 else row["cdtr_name"]
+    parts = [name, row["return_reason"] and f"Rückl. {row['return_reason']}"]
+    parts.append(row["description"])
+    return " / ".join(filter(None, parts))
+
+
+def _moss_amount_cents(row: _collections_abc.Mapping[str, _typing.Any]) -> int:
+    return int(_decimal.Decimal(row["amount"]).scaleb(2).to_integral_value())
+
+
+def _moss_buchungstext(row: _collections_abc.Mapping[str, _typing.Any]) -> str:
+    parts = [row["supplier_name"], row["reason_for_purchase"] or row["note"]]
+    return " / ".join(filter(None, parts))
+
+
+PRE_NOTIFICATIONS_DATEV_SOURCE = DatevExportSource(
+    name="sammeleinzug",
+    table_name="wsjrdp_direct_debit_pre_notifications",
+    columns=(
+        "payment_initiation_id",
+        "amount_cents",
+        "amount_currency",
+        "debit_sequence_type",
+        "description",
+    ),
+    date_column="collection_date",
+    where="payment_status = 'xml_generated'",
+    amount_cents=_operator.itemgetter("amount_cents"),
+    rules={
+        "WKZ Umsatz": lambda row: row.get("amount_currency") or "EUR",
+        "Konto": _year_account("konto", "collection_date"),
+        "Gegenkonto (ohne BU-Schlüssel)": _year_account(
+            "gegenkonto", "collection_date"
+        ),
+        "Belegfeld 1": _pre_notification_belegfeld,
+        "Buchungstext": lambda row: _rewrite_pre_notification_description(
+            row["description"]
+        ),
+        "KOST1 - Kostenstelle": _year_account("kost1", "collection_date"),
+        "KOST2 - Kostenstelle": _year_account("kost2", "collection_date"),
+        "Festschreibung": "0",
+    },
+    bezeichnung="Sammeleinzug",
+)
+"""Collected pre-notifications (booked against the contribution revenues)."""
+
+CAMT_DATEV_SOURCE = DatevExportSource(
+    name="camt",
+    table_name="wsjrdp_camt_transactions",
+    columns=(
+        "amount_cents",
+        "amount_currency",
+        "account_servicer_reference",
+        "description",
+        "return_reason",
+        "dbtr_name",
+        "cdtr_name",
+    ),
+    date_column="value_date",
+    # Collections of our own payment initiations are already exported
+    # with the pre-notifications.
+    where="deleted_at IS NULL AND payment_initiation_id IS NULL",
+    amount_cents=_operator.itemgetter("amount_cents"),
+    rules={
+        "WKZ Umsatz": lambda row: row.get("amount_currency") or "EUR",
+        "Konto": _year_account("konto", "value_date"),
+        "Gegenkonto (ohne BU-Schlüssel)": _year_account("transit_konto", "value_date"),
+        "Belegfeld 1": lambda row: f"CAMT-{row['id']}",
+        "Belegfeld 2": _operator.itemgetter("account_servicer_reference"),
+        "Buchungstext": _camt_buchungstext,
+        "Festschreibung": "0",
+    },
+    bezeichnung="Bank",
+)
+"""Other bank account movements, booked against the Geldtransit account."""
+
+MOSS_DATEV_SOURCE = DatevExportSource(
+    name="moss",
+    table_name="moss_balance_movements",
+    columns=(
+        "amount",
+        "currency",
+        "account_number",
+        "moss_balance_account",
+        "supplier_name",
+        "reason_for_purchase",
+        "note",
+        "invoice_number",
+        "unique_item_number",
+        "moss_attachment_url",
+    ),
+    date_column="booking_date",
+    amount_cents=_moss_amount_cents,
+    rules={
+        "WKZ Umsatz": lambda row: row.get("currency") or "EUR",
+        "Konto": _operator.itemgetter("moss_balance_account"),
+        "Gegenkonto (ohne BU-Schlüssel)": _operator.itemgetter("account_number"),
+        "Belegfeld 1": lambda row: row["invoice_number"] or row["unique_item_number"],
+        "Buchungstext": _moss_buchungstext,
+        "Beleglink": _operator.itemgetter("moss_attachment_url"),
+        "Festschreibung": "0",
+    },
+    bezeichnung="Moss",
+)
+"""Moss card movements, using the accounts assigned in Moss."""
+
+DATEV_EXPORT_SOURCES = {
+    source.name: source
+    for source in [PRE_NOTIFICATIONS_DATEV_SOURCE, CAMT_DATEV_SOURCE, MOSS_DATEV_SOURCE]
+}
+
+
+def _write_pre_notifications_extf_file(
+    path: _pathlib.Path,
+    rows: _collections_abc.Iterable[_collections_abc.Mapping[str, _typing.Any]],
+    *,
+    header_line: str,
+    encoding: str,
+    csv_file_encoding: str,
+) -> tuple[list[int], int]:
+    """Write an EXTF file for pre-notification *rows* (streamed).
+
+    Returns the ids of the rows and their sum in cents.
+    """
+    source = PRE_NOTIFICATIONS_DATEV_SOURCE
+    ids = []
+    sum_cents = 0
+    with open(path, "w", encoding=csv_file_encoding, newline="\r\n") as csvfile:
+        csvfile.write(header_line)
+        d_writer = DatevExtfWriter(csvfile)
+        d_writer.writeheader()
+        for row in rows:
+            d_writer.writerow(source.to_extf_row(row, encoding=encoding))
+            ids.append(row["id"])
+            sum_cents += int(round(source.amount_cents(row)))
+    return ids, sum_cents
+
+
 def write_datev_csv_for_pain_id(
     *,
     ctx: _context.WsjRdpContext,
@@ -368,47 +733,57 @@ def write_datev_csv_for_pain_id(
     csv_encoding: str = "utf-8",
     limit: int | None = None,
     offset: int | None = None,
+    include_exported: bool = False,
+    mark_exported: bool = True,
     now: _datetime.date | None = None,
-) -> _pathlib.Path:
-    # See https://developer.datev.de/de/file-format/details/datev-format/format-description/booking-batch
+) -> _pathlib.Path | None:
+    """Write a DATEV EXTF Buchungsstapel file for one payment initiation.
 
-    import re
+    Pre-notifications already exported to DATEV are skipped unless
+    *include_exported* is set, the written ones are marked as exported
+    like in `write_datev_csvs_for_source` (unless *mark_exported* is
+    false).  *limit* and *offset* select a page of all pre-notifications
+    of the payment initiation before exported ones are skipped.  Returns
+    `None` if there is nothing to export.
+    """
+    # See https://developer.datev.de/de/file-format/details/datev-format/format-description/booking-batch
 
     from . import _pg, _util
 
     now = _util.to_datetime(now, now=ctx.start_time)
 
-    df = _pg.pg_select_dataframe(
+    # LIMIT/OFFSET page over all rows of the payment initiation, so that
+    # marking the rows of one page does not shift the following pages.
+    rows = _pg.pg_select_dict_rows(
         conn,
         t"""SELECT
-  id, payment_status,
+  id, payment_status, payment_initiation_id,
   dbtr_name, dbtr_iban, dbtr_bic,
   amount_cents, amount_currency,
   debit_sequence_type, collection_date,
   mandate_id, mandate_date,
   description, endtoend_id
-FROM wsjrdp_direct_debit_pre_notifications
-WHERE payment_status = 'xml_generated'
-  AND payment_initiation_id = {pain_id}
-LIMIT {limit}
-OFFSET {offset or 0}
+FROM (
+  SELECT *
+  FROM wsjrdp_direct_debit_pre_notifications
+  WHERE payment_status = 'xml_generated'
+    AND payment_initiation_id = {pain_id}
+  ORDER BY id
+  LIMIT {limit}
+  OFFSET {offset or 0}
+) AS page
+WHERE {include_exported} OR NOT COALESCE(additional_info ? {_DATEV_EXPORT_MARKER_KEY}, FALSE)
+ORDER BY id
 """,
     )
+    if not rows:
+        _LOGGER.warning("No pre-notifications of pain %s to export", pain_id)
+        return None
 
-    row = df.iloc[0]
-    collection_date = row["collection_date"]
-
-    match csv_encoding.lower():
-        case "cp1252" | "win1252" | "windows-1252":
-            encoding = "cp1252"
-            csv_file_encoding = "cp1252"
-            encoding_filename_suffix = "cp1252"
-        case "utf-8" | "utf-8-sig":
-            encoding = "utf-8"
-            csv_file_encoding = "utf-8-sig"
-            encoding_filename_suffix = "utf8"
-        case _:
-            raise RuntimeError("Unsupported CSV encoding: {csv_encoding!r}")
+    collection_date = rows[0]["collection_date"]
+    encoding, csv_file_encoding, encoding_filename_suffix = _resolve_csv_encoding(
+        csv_encoding
+    )
 
     base_csv_filename = ctx.make_out_path(
         f"EXTF_sammeleinzug_wsj27_{collection_date.strftime('%Y-%m')}_pain{pain_id}_{encoding_filename_suffix}"
@@ -423,111 +798,320 @@ OFFSET {offset or 0}
         )
     csv_filename = base_csv_filename.with_name(base_csv_filename.name + ".csv")
 
-    beraternummer = ctx.config.datev_beraternummer
-    mandantennummer = ctx.config.datev_mandantennummer
-    if collection_date.year < 2026:
-        konto = "1200"
-        gegenkonto = "8116"
-        kost1 = "9500"
-        kost2 = None
-        sachkontenlaenge = 4
-        sachkontenrahmen = "03"
-    else:
-        konto = "18000"
-        gegenkonto = "41030"
-        kost1 = None
-        kost2 = "9500"
-        sachkontenlaenge = 5
-        sachkontenrahmen = "42"
-
-    with open(csv_filename, "w", encoding=csv_file_encoding, newline="\r\n") as csvfile:
-        d_writer = DatevExtfWriter(csvfile)
-        datev_header = [
-            '"EXTF"',  # 1 - Kennzeichen
-            700,  # 2 - Versionsnummer
-            21,  # 3 - Formatkategorie
-            '"Buchungsstapel"',  # 4 - Formatname
-            13,  # 5 - Formatversion
-            now.strftime("%Y%m%d%H%M%S%f")[:-3],  # 6 - Erzeugt am YYYYMMDDHHMMSSFFF
-            # 20240130140440439
-            # 20260220024353259
-            None,  # 7 - Importiert
-            '""',  # 8 - Herkunft
-            '"wsjrdp"',  # 9 - Exportiert von
-            '""',  # 10 - Importiert von
-            beraternummer,  # 11 - Beraternummer
-            mandantennummer,  # 12 - Mandantennummer
-            collection_date.replace(month=1, day=1).strftime(
-                "%Y%m%d"
-            ),  # 13 - WJ-Beginn YYYYMMDD
-            sachkontenlaenge,  # 14 - Sachkontenlänge
-            collection_date.strftime("%Y%m%d"),  # 15 - Datum von
-            collection_date.strftime("%Y%m%d"),  # 16 - Datum bis
-            f'"Sammeleinzug {collection_date.strftime("%Y-%m")}"',  # 17 - Bezeichnung
-            '""',  # 18 - Diktatkürzel
-            1,  # 19 - Buchungstyp
-            0,  # 20 - Rechungslegungszweck
-            0,  # 21 - Festschreibung
-            '"EUR"',  # 22 - WKZ
-            None,  # 23 - Reserviert
-            '""',  # 24 - Derivatskennzeichen
-            None,  # 25 - Reserviert
-            None,  # 26 - Reserviert
-            f'"{sachkontenrahmen}"',  # 27 - Sachkontenrahmen
-            None,  # 28 - ID der Branchenlösung
-            None,  # 29 - Reserviert
-            '""',  # 30 - Reserviert
-            '""',  # 31 - Anwendungsinformation
-        ]
-        csvfile.write(
-            ";".join(str(s if s is not None else "") for s in datev_header) + "\n"
+    header_line = _extf_header_line(
+        now=now,
+        beraternummer=ctx.config.datev_beraternummer,
+        mandantennummer=ctx.config.datev_mandantennummer,
+        accounts=_booking_accounts_for_year(collection_date.year),
+        date_from=collection_date,
+        date_to=collection_date,
+        bezeichnung=f"Sammeleinzug {collection_date.strftime('%Y-%m')}",
+    )
+    ids, sum_cents = _write_pre_notifications_extf_file(
+        csv_filename,
+        rows,
+        header_line=header_line,
+        encoding=encoding,
+        csv_file_encoding=csv_file_encoding,
+    )
+    _LOGGER.info("    %s rows in dataframe", len(ids))
+    _LOGGER.info("    %s cents in dataframe", sum_cents)
+    _LOGGER.info(f"  wrote {csv_filename}")
+    if mark_exported:
+        _mark_datev_exported(
+            conn,
+            PRE_NOTIFICATIONS_DATEV_SOURCE,
+            ids,
+            marker={"exported_at": now.isoformat(), "file": csv_filename.name},
         )
-        d_writer.writeheader()
-        sum_cents = 0
-        for _, row in df.iterrows():
-            amount_currency = row.get("amount_currency") or "EUR"
-            amount_cents = int(round(row["amount_cents"]))
-            amount_eur = amount_cents / 100
-            amount_de = str(f"{amount_eur:.2f}").replace(".", ",").replace(",00", "")
-            sum_cents += amount_cents
-            collection_date = row["collection_date"]
-            belegfeld = f"Einzug-{collection_date.strftime('%Y-%m')}-{row['debit_sequence_type']}-{pain_id}-{row['id']}"
-            buchungstext = row["description"].replace(" WSJ 2027 ", " ")
-            buchungstext = buchungstext.removeprefix("WSJ 2027 ")
-            buchungstext = re.sub(
-                r"Beitrag *(?P<descr>.*) +(?P<role>CMT|YP|UL|IST) (?P<id>[0-9]+)",
-                r"\g<role> \g<id> \g<descr> / Beitrag",
-                buchungstext,
+    return csv_filename
+
+
+def write_datev_csvs_for_pre_notifications(
+    *,
+    ctx: _context.WsjRdpContext,
+    conn: _psycopg.Connection,
+    pain_ids: _collections_abc.Iterable[int] | None = None,
+    start_date: _datetime.date | None = None,
+    end_date: _datetime.date | None = None,
+    csv_encoding: str = "utf-8",
+    include_exported: bool = False,
+    mark_exported: bool = True,
+    now: _datetime.date | None = None,
+) -> list[_pathlib.Path]:
+    """Write DATEV EXTF Buchungsstapel files for several payment initiations.
+
+    Exports all pre-notifications with payment_status ``xml_generated``
+    of the given *pain_ids* and/or with a collection date between
+    *start_date* and *end_date* (inclusive).  The rows are streamed from
+    a server-side cursor into one file per fiscal year, each using the
+    accounts of that year.  Returns the written files.
+
+    As in `write_datev_csvs_for_source`, pre-notifications already
+    exported to DATEV are skipped unless *include_exported* is set and
+    the written ones are marked as exported (unless *mark_exported* is
+    false), so the ``sammeleinzug`` source never exports them again.
+    """
+    import itertools as _itertools
+
+    from . import _pg, _util
+
+    if pain_ids is not None:
+        pain_ids = sorted(set(pain_ids))
+    if not pain_ids and start_date is None and end_date is None:
+        raise ValueError("Need pain_ids, start_date or end_date")
+    now = _util.to_datetime(now, now=ctx.start_time)
+    encoding, csv_file_encoding, encoding_filename_suffix = _resolve_csv_encoding(
+        csv_encoding
+    )
+
+    where = t"""payment_status = 'xml_generated'
+  AND ({include_exported} OR NOT COALESCE(additional_info ? {_DATEV_EXPORT_MARKER_KEY}, FALSE))
+  AND ({pain_ids}::bigint[] IS NULL OR payment_initiation_id = ANY({pain_ids}::bigint[]))
+  AND ({start_date}::date IS NULL OR collection_date >= {start_date})
+  AND ({end_date}::date IS NULL OR collection_date <= {end_date})"""
+    year2stats = {
+        row["year"]: row
+        for row in _pg.pg_select_dict_rows(
+            conn,
+            t"""SELECT
+  EXTRACT(YEAR FROM collection_date)::integer AS year,
+  MIN(collection_date) AS date_from,
+  MAX(collection_date) AS date_to
+FROM wsjrdp_direct_debit_pre_notifications
+WHERE {where:q}
+GROUP BY 1
+""",
+        )
+    }
+    rows = _pg.pg_iter_dict_rows(
+        conn,
+        t"""SELECT
+  id, payment_initiation_id,
+  amount_cents, amount_currency,
+  debit_sequence_type, collection_date,
+  description
+FROM wsjrdp_direct_debit_pre_notifications
+WHERE {where:q}
+ORDER BY collection_date, payment_initiation_id, id
+""",
+        cursor_name="datev_pre_notifications",
+    )
+
+    csv_filenames = []
+    path2ids: dict[_pathlib.Path, list[int]] = {}
+    for year, year_rows in _itertools.groupby(
+        rows, key=lambda row: row["collection_date"].year
+    ):
+        date_from = year2stats[year]["date_from"]
+        date_to = year2stats[year]["date_to"]
+        month_from = date_from.strftime("%Y-%m")
+        month_to = date_to.strftime("%Y-%m")
+        months = month_from if month_from == month_to else f"{month_from}..{month_to}"
+        name_parts = ["EXTF_sammeleinzug_wsj27", months.replace("..", "_")]
+        if pain_ids:
+            name_parts.append("pain" + "-".join(str(pain_id) for pain_id in pain_ids))
+        name_parts.append(encoding_filename_suffix)
+        csv_filename = ctx.make_out_path("_".join(name_parts)).with_suffix(".csv")
+
+        header_line = _extf_header_line(
+            now=now,
+            beraternummer=ctx.config.datev_beraternummer,
+            mandantennummer=ctx.config.datev_mandantennummer,
+            accounts=_booking_accounts_for_year(year),
+            date_from=date_from,
+            date_to=date_to,
+            bezeichnung=f"Sammeleinzug {months}",
+        )
+        ids, sum_cents = _write_pre_notifications_extf_file(
+            csv_filename,
+            year_rows,
+            header_line=header_line,
+            encoding=encoding,
+            csv_file_encoding=csv_file_encoding,
+        )
+        _LOGGER.info("  fiscal year %s: %s rows, %s cents", year, len(ids), sum_cents)
+        _LOGGER.info(f"  wrote {csv_filename}")
+        csv_filenames.append(csv_filename)
+        path2ids[csv_filename] = ids
+    if mark_exported:
+        for csv_filename, ids in path2ids.items():
+            _mark_datev_exported(
+                conn,
+                PRE_NOTIFICATIONS_DATEV_SOURCE,
+                ids,
+                marker={"exported_at": now.isoformat(), "file": csv_filename.name},
             )
-            buchungstext = re.sub(
-                r"(?P<role>CMT|YP|UL|IST) Beitrag *(?P<descr>.*) +(?P<id>[0-9]+)",
-                r"\g<role> \g<id> \g<descr> / Beitrag",
-                buchungstext,
+    return csv_filenames
+
+
+_DATEV_EXPORT_MARKER_KEY = "datev_export"
+"""Key in a source row's ``additional_info`` recording its DATEV export."""
+
+
+@_dataclasses.dataclass(kw_only=True)
+class DatevExportFile:
+    """An EXTF file written by `write_datev_csvs_for_source`."""
+
+    source_name: str
+    fiscal_year: int
+    path: _pathlib.Path
+    number_of_rows: int = 0
+    sum_cents: int = 0
+
+
+def _mark_datev_exported(
+    conn: _psycopg.Connection,
+    source: DatevExportSource,
+    ids: list[int],
+    *,
+    marker: dict[str, _typing.Any],
+) -> None:
+    from psycopg.types.json import Jsonb
+
+    with conn.cursor() as cursor:
+        cursor.execute(
+            t"""UPDATE {source.table_name:i}
+SET additional_info = COALESCE(additional_info, jsonb_build_object())
+  || jsonb_build_object({_DATEV_EXPORT_MARKER_KEY}::text, {Jsonb(marker)})
+WHERE id = ANY({ids})
+"""
+        )
+        _LOGGER.debug(
+            "marked %s %s row(s) as exported to %s",
+            cursor.rowcount,
+            source.table_name,
+            marker.get("file"),
+        )
+
+
+def write_datev_csvs_for_source(
+    *,
+    ctx: _context.WsjRdpContext,
+    conn: _psycopg.Connection,
+    source: DatevExportSource,
+    start_date: _datetime.date | None = None,
+    end_date: _datetime.date | None = None,
+    mark_exported: bool = True,
+    page_size: int = 1000,
+    csv_encoding: str = "utf-8",
+    now: _datetime.date | None = None,
+) -> list[DatevExportFile]:
+    """Export the not yet exported rows of *source* to DATEV EXTF files.
+
+    The rows are read in pages of *page_size* using keyset pagination on
+    ``id`` and written to one file per fiscal year.  Rows already marked
+    as exported are never exported again; with *mark_exported* the
+    exported rows get such a marker in their ``additional_info`` (in the
+    connection's current transaction).
+    """
+    import contextlib as _contextlib
+    import datetime as _datetime
+
+    from psycopg.sql import SQL, Identifier
+
+    from . import _pg, _util
+
+    now = _util.to_datetime(now, now=ctx.start_time)
+    encoding, csv_file_encoding, encoding_filename_suffix = _resolve_csv_encoding(
+        csv_encoding
+    )
+    after_id = 0
+    columns = SQL(", ").join(
+        Identifier(col)
+        for col in _util.dedup(["id", source.date_column, *source.columns])
+    )
+    where = SQL(source.where)  # type: ignore
+    date_column = source.date_column
+    exported_at = now.isoformat()
+    year2file: dict[int, tuple[DatevExportFile, DatevExtfWriter]] = {}
+
+    with _contextlib.ExitStack() as stack:
+
+        def open_file(year: int) -> tuple[DatevExportFile, DatevExtfWriter]:
+            path = ctx.make_out_path(
+                f"EXTF_{source.name}_wsj27_{year}_{encoding_filename_suffix}"
+            ).with_suffix(".csv")
+            csvfile = stack.enter_context(
+                open(path, "w", encoding=csv_file_encoding, newline="\r\n")
             )
-            buchungstext = re.sub(
-                r"(?P<installment>[0-9]+. Rate \w+ 202[567]) (?P<role>CMT|YP|UL|IST) *(?P<descr>.*) +\(id (?P<id>[0-9]+)\)",
-                r"\g<role> \g<id> \g<descr> / \g<installment>",
-                buchungstext,
+            date_from = _datetime.date(year, 1, 1)
+            date_to = _datetime.date(year, 12, 31)
+            csvfile.write(
+                _extf_header_line(
+                    now=now,
+                    beraternummer=ctx.config.datev_beraternummer,
+                    mandantennummer=ctx.config.datev_mandantennummer,
+                    accounts=_booking_accounts_for_year(year),
+                    date_from=max(date_from, start_date or date_from),
+                    date_to=min(date_to, end_date or date_to),
+                    bezeichnung=f"{source.bezeichnung} {year}",
+                )
             )
-            buchungstext = _prepare_description(
-                buchungstext, encoding=encoding, max_bytes_length=60
+            d_writer = DatevExtfWriter(csvfile)
+            d_writer.writeheader()
+            export_file = DatevExportFile(
+                source_name=source.name, fiscal_year=year, path=path
             )
-            d_writer.writerow(
-                {
-                    "Umsatz (ohne Soll/Haben-Kz)": amount_de.lstrip("-"),
-                    "Soll/Haben-Kennzeichen": "S" if amount_cents > 0 else "H",
-                    "WKZ Umsatz": amount_currency,
-                    "Konto": konto,
-                    "Gegenkonto (ohne BU-Schlüssel)": gegenkonto,
-                    "Belegdatum": collection_date.strftime("%d%m"),
-                    "Belegfeld 1": belegfeld[:36],
-                    "Buchungstext": buchungstext,
-                    "KOST1 - Kostenstelle": kost1,
-                    "KOST2 - Kostenstelle": kost2,
-                    "Festschreibung": "0",
-                }
+            return export_file, d_writer
+
+        while True:
+            rows = _pg.pg_select_dict_rows(
+                conn,
+                t"""SELECT {columns:q}
+FROM {source.table_name:i}
+WHERE id > {after_id}
+  AND NOT COALESCE(additional_info ? {_DATEV_EXPORT_MARKER_KEY}, FALSE)
+  AND ({start_date}::date IS NULL OR {date_column:i} >= {start_date})
+  AND ({end_date}::date IS NULL OR {date_column:i} <= {end_date})
+  AND ({where:q})
+ORDER BY id
+LIMIT {page_size}
+""",
             )
-    _LOGGER.info("    %s rows in dataframe", len(df))
-    _LOGGER.info("    %s cents in dataframe", sum_cents)
-    _LOGGER.info(f"  wrote {csv_filename}")
-    return csv_filename
+            if not rows:
+                break
+            after_id = rows[-1]["id"]
+
+            path2ids: dict[_pathlib.Path, list[int]] = {}
+            for row in rows:
+                extf_row = source.to_extf_row(row, encoding=encoding)
+                if missing := source.missing_required(extf_row):
+                    _LOGGER.warning(
+                        "Skip %s id=%s: no %s",
+                        source.name,
+                        row["id"],
+                        ", ".join(missing),
+                    )
+                    continue
+                year = row[date_column].year
+                if year not in year2file:
+                    year2file[year] = open_file(year)
+                export_file, d_writer = year2file[year]
+                d_writer.writerow(extf_row)
+                export_file.number_of_rows += 1
+                export_file.sum_cents += int(round(source.amount_cents(row)))
+                path2ids.setdefault(export_file.path, []).append(row["id"])
+
+            if mark_exported:
+                for path, ids in path2ids.items():
+                    _mark_datev_exported(
+                        conn,
+                        source,
+                        ids,
+                        marker={"exported_at": exported_at, "file": path.name},
+                    )
+            if len(rows) < page_size:
+                break
+
+    export_files = [year2file[year][0] for year in sorted(year2file)]
+    for export_file in export_files:
+        _LOGGER.info(
+            "  %s fiscal year %s: %s rows, %s cents",
+            source.name,
+            export_file.fiscal_year,
+            export_file.number_of_rows,
+            export_file.sum_cents,
+        )
+        _LOGGER.info(f"  wrote {export_file.path}")
+    return export_files
@@ -0,0 +1,253 @@
+"""Forwarding graph of e-mail aliases.
+
+A :class:`ForwardingGraph` is built once from all Mailcow aliases (and
+the ``goto`` of Keycloak users) and answers goto expansion, reverse
+lookups ("who forwards to X") and cycle checks without further
+requests.  Addresses are compared case-insensitively.
+"""
+
+from __future__ import annotations
+
+import collections.abc as _collections_abc
+import logging as _logging
+import typing as _typing
+
+
+if _typing.TYPE_CHECKING:
+    from . import _mailcow_client
+
+
+_LOGGER = _logging.getLogger(__name__)
+
+
+def _key(address: str) -> str:
+    return address.strip().lower()
+
+
+def _split_goto(goto: str | _collections_abc.Iterable[str] | None) -> list[str]:
+    if not goto or not isinstance(goto, (str, _collections_abc.Iterable)):
+        return []
+    if isinstance(goto, str):
+        goto = goto.split(",")
+    return [addr.strip() for addr in goto if addr and addr.strip()]
+
+
+class ForwardingGraph:
+    """Directed graph *address* → *goto addresses*.
+
+    Addresses that are no alias are final recipients, aliases with an
+    empty goto (e.g. goto ``null@localhost``) discard mail.  An alias
+    that lists itself in its goto (Mailcow's "keep a copy") delivers
+    to itself as well.
+
+    >>> graph = ForwardingGraph({
+    ...     "a@x": ["b@x", "c@x"],
+    ...     "b@x": "d@x",
+    ...     "c@x": ["c@x", "d@x"],
+    ... })
+    >>> graph.expand("a@x")
+    ['d@x', 'c@x']
+    >>> graph.expand("A@X") == graph.expand("a@x")
+    True
+    >>> graph.expand("d@x")
+    []
+    >>> sorted(graph.forwarders("d@x"))
+    ['a@x', 'b@x', 'c@x']
+    >>> graph.cycles()
+    []
+    """
+
+    def __init__(
+        self,
+        edges: _collections_abc.Mapping[
+            str, str | _collections_abc.Iterable[str] | None
+        ]
+        | _collections_abc.Iterable[
+            tuple[str, str | _collections_abc.Iterable[str] | None]
+        ] = (),
+    ) -> None:
+        self._addresses: dict[str, str] = {}
+        self._goto: dict[str, list[str]] = {}
+        self._expanded: dict[str, list[str]] | None = None
+        self._reverse: dict[str, set[str]] | None = None
+        self._cycles: list[list[str]] = []
+        items = edges.items() if isinstance(edges, _collections_abc.Mapping) else edges
+        for address, goto in items:
+            self.add(address, goto)
+
+    @classmethod
+    def from_mailcow_aliases(
+        cls,
+        aliases: _collections_abc.Iterable[_mailcow_client.MailcowAlias],
+        *,
+        keycloak_users: _collections_abc.Iterable[dict] = (),
+    ) -> _typing.Self:
+        """Build the graph from Mailcow aliases and Keycloak users.
+
+        Inactive aliases are skipped, aliases to ``null``/``spam``/``ham``
+        have an empty goto.  Keycloak users only contribute a ``goto``
+        if they have one; Mailcow aliases take precedence.
+        """
+        graph = cls()
+        for user in keycloak_users:
+            if (email := user.get("email")) and (goto := user.get("goto")):
+                graph.add(email, goto)
+        for alias in aliases:
+            if int(alias.get("active", 1)):
+                graph.add(alias.address, alias.goto, replace=True)
+        return graph
+
+    def add(
+        self,
+        address: str,
+        goto: str | _collections_abc.Iterable[str] | None,
+        *,
+        replace: bool = False,
+    ) -> None:
+        """Add the edges *address* → *goto* (comma separated or a list)."""
+        key = _key(address)
+        if not key:
+            return
+        goto_list = _split_goto(goto)
+        self._addresses.setdefault(key, address.strip())
+        for addr in goto_list:
+            self._addresses.setdefault(_key(addr), addr)
+        if replace or key not in self._goto:
+            self._goto[key] = goto_list
+        else:
+            self._goto[key] = self._goto[key] + [
+                addr for addr in goto_list if addr not in self._goto[key]
+            ]
+        self._expanded = None
+        self._reverse = None
+
+    def __contains__(self, address: object) -> bool:
+        return isinstance(address, str) and _key(address) in self._goto
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    @property
+    def addresses(self) -> list[str]:
+        """All addresses with a goto entry (possibly empty)."""
+        return [self._addresses[key] for key in self._goto]
+
+    def goto(self, address: str) -> list[str]:
+        """The direct goto list of *address* (empty if it is no alias)."""
+        return list(self._goto.get(_key(address), []))
+
+    def expand(self, address: str) -> list[str]:
+        """The final recipients of *address*, in goto order.
+
+        Returns an empty list if *address* does not forward anywhere.
+        Members of a forwarding cycle are dropped, except for aliases
+        that forward to themselves.
+        """
+        return list(self.__get_expanded().get(_key(address), ()))
+
+    def forwarders(self, address: str) -> set[str]:
+        """All addresses that forward (directly or indirectly) to *address*."""
+        if self._reverse is None:
+            reverse: dict[str, set[str]] = {}
+            for source, goto_list in self._goto.items():
+                for addr in goto_list:
+                    reverse.setdefault(_key(addr), set()).add(source)
+            self._reverse = reverse
+        start = _key(address)
+        seen: set[str] = set()
+        todo = [start]
+        while todo:
+            for source in self._reverse.get(todo.pop(), ()):
+                if source not in seen:
+                    seen.add(source)
+                    todo.append(source)
+        seen.discard(start)
+        return {self._addresses[key] for key in seen}
+
+    def cycles(self) -> list[list[str]]:
+        """Forwarding cycles, ignoring aliases that only list themselves."""
+        self.__get_expanded()
+        return [list(cycle) for cycle in self._cycles]
+
+    def __get_expanded(self) -> dict[str, list[str]]:
+        if self._expanded is None:
+            self.__compute()
+        assert self._expanded is not None
+        return self._expanded
+
+    def __compute(self) -> None:
+        # Tarjan's algorithm yields the strongly connected components in
+        # reverse topological order, so all targets outside a component
+        # are expanded before the component itself.
+        expanded: dict[str, list[str]] = {}
+        cycles: list[list[str]] = []
+        index: dict[str, int] = {}
+        lowlink: dict[str, int] = {}
+        stack: list[str] = []
+        on_stack: set[str] = set()
+
+        def finish(component: list[str]) -> None:
+            members = set(component)
+            recipients: dict[str, str] = {}
+            for key in component:
+                for addr in self._goto[key]:
+                    target = _key(addr)
+                    if target == key or target not in self._goto:
+                        recipients.setdefault(target, addr)
+                    elif target not in members:
+                        for final in expanded.get(target, ()):
+                            recipients.setdefault(_key(final), final)
+            if len(component) > 1:
+                cycles.append([self._addresses[key] for key in component])
+            for key in component:
+                expanded[key] = list(recipients.values())
+
+        def successors(key: str) -> _collections_abc.Iterator[str]:
+            for addr in self._goto[key]:
+                target = _key(addr)
+                if self._goto.get(target) and target != key:
+                    yield target
+
+        def enter(key: str) -> None:
+            index[key] = lowlink[key] = len(index)
+            stack.append(key)
+            on_stack.add(key)
+            work.append((key, successors(key)))
+
+        # Iterative depth-first search, so long alias chains do not hit
+        # the recursion limit. Each *work* entry holds a key and the
+        # iterator over its remaining successors.
+        work: list[tuple[str, _collections_abc.Iterator[str]]] = []
+
+        def visit(root: str) -> None:
+            enter(root)
+            while work:
+                key, targets = work[-1]
+                for target in targets:
+                    if target not in index:
+                        enter(target)
+                        break
+                    elif target in on_stack:
+                        lowlink[key] = min(lowlink[key], index[target])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[key])
+                    if lowlink[key] == index[key]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == key:
+                                break
+                        finish(component[::-1])
+
+        for key, goto_list in self._goto.items():
+            if goto_list and key not in index:
+                visit(key)
+        for cycle in cycles:
+            _LOGGER.warning(f"[forwarding] Cycle: {' -> '.join(cycle)}")
+        self._expanded = expanded
+        self._cycles = cycles
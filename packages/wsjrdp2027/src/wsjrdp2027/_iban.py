@@ -0,0 +1,250 @@
+"""Memoized IBAN/BIC validation and bank lookup.
+
+Parsing a `schwifty.IBAN` (checksum, BBAN validation, bank registry
+lookup) is by far the most expensive part of checking the SEPA data of
+a people/payment DataFrame, while most IBANs show up load after load and
+many people share the same bank.  `IbanService` therefore memoizes the
+parsed results in bounded LRU caches and validates whole columns by
+looking at each distinct value only once.
+"""
+
+from __future__ import annotations
+
+import dataclasses as _dataclasses
+import functools as _functools
+import logging as _logging
+import typing as _typing
+
+
+if _typing.TYPE_CHECKING:
+    import pandas as _pandas
+
+
+_LOGGER = _logging.getLogger(__name__)
+
+
+@_dataclasses.dataclass(kw_only=True, frozen=True, slots=True)
+class IbanInfo:
+    """Parse result of a single IBAN."""
+
+    iban: str | None
+    """The IBAN as given."""
+    valid: bool
+    error: str | None = None
+    """Error message if not `valid`."""
+    bic: str | None = None
+    """BIC derived from the IBAN (via the bank registry)."""
+    bank_name: str | None = None
+    country_code: str | None = None
+
+
+@_dataclasses.dataclass(kw_only=True, frozen=True, slots=True)
+class IbanBicCheck:
+    """Result of checking an IBAN together with a given BIC.
+
+    The ``sepa_bic*`` fields correspond to the columns of the payment
+    DataFrame, *skip_reasons* lists why a payment has to be skipped.
+    """
+
+    sepa_bic: str | None
+    sepa_bic_status: str
+    """One of valid, invalid, from_iban, not_present, inconsistent."""
+    sepa_bic_status_reason: str = ""
+    skip_reasons: tuple[str, ...] = ()
+
+
+class IbanService:
+    """Validate IBANs/BICs and look up banks with bounded memoization.
+
+    *maxsize* bounds each of the caches (parsed IBANs, parsed BICs and
+    IBAN/BIC checks).  Instances are thread-safe, `get_iban_service`
+    returns a process-wide one.
+    """
+
+    def __init__(self, *, maxsize: int | None = 16384) -> None:
+        self.__lookup_cache = _functools.lru_cache(maxsize=maxsize)(_lookup_iban)
+        self.__bic_cache = _functools.lru_cache(maxsize=maxsize)(_parse_bic)
+        self.__check_cache = _functools.lru_cache(maxsize=maxsize)(self.__check)
+
+    def lookup(self, iban: str | None, /, *, validate_bban: bool = False) -> IbanInfo:
+        """Parse *iban* (memoized)."""
+        return self.__lookup_cache(iban, validate_bban)
+
+    def check(
+        self, iban: str | None, bic: str | None, /, *, pedantic: bool = True
+    ) -> IbanBicCheck:
+        """Check *iban* and *bic* like `load_payment_dataframe` does (memoized).
+
+        A missing or invalid IBAN is a skip reason.  A missing BIC is
+        derived from the IBAN.  An invalid BIC, or one that does not
+        match the IBAN, is a skip reason only if *pedantic*.
+        """
+        return self.__check_cache(iban, bic, pedantic)
+
+    def bank_name(self, iban: str | None, /) -> str | None:
+        info = self.lookup(iban)
+        if info.error:
+            _LOGGER.debug(
+                "Could not determine bank name for IBAN %r: %s", iban, info.error
+            )
+        return info.bank_name
+
+    def cache_info(self) -> dict[str, _functools._CacheInfo]:
+        return {
+            "lookup": self.__lookup_cache.cache_info(),
+            "bic": self.__bic_cache.cache_info(),
+            "check": self.__check_cache.cache_info(),
+        }
+
+    def cache_clear(self) -> None:
+        self.__lookup_cache.cache_clear()
+        self.__bic_cache.cache_clear()
+        self.__check_cache.cache_clear()
+
+    def bank_name_series(self, iban_series: _pandas.Series, /) -> _pandas.Series:
+        """`bank_name` for each element, computed once per distinct IBAN."""
+        import pandas as _pandas
+
+        ibans = [_str_or_none(iban) for iban in iban_series]
+        bank_names = {iban: self.bank_name(iban) for iban in dict.fromkeys(ibans)}
+        return _pandas.Series(
+            [bank_names[iban] for iban in ibans], index=iban_series.index, dtype=object
+        )
+
+    def validate_series(
+        self,
+        iban_series: _pandas.Series,
+        bic_series: _pandas.Series,
+        /,
+        *,
+        pedantic: bool = True,
+    ) -> _pandas.DataFrame:
+        """`check` each (IBAN, BIC) pair of the aligned series.
+
+        Every distinct pair is checked once.  Returns a DataFrame with the
+        index of *iban_series* and the columns ``sepa_bic``,
+        ``sepa_bic_status``, ``sepa_bic_status_reason`` and
+        ``skip_reasons`` (tuple of str, empty if ok).
+        """
+        import pandas as _pandas
+
+        keys = [
+            (_str_or_none(iban), _str_or_none(bic))
+            for iban, bic in zip(iban_series, bic_series, strict=True)
+        ]
+        checks = {
+            key: self.check(*key, pedantic=pedantic) for key in dict.fromkeys(keys)
+        }
+        rows = [checks[key] for key in keys]
+        return _pandas.DataFrame(
+            {
+                "sepa_bic": [c.sepa_bic for c in rows],
+                "sepa_bic_status": [c.sepa_bic_status for c in rows],
+                "sepa_bic_status_reason": [c.sepa_bic_status_reason for c in rows],
+                "skip_reasons": [c.skip_reasons for c in rows],
+            },
+            index=iban_series.index,
+            dtype=object,
+        )
+
+    def __check(
+        self, iban: str | None, bic: str | None, pedantic: bool, /
+    ) -> IbanBicCheck:
+        skip_reasons = []
+        info = self.lookup(iban, validate_bban=pedantic)
+        if not iban:
+            skip_reasons.append("No IBAN")
+        elif not info.valid:
+            skip_reasons.append(f"sepa_iban: {info.error}")
+        auto_bic = info.bic
+
+        if not bic:
+            if auto_bic:
+                return IbanBicCheck(
+                    sepa_bic=auto_bic,
+                    sepa_bic_status="from_iban",
+                    sepa_bic_status_reason="sepa_bic empty",
+                    skip_reasons=tuple(skip_reasons),
+                )
+            return IbanBicCheck(
+                sepa_bic=bic,
+                sepa_bic_status="not_present",
+                skip_reasons=tuple(skip_reasons),
+            )
+
+        parsed_bic, bic_error = self.__bic_cache(bic)
+        if parsed_bic is None:
+            if pedantic:
+                skip_reasons.append(f"sepa_bic: {bic_error}")
+            return IbanBicCheck(
+                sepa_bic=bic,
+                sepa_bic_status="invalid",
+                sepa_bic_status_reason=str(bic_error),
+                skip_reasons=tuple(skip_reasons),
+            )
+        if auto_bic and not _is_bic_compatible(parsed_bic, auto_bic):
+            reason = (
+                f"sepa_bic {parsed_bic} not consistent with {auto_bic}"
+                f" derived from sepa_iban"
+            )
+            if pedantic:
+                skip_reasons.append(f"sepa_bic: {reason}")
+            return IbanBicCheck(
+                sepa_bic=auto_bic,
+                sepa_bic_status="inconsistent",
+                sepa_bic_status_reason=reason,
+                skip_reasons=tuple(skip_reasons),
+            )
+        return IbanBicCheck(
+            sepa_bic=bic, sepa_bic_status="valid", skip_reasons=tuple(skip_reasons)
+        )
+
+
+def _lookup_iban(iban: str | None, validate_bban: bool, /) -> IbanInfo:
+    import schwifty
+
+    if not iban:
+        return IbanInfo(iban=iban, valid=False, error="No IBAN")
+    try:
+        parsed = schwifty.IBAN(iban, validate_bban=validate_bban)
+    except Exception as exc:
+        return IbanInfo(iban=iban, valid=False, error=str(exc))
+    bic = parsed.bic
+    return IbanInfo(
+        iban=iban,
+        valid=True,
+        bic=str(bic) if bic else None,
+        bank_name=parsed.bank_name,
+        country_code=parsed.country_code,
+    )
+
+
+def _parse_bic(bic: str, /) -> tuple[str | None, str | None]:
+    import schwifty
+
+    try:
+        return str(schwifty.BIC(bic)), None
+    except Exception as exc:
+        return None, str(exc)
+
+
+def _is_bic_compatible(bic_a: str | None, bic_b: str | None) -> bool:
+    if (
+        (bic_a is None or bic_b is None)
+        or (bic_a == bic_b)
+        or (bic_a + "XXX" == bic_b)
+        or (bic_a == bic_b + "XXX")
+    ):
+        return True
+    else:
+        return False
+
+
+def _str_or_none(obj: object, /) -> str | None:
+    return obj if isinstance(obj, str) and obj else None
+
+
+@_functools.cache
+def get_iban_service() -> IbanService:
+    """Return the process-wide `IbanService`."""
+    return IbanService()
@@ -11,7 +11,7 @@ from .._models import person as _person
 
 
 if _typing.TYPE_CHECKING:
-    from .. import _keycloak_wsjrdp_adapter
+    from .. import _forwarding_graph, _keycloak_sync_plan, _keycloak_wsjrdp_adapter
 
 
 _LOGGER = _logging.getLogger(__name__)
@@ -336,6 +336,11 @@ def sync(
 ) -> bool:
 
     keycloak_adapter = ctx.keycloak()
+    # All lookups below use allow_cached=True, so after loading all
+    # users once no further Keycloak requests are needed until the
+    # updates are written back.
+    keycloak_adapter.prefetch_users()
+    forwarding_graph = _get_forwarding_graph(ctx, keycloak_adapter=keycloak_adapter)
 
     errors = []
     email2row = {}
@@ -440,9 +445,7 @@ def sync(
             _LOGGER.debug(f"{p.role_id_name} Check {key=} for {email=}")
             if email is None:
                 continue
-            goto_list = _get_expanded_goto_list(
-                ctx, email, keycloak_adapter=keycloak_adapter
-            )
+            goto_list = forwarding_graph.expand(email)
             _LOGGER.debug(f"{p.role_id_name} {goto_list=}")
             _LOGGER.debug(f"{p.role_id_name} {p.additional_info.get(key)=}")
             old_goto_list = p.additional_info.get(key)
@@ -461,29 +464,62 @@ def sync(
     return True
 
 
-def _get_expanded_goto_list(
+def plan_sync(
+    ctx: _context.WsjRdpContext,
+    people_df: _pandas.DataFrame,
+    *,
+    keycloak_groupname: str | None = None,
+    sync_enabled: bool = False,
+    prune_group: bool = False,
+) -> _keycloak_sync_plan.KeycloakSyncPlan:
+    """Compute the Keycloak changes for *people_df* in one pass.
+
+    Unlike `sync`, this works on a snapshot of all Keycloak users and
+    does not ask per person. Review the plan with
+    `KeycloakSyncPlan.get_description` and write it with
+    `KeycloakSyncPlan.apply`.
+    """
+    from .. import _keycloak_sync_plan
+
+    keycloak_adapter = ctx.keycloak()
+    keycloak_adapter.prefetch_users()
+    users_df = _keycloak_sync_plan.keycloak_users_dataframe(
+        keycloak_adapter.get_user_list(allow_cached=True)
+    )
+    forwarding_graph = _get_forwarding_graph(ctx, keycloak_adapter=keycloak_adapter)
+    group_member_ids = None
+    if keycloak_groupname:
+        group_member_ids = {
+            user["id"]
+            for user in keycloak_adapter.get_users_in_group(keycloak_groupname)
+        }
+    return _keycloak_sync_plan.compute_keycloak_sync_plan(
+        people_df,
+        users_df,
+        keycloak_groupname=keycloak_groupname,
+        group_member_ids=group_member_ids,
+        sync_enabled=sync_enabled,
+        prune_group=prune_group,
+        forwarding_graph=forwarding_graph,
+    )
+
+
+def _get_forwarding_graph(
     ctx: _context.WsjRdpContext,
-    email: str,
     *,
     keycloak_adapter: _keycloak_wsjrdp_adapter.WsjRdpKeycloakAdapter,
-) -> list[str]:
-    import itertools
+) -> _forwarding_graph.ForwardingGraph:
+    """Forwarding graph of all Mailcow aliases and Keycloak users.
 
-    def get_goto_list(email, default=None) -> list[str]:
-        user_dict = keycloak_adapter.get_user_or_none_by_email(email, allow_cached=True)
-        if not user_dict:
-            return default or []
-        else:
-            goto = user_dict.get("goto")
-            return goto.split(",") if goto else []
-
-    old_goto_list = []
-    goto_list = get_goto_list(email, [])
-    while goto_list != old_goto_list:
-        old_goto_list, goto_list = (
-            goto_list,
-            list(
-                itertools.chain.from_iterable(get_goto_list(a, [a]) for a in goto_list)
-            ),
-        )
-    return goto_list
+    Built once per sync, so expanding the goto list of an address does
+    not need any further requests.
+    """
+    from .. import _forwarding_graph
+
+    mailcow_client = ctx.mailcow()
+    # Also warms the mailbox cache used when creating missing users.
+    mailcow_client.prefetch()
+    return _forwarding_graph.ForwardingGraph.from_mailcow_aliases(
+        mailcow_client.get_alias_list(allow_cached=True),
+        keycloak_users=keycloak_adapter.get_user_list(allow_cached=True),
+    )
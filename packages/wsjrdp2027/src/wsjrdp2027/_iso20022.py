@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import threading as _threading
 import typing as _typing
 
 
 if _typing.TYPE_CHECKING:
     import io as _io
 
+    import lxml.etree as _lxml_etree
     import saxonche as _saxonche  # ty: ignore
 
     from . import _file
@@ -65,6 +67,47 @@ so this is transformed into an object comprising an "amt" and "Ccy".
 """
 
 
+_SAXON_LOCK = _threading.Lock()
+_SAXON_PROCESSOR: _saxonche.PySaxonProcessor | None = None
+_SAXON_THREAD_LOCAL = _threading.local()
+
+
+def _saxon_processor() -> _saxonche.PySaxonProcessor:
+    """Return the process-wide Saxon processor, created on first use.
+
+    Creating a processor (and compiling the stylesheet) dominates the
+    cost of converting small files, so it is shared and never closed.
+    """
+    global _SAXON_PROCESSOR
+
+    if (proc := _SAXON_PROCESSOR) is None:
+        import saxonche  # ty: ignore
+
+        with _SAXON_LOCK:
+            if (proc := _SAXON_PROCESSOR) is None:
+                proc = _SAXON_PROCESSOR = saxonche.PySaxonProcessor(license=False)
+    return proc
+
+
+def _saxon_xslt_executable() -> _saxonche.PyXsltExecutable:
+    """Return the compiled `_ISO_20022_XML_TO_JSON_XSL` of the current thread."""
+    if (executable := getattr(_SAXON_THREAD_LOCAL, "executable", None)) is None:
+        xsltproc = _saxon_processor().new_xslt30_processor()
+        executable = xsltproc.compile_stylesheet(
+            stylesheet_text=_ISO_20022_XML_TO_JSON_XSL
+        )
+        _SAXON_THREAD_LOCAL.executable = executable
+    return executable
+
+
+def _saxon_xpath_processor() -> _saxonche.PyXPathProcessor:
+    """Return the XPath processor of the current thread."""
+    if (xpath_proc := getattr(_SAXON_THREAD_LOCAL, "xpath_proc", None)) is None:
+        xpath_proc = _saxon_processor().new_xpath_processor()
+        _SAXON_THREAD_LOCAL.xpath_proc = xpath_proc
+    return xpath_proc
+
+
 def _sepa_schema_from_uri(uri: str, /) -> str | None:
     if uri.startswith("urn:iso:std:iso:20022:tech:xsd:"):
         return uri.rsplit(":", 1)[1] or None
@@ -73,9 +116,9 @@ def _sepa_schema_from_uri(uri: str, /) -> str | None:
 
 
 def _iso20022_sepa_schema_from_xml_document(
-    processor: _saxonche.PySaxonProcessor, document: _saxonche.PyXdmNode
+    document: _saxonche.PyXdmNode,
 ) -> str | None:
-    xpath_proc = processor.new_xpath_processor()
+    xpath_proc = _saxon_xpath_processor()
     xpath_proc.set_context(xdm_item=document)
     ns_items = xpath_proc.evaluate("/*/namespace::*")
     for ns_node in ns_items or []:
@@ -87,17 +130,14 @@ def _iso20022_sepa_schema_from_xml_document(
 
 
 def _iso20022_xml_document_to_dict(
-    processor: _saxonche.PySaxonProcessor,
     document: _saxonche.PyXdmNode,
     *,
     expected_format: str | None = None,
 ) -> dict:
     import json
 
-    sepa_schema = _iso20022_sepa_schema_from_xml_document(processor, document)
-    xsltproc = processor.new_xslt30_processor()
-    executable = xsltproc.compile_stylesheet(stylesheet_text=_ISO_20022_XML_TO_JSON_XSL)
-    output = executable.transform_to_string(xdm_node=document)
+    sepa_schema = _iso20022_sepa_schema_from_xml_document(document)
+    output = _saxon_xslt_executable().transform_to_string(xdm_node=document)
     d = json.loads(output)
     if sepa_schema:
         if expected_format:
@@ -119,16 +159,66 @@ def iso20022_xml_file_to_dict(
     return iso20022_xml_text_to_dict(xml_text, expected_format=expected_format)
 
 
-def iso20022_xml_text_to_dict(xml_text: str | bytes, *, expected_format=None) -> dict:
-    import saxonche  # ty: ignore
+def iso20022_xml_files_to_dicts(
+    files_or_paths: _typing.Iterable[_file.PathLike | _io.Reader[bytes]],
+    /,
+    *,
+    expected_format=None,
+) -> list[dict]:
+    """Convert several ISO 20022 XML files, see `iso20022_xml_file_to_dict`.
 
+    The Saxon processor, the compiled stylesheet and the XPath processor
+    are set up once and reused for all files.
+    """
+    return [
+        iso20022_xml_file_to_dict(file_or_path, expected_format=expected_format)
+        for file_or_path in files_or_paths
+    ]
+
+
+def iso20022_xml_text_to_dict(xml_text: str | bytes, *, expected_format=None) -> dict:
     if isinstance(xml_text, bytes):
         xml_text = decode_xml_bytes(xml_text)
-    with saxonche.PySaxonProcessor(license=False) as proc:
-        document = proc.parse_xml(xml_text=xml_text)
-        return _iso20022_xml_document_to_dict(
-            proc, document, expected_format=expected_format
-        )
+    proc = _saxon_processor()
+    document = proc.parse_xml(xml_text=xml_text)
+    return _iso20022_xml_document_to_dict(document, expected_format=expected_format)
+
+
+def iso20022_element_to_dict(element: _lxml_etree._Element, /) -> dict | str:
+    """Convert an lxml element like `_ISO_20022_XML_TO_JSON_XSL` does.
+
+    Used by streaming readers that convert one subtree at a time (see
+    `CamtMessage.stream_transaction_details`) instead of the whole
+    document.
+
+    >>> import lxml.etree
+    >>> iso20022_element_to_dict(lxml.etree.fromstring(
+    ...     '<Ntry xmlns="urn:x"><Amt Ccy="EUR">1.50</Amt><Sts><Cd>BOOK</Cd></Sts>'
+    ...     '<Ustrd>a</Ustrd><Ustrd>b</Ustrd><Empty/></Ntry>'
+    ... ))
+    {'Amt': {'Ccy': 'EUR', 'amt': '1.50'}, 'Sts': {'Cd': 'BOOK'}, 'Ustrd': ['a', 'b'], 'Empty': ''}
+    """
+    import lxml.etree as _lxml_etree
+
+    children = [child for child in element if isinstance(child.tag, str)]
+    if not children:
+        text = element.text or ""
+        if text and (ccy := element.get("Ccy")) is not None:
+            return {"Ccy": ccy, "amt": text}
+        return text
+    d: dict = {}
+    repeated: set[str] = set()
+    for child in children:
+        key = _lxml_etree.QName(child).localname
+        value = iso20022_element_to_dict(child)
+        if key not in d:
+            d[key] = value
+        elif key in repeated:
+            d[key].append(value)
+        else:
+            d[key] = [d[key], value]
+            repeated.add(key)
+    return d
 
 
 def amount_string_to_cents(amount: str, currency: str, is_credit: bool) -> int:
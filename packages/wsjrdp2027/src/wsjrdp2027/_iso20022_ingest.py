@@ -0,0 +1,399 @@
+"""Parallel ingestion of CAMT (camt.052/053/054) and PAIN (pain.008) files.
+
+Files are parsed in a process pool into plain row dicts (see
+`camt_tx_insert_kwargs`), transactions are deduplicated across files by
+`CamtTxUniqueDbKey` and finally inserted with
+`pg_insert_camt_transactions` in a single transaction.  PAIN files are
+not inserted themselves, their end-to-end ids are used to link the CAMT
+transactions to already known payment initiations.
+"""
+
+from __future__ import annotations
+
+import dataclasses as _dataclasses
+import logging as _logging
+import pathlib as _pathlib
+import time as _time
+import typing as _typing
+
+
+if _typing.TYPE_CHECKING:
+    import collections.abc as _collections_abc
+
+    import psycopg as _psycopg
+
+    from . import _camt
+
+
+_LOGGER = _logging.getLogger(__name__)
+
+
+@_dataclasses.dataclass(kw_only=True)
+class Iso20022ParsedFile:
+    """Result of parsing one CAMT or PAIN file in a worker process."""
+
+    path: _pathlib.Path
+    sepa_schema: str | None = None
+    message_identification: str | None = None
+    #: `camt_tx_insert_kwargs` of all booked CAMT transactions.
+    camt_rows: list[dict] = _dataclasses.field(default_factory=list, repr=False)
+    #: PAIN only: payment information identification per end-to-end id.
+    pain_endtoend_ids: dict[str, str] = _dataclasses.field(
+        default_factory=dict, repr=False
+    )
+    num_transactions: int = 0
+    amount_cents: int = 0
+    parse_seconds: float = 0.0
+    error: str | None = None
+
+    @property
+    def message_type(self) -> str | None:
+        return ".".join(self.sepa_schema.split(".")[:2]) if self.sepa_schema else None
+
+    @property
+    def is_camt(self) -> bool:
+        return bool(self.sepa_schema and self.sepa_schema.startswith("camt."))
+
+    @property
+    def is_pain(self) -> bool:
+        return bool(self.sepa_schema and self.sepa_schema.startswith("pain."))
+
+
+@_dataclasses.dataclass(kw_only=True)
+class Iso20022IngestFileSummary:
+    path: _pathlib.Path
+    message_type: str | None
+    message_identification: str | None
+    num_transactions: int
+    num_new: int = 0
+    num_duplicates: int = 0
+    num_in_db: int = 0
+    amount_cents: int = 0
+    parse_seconds: float = 0.0
+    error: str | None = None
+
+
+@_dataclasses.dataclass(kw_only=True)
+class Iso20022IngestResult:
+    files: list[Iso20022IngestFileSummary]
+    #: Deduplicated rows that are not in the database yet, in file order.
+    new_rows: list[dict] = _dataclasses.field(repr=False)
+    inserted_ids: list[int] = _dataclasses.field(default_factory=list, repr=False)
+    wall_seconds: float = 0.0
+
+    @property
+    def num_transactions(self) -> int:
+        return sum(f.num_transactions for f in self.files)
+
+    @property
+    def num_errors(self) -> int:
+        return sum(1 for f in self.files if f.error)
+
+    @property
+    def transactions_per_second(self) -> float:
+        return self.num_transactions / self.wall_seconds if self.wall_seconds else 0.0
+
+    def log_summary(
+        self, logger: _logging.Logger | _logging.LoggerAdapter = _LOGGER
+    ) -> None:
+        from . import _util
+
+        for f in self.files:
+            if f.error:
+                logger.error(f"{f.path}: {f.error}")
+                continue
+            amount = _util.format_cents_as_eur_de(f.amount_cents, zero_cents=",00")
+            logger.info(
+                f"{f.path}: {f.message_type} {f.message_identification}"
+                f" | {f.num_transactions:>5} tx {amount:>14}"
+                f" | new={f.num_new} duplicates={f.num_duplicates}"
+                f" in_db={f.num_in_db} | {f.parse_seconds:.3f}s"
+            )
+        logger.info(
+            f"Total: {len(self.files)} file(s), {self.num_transactions} tx,"
+            f" {len(self.new_rows)} new, {self.num_errors} error(s)"
+            f" in {self.wall_seconds:.2f}s"
+            f" ({self.transactions_per_second:.1f} tx/s)"
+        )
+
+
+def expand_iso20022_paths(
+    patterns: _collections_abc.Iterable[str | _pathlib.Path],
+) -> list[_pathlib.Path]:
+    """Expand directories (``*.xml`` inside) and glob patterns to files.
+
+    Paths are returned sorted per pattern and without duplicates.
+    """
+    import glob
+
+    paths: dict[_pathlib.Path, None] = {}
+    for pattern in patterns:
+        path = _pathlib.Path(pattern)
+        if path.is_dir():
+            found = [p for p in path.iterdir() if p.suffix.lower() == ".xml"]
+        elif glob.has_magic(str(pattern)):
+            found = [_pathlib.Path(p) for p in glob.glob(str(pattern), recursive=True)]
+        else:
+            found = [path]
+        paths.update(dict.fromkeys(sorted(found)))
+    return list(paths)
+
+
+def parse_iso20022_file(path: str | _pathlib.Path, /) -> Iso20022ParsedFile:
+    """Parse a CAMT or PAIN file into plain (picklable) rows.
+
+    Errors are reported in `Iso20022ParsedFile.error` instead of being
+    raised, so that one broken file does not stop a whole batch.
+    """
+    from . import _camt, _iso20022, _pain, _pg
+
+    path = _pathlib.Path(path)
+    parsed = Iso20022ParsedFile(path=path)
+    start = _time.perf_counter()
+    try:
+        d = _iso20022.iso20022_xml_file_to_dict(path)
+        parsed.sepa_schema = d.get("sepa_schema")
+        if parsed.is_camt:
+            camt = _camt.CamtMessage(
+                sepa_schema=d["sepa_schema"], Document=d["Document"]
+            )
+            parsed.message_identification = camt.GrpHdr.get("MsgId")
+            for record in camt.iter_records(booked_only=True):
+                parsed.camt_rows.append(_pg.camt_tx_insert_kwargs(record))
+                parsed.amount_cents += record.amount_cents
+        elif parsed.is_pain:
+            pain = _pain.PainMessage(
+                sepa_schema=d["sepa_schema"], Document=d["Document"]
+            )
+            parsed.message_identification = pain.message_identification
+            for pmt_inf in pain.payment_infos:
+                pmt_inf_id = pmt_inf.payment_information_identification
+                for tx_inf in pmt_inf.direct_debit_tx_infs:
+                    parsed.pain_endtoend_ids[tx_inf.endtoend_id] = pmt_inf_id
+                    parsed.amount_cents += tx_inf.amount_cents
+        else:
+            raise RuntimeError(f"Unsupported format {parsed.sepa_schema!r}")
+    except Exception as exc:
+        parsed.error = f"{type(exc).__name__}: {exc}"
+    parsed.num_transactions = len(parsed.camt_rows) or len(parsed.pain_endtoend_ids)
+    parsed.parse_seconds = _time.perf_counter() - start
+    return parsed
+
+
+def parse_iso20022_files(
+    paths: _collections_abc.Sequence[str | _pathlib.Path],
+    /,
+    *,
+    max_workers: int | None = None,
+) -> _collections_abc.Iterator[Iso20022ParsedFile]:
+    """Parse *paths* with `parse_iso20022_file` in a process pool.
+
+    Results are yielded in the order of *paths*.  With ``max_workers=1``
+    (or a single file) the files are parsed in the current process.
+    Workers are started from a fork server, as forking a process running
+    the (multi-threaded) Saxon processor is not safe.
+    """
+    import concurrent.futures
+    import multiprocessing
+    import os
+
+    if max_workers is None:
+        max_workers = os.process_cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(paths)))
+    if max_workers == 1:
+        yield from map(parse_iso20022_file, paths)
+        return
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context("forkserver")
+    ) as executor:
+        yield from executor.map(parse_iso20022_file, paths)
+
+
+def _unique_db_key(row: dict, /) -> _camt.CamtTxUniqueDbKey:
+    from . import _camt
+
+    return _camt.CamtTxUniqueDbKey(
+        camt_type=row["camt_type"],
+        account_identification=row["account_identification"],
+        account_servicer_reference=row["account_servicer_reference"],
+        transaction_details_index=row["transaction_details_index"],
+    )
+
+
+_COMPARED_COLUMNS = ("amount_cents", "amount_currency", "value_date")
+
+
+def _check_same_transaction(key, row: dict, other: dict, /) -> None:
+    if mismatches := [
+        f"{col}: {row[col]!r} != {other[col]!r}"
+        for col in _COMPARED_COLUMNS
+        if row[col] != other[col]
+    ]:
+        raise RuntimeError(f"Tx {key}: Mismatch of " + ", ".join(mismatches))
+
+
+def deduplicate_camt_rows(
+    parsed_files: _collections_abc.Iterable[Iso20022ParsedFile],
+    /,
+    *,
+    existing: _collections_abc.Mapping[_camt.CamtTxUniqueDbKey, dict] | None = None,
+) -> tuple[list[dict], list[Iso20022IngestFileSummary]]:
+    """Return the CAMT rows of *parsed_files* that are neither duplicates
+    within the files nor contained in *existing* (e.g. from
+    `pg_select_camt_tx_unique_db_key2row`), together with per file
+    summaries.
+
+    Duplicates have to agree on amount, currency and value date,
+    otherwise a `RuntimeError` is raised.
+    """
+    existing = existing or {}
+    seen: dict[_camt.CamtTxUniqueDbKey, dict] = {}
+    new_rows = []
+    summaries = []
+    for parsed in parsed_files:
+        summary = Iso20022IngestFileSummary(
+            path=parsed.path,
+            message_type=parsed.message_type,
+            message_identification=parsed.message_identification,
+            num_transactions=parsed.num_transactions,
+            amount_cents=parsed.amount_cents,
+            parse_seconds=parsed.parse_seconds,
+            error=parsed.error,
+        )
+        summaries.append(summary)
+        for row in parsed.camt_rows:
+            key = _unique_db_key(row)
+            if (other := existing.get(key)) is not None:
+                _check_same_transaction(key, row, other)
+                summary.num_in_db += 1
+            elif (other := seen.get(key)) is not None:
+                _check_same_transaction(key, row, other)
+                summary.num_duplicates += 1
+            else:
+                seen[key] = row
+                new_rows.append(row)
+                summary.num_new += 1
+    return new_rows, summaries
+
+
+def _pg_select_payment_info_ids(
+    conn: _psycopg.Connection, message_ids: _collections_abc.Collection[str], /
+) -> dict[tuple[str, str], tuple[int, int]]:
+    from . import _pg
+
+    if not message_ids:
+        return {}
+    rows = _pg.pg_select_dict_rows(
+        conn,
+        t"""SELECT
+  pi.id AS payment_initiation_id,
+  pi.message_identification,
+  ddpi.id AS direct_debit_payment_info_id,
+  ddpi.payment_information_identification
+FROM wsjrdp_payment_initiations AS pi
+JOIN wsjrdp_direct_debit_payment_infos AS ddpi ON ddpi.payment_initiation_id = pi.id
+WHERE pi.message_identification = ANY({list(message_ids)})""",
+    )
+    return {
+        (row["message_identification"], row["payment_information_identification"]): (
+            row["payment_initiation_id"],
+            row["direct_debit_payment_info_id"],
+        )
+        for row in rows
+    }
+
+
+def link_camt_rows_to_payment_infos(
+    conn: _psycopg.Connection,
+    rows: _collections_abc.Iterable[dict],
+    parsed_files: _collections_abc.Iterable[Iso20022ParsedFile],
+    /,
+) -> int:
+    """Set ``payment_initiation_id`` and ``direct_debit_payment_info_id`` of
+    *rows* whose end-to-end id is contained in one of the PAIN files.
+
+    Returns the number of linked rows.
+    """
+    endtoend_id2key: dict[str, tuple[str, str]] = {}
+    for parsed in parsed_files:
+        if parsed.is_pain and parsed.message_identification and not parsed.error:
+            for endtoend_id, pmt_inf_id in parsed.pain_endtoend_ids.items():
+                endtoend_id2key[endtoend_id] = (
+                    parsed.message_identification,
+                    pmt_inf_id,
+                )
+    if not endtoend_id2key:
+        return 0
+    key2ids = _pg_select_payment_info_ids(
+        conn, {msg_id for msg_id, _ in endtoend_id2key.values()}
+    )
+    for msg_id in sorted(
+        {k[0] for k in endtoend_id2key.values()} - {k[0] for k in key2ids}
+    ):
+        _LOGGER.warning(f"Payment initiation {msg_id!r} not in DB, cannot link")
+    num_linked = 0
+    for row in rows:
+        key = endtoend_id2key.get(row.get("endtoend_id") or "")
+        if key and (ids := key2ids.get(key)):
+            row["payment_initiation_id"], row["direct_debit_payment_info_id"] = ids
+            num_linked += 1
+    return num_linked
+
+
+def ingest_iso20022_files(
+    conn: _psycopg.Connection,
+    paths: _collections_abc.Sequence[str | _pathlib.Path],
+    /,
+    *,
+    fin_account_ids: _collections_abc.Mapping[str, int],
+    max_workers: int | None = None,
+    dry_run: bool = False,
+) -> Iso20022IngestResult:
+    """Parse, deduplicate and insert CAMT/PAIN files.
+
+    *fin_account_ids* maps account identifications (IBANs) to
+    ``wsjrdp_fin_accounts.id`` (see `pg_select_fin_account_ids`).
+    Accounts missing there but listed in
+    `bank_accounts.WSJ27_ACCOUNT_IDENTIFICATION_TO_BANK_ACCOUNT_DICT` are
+    inserted first, transactions are inserted with ``upsert=True``.
+    Nothing is inserted if a file could not be parsed, an account is
+    unknown, or with *dry_run*.
+    """
+    from . import _pg, bank_accounts
+
+    start = _time.perf_counter()
+    parsed_files = list(parse_iso20022_files(paths, max_workers=max_workers))
+    existing = _pg.pg_select_camt_tx_unique_db_key2row(conn, show_result=False)
+    new_rows, summaries = deduplicate_camt_rows(parsed_files, existing=existing)
+    result = Iso20022IngestResult(files=summaries, new_rows=new_rows)
+
+    known_accounts = bank_accounts.WSJ27_ACCOUNT_IDENTIFICATION_TO_BANK_ACCOUNT_DICT
+    fin_account_ids = dict(fin_account_ids)
+    new_accounts = sorted(
+        {row["account_identification"] for row in new_rows} - set(fin_account_ids)
+    )
+    if unknown := [acc_id for acc_id in new_accounts if acc_id not in known_accounts]:
+        raise RuntimeError(f"Unknown account(s): {', '.join(unknown)}")
+    for row in new_rows:
+        row["fin_account_id"] = fin_account_ids.get(row["account_identification"])
+    if num_linked := link_camt_rows_to_payment_infos(conn, new_rows, parsed_files):
+        _LOGGER.info(f"Linked {num_linked} transaction(s) to payment infos")
+
+    if result.num_errors:
+        _LOGGER.error(f"{result.num_errors} file(s) failed to parse, not inserting")
+    elif dry_run:
+        for acc_id in new_accounts:
+            _LOGGER.warning(f"Account {acc_id} not in DB, would insert it")
+    elif new_rows:
+        for acc_id in new_accounts:
+            acc = known_accounts[acc_id]
+            _LOGGER.warning(f"Account {acc_id} not in DB, inserting:\n{acc}")
+            fin_account_ids[acc_id] = _pg.pg_insert_fin_account(conn, **acc.asdict())
+        for row in new_rows:
+            if row["fin_account_id"] is None:
+                row["fin_account_id"] = fin_account_ids[row["account_identification"]]
+        result.inserted_ids = _pg.pg_insert_camt_transactions(
+            conn, new_rows, upsert=True
+        )
+    result.wall_seconds = _time.perf_counter() - start
+    return result
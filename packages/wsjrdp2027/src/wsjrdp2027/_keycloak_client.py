@@ -2,12 +2,16 @@ from __future__ import annotations
 
 import collections.abc as _collections_abc
 import copy as _copy
+import functools as _functools
 import logging as _logging
+import threading as _threading
 import typing as _typing
 import uuid as _uuid
 
 import keycloak as _keycloak_python
 
+from . import _snapshot_cache, _util
+
 
 if _typing.TYPE_CHECKING:
     from . import _context
@@ -43,6 +47,23 @@ class _KeycloakCache:
     _uid2user: dict[str, KeycloakUserDict]
     _username2uid: dict[str, str]
     _email2uid: dict[str, str]
+    _hitobito_id2uid: dict[str, str]
+    _moss_email2uid: dict[str, str]
+
+    # True once all users of the realm were loaded (see
+    # KeycloakClient.prefetch_users) or taken from a snapshot.
+    complete: bool = False
+
+    # True if all users were loaded by this process, a cache miss then
+    # means that the user does not exist. A snapshot may lack users
+    # created by other processes since it was taken, so misses are
+    # looked up with the admin API.
+    misses_are_final: bool = False
+
+    # Number of user lookups by username, email, hitobitoId or
+    # mossEmail answered from the cache (hits) or not (misses).
+    hits: int = 0
+    misses: int = 0
 
     _gid2group: dict[str, KeycloakGroupDict]
     _gid2groupname: dict[str, str]
@@ -56,6 +77,8 @@ class _KeycloakCache:
         self._uid2user = {}
         self._username2uid = {}
         self._email2uid = {}
+        self._hitobito_id2uid = {}
+        self._moss_email2uid = {}
 
         self._groupname2gid = {}
         self._gid2groupname = {}
@@ -72,6 +95,22 @@ class _KeycloakCache:
         else:
             self._logger = logger
 
+    def to_snapshot(self) -> dict[str, _typing.Any]:
+        return {
+            "complete": self.complete,
+            "users": [
+                _filter_user_dict(user_dict, user_profile_metadata=False)
+                for user_dict in self._uid2user.values()
+            ],
+        }
+
+    def load_snapshot(self, data: dict[str, _typing.Any]) -> None:
+        # Users already in the cache are newer than the snapshot.
+        for user_dict in data.get("users", []):
+            if user_dict["id"] not in self._uid2user:
+                self.add_user(user_dict)
+        self.complete = self.complete or bool(data.get("complete"))
+
     def get_group_id(self, groupname: str) -> str | None:
         return self._groupname2gid.get(groupname)
 
@@ -139,6 +178,14 @@ class _KeycloakCache:
     def get_username(self, user_id: str) -> str | None:
         return self._uid2user.get(user_id, {}).get("username")
 
+    def __lookup(self, index: dict[str, str], key: str) -> str | None:
+        maybe_user_id = index.get(key)
+        if maybe_user_id:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return maybe_user_id
+
     def get_user_by_username(
         self,
         username: str,
@@ -147,7 +194,7 @@ class _KeycloakCache:
         user_profile_metadata: bool | None = None,
         omit_keys: _collections_abc.Iterable[str] | None = None,
     ) -> KeycloakUserDict | None:
-        maybe_user_id = self._username2uid.get(username)
+        maybe_user_id = self.__lookup(self._username2uid, username)
         if maybe_user_id:
             return self.get_user_by_id(
                 maybe_user_id,
@@ -166,7 +213,26 @@ class _KeycloakCache:
         user_profile_metadata: bool | None = None,
         omit_keys: _collections_abc.Iterable[str] | None = None,
     ) -> KeycloakUserDict | None:
-        maybe_user_id = self._email2uid.get(email)
+        maybe_user_id = self.__lookup(self._email2uid, _normalize_email_key(email))
+        if maybe_user_id:
+            return self.get_user_by_id(
+                maybe_user_id,
+                copy=copy,
+                user_profile_metadata=user_profile_metadata,
+                omit_keys=omit_keys,
+            )
+        else:
+            return None
+
+    def get_user_by_hitobito_id(
+        self,
+        hitobito_id: int | str,
+        *,
+        copy: bool = True,
+        user_profile_metadata: bool | None = None,
+        omit_keys: _collections_abc.Iterable[str] | None = None,
+    ) -> KeycloakUserDict | None:
+        maybe_user_id = self.__lookup(self._hitobito_id2uid, str(hitobito_id))
         if maybe_user_id:
             return self.get_user_by_id(
                 maybe_user_id,
@@ -177,6 +243,30 @@ class _KeycloakCache:
         else:
             return None
 
+    def get_user_by_moss_email(
+        self,
+        moss_email: str,
+        *,
+        copy: bool = True,
+        user_profile_metadata: bool | None = None,
+        omit_keys: _collections_abc.Iterable[str] | None = None,
+    ) -> KeycloakUserDict | None:
+        maybe_user_id = self.__lookup(
+            self._moss_email2uid, _normalize_email_key(moss_email)
+        )
+        if maybe_user_id:
+            return self.get_user_by_id(
+                maybe_user_id,
+                copy=copy,
+                user_profile_metadata=user_profile_metadata,
+                omit_keys=omit_keys,
+            )
+        else:
+            return None
+
+    def get_all_users(self) -> list[KeycloakUserDict]:
+        return list(self._uid2user.values())
+
     def get_user_by_id(
         self,
         user_id: str,
@@ -215,26 +305,36 @@ class _KeycloakCache:
             _LOGGER.debug(f"{self.__class__.__qualname__}.add_user(<{username}>)")
             if dict_diff := list(dictdiffer.diff(old_user, user_dict)):
                 _LOGGER.debug(f"  {dict_diff=}")
-            old_username = old_user["username"]
-            old_email = old_user["email"]
-            self._username2uid.pop(old_username, None)
-            self._email2uid.pop(old_email, None)
+            self.__remove_user_from_indexes(old_user)
 
         self._logger.debug(f"add_user {user_id=} {username=} {user_dict}")
         self._uid2user[user_id] = user_dict  # type: ignore
         if username:
             self._username2uid[username] = user_id
-        if email := user_dict.get("email"):
-            self._email2uid[email] = user_id
+        email_key, hitobito_id, moss_email_key = _user_index_keys(user_dict)
+        if email_key:
+            self._email2uid[email_key] = user_id
+        if hitobito_id:
+            self._hitobito_id2uid[hitobito_id] = user_id
+        if moss_email_key:
+            self._moss_email2uid[moss_email_key] = user_id
+
+    def __remove_user_from_indexes(self, user_dict: KeycloakUserDict | dict) -> None:
+        if username := user_dict.get("username"):
+            self._username2uid.pop(username, None)
+        email_key, hitobito_id, moss_email_key = _user_index_keys(user_dict)
+        if email_key:
+            self._email2uid.pop(email_key, None)
+        if hitobito_id:
+            self._hitobito_id2uid.pop(hitobito_id, None)
+        if moss_email_key:
+            self._moss_email2uid.pop(moss_email_key, None)
 
     def remove_user_by_id(self, user_id: str) -> None:
         _LOGGER.debug(f"{self.__class__.__qualname__}.delete_user_by_id({user_id!r})")
         maybe_user = self._uid2user.pop(user_id, None)
         if maybe_user:
-            if username := maybe_user.get("username"):
-                self._username2uid.pop(username, None)
-            if email := maybe_user.get("email"):
-                self._email2uid.pop(email, None)
+            self.__remove_user_from_indexes(maybe_user)
 
     def set_user_id_for_username(self, *, username: str, user_id: str) -> None:
         if user_dict := self._uid2user.get(user_id):
@@ -248,6 +348,15 @@ class _KeycloakCache:
 class KeycloakClient:
     _cache: _KeycloakCache
     _admin: _keycloak_python.KeycloakAdmin
+    _token_lock: _threading.Lock
+    _snapshot: _snapshot_cache.SnapshotState = _snapshot_cache.SnapshotState(
+        None, kind="keycloak", key=""
+    )
+
+    # Number of concurrent admin API requests used by bulk operations
+    # (update_users, add_users_to_group, disable_users). Keep this
+    # below the connection pool size of the requests session (10).
+    max_workers: int = 4
 
     def __init__(
         self,
@@ -257,8 +366,18 @@ class KeycloakClient:
         realm_name: str,
         user_realm_name: str,
         verify: bool = True,
+        max_workers: int | None = None,
+        snapshot_store: _snapshot_cache.SnapshotStore | None = None,
     ) -> None:
         self._cache = _KeycloakCache()
+        self._token_lock = _threading.Lock()
+        if max_workers is not None:
+            self.max_workers = max_workers
+        self._snapshot = _snapshot_cache.SnapshotState(
+            snapshot_store,
+            kind="keycloak",
+            key=f"{server_url}|{realm_name}|{user_realm_name}",
+        )
         self._admin = _keycloak_python.KeycloakAdmin(
             server_url=server_url,
             username=username,
@@ -269,9 +388,15 @@ class KeycloakClient:
         )
 
     def close(self):
+        if self._snapshot.dirty and self._cache.complete:
+            self._snapshot.save(self._cache.to_snapshot())
         if hasattr(self, "_admin"):
             del self._admin
 
+    def __use_snapshot(self) -> None:
+        if data := self._snapshot.load():
+            self._cache.load_snapshot(data)
+
     @classmethod
     def from_wsjrdp_context(
         cls, ctx: _context.WsjRdpContext, *, verify: bool = True
@@ -283,6 +408,7 @@ class KeycloakClient:
             realm_name=ctx.config.keycloak_realm,
             user_realm_name=ctx.config.keycloak_user_realm or ctx.config.keycloak_realm,
             verify=verify,
+            snapshot_store=ctx.snapshot_store(),
         )
 
     def get_realms(self) -> list[KeycloakRealmDict]:
@@ -373,15 +499,33 @@ class KeycloakClient:
 
         all_users = []
         for groupname in groupnames:  # noqa: PLR1704
-            group_id = self.get_group_id(groupname)
-            users = self._admin.get_group_members(group_id)
-            for user in users:
-                self._cache.add_user(user)
-            if enabled is not None:
-                users = [user for user in users if user.get("enabled") == enabled]
-            all_users.extend(users)
+            all_users.extend(self.iter_users_in_group(groupname, enabled=enabled))
         return all_users
 
+    def iter_users_in_group(
+        self,
+        groupname: str,
+        *,
+        enabled: bool | None = None,
+        attributes: _collections_abc.Mapping[str, str] | None = None,
+        omit_keys: _collections_abc.Iterable[str] | None = None,
+        page_size: int = 500,
+        add_to_cache: bool = True,
+    ) -> _collections_abc.Iterator[KeycloakUserDict]:
+        """Yield the members of *groupname* page by page.
+
+        See `iter_users` for the filter arguments.
+        """
+        group_id = self.get_group_id(groupname)
+        yield from self.__iter_user_pages(
+            lambda query: self._admin.get_group_members(group_id, query),
+            enabled=enabled,
+            attributes=attributes,
+            omit_keys=omit_keys,
+            page_size=page_size,
+            add_to_cache=add_to_cache,
+        )
+
     def get_user_id(self, username: str) -> str:
         user_id = self.get_user_id_or_none(username)
         if user_id is None:
@@ -390,8 +534,11 @@ class KeycloakClient:
             return user_id
 
     def get_user_id_or_none(self, username: str) -> str | None:
+        self.__use_snapshot()
         if user_id := self._cache.get_user_id(username):
             return user_id
+        elif self._cache.misses_are_final:
+            return None
         user_id = self._admin.get_user_id(username)
         if user_id:
             self._cache.set_user_id_for_username(username=username, user_id=user_id)
@@ -406,19 +553,76 @@ class KeycloakClient:
         dry_run: bool | None = None,
         audit: _collections_abc.Callable[[str | None], object] | None = None,
     ) -> None:
+        if ids := self.__prepare_group_membership(
+            "add_user_to_group", username, groupname, dry_run=dry_run, audit=audit
+        ):
+            self._admin.group_user_add(*ids)
+
+    def add_users_to_group(
+        self,
+        usernames: _collections_abc.Iterable[str],
+        groupname: str,
+        dry_run: bool | None = None,
+        audit: _collections_abc.Callable[[str | None], object] | None = None,
+    ) -> None:
+        """Add all *usernames* to *groupname* using concurrent requests."""
+        calls = []
+        for username in usernames:
+            if ids := self.__prepare_group_membership(
+                "add_user_to_group", username, groupname, dry_run=dry_run, audit=audit
+            ):
+                calls.append(
+                    (username, _functools.partial(self._admin.group_user_add, *ids))
+                )
+        self._run_concurrently(f"add_users_to_group(..., {groupname!r})", calls)
+
+    def remove_users_from_group(
+        self,
+        usernames: _collections_abc.Iterable[str],
+        groupname: str,
+        dry_run: bool | None = None,
+        audit: _collections_abc.Callable[[str | None], object] | None = None,
+    ) -> None:
+        """Remove all *usernames* from *groupname* using concurrent requests."""
+        calls = []
+        for username in usernames:
+            if ids := self.__prepare_group_membership(
+                "remove_user_from_group",
+                username,
+                groupname,
+                dry_run=dry_run,
+                audit=audit,
+            ):
+                calls.append(
+                    (username, _functools.partial(self._admin.group_user_remove, *ids))
+                )
+        self._run_concurrently(f"remove_users_from_group(..., {groupname!r})", calls)
+
+    def __prepare_group_membership(
+        self,
+        action: _typing.Literal["add_user_to_group", "remove_user_from_group"],
+        username: str,
+        groupname: str,
+        dry_run: bool | None = None,
+        audit: _collections_abc.Callable[[str | None], object] | None = None,
+    ) -> tuple[str, str] | None:
         user_id = self.get_user_id(username)
         group_id = self.get_group_id(groupname)
         cls_name = self.__class__.__qualname__
-        description = f"{cls_name}.add_user_to_group({username!r}, {groupname!r}, ...)"
+        description = f"{cls_name}.{action}({username!r}, {groupname!r}, ...)"
+        admin_method = (
+            "group_user_add" if action == "add_user_to_group" else "group_user_remove"
+        )
         if dry_run:
             _LOGGER.debug(
                 f"[dry-run] {description}"
-                f" :: skip call to keycloak_admin.group_user_add({user_id!r}, {group_id!r})"
+                f" :: skip call to keycloak_admin.{admin_method}({user_id!r}, {group_id!r})"
             )
+            return None
         else:
             audit(description) if audit else None
             _LOGGER.debug(f"{description}\n  {user_id=}\n  {group_id=}")
-            self._admin.group_user_add(user_id, group_id)
+            return user_id, group_id
 
     def create_user(
         self,
@@ -469,12 +673,25 @@ class KeycloakClient:
             )
             user_dict: KeycloakUserDict = payload.copy()  # type: ignore
             user_dict.setdefault("id", str(_uuid.uuid8()))
+            self._snapshot.mutated(dry_run=True)
             self._cache.add_user(user_dict)
             return user_dict
         else:
             audit(description) if audit else None
             _LOGGER.debug(f"{description}\n  {payload=}\n  {exist_ok=}")
-            user_id = self._admin.create_user(payload, exist_ok=exist_ok)
+            self._snapshot.mutated()
+            try:
+                user_id = self._admin.create_user(payload, exist_ok=exist_ok)
+            except _keycloak_python.KeycloakPostError as exc:
+                if exc.response_code == 409:
+                    # The user exists although the cache did not know
+                    # it, e.g. created by another process.
+                    _LOGGER.warning(
+                        f"{description} :: conflict, no longer trust the user cache"
+                    )
+                    self._cache.complete = False
+                    self._cache.misses_are_final = False
+                raise
             return self.get_user_by_id(user_id)
 
     def create_or_update_user(
@@ -607,6 +824,7 @@ class KeycloakClient:
         audit: _collections_abc.Callable[[str | None], object] | None = None,
         dry_run: bool | None = None,
     ) -> None:
+        self._snapshot.mutated(dry_run=bool(dry_run))
         self._cache.remove_user_by_id(user_id)
         if dry_run:
             _LOGGER.debug(
@@ -629,6 +847,8 @@ class KeycloakClient:
         omit_keys: _collections_abc.Iterable[str] | None = None,
         allow_cached: bool = False,
     ) -> KeycloakUserDict:
+        if allow_cached:
+            self.__use_snapshot()
         if allow_cached and (cached_user := self._cache.get_user_by_id(user_id)):
             return _filter_user_dict(
                 cached_user, user_profile_metadata, omit_keys=omit_keys
@@ -650,6 +870,8 @@ class KeycloakClient:
         omit_keys: _collections_abc.Iterable[str] | None = None,
         allow_cached: bool = False,
     ) -> KeycloakUserDict | None:
+        if allow_cached:
+            self.__use_snapshot()
         if allow_cached and (
             user_dict := self._cache.get_user_by_username(
                 username,
@@ -659,7 +881,11 @@ class KeycloakClient:
             )
         ):
             return user_dict
-        user_id = self.get_user_id(username)
+        elif allow_cached and self._cache.misses_are_final:
+            return None
+        user_id = self.get_user_id_or_none(username)
+        if user_id is None:
+            return None
         user_dict = self._admin.get_user(user_id, user_profile_metadata=True)
         if not user_dict:
             return None
@@ -699,6 +925,8 @@ class KeycloakClient:
     ) -> KeycloakUserDict | None:
         if not email:
             return None
+        if allow_cached:
+            self.__use_snapshot()
         if allow_cached and (
             user_dict := self._cache.get_user_by_email(
                 email,
@@ -708,11 +936,92 @@ class KeycloakClient:
             )
         ):
             return user_dict
+        elif allow_cached and self._cache.misses_are_final:
+            return None
         users_list = self._admin.get_users({"email": email})
+        return self.__single_user_or_none(
+            users_list,
+            f"{email=}",
+            user_profile_metadata=user_profile_metadata,
+            omit_keys=omit_keys,
+        )
+
+    def get_user_or_none_by_hitobito_id(
+        self,
+        hitobito_id: int | str,
+        *,
+        user_profile_metadata: bool | None = None,
+        omit_keys: _collections_abc.Iterable[str] | None = None,
+        allow_cached: bool = False,
+    ) -> KeycloakUserDict | None:
+        if allow_cached:
+            self.__use_snapshot()
+        if allow_cached and (
+            user_dict := self._cache.get_user_by_hitobito_id(
+                hitobito_id,
+                copy=True,
+                user_profile_metadata=user_profile_metadata,
+                omit_keys=omit_keys,
+            )
+        ):
+            return user_dict
+        elif allow_cached and self._cache.misses_are_final:
+            return None
+        users_list = self._admin.get_users(
+            {"q": f"hitobitoId:{hitobito_id}", "briefRepresentation": False}
+        )
+        return self.__single_user_or_none(
+            users_list,
+            f"{hitobito_id=}",
+            user_profile_metadata=user_profile_metadata,
+            omit_keys=omit_keys,
+        )
+
+    def get_user_or_none_by_moss_email(
+        self,
+        moss_email: str | None,
+        *,
+        user_profile_metadata: bool | None = None,
+        omit_keys: _collections_abc.Iterable[str] | None = None,
+        allow_cached: bool = False,
+    ) -> KeycloakUserDict | None:
+        if not moss_email:
+            return None
+        if allow_cached:
+            self.__use_snapshot()
+        if allow_cached and (
+            user_dict := self._cache.get_user_by_moss_email(
+                moss_email,
+                copy=True,
+                user_profile_metadata=user_profile_metadata,
+                omit_keys=omit_keys,
+            )
+        ):
+            return user_dict
+        elif allow_cached and self._cache.misses_are_final:
+            return None
+        users_list = self._admin.get_users(
+            {"q": f"mossEmail:{moss_email}", "briefRepresentation": False}
+        )
+        return self.__single_user_or_none(
+            users_list,
+            f"{moss_email=}",
+            user_profile_metadata=user_profile_metadata,
+            omit_keys=omit_keys,
+        )
+
+    def __single_user_or_none(
+        self,
+        users_list: list[KeycloakUserDict],
+        key_desc: str,
+        *,
+        user_profile_metadata: bool | None = None,
+        omit_keys: _collections_abc.Iterable[str] | None = None,
+    ) -> KeycloakUserDict | None:
         if not users_list:
             return None
         elif len(users_list) > 1:
-            err_msg = f"Found more than one user for {email=}:\n" + "\n".join(
+            err_msg = f"Found more than one user for {key_desc}:\n" + "\n".join(
                 f"  id={user_dict.get('id')} username={user_dict.get('username')} email={user_dict.get('email')}"
                 for user_dict in users_list
             )
@@ -725,19 +1034,123 @@ class KeycloakClient:
                 user_dict, user_profile_metadata, omit_keys=omit_keys
             )
 
+    def prefetch_users(self, *, page_size: int = 500, use_snapshot: bool = True) -> int:
+        """Load all users of the realm (with attributes) into the cache.
+
+        Users are fetched page by page using *first*/*max*.  Afterwards
+        lookups with ``allow_cached=True`` are answered from the cache
+        alone, a cache miss then means that there is no such user.
+
+        With *use_snapshot* a complete on-disk snapshot (see
+        `SnapshotStore`) is used instead of fetching the users.  Cache
+        misses are then still looked up with the admin API, since the
+        user may have been created after the snapshot was taken.
+
+        Returns the number of fetched users.
+        """
+        if use_snapshot:
+            self.__use_snapshot()
+            if self._cache.complete:
+                return 0
+        count = 0
+        for _ in self.iter_users(page_size=page_size):
+            count += 1
+        self._cache.complete = True
+        self._cache.misses_are_final = True
+        _LOGGER.debug(f"Prefetched {count} Keycloak users")
+        self._snapshot.save(self._cache.to_snapshot())
+        return count
+
+    @property
+    def all_users_cached(self) -> bool:
+        return self._cache.complete
+
+    @property
+    def cache_stats(self) -> dict[str, int]:
+        """Hits and misses of cached user lookups (``allow_cached=True``)."""
+        return {"hits": self._cache.hits, "misses": self._cache.misses}
+
     def get_user_list(
         self,
         *,
         omit_keys: _collections_abc.Iterable[str] | None = None,
         allow_cached: bool = True,
     ) -> list[KeycloakUserDict]:
-        user_list = self._admin.get_users()
-        for user in user_list:
-            self._cache.add_user(user)
-        return [
-            _filter_user_dict(user, user_profile_metadata=False, omit_keys=omit_keys)
-            for user in user_list
-        ]
+        if allow_cached:
+            self.__use_snapshot()
+        if allow_cached and self._cache.complete:
+            return [
+                _filter_user_dict(
+                    user, user_profile_metadata=False, omit_keys=omit_keys
+                )
+                for user in self._cache.get_all_users()
+            ]
+        else:
+            return list(self.iter_users(omit_keys=omit_keys))
+
+    def iter_users(
+        self,
+        *,
+        query: dict | None = None,
+        enabled: bool | None = None,
+        attributes: _collections_abc.Mapping[str, str] | None = None,
+        omit_keys: _collections_abc.Iterable[str] | None = None,
+        page_size: int = 500,
+        add_to_cache: bool = True,
+    ) -> _collections_abc.Iterator[KeycloakUserDict]:
+        """Yield the users of the realm page by page.
+
+        Pages of *page_size* users are requested with *first*/*max*
+        only when the previous page is consumed, so memory stays bounded
+        and the first users arrive before the whole realm is loaded.
+        *query* is passed on to Keycloak (e.g. ``{"search": "..."}``),
+        *enabled* and *attributes* (e.g. ``{"hitobitoId": "42"}``)
+        are checked for each user.  With ``add_to_cache=False`` the
+        users are not added to the cache.
+        """
+        yield from self.__iter_user_pages(
+            self._admin.get_users,
+            query=query,
+            enabled=enabled,
+            attributes=attributes,
+            omit_keys=omit_keys,
+            page_size=page_size,
+            add_to_cache=add_to_cache,
+        )
+
+    def __iter_user_pages(
+        self,
+        fetch_page: _collections_abc.Callable[[dict], list[KeycloakUserDict]],
+        *,
+        query: dict | None = None,
+        enabled: bool | None = None,
+        attributes: _collections_abc.Mapping[str, str] | None = None,
+        omit_keys: _collections_abc.Iterable[str] | None = None,
+        page_size: int = 500,
+        add_to_cache: bool = True,
+    ) -> _collections_abc.Iterator[KeycloakUserDict]:
+        if omit_keys is not None:
+            omit_keys = frozenset(omit_keys)
+        first = 0
+        while True:
+            users_page = fetch_page(
+                {
+                    **(query or {}),
+                    "first": first,
+                    "max": page_size,
+                    "briefRepresentation": False,
+                }
+            )
+            for user_dict in users_page:
+                if add_to_cache:
+                    self._cache.add_user(user_dict)
+                if _user_matches(user_dict, enabled=enabled, attributes=attributes):
+                    yield _filter_user_dict(
+                        user_dict, user_profile_metadata=False, omit_keys=omit_keys
+                    )
+            if len(users_page) < page_size:
+                return
+            first += len(users_page)
 
     def update_user(
         self,
@@ -749,6 +1162,83 @@ class KeycloakClient:
         audit: _collections_abc.Callable[[str | None], object] | None = None,
     ) -> None:
         """High-level user update. Merges with existing values."""
+        if update := self.__prepare_update_user(
+            username, payload, allow_cached=allow_cached, dry_run=dry_run, audit=audit
+        ):
+            self.__apply_update_user(*update)
+
+    def update_users(
+        self,
+        updates: _collections_abc.Iterable[tuple[str, dict[str, _typing.Any]]],
+        *,
+        allow_cached: bool = False,
+        dry_run: bool | None = None,
+        audit: _collections_abc.Callable[[str | None], object] | None = None,
+    ) -> None:
+        """Like `update_user` for many ``(username, payload)`` pairs.
+
+        Payloads are merged and audited in order, the resulting admin
+        API requests are sent concurrently. Unless *allow_cached* is
+        set, the current users are reloaded concurrently beforehand.
+        """
+        updates = list(updates)
+        if not allow_cached and not dry_run:
+            self.__reload_users({username for username, _ in updates})
+        calls = []
+        for username, payload in updates:
+            if update := self.__prepare_update_user(
+                username, payload, allow_cached=True, dry_run=dry_run, audit=audit
+            ):
+                calls.append(
+                    (username, _functools.partial(self.__apply_update_user, *update))
+                )
+        self._run_concurrently("update_users", calls)
+
+    def disable_users(
+        self,
+        usernames: _collections_abc.Iterable[str],
+        *,
+        dry_run: bool | None = None,
+        audit: _collections_abc.Callable[[str | None], object] | None = None,
+    ) -> None:
+        self.update_users(
+            ((username, {"enabled": False}) for username in usernames),
+            dry_run=dry_run,
+            audit=audit,
+        )
+
+    def __reload_users(self, usernames: _collections_abc.Iterable[str]) -> None:
+        def fetch(username: str) -> KeycloakUserDict:
+            user_id = self._cache.get_user_id(username) or self._admin.get_user_id(
+                username
+            )
+            if not user_id:
+                raise RuntimeError(f"Failed to get a user_id for {username=}")
+            return self._admin.get_user(user_id, user_profile_metadata=True)
+
+        user_dicts = self._run_concurrently(
+            "reload_users",
+            [(username, _functools.partial(fetch, username)) for username in usernames],
+        )
+        for user_dict in user_dicts:
+            self._cache.add_user(user_dict)
+
+    def __apply_update_user(self, user_id: str, new_payload: dict) -> None:
+        self._snapshot.mutated()
+        self._admin.update_user(user_id=user_id, payload=new_payload)
+        self._cache.add_user(
+            {k: v for k, v in new_payload.items() if k != "credentials"}
+        )
+
+    def __prepare_update_user(
+        self,
+        username: str,
+        payload: dict[str, _typing.Any],
+        *,
+        allow_cached: bool = False,
+        dry_run: bool | None = None,
+        audit: _collections_abc.Callable[[str | None], object] | None = None,
+    ) -> tuple[str, dict] | None:
         omit_keys = frozenset(["createdTimestamp"])
         dry_run = bool(dry_run)
 
@@ -793,7 +1283,37 @@ class KeycloakClient:
             )
             audit(description) if audit else None
             if new_payload:
-                self._admin.update_user(user_id=user_id, payload=new_payload)
+                return user_id, new_payload
+        return None
+
+    def _run_concurrently[T](
+        self,
+        description: str,
+        calls: _collections_abc.Sequence[tuple[str, _collections_abc.Callable[[], T]]],
+    ) -> list[T]:
+        """Run admin API *calls* given as ``(label, fn)`` on a thread pool.
+
+        See `wsjrdp2027._util.run_concurrently`.
+        """
+        return _util.run_concurrently(
+            description,
+            [
+                (label, _functools.partial(self.__call_with_fresh_token, fn))
+                for label, fn in calls
+            ],
+            max_workers=self.max_workers,
+            thread_name_prefix="keycloak",
+            logger=_LOGGER,
+        )
+
+    def __call_with_fresh_token[T](self, fn: _collections_abc.Callable[[], T]) -> T:
+        # The admin connection (and its requests session) is shared by
+        # all workers. Refresh an expiring token once under a lock
+        # instead of letting every worker refresh it on its own.
+        connection = self._admin.connection
+        with self._token_lock:
+            connection._refresh_if_required()
+        return fn()
 
 
 def _dictdiff_s(a: dict, b: dict, *, linesep: str = "\n  ") -> str:
@@ -867,12 +1387,48 @@ def _normalize_email(email: str) -> str:
     return email_addr
 
 
+def _normalize_email_key(email: str) -> str:
+    return email.strip().lower()
+
+
+def _user_index_keys(
+    user_dict: KeycloakUserDict | dict,
+) -> tuple[str | None, str | None, str | None]:
+    """Return the (email, hitobitoId, mossEmail) cache keys of a user."""
+    email = user_dict.get("email")
+    attributes = user_dict.get("attributes") or {}
+    hitobito_id = (attributes.get("hitobitoId") or [None])[0]
+    moss_email = (attributes.get("mossEmail") or [None])[0]
+    return (
+        _normalize_email_key(email) if email else None,
+        str(hitobito_id) if hitobito_id else None,
+        _normalize_email_key(moss_email) if moss_email else None,
+    )
+
+
 def _coalesce_username(
     email: str, username: str | None = None, payload: dict | None = None
 ) -> str:
     return username or (payload or {}).get("username") or _normalize_email(email)
 
 
+def _user_matches(
+    user_dict: dict | KeycloakUserDict,
+    *,
+    enabled: bool | None = None,
+    attributes: _collections_abc.Mapping[str, str] | None = None,
+) -> bool:
+    if enabled is not None and user_dict.get("enabled") != enabled:
+        return False
+    if attributes:
+        user_attributes = user_dict.get("attributes") or {}
+        return all(
+            str(value) in user_attributes.get(key, [])
+            for key, value in attributes.items()
+        )
+    return True
+
+
 def _filter_user_dict(
     user_dict: dict | KeycloakUserDict,
     user_profile_metadata: bool | None = None,
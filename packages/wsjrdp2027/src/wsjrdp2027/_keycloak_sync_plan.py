@@ -0,0 +1,459 @@
+"""Set-based reconciliation of Hitobito people with Keycloak users.
+
+:func:`compute_keycloak_sync_plan` joins a people DataFrame with a
+snapshot of all Keycloak users (see :func:`keycloak_users_dataframe`) on
+username, wsjrdp email and ``hitobitoId`` and returns a
+:class:`KeycloakSyncPlan` with the categorized changes.  The plan can be
+reviewed as a :class:`~wsjrdp2027.ReportTree` and applied using the bulk
+writers of :class:`~wsjrdp2027.WsjRdpKeycloakAdapter`.
+"""
+
+from __future__ import annotations
+
+import dataclasses as _dataclasses
+import logging as _logging
+import typing as _typing
+
+
+if _typing.TYPE_CHECKING:
+    import collections.abc as _collections_abc
+
+    import pandas as _pandas
+
+    from . import (
+        _context,
+        _forwarding_graph,
+        _keycloak_client,
+        _keycloak_wsjrdp_adapter,
+        _report_tree,
+    )
+
+
+_LOGGER = _logging.getLogger(__name__)
+
+
+KEYCLOAK_USERS_DATAFRAME_COLUMNS = [
+    "keycloak_id",
+    "keycloak_username",
+    "keycloak_email",
+    "keycloak_enabled",
+    "keycloak_hitobito_id",
+    "keycloak_moss_email",
+    "keycloak_goto",
+]
+
+
+def keycloak_users_dataframe(
+    users: _collections_abc.Iterable[_keycloak_client.KeycloakUserDict],
+) -> _pandas.DataFrame:
+    """Return a DataFrame with one row per Keycloak user.
+
+    >>> df = keycloak_users_dataframe(
+    ...     [{"id": "u1", "username": "a", "email": "A@x.de", "enabled": True,
+    ...       "attributes": {"hitobitoId": ["1"]}}]
+    ... )
+    >>> df.loc[0, ["keycloak_username", "keycloak_hitobito_id"]].tolist()
+    ['a', '1']
+    """
+    import pandas as _pandas
+
+    def first_attr(user, key):
+        return ((user.get("attributes") or {}).get(key) or [None])[0]
+
+    return _pandas.DataFrame(
+        [
+            (
+                user["id"],
+                user.get("username"),
+                user.get("email"),
+                bool(user.get("enabled", True)),
+                first_attr(user, "hitobitoId"),
+                first_attr(user, "mossEmail"),
+                user.get("goto"),
+            )
+            for user in users
+        ],
+        columns=KEYCLOAK_USERS_DATAFRAME_COLUMNS,
+        dtype=object,
+    )
+
+
+@_dataclasses.dataclass(kw_only=True)
+class KeycloakSyncPlan:
+    """Changes needed to bring Keycloak in line with Hitobito."""
+
+    keycloak_groupname: str | None = None
+    num_people: int = 0
+    num_keycloak_users: int = 0
+
+    create: list[dict] = _dataclasses.field(default_factory=list)
+    """People without Keycloak user (id, role_id_name, username, email, moss_email)."""
+
+    attribute_updates: list[dict] = _dataclasses.field(default_factory=list)
+    """Payloads for `WsjRdpKeycloakAdapter.update_users`."""
+
+    enable: list[str] = _dataclasses.field(default_factory=list)
+    disable: list[str] = _dataclasses.field(default_factory=list)
+    group_add: list[str] = _dataclasses.field(default_factory=list)
+    group_remove: list[str] = _dataclasses.field(default_factory=list)
+
+    additional_info_updates: list[dict] = _dataclasses.field(default_factory=list)
+    """Updates for `WsjRdpContext.update_people_additional_info`."""
+
+    errors: list[str] = _dataclasses.field(default_factory=list)
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(
+            self.create
+            or self.attribute_updates
+            or self.enable
+            or self.disable
+            or self.group_add
+            or self.group_remove
+            or self.additional_info_updates
+        )
+
+    def get_keycloak_updates(self) -> list[dict]:
+        return [
+            *self.attribute_updates,
+            *({"username": username, "enabled": True} for username in self.enable),
+            *({"username": username, "enabled": False} for username in self.disable),
+        ]
+
+    def get_report_tree(self) -> _report_tree.ReportTree:
+        from . import _report_tree
+
+        ReportNode = _report_tree.ReportNode
+
+        def category(label: str, leaves: _collections_abc.Iterable[str]):
+            leaves = list(leaves)
+            return ReportNode(
+                f"{label} — {len(leaves)}",
+                children=[ReportNode(leaf) for leaf in leaves],
+            )
+
+        group_suffix = (
+            f" ({self.keycloak_groupname})" if self.keycloak_groupname else ""
+        )
+        children = [
+            ReportNode(
+                *(_report_tree.ReportContent(e, kind="warning") for e in self.errors),
+                f"Errors — {len(self.errors)}",
+            )
+            if self.errors
+            else ReportNode("Errors — 0"),
+            category(
+                "Create Keycloak users",
+                [
+                    f"{c['role_id_name']}: {c['username']} <{c['email']}>"
+                    for c in self.create
+                ],
+            ),
+            category(
+                "Update Keycloak attributes",
+                [f"{u['username']}: {u['attributes']}" for u in self.attribute_updates],
+            ),
+            category("Enable Keycloak users", self.enable),
+            category("Disable Keycloak users", self.disable),
+            category(f"Add to group{group_suffix}", self.group_add),
+            category(f"Remove from group{group_suffix}", self.group_remove),
+            category(
+                "Update additional_info",
+                [
+                    f"id={u['id']} "
+                    + ", ".join(
+                        f"{k}: {v[0]!r} -> {v[1]!r}" for k, v in u.items() if k != "id"
+                    )
+                    for u in self.additional_info_updates
+                ],
+            ),
+        ]
+        root = ReportNode(
+            f"Keycloak sync plan: {self.num_people} people,"
+            f" {self.num_keycloak_users} Keycloak users",
+            children=children,
+        )
+        return _report_tree.ReportTree(root=root)
+
+    def get_description(self) -> str:
+        return self.get_report_tree().full_description()
+
+    def apply(
+        self,
+        ctx: _context.WsjRdpContext,
+        *,
+        keycloak_adapter: _keycloak_wsjrdp_adapter.WsjRdpKeycloakAdapter | None = None,
+        console_confirm: bool = True,
+    ) -> bool:
+        """Write the planned changes, except for user creation.
+
+        Returns `False` without changing anything if the plan has errors
+        or if the user does not confirm.
+        """
+        if self.errors:
+            for err in self.errors:
+                _LOGGER.error(err)
+            return False
+        if not self.has_changes:
+            _LOGGER.info("Keycloak sync plan: nothing to do")
+            return True
+        if console_confirm and not ctx.console_confirm(
+            f"{self.get_description()}\nApply Keycloak sync plan?"
+        ):
+            return False
+        if keycloak_adapter is None:
+            keycloak_adapter = ctx.keycloak()
+        if self.create:
+            _LOGGER.warning(
+                f"Keycloak sync plan: skip creation of {len(self.create)} users,"
+                " use sync_hitobito_keycloak.sync(create_missing_keycloak_user=True)"
+            )
+        ctx.update_people_additional_info(self.additional_info_updates)
+        keycloak_adapter.update_users(self.get_keycloak_updates())
+        if self.group_add and self.keycloak_groupname:
+            keycloak_adapter.add_users_to_group(self.group_add, self.keycloak_groupname)
+        if self.group_remove and self.keycloak_groupname:
+            keycloak_adapter.remove_users_from_group(
+                self.group_remove, self.keycloak_groupname
+            )
+        return True
+
+
+def compute_keycloak_sync_plan(
+    people_df: _pandas.DataFrame,
+    keycloak_users_df: _pandas.DataFrame,
+    *,
+    keycloak_groupname: str | None = None,
+    group_member_ids: _collections_abc.Collection[str] | None = None,
+    sync_enabled: bool = False,
+    prune_group: bool = False,
+    forwarding_graph: _forwarding_graph.ForwardingGraph | None = None,
+) -> KeycloakSyncPlan:
+    """Compare *people_df* with *keycloak_users_df* and plan the changes.
+
+    People are matched to Keycloak users by their expected Keycloak
+    username, then by wsjrdp email, then by the ``hitobitoId``
+    attribute.  Keys that are not unique in Keycloak are not used for
+    matching.
+
+    If *sync_enabled* is set, Keycloak users of deregistered people are
+    disabled and all others enabled.  If *group_member_ids* (Keycloak
+    ids of the members of *keycloak_groupname*) is given, matched users
+    missing from the group are added, and with *prune_group* members
+    without matching person are removed.
+
+    The ``*_email_goto`` entries of ``additional_info`` are expanded
+    with *forwarding_graph*, by default built from the ``keycloak_goto``
+    column.
+    """
+    people = _expected_people_frame(people_df)
+    users = keycloak_users_df.copy()
+    users["_username_key"] = _normalized(users["keycloak_username"])
+    users["_email_key"] = _normalized(users["keycloak_email"])
+    users["_hitobito_id_key"] = users["keycloak_hitobito_id"].astype("string")
+
+    def match(people_key: _pandas.Series, users_key: str) -> _pandas.Series:
+        lookup = users.dropna(subset=[users_key]).drop_duplicates(users_key, keep=False)
+        return people_key.map(lookup.set_index(users_key)["keycloak_id"])
+
+    by_username = match(_normalized(people["username_expected"]), "_username_key")
+    by_email = match(_normalized(people["wsjrdp_email"]), "_email_key")
+    by_hitobito_id = match(people["id"].astype("string"), "_hitobito_id_key")
+
+    plan = KeycloakSyncPlan(
+        keycloak_groupname=keycloak_groupname,
+        num_people=len(people),
+        num_keycloak_users=len(users),
+    )
+    errors: list[tuple[int, str]] = []
+
+    def add_errors(mask: _pandas.Series, fmt: _collections_abc.Callable) -> None:
+        errors.extend((idx, fmt(row)) for idx, row in people[mask].iterrows())
+
+    no_email = people["wsjrdp_email"].isna()
+    add_errors(no_email, lambda r: f"{r['role_id_name']} has no wsjrdp_email")
+    conflict = by_username.notna() & by_email.notna() & (by_username != by_email)
+    add_errors(
+        conflict,
+        lambda r: (
+            f"{r['role_id_name']}: Keycloak username {r['username_expected']!r}"
+            f" and email {r['wsjrdp_email']!r} belong to different users"
+        ),
+    )
+
+    people["keycloak_id"] = (
+        by_username.combine_first(by_email)
+        .combine_first(by_hitobito_id)
+        .where(~no_email & ~conflict)
+    )
+    matched = people["keycloak_id"].notna()
+    shared = matched & people["keycloak_id"].duplicated(keep=False)
+    add_errors(
+        shared,
+        lambda r: f"{r['role_id_name']}: Keycloak user shared with other people",
+    )
+    matched &= ~shared
+
+    df = people.join(
+        users.set_index("keycloak_id")[KEYCLOAK_USERS_DATAFRAME_COLUMNS[1:]],
+        on="keycloak_id",
+    )
+    unmatched = ~no_email & ~conflict & people["keycloak_id"].isna()
+    plan.create = [
+        {
+            "id": row["id"],
+            "role_id_name": row["role_id_name"],
+            "username": row["keycloak_username_info"] or row["wsjrdp_email"],
+            "email": row["wsjrdp_email"],
+            "moss_email": row["moss_email"],
+        }
+        for _, row in people[unmatched].iterrows()
+    ]
+
+    # Keycloak attributes
+    attribute_updates: dict[str, dict[str, list[str]]] = {}
+    for k_key, p_col, fix_if_lower_equal in [
+        ("mossEmail", "moss_email", True),
+        ("hitobitoId", "hitobito_id", False),
+    ]:
+        k_val = df[f"keycloak_{_snake(k_key)}"]
+        p_val = df[p_col]
+        add_errors(
+            matched & p_val.isna(),
+            lambda r, p_col=p_col: f"{r['role_id_name']}: Missing {p_col}",
+        )
+        to_set = matched & p_val.notna() & k_val.isna()
+        differs = matched & p_val.notna() & k_val.notna() & (k_val != p_val)
+        to_fix = differs & (k_val.str.lower() == p_val) & fix_if_lower_equal
+        add_errors(
+            differs & ~to_fix,
+            lambda r, k_key=k_key, k_val=k_val: (
+                f"{r['role_id_name']}: Unexpected Keycloak {k_key}={k_val[r.name]!r}"
+            ),
+        )
+        for username, value in df.loc[
+            to_set | to_fix, ["keycloak_username", p_col]
+        ].itertuples(index=False):
+            attribute_updates.setdefault(username, {})[k_key] = [str(value)]
+    plan.attribute_updates = [
+        {"username": username, "attributes": attributes}
+        for username, attributes in attribute_updates.items()
+    ]
+
+    # additional_info
+    info_updates: dict[int, dict] = {}
+    for key in [
+        "keycloak_username",
+        "wsjrdp_email",
+        "moss_email",
+        "wsjrdp_email_is_mailbox",
+    ]:
+        values = df[key]
+        has_key = df["additional_info"].map(lambda d, key=key: key in d)
+        mask = matched & ~has_key & values.notna()
+        for person_id, value in zip(df.loc[mask, "id"], values[mask], strict=True):
+            info_updates.setdefault(person_id, {"id": person_id})[key] = [None, value]
+    if forwarding_graph is None:
+        from ._forwarding_graph import ForwardingGraph
+
+        forwarding_graph = ForwardingGraph(
+            (email, goto)
+            for email, goto in zip(
+                users["keycloak_email"], users["keycloak_goto"], strict=True
+            )
+            if isinstance(email, str) and isinstance(goto, str) and goto
+        )
+    for key, col in [
+        ("moss_email_goto", "moss_email"),
+        ("wsjrdp_email_goto", "wsjrdp_email"),
+    ]:
+        for person_id, email, info in df.loc[
+            matched & df[col].notna(), ["id", col, "additional_info"]
+        ].itertuples(index=False):
+            goto_list = forwarding_graph.expand(email)
+            old_goto_list = info.get(key)
+            if goto_list and goto_list != old_goto_list:
+                info_updates.setdefault(person_id, {"id": person_id})[key] = [
+                    old_goto_list,
+                    goto_list,
+                ]
+    plan.additional_info_updates = list(info_updates.values())
+
+    # enabled state
+    if sync_enabled:
+        deregistered = df["status"] == "deregistered"
+        enabled = df["keycloak_enabled"].astype(bool)
+        plan.disable = list(
+            df.loc[matched & deregistered & enabled, "keycloak_username"]
+        )
+        plan.enable = list(
+            df.loc[matched & ~deregistered & ~enabled, "keycloak_username"]
+        )
+
+    # group membership
+    if keycloak_groupname and group_member_ids is not None:
+        member_ids = set(group_member_ids)
+        in_group = df["keycloak_id"].isin(member_ids)
+        plan.group_add = list(df.loc[matched & ~in_group, "keycloak_username"])
+        if prune_group:
+            orphans = users["keycloak_id"].isin(member_ids) & ~users[
+                "keycloak_id"
+            ].isin(set(df.loc[matched, "keycloak_id"]))
+            plan.group_remove = list(users.loc[orphans, "keycloak_username"])
+
+    plan.errors = [msg for _, msg in sorted(errors, key=lambda e: e[0])]
+    return plan
+
+
+def _expected_people_frame(people_df: _pandas.DataFrame) -> _pandas.DataFrame:
+    """Per person: ids, current additional_info and expected Keycloak values.
+
+    The expected values depend on role specific rules in
+    `Person`, everything else is taken from *people_df* as is.
+    """
+    import pandas as _pandas
+
+    from ._models import person as _person
+
+    expected = [
+        (
+            p.keycloak_username,
+            p.get_keycloak_username_expected(),
+            p.wsjrdp_email,
+            p.moss_email,
+            p.wsjrdp_email_should_be_mailbox(),
+        )
+        for p in _person.iter_people(people_df)
+    ]
+    people = _pandas.DataFrame(
+        expected,
+        columns=[
+            "keycloak_username_info",
+            "username_expected",
+            "wsjrdp_email",
+            "moss_email",
+            "wsjrdp_email_is_mailbox",
+        ],
+        dtype=object,
+    )
+    people.insert(0, "id", people_df["id"].to_numpy())
+    people.insert(1, "role_id_name", people_df["role_id_name"].to_numpy())
+    people.insert(2, "status", people_df["status"].to_numpy())
+    people["additional_info"] = [info or {} for info in people_df["additional_info"]]
+    people["hitobito_id"] = people["id"].astype(str)
+    return people
+
+
+def _normalized(emails: _pandas.Series) -> _pandas.Series:
+    return emails.astype("string").str.strip().str.lower()
+
+
+def _snake(key: str) -> str:
+    """
+    >>> _snake("mossEmail"), _snake("hitobitoId")
+    ('moss_email', 'hitobito_id')
+    """
+    import re
+
+    return re.sub(r"(?<!^)([A-Z])", r"_\1", key).lower()
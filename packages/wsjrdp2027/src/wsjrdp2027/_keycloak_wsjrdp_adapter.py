@@ -44,6 +44,7 @@ class WsjRdpKeycloakAdapter:
             realm_name=config.keycloak_realm,
             user_realm_name=config.keycloak_user_realm or config.keycloak_realm,
             verify=verify,
+            snapshot_store=context.snapshot_store(),
         )
 
     def close(self):
@@ -81,6 +82,36 @@ class WsjRdpKeycloakAdapter:
             audit=lambda s: self.__audit("add_user_to_group", s),
         )
 
+    def add_users_to_group(
+        self,
+        usernames: _collections_abc.Iterable[str],
+        groupname: str,
+        dry_run: bool | None = None,
+    ) -> None:
+        if dry_run is None:
+            dry_run = self.dry_run
+        self._client.add_users_to_group(
+            usernames,
+            groupname,
+            dry_run=dry_run,
+            audit=lambda s: self.__audit("add_user_to_group", s),
+        )
+
+    def remove_users_from_group(
+        self,
+        usernames: _collections_abc.Iterable[str],
+        groupname: str,
+        dry_run: bool | None = None,
+    ) -> None:
+        if dry_run is None:
+            dry_run = self.dry_run
+        self._client.remove_users_from_group(
+            usernames,
+            groupname,
+            dry_run=dry_run,
+            audit=lambda s: self.__audit("remove_user_from_group", s),
+        )
+
     def create_user(
         self,
         email: str,
@@ -175,6 +206,17 @@ class WsjRdpKeycloakAdapter:
             audit=lambda s: self.__audit("enable_user", s),
         )
 
+    def disable_users(
+        self, usernames: _collections_abc.Iterable[str], dry_run: bool | None = None
+    ) -> None:
+        if dry_run is None:
+            dry_run = self.dry_run
+        self._client.disable_users(
+            usernames,
+            dry_run=dry_run,
+            audit=lambda s: self.__audit("disable_user", s),
+        )
+
     def delete_user_by_username(
         self,
         username: str,
@@ -228,9 +270,13 @@ class WsjRdpKeycloakAdapter:
             if not _util.console_confirm("Update Keycloak users?"):
                 _LOGGER.info("!! Skipped updates to Keycloak users")
                 return
-        for update in updates:
-            username = update["username"]
-            self.update_user(username, update, dry_run=dry_run)
+        if dry_run is None:
+            dry_run = self.dry_run
+        self._client.update_users(
+            ((update["username"], update) for update in updates),
+            dry_run=dry_run,
+            audit=lambda s: self.__audit("update_user", s),
+        )
 
     def __audit(self, action, description):
         self._ctx.require_approval_to_run_in_prod(
@@ -249,6 +295,23 @@ class WsjRdpKeycloakAdapter:
     ) -> list[_keycloak_client.KeycloakUserDict]:
         return self._client.get_users_in_group(groupname, enabled=enabled)
 
+    def iter_users_in_group(
+        self,
+        groupname: str,
+        *,
+        enabled: bool | None = None,
+        attributes: _collections_abc.Mapping[str, str] | None = None,
+        page_size: int = 500,
+        add_to_cache: bool = True,
+    ) -> _collections_abc.Iterator[_keycloak_client.KeycloakUserDict]:
+        return self._client.iter_users_in_group(
+            groupname,
+            enabled=enabled,
+            attributes=attributes,
+            page_size=page_size,
+            add_to_cache=add_to_cache,
+        )
+
     def get_user_by_username(
         self,
         username: str,
@@ -317,6 +380,51 @@ class WsjRdpKeycloakAdapter:
         else:
             raise RuntimeError(f"Found no keycloak user for {email=}")
 
+    def get_user_or_none_by_hitobito_id(
+        self,
+        hitobito_id: int | str,
+        *,
+        allow_cached: bool = False,
+        user_profile_metadata: bool | None = None,
+        omit_keys: _collections_abc.Iterable[str] | None = None,
+    ) -> _keycloak_client.KeycloakUserDict | None:
+        return self._client.get_user_or_none_by_hitobito_id(
+            hitobito_id,
+            allow_cached=allow_cached,
+            user_profile_metadata=user_profile_metadata,
+            omit_keys=omit_keys,
+        )
+
+    def get_user_or_none_by_moss_email(
+        self,
+        moss_email: str | None,
+        *,
+        allow_cached: bool = False,
+        user_profile_metadata: bool | None = None,
+        omit_keys: _collections_abc.Iterable[str] | None = None,
+    ) -> _keycloak_client.KeycloakUserDict | None:
+        return self._client.get_user_or_none_by_moss_email(
+            moss_email,
+            allow_cached=allow_cached,
+            user_profile_metadata=user_profile_metadata,
+            omit_keys=omit_keys,
+        )
+
+    def prefetch_users(self, *, force: bool = False, page_size: int = 500) -> int:
+        """Load all Keycloak users into the client cache.
+
+        Does nothing if all users are already cached, unless *force*
+        is set.  Without *force* a fresh on-disk snapshot is used if
+        configured.  Returns the number of fetched users.
+        """
+        if self._client.all_users_cached and not force:
+            return 0
+        return self._client.prefetch_users(page_size=page_size, use_snapshot=not force)
+
+    @property
+    def cache_stats(self) -> dict[str, int]:
+        return self._client.cache_stats
+
     def get_user_list(
         self,
         *,
@@ -328,6 +436,23 @@ class WsjRdpKeycloakAdapter:
             allow_cached=allow_cached,
         )
 
+    def iter_users(
+        self,
+        *,
+        enabled: bool | None = None,
+        attributes: _collections_abc.Mapping[str, str] | None = None,
+        omit_keys: _collections_abc.Iterable[str] | None = None,
+        page_size: int = 500,
+        add_to_cache: bool = True,
+    ) -> _collections_abc.Iterator[_keycloak_client.KeycloakUserDict]:
+        return self._client.iter_users(
+            enabled=enabled,
+            attributes=attributes,
+            omit_keys=omit_keys,
+            page_size=page_size,
+            add_to_cache=add_to_cache,
+        )
+
     def get_user_for_person_or_none(
         self,
         person: _person.Person,
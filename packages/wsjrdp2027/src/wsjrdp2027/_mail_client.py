@@ -33,6 +33,7 @@ class MailClient:
 
     _logger: _logging.Logger | _logging.LoggerAdapter = _LOGGER
     _exit_stack: _contextlib.ExitStack
+    _smtp_exit_stack: _contextlib.ExitStack | None = None
     _smtp: _smtplib.SMTP | None = None
     _imap: _imaplib.IMAP4 | None = None
     _imap_has_sent_mailbox: bool | None = None
@@ -60,6 +61,10 @@ class MailClient:
     def config(self) -> _mail_config.WsjRdpMailConfig:
         return self._config
 
+    @property
+    def dry_run(self) -> bool:
+        return self._dry_run
+
     def __smtp_connect(self, exit_stack: _contextlib.ExitStack | None) -> _smtplib.SMTP:
         import smtplib
 
@@ -122,7 +127,10 @@ class MailClient:
             self._imap = None
             self._smtp = None
         else:
-            self._smtp = self.__smtp_connect(self._exit_stack)
+            self._smtp_exit_stack = self._exit_stack.enter_context(
+                _contextlib.ExitStack()
+            )
+            self._smtp = self.__smtp_connect(self._smtp_exit_stack)
             self._logger.info("config.has_imap: %s", self._config.has_imap)
             if self._config.has_imap:
                 self._logger.info("IMAP connect")
@@ -131,11 +139,32 @@ class MailClient:
 
     def __exit__(self, *args):
         self._smtp = None
+        self._smtp_exit_stack = None
         self._imap = None
         self._imap_has_sent_mailbox = None
         self._imap_sent_mailbox = None
         self._exit_stack.__exit__(*args)
 
+    def reconnect_smtp(self) -> None:
+        """Close the current SMTP session (if any) and connect again.
+
+        Errors while closing the old session are logged and ignored,
+        e.g. if the server already dropped the connection.
+        """
+        if self._dry_run:
+            return
+        if (smtp_exit_stack := self._smtp_exit_stack) is not None:
+            self._smtp = None
+            try:
+                smtp_exit_stack.close()
+            except Exception as exc:
+                self._logger.warning("Failed to close SMTP session: %s", str(exc))
+        else:
+            smtp_exit_stack = self._exit_stack.enter_context(_contextlib.ExitStack())
+            self._smtp_exit_stack = smtp_exit_stack
+        self._logger.info("Reconnect to SMTP server")
+        self._smtp = self.__smtp_connect(smtp_exit_stack)
+
     def get_default_email_policy(self) -> _email_policy.EmailPolicy:
         import email.policy
 
@@ -149,15 +178,25 @@ class MailClient:
         msg: _email_message.EmailMessage | _batch.PreparedEmailMessage,
         *,
         from_addr: str | None = None,
+        to_addrs: _collections_abc.Sequence[str] | None = None,
+        imap_store: bool = True,
         dry_run: bool | None = None,
     ) -> tuple:
         """Send *msg* over SMTP and stores it in the Sent mailbox.
 
+        The message is serialized only once (reusing
+        `PreparedEmailMessage.eml` if possible) and the same bytes
+        are used for SMTP and IMAP.
+
         Args:
           msg: The message to send.
           from_addr: The *from_addr* to be used for sending over
             SMTP. If not set, the envelope from address is extracted
             from *msg*.
+          to_addrs: The envelope recipients. If not set, they are
+            extracted from *msg* using `get_to_addrs`.
+          imap_store: Whether to store the message in the Sent
+            mailbox (if IMAP is configured).
         """
         import copy
         import email.utils
@@ -176,10 +215,10 @@ class MailClient:
                 err_msg = "Cannot send message: msg.message is None"
                 self._logger.error(err_msg)
                 raise RuntimeError(err_msg)
-            email_msg_bytes = msg.eml
+            email_msg_bytes = msg.eml if "Date" in email_msg else None
         else:
             email_msg = msg
-            email_msg_bytes = msg.as_bytes()
+            email_msg_bytes = None
         if "Date" in email_msg:
             email_date = email.utils.parsedate_to_datetime(email_msg["Date"])
             self._logger.debug("Use existing header 'Date: %s'", email_msg["Date"])
@@ -206,23 +245,45 @@ class MailClient:
             else:
                 self._confirm_count += 1
 
-        to_addrs = get_to_addrs(email_msg)
+        if to_addrs is None:
+            to_addrs = get_to_addrs(email_msg)
+        else:
+            to_addrs = list(to_addrs)
         if not to_addrs:
             self._logger.info("No recipients: Skipped")
             return None, None
+        if not from_addr:
+            from_addr = get_from_addr(email_msg)
+        if email_msg_bytes is None:
+            email_msg_bytes = message_as_bytes(email_msg)
         smtp_result = self.__smtp_send_message(
-            email_msg, from_addr=from_addr, to_addrs=to_addrs
+            email_msg,
+            email_msg_bytes,
+            from_addr=from_addr,
+            to_addrs=to_addrs,
         )
-        imap_result = self.__imap_store_as_sent(email_msg_bytes, email_date=email_date)
+        if imap_store:
+            imap_result = self.__imap_store_as_sent(
+                email_msg_bytes, email_date=email_date
+            )
+        else:
+            imap_result = None
         return smtp_result, imap_result
 
-    def __smtp_send_message(self, msg, /, *, from_addr, to_addrs):
+    def __smtp_send_message(self, msg, msg_bytes, /, *, from_addr, to_addrs):
         assert self._smtp
 
         try:
-            smtp_result = self._smtp.send_message(
-                msg, from_addr=from_addr, to_addrs=to_addrs
-            )
+            if _is_ascii_addrs(from_addr, *to_addrs):
+                smtp_result = self._smtp.sendmail(
+                    from_addr, to_addrs, strip_bcc_headers(msg_bytes)
+                )
+            else:
+                # SMTPUTF8 needs a re-serialization with utf8=True,
+                # which smtplib takes care of.
+                smtp_result = self._smtp.send_message(
+                    msg, from_addr=from_addr, to_addrs=to_addrs
+                )
         except Exception as exc:
             self.__report_smtp_send(
                 msg=msg,
@@ -247,7 +308,7 @@ class MailClient:
         smtp_result = smtp_result or {}
         self._logger.log(
             log_level,
-            "SMTP send_message(..., from_addr=%r, to_addrs=%r)",
+            "SMTP sendmail(%r, %r, ...)",
             from_addr,
             to_addrs,
         )
@@ -344,6 +405,69 @@ def get_to_addrs(msg: _email_message.EmailMessage) -> list[str]:
     return to_addrs
 
 
+def get_from_addr(msg: _email_message.EmailMessage) -> str:
+    """Return the envelope from address of *msg* (like `smtplib`)."""
+    import email.utils
+
+    if "Resent-Date" in msg:
+        sender = msg["Resent-Sender"] or msg["Resent-From"]
+    else:
+        sender = msg["Sender"] or msg["From"]
+    if not sender:
+        return ""
+    return email.utils.getaddresses([str(sender)])[0][1]
+
+
+def message_as_bytes(
+    msg: _email_message.EmailMessage,
+    *,
+    policy: _email_policy.Policy | None = None,
+) -> bytes:
+    """Serialize *msg* into the bytes used for SMTP, IMAP and eml files.
+
+    Uses the policy of *msg* with ``\\r\\n`` line separators if
+    *policy* is not given. The result is what `smtplib.SMTP.send_message`
+    would put on the wire (including ``Bcc`` headers, see
+    `strip_bcc_headers`).
+    """
+    import email.generator
+    import io
+
+    if policy is None:
+        policy = msg.policy
+    if policy.linesep != "\r\n":
+        policy = policy.clone(linesep="\r\n")
+    buf = io.BytesIO()
+    gen = email.generator.BytesGenerator(buf, mangle_from_=False, policy=policy)
+    gen.flatten(msg)
+    return buf.getvalue()
+
+
+_BCC_HEADER_RE = _re.compile(
+    rb"^(?:Resent-)?Bcc:.*?\r?\n(?:[ \t].*?\r?\n)*", _re.IGNORECASE | _re.MULTILINE
+)
+
+
+def strip_bcc_headers(msg_bytes: bytes) -> bytes:
+    """Remove ``Bcc`` and ``Resent-Bcc`` headers from serialized message.
+
+    Only the header section of *msg_bytes* is touched, the body is
+    passed on as is.
+
+    >>> strip_bcc_headers(b"To: a@x\\r\\nBcc: b@x,\\r\\n c@x\\r\\nSubject: Bcc:\\r\\n\\r\\nBcc: d@x")
+    b'To: a@x\\r\\nSubject: Bcc:\\r\\n\\r\\nBcc: d@x'
+    """
+    headers, sep, body = msg_bytes.partition(b"\r\n\r\n")
+    if not sep:
+        headers, sep, body = msg_bytes.partition(b"\n\n")
+    headers = _BCC_HEADER_RE.sub(b"", headers + sep[: len(sep) // 2])
+    return headers + sep[len(sep) // 2 :] + body
+
+
+def _is_ascii_addrs(*addrs: str) -> bool:
+    return all(addr.isascii() for addr in addrs if addr)
+
+
 # ==============================================================================
 # IMAP4
 # ==============================================================================
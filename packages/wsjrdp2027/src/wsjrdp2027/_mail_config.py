@@ -20,6 +20,18 @@ class WsjRdpMailConfig:
     email_from: str | None = None
     from_addr: str | None = None
 
+    # Sending limits of the mail provider (`None` means unlimited),
+    # see `_mail_scheduler.MailSendScheduler`.
+    max_messages_per_minute: float | None = None
+    max_messages_per_hour: float | None = None
+    max_recipients_per_message: int | None = None
+
+    # Retries for transient SMTP errors (e.g. 421, 451) with
+    # exponential backoff starting at *send_retry_delay* seconds.
+    max_send_retries: int = 5
+    send_retry_delay: float = 5.0
+    send_retry_max_delay: float = 300.0
+
     def __post_init__(self) -> None:
         if self.email_from and not self.from_addr:
             import email.utils
@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import collections.abc as _collections_abc
+import datetime as _datetime
+import logging as _logging
+import time as _time
+import typing as _typing
+
+
+if _typing.TYPE_CHECKING:
+    import email.message as _email_message
+
+    from . import _batch, _mail_client
+
+
+__all__ = [
+    "MailSendScheduler",
+    "TokenBucket",
+]
+
+
+_LOGGER = _logging.getLogger(__name__)
+
+
+# SMTP reply codes after which the server has closed (or is about to
+# close) the connection.
+_RECONNECT_SMTP_CODES = frozenset([421])
+
+
+class TokenBucket:
+    """Token bucket refilled with *rate* tokens per second.
+
+    The bucket holds at most *capacity* tokens and starts full.
+
+    >>> now = [0.0]
+    >>> bucket = TokenBucket(rate=1.0, capacity=2, clock=lambda: now[0])
+    >>> bucket.take(), bucket.take(), bucket.wait_time()
+    (None, None, 1.0)
+    >>> now[0] = 0.5
+    >>> bucket.wait_time()
+    0.5
+    """
+
+    __slots__ = ("_capacity", "_clock", "_rate", "_tokens", "_updated")
+
+    def __init__(
+        self,
+        *,
+        rate: float,
+        capacity: float,
+        clock: _collections_abc.Callable[[], float] = _time.monotonic,
+    ) -> None:
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+        self._rate = float(rate)
+        self._capacity = float(capacity)
+        self._clock = clock
+        self._tokens = self._capacity
+        self._updated = clock()
+
+    @classmethod
+    def per_period(
+        cls,
+        limit: float,
+        period: float,
+        *,
+        clock: _collections_abc.Callable[[], float] = _time.monotonic,
+    ) -> _typing.Self:
+        """Bucket allowing *limit* tokens per *period* seconds."""
+        return cls(rate=limit / period, capacity=limit, clock=clock)
+
+    def __refill(self) -> None:
+        now = self._clock()
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self._capacity, self._tokens + elapsed * self._rate)
+        self._updated = now
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """Return the seconds until *tokens* tokens are available."""
+        self.__refill()
+        missing = min(tokens, self._capacity) - self._tokens
+        return max(0.0, missing / self._rate)
+
+    def take(self, tokens: float = 1.0) -> None:
+        """Remove *tokens* tokens (the bucket may go negative)."""
+        self.__refill()
+        self._tokens -= tokens
+
+
+class MailSendScheduler:
+    """Send messages through a `MailClient` within the provider limits.
+
+    The limits are read from the `WsjRdpMailConfig` of the client
+    (``max_messages_per_minute``, ``max_messages_per_hour`` and
+    ``max_recipients_per_message``). Every SMTP transaction takes one
+    token from each bucket. Messages with more envelope recipients
+    than allowed are sent in several transactions.
+
+    Transient SMTP errors (4xx replies, dropped connections) are
+    retried with exponential backoff. After a ``421`` reply or a
+    dropped connection the SMTP session is reconnected.
+
+    The time spent waiting for the rate limit is accumulated in
+    `throttled_seconds`, the time spent in retry backoff in
+    `backoff_seconds`.
+    """
+
+    _mail_client: _mail_client.MailClient
+    _buckets: list[TokenBucket]
+    _sleep: _collections_abc.Callable[[float], None]
+    _clock: _collections_abc.Callable[[], float]
+    _start_time: float | None = None
+
+    messages_sent: int = 0
+    transactions: int = 0
+    retries: int = 0
+    reconnects: int = 0
+    throttled_seconds: float = 0.0
+    backoff_seconds: float = 0.0
+
+    def __init__(
+        self,
+        mail_client: _mail_client.MailClient,
+        /,
+        *,
+        sleep: _collections_abc.Callable[[float], None] = _time.sleep,
+        clock: _collections_abc.Callable[[], float] = _time.monotonic,
+        logger: _logging.Logger | _logging.LoggerAdapter | None = None,
+    ) -> None:
+        self._mail_client = mail_client
+        self._sleep = sleep
+        self._clock = clock
+        self._logger = logger if logger is not None else _LOGGER
+        config = mail_client.config
+        self._buckets = []
+        if config.max_messages_per_minute:
+            self._buckets.append(
+                TokenBucket.per_period(config.max_messages_per_minute, 60, clock=clock)
+            )
+        if config.max_messages_per_hour:
+            self._buckets.append(
+                TokenBucket.per_period(config.max_messages_per_hour, 3600, clock=clock)
+            )
+
+    @property
+    def config(self):
+        return self._mail_client.config
+
+    def send(
+        self,
+        msg: _email_message.EmailMessage | _batch.PreparedEmailMessage,
+        /,
+        *,
+        from_addr: str | None = None,
+    ) -> list[tuple]:
+        """Send *msg* and return the results of `MailClient.send_message`."""
+        from . import _batch, _mail_client
+
+        if self._start_time is None:
+            self._start_time = self._clock()
+        if self._mail_client.dry_run:
+            result = self._mail_client.send_message(msg, from_addr=from_addr)
+            self.messages_sent += 1
+            return [result]
+
+        email_msg = msg.message if isinstance(msg, _batch.PreparedEmailMessage) else msg
+        if email_msg is None:
+            raise RuntimeError("Cannot send message: msg.message is None")
+        to_addrs = _mail_client.get_to_addrs(email_msg)
+        chunks = _chunked(to_addrs, self.config.max_recipients_per_message)
+        results = []
+        for idx, chunk in enumerate(chunks):
+            if len(chunks) > 1:
+                self._logger.debug(
+                    "  send to recipients chunk %s/%s", idx + 1, len(chunks)
+                )
+            results.append(
+                self.__send_with_retry(
+                    msg,
+                    from_addr=from_addr,
+                    to_addrs=chunk,
+                    imap_store=(idx == len(chunks) - 1),
+                )
+            )
+        self.messages_sent += 1
+        return results
+
+    def __send_with_retry(
+        self,
+        msg: _email_message.EmailMessage | _batch.PreparedEmailMessage,
+        /,
+        *,
+        from_addr: str | None,
+        to_addrs: list[str],
+        imap_store: bool,
+    ) -> tuple:
+        attempt = 0
+        needs_reconnect = False
+        while True:
+            try:
+                if needs_reconnect:
+                    self.reconnects += 1
+                    self._mail_client.reconnect_smtp()
+                    needs_reconnect = False
+                self.__acquire()
+                self.transactions += 1
+                result = self._mail_client.send_message(
+                    msg, from_addr=from_addr, to_addrs=to_addrs, imap_store=imap_store
+                )
+            except Exception as exc:
+                is_transient, needs_reconnect = _classify_smtp_exception(exc)
+                if not is_transient or attempt >= self.config.max_send_retries:
+                    raise
+                attempt += 1
+                self.__backoff(attempt, exc)
+                continue
+            smtp_result = result[0] or {}
+            deferred = [
+                addr for addr, (code, _) in smtp_result.items() if 400 <= code < 500
+            ]
+            if not deferred or attempt >= self.config.max_send_retries:
+                return result
+            attempt += 1
+            self.__backoff(attempt, f"{len(deferred)} recipient(s) temporarily refused")
+            to_addrs = deferred
+            imap_store = False
+
+    def __acquire(self) -> None:
+        while self._buckets:
+            delay = max(b.wait_time() for b in self._buckets)
+            if delay <= 0:
+                break
+            self._logger.debug("  rate limit: wait %.1f seconds", delay)
+            self.throttled_seconds += delay
+            self._sleep(delay)
+        for bucket in self._buckets:
+            bucket.take()
+
+    def __backoff(self, attempt: int, reason: Exception | str) -> None:
+        config = self.config
+        delay = min(
+            config.send_retry_delay * 2 ** (attempt - 1), config.send_retry_max_delay
+        )
+        self.retries += 1
+        self._logger.warning(
+            "  transient SMTP error (%s), retry %s/%s in %g seconds",
+            str(reason),
+            attempt,
+            config.max_send_retries,
+            delay,
+        )
+        self.backoff_seconds += delay
+        self._sleep(delay)
+
+    def progress_message(self, count: int, size: int) -> str:
+        """Return the progress prefix for message *count* of *size*.
+
+        Contains the throughput of the messages sent so far and an
+        estimate for the remaining time.
+        """
+        pcnt = (count / size) * 100.0 if size else 100.0
+        message = f"{count}/{size} ({pcnt:.1f}%)"
+        if self._start_time is None or not self.messages_sent:
+            return message
+        elapsed = self._clock() - self._start_time
+        if elapsed <= 0:
+            return message
+        rate = self.messages_sent / elapsed
+        remaining = max(0, size - count + 1)
+        eta = _datetime.timedelta(seconds=round(remaining / rate))
+        return f"{message} {rate * 60:.1f} msg/min, ETA {eta}"
+
+
+def _chunked(items: list[str], size: int | None) -> list[list[str]]:
+    """Split *items* into lists of at most *size* elements.
+
+    >>> _chunked(["a", "b", "c"], 2)
+    [['a', 'b'], ['c']]
+    >>> _chunked(["a", "b", "c"], None)
+    [['a', 'b', 'c']]
+    """
+    if not size or len(items) <= size:
+        return [items]
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def _classify_smtp_exception(exc: Exception) -> tuple[bool, bool]:
+    """Return ``(is_transient, needs_reconnect)`` for *exc*."""
+    import smtplib
+
+    if isinstance(exc, smtplib.SMTPServerDisconnected):
+        return True, True
+    elif isinstance(exc, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in exc.recipients.values()]
+        is_transient = bool(codes) and all(400 <= code < 500 for code in codes)
+        return is_transient, any(code in _RECONNECT_SMTP_CODES for code in codes)
+    elif isinstance(exc, smtplib.SMTPResponseException):
+        code = exc.smtp_code
+        return 400 <= code < 500, code in _RECONNECT_SMTP_CODES
+    elif isinstance(exc, (ConnectionError, TimeoutError)):
+        return True, True
+    else:
+        return False, False
@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import collections.abc as _collections_abc
 import dataclasses as _dataclasses
+import functools as _functools
 import logging as _logging
+import threading as _threading
+import time as _time
 import typing as _typing
 
-from . import _logging_util, _util
+from . import _logging_util, _snapshot_cache, _util
 
 
 if _typing.TYPE_CHECKING:
@@ -47,6 +50,9 @@ _MAILBOX_ATTRIBUTES_KEYS = [
     "tls_enforce_out",
 ]
 
+# Mailbox payload keys that must never end up in a cache snapshot.
+_SECRET_MAILBOX_KEYS = frozenset(["password", "password2"])
+
 _EDIT_ALIAS_ATTRS = [
     "active",
     "address",
@@ -85,6 +91,30 @@ class _MailcowCache:
         self._aid2address = {}
         self._address2alias = {}
 
+    def to_snapshot(self) -> dict[str, _typing.Any]:
+        return {
+            "domains": list(self._domains.values()),
+            "mailboxes": [
+                {k: v for k, v in mailbox.items() if k not in _SECRET_MAILBOX_KEYS}
+                for mailbox in self._mailboxes.values()
+            ],
+            "aliases": list(self._address2alias.values()),
+        }
+
+    def load_snapshot(self, data: dict[str, _typing.Any]) -> None:
+        # Entries already in the cache are newer than the snapshot.  The
+        # snapshot may lack objects created since it was taken, so it
+        # never marks a list as complete and misses still go to Mailcow.
+        for domain in data.get("domains", []):
+            if domain.get("domain_name") not in self._domains:
+                self.add_domain(domain)
+        for mailbox in data.get("mailboxes", []):
+            if mailbox.get("username") not in self._mailboxes:
+                self.add_mailbox(mailbox)
+        for alias in data.get("aliases", []):
+            if alias.get("address") not in self._address2alias:
+                self.add_alias(alias)
+
     def clear(self) -> None:
         self._domains.clear()
         self._all_aliases_cached = False
@@ -212,7 +242,9 @@ class _MailcowCache:
                 return None
         else:
             mailbox = self.get_mailbox_by_username(key, client=client)
-            return [mailbox] if mailbox is not None else None
+            if mailbox is not None:
+                return [mailbox]
+            return [] if self._all_mailboxes_cached else None
 
     def delete_mailbox(self, username: str | _collections_abc.Iterable[str], /) -> None:
         for key in _util.to_str_list(username):
@@ -285,7 +317,9 @@ class _MailcowCache:
                 alias = self.get_alias_by_id(key, client=client)
             else:
                 alias = self.get_alias_by_address(key, client=client)
-            return [alias] if alias is not None else None
+            if alias is not None:
+                return [alias]
+            return [] if self._all_aliases_cached else None
 
     def delete_alias(
         self, address_or_id: str | int | _collections_abc.Iterable[str | int], /
@@ -551,7 +585,41 @@ class MailcowAlias(_MailcowDict):
 class MailcowConfig:
     server: str
     api_key: str
+    #: Connect and read timeout of each request in seconds.
     timeout: float = 30.0
+    #: Number of pooled HTTP connections, at least *max_workers*.
+    pool_maxsize: int = 8
+    #: Retries of GET requests on connection errors and 429/5xx responses.
+    max_retries: int = 3
+    retry_backoff_factor: float = 0.5
+    #: Number of threads for parallel reads, see `MailcowClient.prefetch`.
+    max_workers: int = 3
+
+
+@_dataclasses.dataclass(kw_only=True)
+class MailcowRequestMetrics:
+    """Latency of the requests to one Mailcow API endpoint."""
+
+    count: int = 0
+    errors: int = 0
+    total_s: float = 0.0
+    max_s: float = 0.0
+
+    @property
+    def mean_s(self) -> float:
+        return self.total_s / self.count if self.count else 0.0
+
+    def add(self, duration_s: float, *, error: bool = False) -> None:
+        self.count += 1
+        self.errors += int(error)
+        self.total_s += duration_s
+        self.max_s = max(self.max_s, duration_s)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.count} request(s), {self.errors} error(s), "
+            f"mean {self.mean_s * 1000:.0f} ms, max {self.max_s * 1000:.0f} ms"
+        )
 
 
 class MailcowAudithook(_typing.Protocol):
@@ -562,9 +630,12 @@ class MailcowClient:
     _config: MailcowConfig
     _cache: _MailcowCache
     _dry_run: bool = False
+    #: Maximum number of items per ``edit/*`` or ``delete/*`` request.
+    bulk_chunk_size: int = 100
     __session: _requests.Session | None = None
     __is_closed: bool = False
     _audithook: MailcowAudithook
+    _snapshot: _snapshot_cache.SnapshotState
 
     def __init__(
         self,
@@ -574,16 +645,26 @@ class MailcowClient:
         logger: _logging.Logger | _logging.LoggerAdapter | bool = True,
         cache_logger: _logging.Logger | _logging.LoggerAdapter | bool = False,
         audithook: MailcowAudithook | None = None,
+        snapshot_store: _snapshot_cache.SnapshotStore | None = None,
     ) -> None:
         self._logger = _logging_util.to_logger_or_adapter(
             logger, prefix=f"Mailcow-{id(self)}"
         )
         self._config = config
         self._cache = _MailcowCache(logger=cache_logger)
+        self._snapshot = _snapshot_cache.SnapshotState(
+            snapshot_store, kind="mailcow", key=config.server
+        )
         self._dry_run = bool(dry_run)
         self.audithook = audithook
+        self._metrics: dict[str, MailcowRequestMetrics] = {}
+        self._metrics_lock = _threading.Lock()
 
     def close(self) -> None:
+        if self._snapshot.dirty:
+            self._snapshot.save(self._cache.to_snapshot())
+        for endpoint, metrics in self.request_metrics.items():
+            self._logger.debug(f"[metrics] {endpoint}: {metrics}")
         self.clear()
         if (session := self.__session) is not None:
             session.close()
@@ -599,21 +680,62 @@ class MailcowClient:
         """Clears the cache."""
         self._cache.clear()
 
+    def __use_snapshot(self) -> None:
+        if data := self._snapshot.load():
+            self._cache.load_snapshot(data)
+
+    def __save_snapshot(self) -> None:
+        self._snapshot.save(self._cache.to_snapshot())
+
     def _session(self) -> _requests.Session:
         import requests as _requests
+        import requests.adapters as _requests_adapters
+        import urllib3.util as _urllib3_util
 
         if self.__session is None:
             if self.__is_closed:
                 raise RuntimeError("Underlying HTTP session already closed")
-            self.__session = _requests.Session()
-            self.__session.headers.update(
+            config = self._config
+            # Only idempotent reads are retried after a response, writes
+            # are retried only if the connection could not be opened.
+            retry = _urllib3_util.Retry(
+                total=config.max_retries,
+                backoff_factor=config.retry_backoff_factor,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset(["GET", "HEAD"]),
+                raise_on_status=False,
+            )
+            adapter = _requests_adapters.HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=max(config.pool_maxsize, config.max_workers),
+                max_retries=retry,
+            )
+            session = _requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update(
                 {
                     "Content-Type": "application/json",
-                    "X-API-Key": self._config.api_key,
+                    "X-API-Key": config.api_key,
                 }
             )
+            self.__session = session
         return self.__session
 
+    @property
+    def request_metrics(self) -> dict[str, MailcowRequestMetrics]:
+        """Request latency per endpoint (e.g. ``"GET get/alias"``)."""
+        with self._metrics_lock:
+            return {
+                endpoint: _dataclasses.replace(metrics)
+                for endpoint, metrics in sorted(self._metrics.items())
+            }
+
+    def __record_latency(self, endpoint: str, duration_s: float, error: bool) -> None:
+        with self._metrics_lock:
+            metrics = self._metrics.setdefault(endpoint, MailcowRequestMetrics())
+            metrics.add(duration_s, error=error)
+
     @property
     def audithook(self) -> MailcowAudithook | None:
         return self._audithook if self._audithook is not self.__null_audithook else None
@@ -695,12 +817,25 @@ class MailcowClient:
         audit_args = {k: v for k, v in audit_args.items() if v is not None}
         audit_args_msg = " ".join(f"{k}={v!r}" for k, v in audit_args.items())
         logger.debug(f"{method} {url} {audit_args_msg}")
+        if not read_only:
+            self._snapshot.mutated(dry_run=dry_run)
         if dry_run:
             response = _DryRunResponse(200)
         else:
             action = path.lstrip("/").removeprefix("api/v1").lstrip("/")
             self._audithook(action, method=method, url=url, **audit_args)
-            response = self._session().request(method, url, json=json)
+            endpoint = f"{method} {'/'.join(action.split('/')[:2])}"
+            start = _time.perf_counter()
+            try:
+                response = self._session().request(
+                    method, url, json=json, timeout=self._config.timeout
+                )
+            except Exception:
+                self.__record_latency(endpoint, _time.perf_counter() - start, True)
+                raise
+            self.__record_latency(
+                endpoint, _time.perf_counter() - start, not response.ok
+            )
         logger.debug(f"  => {response}")
         response.raise_for_status()
         response_json = response.json()
@@ -710,6 +845,108 @@ class MailcowClient:
         )
         return response_json
 
+    def _request_many(
+        self,
+        path: str,
+        payloads: _collections_abc.Iterable[_typing.Any],
+        *,
+        allow_danger: str | None = None,
+        dry_run: bool | None = None,
+    ) -> None:
+        """POST each of *payloads* to *path*, continuing after Mailcow errors.
+
+        Mailcow reports one note per item, so a failing item does not
+        stop the remaining requests.  The cache is cleared if any item
+        failed, since it is no longer known which changes were applied.
+        """
+        errors = []
+        num_requests = 0
+        for payload in payloads:
+            num_requests += 1
+            try:
+                self._request(
+                    "POST",
+                    path,
+                    json=payload,
+                    allow_danger=allow_danger,
+                    read_only=False,
+                    dry_run=dry_run,
+                )
+            except MailcowError as exc:
+                errors.append(exc)
+        if errors:
+            self.clear()
+            if num_requests == 1:
+                raise errors[0]
+            raise ExceptionGroup(
+                f"{len(errors)} of {num_requests} Mailcow request(s) to {path} failed",
+                errors,
+            )
+
+    def prefetch(self, *, allow_cached: bool = True) -> None:
+        """Load all domains, mailboxes and aliases into the cache.
+
+        The lists that are not cached yet are requested in parallel
+        (see `MailcowConfig.max_workers`).
+        """
+        if allow_cached:
+            self.__use_snapshot()
+        kinds = [
+            kind
+            for kind, cached in [
+                ("domain", self._cache.all_domains_cached),
+                ("mailbox", self._cache.all_mailboxes_cached),
+                ("alias", self._cache.all_aliases_cached),
+            ]
+            if not (allow_cached and cached)
+        ]
+        if not kinds:
+            return
+        self._session()  # create the session before starting workers
+        results = _util.run_concurrently(
+            "Mailcow prefetch",
+            [
+                (
+                    kind,
+                    _functools.partial(self._request, "GET", f"/api/v1/get/{kind}/all"),
+                )
+                for kind in kinds
+            ],
+            max_workers=self._config.max_workers,
+            thread_name_prefix="mailcow",
+            logger=self._logger,
+        )
+        for kind, result in zip(kinds, results, strict=True):
+            self.__add_to_cache(kind, result, all=True)
+        self.__save_snapshot()
+
+    def __add_to_cache(self, kind: str, result, *, all: bool) -> list:
+        if not result:
+            # note: mailcow seems to send b'{}' if there is an empty list
+            result = []
+        elif isinstance(result, dict):
+            result = [result]
+        match kind:
+            case "domain":
+                domains = [MailcowDomain.fromdict(d, client=self) for d in result]
+                self._cache.add_domains(domains, all=all)
+                return domains
+            case "mailbox":
+                mailboxes = [MailcowMailbox.fromdict(d, client=self) for d in result]
+                self._cache.add_mailboxes(mailboxes, all=all)
+                return mailboxes
+            case "alias":
+                aliases = [MailcowAlias.fromdict(d, client=self) for d in result]
+                self._cache.add_aliases(aliases, all=all)
+                return aliases
+            case _:
+                raise ValueError(f"Unknown Mailcow object kind {kind!r}")
+
+    def __chunked[T](self, items: _collections_abc.Iterable[T]) -> list[list[T]]:
+        import itertools
+
+        return [list(chunk) for chunk in itertools.batched(items, self.bulk_chunk_size)]
+
     # ==================================================================================
     # Domains
     # ==================================================================================
@@ -721,6 +958,8 @@ class MailcowClient:
         *,
         allow_cached: bool = True,
     ) -> list[MailcowDomain]:
+        if allow_cached:
+            self.__use_snapshot()
         if (
             domain_list := self._cache.get_domain_list(
                 id, client=self, allow_cached=allow_cached
@@ -728,12 +967,9 @@ class MailcowClient:
         ) is not None:
             return domain_list
         result = self._request("GET", f"/api/v1/get/domain/{id}")
-        if not result:
-            result = []
-        elif isinstance(result, dict):
-            result = [result]
-        domains = [MailcowDomain.fromdict(d, client=self) for d in result]
-        self._cache.add_domains(domains, all=(id == "all"))
+        domains = self.__add_to_cache("domain", result, all=(id == "all"))
+        if id == "all":
+            self.__save_snapshot()
         return domains
 
     def get_domain_or_none_by_name(
@@ -824,6 +1060,7 @@ class MailcowClient:
             domain = {}
         domain.update(_payload_to_domain_dict(payload))
         self._logger.debug(f"[dry-run] add fake domain {domain} to cache")
+        self._snapshot.mutated(dry_run=True)
         self._cache.add_domain(domain)
         return self._cache.get_domain_by_name_or_raise(domain_name, client=self)
 
@@ -902,6 +1139,8 @@ class MailcowClient:
         *,
         allow_cached: bool = True,
     ) -> list[MailcowMailbox]:
+        if allow_cached:
+            self.__use_snapshot()
         if (
             mailbox_list := self._cache.get_mailbox_list(
                 id, client=self, allow_cached=allow_cached
@@ -909,13 +1148,10 @@ class MailcowClient:
         ) is not None:
             return mailbox_list
         result = self._request("GET", f"/api/v1/get/mailbox/{id}")
-        if not result:
-            result = []
-        elif isinstance(result, dict):
-            result = [result]
-        mailboxs = [MailcowMailbox.fromdict(d, client=self) for d in result]
-        self._cache.add_mailboxes(mailboxs, all=(id == "all"))
-        return mailboxs
+        mailboxes = self.__add_to_cache("mailbox", result, all=(id == "all"))
+        if id == "all":
+            self.__save_snapshot()
+        return mailboxes
 
     def get_mailbox_or_none_by_username(
         self, username: str, /, *, allow_cached: bool = True
@@ -958,29 +1194,22 @@ class MailcowClient:
         exist_ok: bool = True,
         dry_run: bool | None = None,
     ) -> MailcowMailbox:
-        import email.utils as _email_utils
-
         if self.dry_run or bool(dry_run):
             self._logger.debug(f"[dry-run] load all mailboxes into cache")
             self.get_mailbox_list(allow_cached=True)  # cache all mailboxes
 
-        email_addr = _email_utils.parseaddr(username, strict=True)[1]
-        local_part, domain = email_addr.split("@", 1)
-        password2 = password2 or password
-        payload = {
-            "local_part": local_part,
-            "domain": domain,
-            "authsource": authsource,
-            "password": password,
-            "password2": password2,
-            "active": active,
-            "name": name,
-            "quota": quota_mib,
-            "force_pw_update": force_pw_update,
-            "tls_enforce_in": tls_enforce_in,
-            "tls_enforce_out": tls_enforce_out,
-        }
-        payload = {k: v for k, v in payload.items() if v is not None}
+        payload = _mailbox_payload(
+            username,
+            password=password,
+            password2=password2,
+            active=active,
+            name=name,
+            quota_mib=quota_mib,
+            authsource=authsource,
+            force_pw_update=force_pw_update,
+            tls_enforce_in=tls_enforce_in,
+            tls_enforce_out=tls_enforce_out,
+        )
 
         old_mailbox = self.get_mailbox_or_none_by_username(username)
         if old_mailbox:
@@ -993,19 +1222,29 @@ class MailcowClient:
             return self.get_mailbox_by_username(username)
 
     def _add_mailbox(self, payload: dict, *, dry_run: bool | None = None) -> None:
-        payload.setdefault("force_pw_update", False)
-        payload.setdefault("tls_enforce_in", True)
-        payload.setdefault("tls_enforce_out", True)
-        payload.setdefault("quota", 1024)
-        payload.setdefault("active", True)
-        payload.setdefault("authsource", "mailcow")
+        self._add_mailboxes([payload], dry_run=dry_run)
+
+    def _add_mailboxes(
+        self, payloads: list[dict], *, dry_run: bool | None = None
+    ) -> None:
+        for payload in payloads:
+            payload.setdefault("force_pw_update", False)
+            payload.setdefault("tls_enforce_in", True)
+            payload.setdefault("tls_enforce_out", True)
+            payload.setdefault("quota", 1024)
+            payload.setdefault("active", True)
+            payload.setdefault("authsource", "mailcow")
         dry_run = self.dry_run or bool(dry_run)
         if dry_run:
-            mailbox = MailcowMailbox.from_payload(payload)
-            self._logger.debug(f"[dry-run] add fake {mailbox=} to cache")
-            self._cache.add_mailbox(mailbox)
+            for payload in payloads:
+                mailbox = MailcowMailbox.from_payload(payload)
+                self._logger.debug(f"[dry-run] add fake {mailbox=} to cache")
+                self._snapshot.mutated(dry_run=True)
+                self._cache.add_mailbox(
+                    {k: v for k, v in mailbox.items() if k not in _SECRET_MAILBOX_KEYS}
+                )
         else:
-            self._request("POST", "/api/v1/add/mailbox", json=payload)
+            self._request_many("/api/v1/add/mailbox", payloads)
 
     def _edit_mailbox(
         self,
@@ -1025,14 +1264,81 @@ class MailcowClient:
             read_only=False,
             dry_run=dry_run,
         )
+        # Only cache the change once Mailcow accepted it, otherwise it
+        # would also end up in the snapshot.
+        self._cache.add_mailbox(
+            {k: v for k, v in new_mailbox.items() if k not in _SECRET_MAILBOX_KEYS}
+        )
         return MailcowMailbox.fromdict(new_mailbox, client=self)
 
+    def add_mailboxes(
+        self,
+        mailboxes: _collections_abc.Iterable[
+            _collections_abc.Mapping[str, _typing.Any]
+        ],
+        *,
+        exist_ok: bool = True,
+        dry_run: bool | None = None,
+    ) -> list[MailcowMailbox]:
+        """Add or update many mailboxes.
+
+        Each item holds the keyword arguments of `add_mailbox` plus the
+        ``username``.  All mailboxes are listed once.  Mailcow adds only
+        one mailbox per request, but updates with equal attributes (e.g.
+        ``active``) share one ``edit/mailbox`` request.
+        """
+        import json
+
+        self.get_mailbox_list(allow_cached=True)
+        usernames = []
+        new_payloads = []
+        edits: dict[str, tuple[dict, list[str]]] = {}
+        for kwargs in mailboxes:
+            kwargs = dict(kwargs)
+            username = kwargs.pop("username")
+            payload = _mailbox_payload(username, **kwargs)
+            usernames.append(username)
+            old_mailbox = self._cache.get_mailbox_by_username(username, client=None)
+            if old_mailbox is None:
+                new_payloads.append(payload)
+                continue
+            elif not exist_ok:
+                raise MailcowError(f"error: mailbox_exists ({username})")
+            attr = {
+                k: v for k, v in payload.items() if k not in ("local_part", "domain")
+            }
+            new_mailbox = _merge_mailbox_dicts(
+                old_mailbox, MailcowMailbox.from_payload(attr)
+            )
+            self._cache.add_mailbox(
+                {k: v for k, v in new_mailbox.items() if k not in _SECRET_MAILBOX_KEYS}
+            )
+            edit_key = json.dumps(attr, sort_keys=True, default=str)
+            edits.setdefault(edit_key, (attr, []))[1].append(username)
+
+        self._request_many(
+            "/api/v1/edit/mailbox",
+            (
+                {"items": chunk, "attr": attr}
+                for attr, edit_usernames in edits.values()
+                if attr
+                for chunk in self.__chunked(edit_usernames)
+            ),
+            dry_run=dry_run,
+        )
+        self._add_mailboxes(new_payloads, dry_run=dry_run)
+        if new_payloads and not (self.dry_run or bool(dry_run)):
+            self.get_mailbox_list(allow_cached=False)
+        return [self.get_mailbox_by_username(username) for username in usernames]
+
     def delete_mailbox(self, username: str | _typing.Iterable[str]) -> None:
         payload = _util.to_str_list(username)
         if not payload:
             return
         self._cache.delete_mailbox(payload)
-        self._request("POST", "/api/v1/delete/mailbox", json=payload, read_only=False)
+        self._request_many("/api/v1/delete/mailbox", self.__chunked(payload))
+
+    delete_mailboxes = delete_mailbox
 
     # ==================================================================================
     # Aliases
@@ -1044,19 +1350,17 @@ class MailcowClient:
         *,
         allow_cached: bool = True,
     ) -> list[MailcowAlias]:
+        if allow_cached:
+            self.__use_snapshot()
         if (
             allow_cached
             and (alias_list := self._cache.get_alias_list(id, client=self)) is not None
         ):
             return alias_list
         result = self._request("GET", f"/api/v1/get/alias/{id}")
-        if not result:
-            # note: mailcow seems to send b'{}' if there is an empty list
-            result = []
-        elif isinstance(result, dict):
-            result = [result]
-        aliases = [MailcowAlias.fromdict(d, client=self) for d in result]
-        self._cache.add_aliases(aliases, all=(id == "all"))
+        aliases = self.__add_to_cache("alias", result, all=(id == "all"))
+        if id == "all":
+            self.__save_snapshot()
         return aliases
 
     def get_alias_or_none_by_address(self, address: str) -> MailcowAlias | None:
@@ -1144,12 +1448,20 @@ class MailcowClient:
         new_alias = _normalize_alias_dict_add_special_goto(new_alias)
         dry_run = self.dry_run or bool(dry_run)
         if dry_run:
-            new_alias.setdefault("id", self._cache.max_alias_id + 1)
-            self._logger.debug(f"[dry-run] add fake alias {new_alias} to cache")
-            self._cache.add_alias(new_alias)
+            self.__add_fake_aliases(new_alias)
         else:
             self._request("POST", "/api/v1/add/alias", json=new_alias, read_only=False)
 
+    def __add_fake_aliases(self, new_alias: dict) -> None:
+        for address in new_alias["address"].split(","):
+            fake_alias = new_alias | {
+                "address": address,
+                "id": new_alias.get("id", self._cache.max_alias_id + 1),
+            }
+            self._logger.debug(f"[dry-run] add fake alias {fake_alias} to cache")
+            self._snapshot.mutated(dry_run=True)
+            self._cache.add_alias(fake_alias)
+
     def _edit_alias(
         self,
         address: str,
@@ -1165,30 +1477,157 @@ class MailcowClient:
             raise ValueError(
                 f"Inconsistent address, {address=} != {old_alias.get('address')}"
             )
-        new_alias = _normalize_alias_dict_remove_special_goto(old_alias)
-        if goto is None:
-            goto = new_alias.get("goto")
-        new_alias["goto"] = ",".join(
-            _normalize_goto(goto, add=add_goto, remove=remove_goto)
+        new_alias = _edited_alias_dict(
+            old_alias,
+            goto=goto,
+            add_goto=add_goto,
+            remove_goto=remove_goto,
+            active=active,
         )
-        if active is not None:
-            new_alias["active"] = active
-        new_alias = _normalize_alias_dict_add_special_goto(new_alias)
-        self._cache.add_alias(new_alias)
-
         attr = {k: v for k, v in new_alias.items() if k in _EDIT_ALIAS_ATTRS}
         payload = {"items": [old_alias["id"]], "attr": attr}
         self._request(
             "POST", "/api/v1/edit/alias", json=payload, read_only=False, dry_run=dry_run
         )
+        self._cache.add_alias(new_alias)
         return MailcowAlias.fromdict(new_alias, client=self)
 
+    def add_aliases(
+        self,
+        aliases: _collections_abc.Mapping[
+            str, str | _collections_abc.Iterable[str] | None
+        ]
+        | _collections_abc.Iterable[
+            tuple[str, str | _collections_abc.Iterable[str] | None]
+        ],
+        *,
+        add_goto: bool = False,
+        active: bool | None = None,
+        dry_run: bool | None = None,
+    ) -> list[MailcowAlias]:
+        """Add or update many aliases *address* → *goto*.
+
+        All aliases are listed once.  New aliases with the same goto are
+        added with one request (Mailcow accepts a comma separated
+        ``address``), changed aliases with equal new attributes share one
+        ``edit/alias`` request and unchanged aliases are skipped.  With
+        *add_goto* the goto is added to existing aliases instead of
+        replacing their goto.
+        """
+        if isinstance(aliases, _collections_abc.Mapping):
+            aliases = aliases.items()
+        self.get_alias_list(allow_cached=True)
+        addresses = []
+        new_addresses: dict[tuple[str, bool], list[str]] = {}
+        edits = []
+        for address, goto in aliases:
+            addresses.append(address)
+            if old_alias := self._cache.get_alias_by_address(address, client=None):
+                edits.append(
+                    (
+                        old_alias,
+                        _edited_alias_dict(
+                            old_alias,
+                            goto=None if add_goto else goto,
+                            add_goto=goto if add_goto else None,
+                            active=active,
+                        ),
+                    )
+                )
+            else:
+                goto_str = ",".join(_normalize_goto(goto))
+                key = (goto_str, True if active is None else bool(active))
+                new_addresses.setdefault(key, []).append(address)
+
+        self.__edit_aliases(edits, dry_run=dry_run)
+        new_aliases = [
+            _normalize_alias_dict_add_special_goto(
+                {"address": ",".join(chunk), "goto": goto_str, "active": alias_active}
+            )
+            for (goto_str, alias_active), new in new_addresses.items()
+            for chunk in self.__chunked(new)
+        ]
+        if self.dry_run or bool(dry_run):
+            for new_alias in new_aliases:
+                self.__add_fake_aliases(new_alias)
+        elif new_aliases:
+            self._request_many("/api/v1/add/alias", new_aliases)
+            self.get_alias_list(allow_cached=False)
+        return [self.get_alias_by_address(address) for address in addresses]
+
+    def edit_aliases(
+        self,
+        addresses: str | _collections_abc.Iterable[str],
+        *,
+        goto: str | _collections_abc.Iterable[str] | None = None,
+        add_goto: str | _collections_abc.Iterable[str] | None = None,
+        remove_goto: str | _collections_abc.Iterable[str] | None = None,
+        active: bool | None = None,
+        dry_run: bool | None = None,
+    ) -> list[MailcowAlias]:
+        """Apply the same change to many existing aliases.
+
+        Aliases that end up with equal attributes are edited with one
+        request, e.g. deactivating aliases or adding a goto to all of
+        them.
+        """
+        self.get_alias_list(allow_cached=True)
+        edits = []
+        for address in _util.to_str_list(addresses):
+            old_alias = self.get_alias_by_address(address)
+            edits.append(
+                (
+                    old_alias,
+                    _edited_alias_dict(
+                        old_alias,
+                        goto=goto,
+                        add_goto=add_goto,
+                        remove_goto=remove_goto,
+                        active=active,
+                    ),
+                )
+            )
+        self.__edit_aliases(edits, dry_run=dry_run)
+        return [MailcowAlias.fromdict(new_alias, client=self) for _, new_alias in edits]
+
+    def __edit_aliases(
+        self,
+        edits: _collections_abc.Iterable[tuple[dict, dict]],
+        *,
+        dry_run: bool | None = None,
+    ) -> None:
+        import json
+
+        id_groups: dict[str, tuple[dict, list[int]]] = {}
+        for old_alias, new_alias in edits:
+            attr = {k: v for k, v in new_alias.items() if k in _EDIT_ALIAS_ATTRS}
+            old_attr = {k: v for k, v in old_alias.items() if k in _EDIT_ALIAS_ATTRS}
+            if attr == old_attr:
+                continue
+            self._cache.add_alias(new_alias)
+            # The address is the same for all items, but must not be sent
+            # along with more than one item.
+            attr.pop("address", None)
+            edit_key = json.dumps(attr, sort_keys=True, default=str)
+            id_groups.setdefault(edit_key, (attr, []))[1].append(old_alias["id"])
+        self._request_many(
+            "/api/v1/edit/alias",
+            (
+                {"items": chunk, "attr": attr}
+                for attr, ids in id_groups.values()
+                for chunk in self.__chunked(ids)
+            ),
+            dry_run=dry_run,
+        )
+
     def delete_alias(self, address: str | _collections_abc.Iterable[str]) -> None:
         payload = _util.to_int_or_str_list(address)
         if not payload:
             return
         self._cache.delete_alias(payload)
-        self._request("POST", "/api/v1/delete/alias", json=payload, read_only=False)
+        self._request_many("/api/v1/delete/alias", self.__chunked(payload))
+
+    delete_aliases = delete_alias
 
 
 def _to_note_dict(obj, allow_danger: str | None = None) -> dict | None:
@@ -1239,6 +1678,71 @@ def _format_note_dict(obj: dict, *, with_action: bool = True) -> str:
     return f"{note_type}: {note}"
 
 
+def _mailbox_payload(
+    username: str,
+    *,
+    password: str | None = None,
+    password2: str | None = None,
+    active: bool | None = None,
+    name: str | None = None,
+    quota_mib: int | None = None,
+    authsource: str | None = None,
+    force_pw_update: bool | None = None,
+    tls_enforce_in: bool | None = None,
+    tls_enforce_out: bool | None = None,
+) -> dict:
+    """The ``add/mailbox`` payload for *username*.
+
+    >>> _mailbox_payload("a@example.org", name="A", quota_mib=512)
+    {'local_part': 'a', 'domain': 'example.org', 'name': 'A', 'quota': 512}
+    """
+    import email.utils as _email_utils
+
+    email_addr = _email_utils.parseaddr(username, strict=True)[1]
+    local_part, domain = email_addr.split("@", 1)
+    password2 = password2 or password
+    payload = {
+        "local_part": local_part,
+        "domain": domain,
+        "authsource": authsource,
+        "password": password,
+        "password2": password2,
+        "active": active,
+        "name": name,
+        "quota": quota_mib,
+        "force_pw_update": force_pw_update,
+        "tls_enforce_in": tls_enforce_in,
+        "tls_enforce_out": tls_enforce_out,
+    }
+    return {k: v for k, v in payload.items() if v is not None}
+
+
+def _edited_alias_dict(
+    old_alias: dict,
+    *,
+    goto: str | _collections_abc.Iterable[str] | None = None,
+    add_goto: str | _collections_abc.Iterable[str] | None = None,
+    remove_goto: str | _collections_abc.Iterable[str] | None = None,
+    active: bool | None = None,
+) -> dict:
+    """Copy of *old_alias* with a changed goto and active state.
+
+    >>> _edited_alias_dict({"id": 1, "goto": "a@x"}, add_goto="b@x")
+    {'id': 1, 'goto': 'a@x,b@x'}
+    >>> _edited_alias_dict({"id": 1, "goto_null": True}, goto="b@x")
+    {'id': 1, 'goto': 'b@x'}
+    """
+    new_alias = _normalize_alias_dict_remove_special_goto(dict(old_alias))
+    if goto is None:
+        goto = new_alias.get("goto")
+    new_alias["goto"] = ",".join(
+        _normalize_goto(goto, add=add_goto, remove=remove_goto)
+    )
+    if active is not None:
+        new_alias["active"] = active
+    return _normalize_alias_dict_add_special_goto(new_alias)
+
+
 def _normalize_goto(
     goto: str | _collections_abc.Iterable[str] | None,
     /,
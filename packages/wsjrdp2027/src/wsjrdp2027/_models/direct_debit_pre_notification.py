@@ -285,16 +285,9 @@ class DirectDebitPreNotification:
 
     @property
     def dbtr_bank_name(self) -> str | None:
-        import schwifty
+        from .. import _iban
 
-        iban = self.dbtr_iban
-        try:
-            return schwifty.IBAN(iban).bank_name
-        except Exception as exc:
-            _LOGGER.debug(
-                "Could not determine bank name for IBAN %r: %s", iban, str(exc)
-            )
-        return None
+        return _iban.get_iban_service().bank_name(self.dbtr_iban)
 
     @property
     def pre_notified_amount(self) -> _decimal.Decimal | None:
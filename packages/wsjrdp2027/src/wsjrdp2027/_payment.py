@@ -15,7 +15,7 @@ if _typing.TYPE_CHECKING:
     import pandas as _pandas
     import psycopg as _psycopg
 
-    from . import _people_query, _types
+    from . import _pain, _people_query, _types
 
 
 _LOGGER = _logging.getLogger(__name__)
@@ -356,74 +356,19 @@ def to_int_or_none(obj: object) -> int | None:
 
 
 def _check_iban_bic_in_payment_dataframe(df, pedantic: bool = True):
-    import schwifty
-
-    def _check_iban(df, idx, row: _pandas.Series) -> schwifty.IBAN | None:
-        # Check for IBAN and if present check that IBAN is valid
-        raw_iban = row.get("sepa_iban", None)
-        if not raw_iban:
-            _skip_payment(df, idx, "No IBAN")
-            return None
-        else:
-            try:
-                return schwifty.IBAN(raw_iban, validate_bban=pedantic)
-            except Exception as exc:
-                _skip_payment(df, idx, f"sepa_iban: {exc}")
-                return None
-
-    def _check_bic(df, idx, row: _pandas.Series, iban: schwifty.IBAN | None) -> None:
-        # Check for BIC and check that BIC is valid
-        bic: schwifty.BIC | None = None
-        raw_bic = row.get("sepa_bic", None)
-        if raw_bic:
-            try:
-                bic = schwifty.BIC(raw_bic)
-                raw_bic = str(bic)
-                df.at[idx, "sepa_bic_status"] = "valid"
-            except Exception as exc:
-                df.at[idx, "sepa_bic_status"] = "invalid"
-                df.at[idx, "sepa_bic_status_reason"] = str(exc)
-                if pedantic:
-                    _skip_payment(df, idx, f"sepa_bic: {exc}")
-                raw_bic = None
-        else:
-            if iban and (auto_bic := iban.bic):
-                df.at[idx, "sepa_bic"] = str(auto_bic)
-                df.at[idx, "sepa_bic_status"] = "from_iban"
-                df.at[idx, "sepa_bic_status_reason"] = "sepa_bic empty"
-            else:
-                df.at[idx, "sepa_bic_status"] = "not_present"
-            return
-
-        if not (bic and iban and (auto_bic := iban.bic)):
-            return
-
-        # here we now have iban, bic and auto_bic
-        if not _is_bic_compatible(str(bic), str(auto_bic)):
-            reason = (
-                f"sepa_bic {bic} not consistent with {auto_bic} derived from sepa_iban"
-            )
-            df.at[idx, "sepa_bic"] = str(auto_bic)
-            df.at[idx, "sepa_bic_status"] = "inconsistent"
-            df.at[idx, "sepa_bic_status_reason"] = reason
-            if pedantic:
-                _skip_payment(df, idx, f"sepa_bic: {reason}")
-
-    for idx, row in df.iterrows():
-        iban = _check_iban(df, idx, row)
-        _check_bic(df, idx, row, iban=iban)
-
-
-def _is_bic_compatible(bic_a: str | None, bic_b: str | None) -> bool:
-    if (
-        (bic_a is None or bic_b is None)
-        or (bic_a == bic_b)
-        or (bic_a + "XXX" == bic_b)
-        or (bic_a == bic_b + "XXX")
-    ):
-        return True
-    else:
-        return False
+    from . import _iban
+
+    if df.empty:
+        return
+    checks = _iban.get_iban_service().validate_series(
+        df["sepa_iban"], df["sepa_bic"], pedantic=pedantic
+    )
+    df["sepa_bic"] = checks["sepa_bic"]
+    df["sepa_bic_status"] = checks["sepa_bic_status"]
+    df["sepa_bic_status_reason"] = checks["sepa_bic_status_reason"]
+    for idx, skip_reasons in checks["skip_reasons"].items():
+        for reason in skip_reasons:
+            _skip_payment(df, idx, reason)
 
 
 def _skip_payment(
@@ -563,6 +508,108 @@ def insert_direct_debit_pre_notification_from_row(
     )
 
 
+_PMT_INF_UPSERT_COLS = [
+    "payment_information_identification",
+    "batch_booking",
+    "number_of_transactions",
+    "control_sum_cents",
+    "payment_type_instrument",
+    "debit_sequence_type",
+    "requested_collection_date",
+    "cdtr_name",
+    "cdtr_iban",
+    "cdtr_bic",
+    "cdtr_address",
+    "creditor_id",
+]
+
+
+def _upsert_payment_initiation_and_create_payment_infos(
+    conn: _psycopg.Connection,
+    df: _pandas.DataFrame,
+    pain_message: _pain.PainMessage,
+    *,
+    pain_id: int | None,
+    rows: _pandas.Series | None = None,
+) -> int:
+    from . import _pg
+
+    selected = slice(None) if rows is None else rows
+    pain_updates = dict(
+        status="xml_generated",
+        sepa_schema=pain_message.sepa_schema,
+        message_identification=pain_message.message_identification,
+        number_of_transactions=pain_message.number_of_transactions,
+        control_sum_cents=pain_message.control_sum_cents,
+        initiating_party_name=pain_message.initiating_party_name,
+    )
+    if pain_id is None:
+        pain_id = _pg.pg_insert_payment_initiation(conn, **pain_updates)  # type: ignore
+        df.loc[selected, "pn_payment_initiation_id"] = pain_id
+        df.loc[selected, "sepa_dd_payment_initiation_id"] = pain_id
+        _LOGGER.info("Finished INSERT wsjrdp_payment_initiations id=%s", pain_id)
+    else:
+        _pg.pg_update_payment_initiation(conn, id=pain_id, updates=pain_updates)
+        _LOGGER.info("Finished UPDATE wsjrdp_payment_initiations id=%s", pain_id)
+
+    endtoend_id2pmt_inf_id = {}
+    for pmt_inf in pain_message.payment_infos:
+        insert_pmt_inf_kwargs = {k: getattr(pmt_inf, k) for k in _PMT_INF_UPSERT_COLS}
+        pmt_inf_id = _pg.pg_insert_direct_debit_payment_info(
+            conn, payment_initiation_id=pain_id, **insert_pmt_inf_kwargs
+        )
+        endtoend_id2pmt_inf_id.update(
+            {tx_inf.endtoend_id: pmt_inf_id for tx_inf in pmt_inf.direct_debit_tx_infs}
+        )
+        _LOGGER.info(
+            "Finished INSERT wsjrdp_direct_debit_payment_infos id=%s", pmt_inf_id
+        )
+
+    df.loc[selected, "pn_direct_debit_payment_info_id"] = df.loc[
+        selected, "sepa_dd_endtoend_id"
+    ].map(lambda id: endtoend_id2pmt_inf_id.get(id))
+    df.loc[selected, "sepa_dd_direct_debit_payment_info_id"] = df.loc[
+        selected, "pn_direct_debit_payment_info_id"
+    ]
+    return pain_id
+
+
+def write_payment_initiations_to_db(
+    conn: _psycopg.Connection,
+    df: _pandas.DataFrame,
+    pain_messages: _collections_abc.Sequence[_pain.PainMessage],
+    *,
+    pain_id: int | None = None,
+) -> list[int]:
+    """Insert or update one payment initiation per PAIN message and its
+    payment infos, and stamp their ids onto the rows of *df*.
+
+    The first message takes over the (planned) payment initiation
+    *pain_id* if given, further messages get a new one each.  Must run
+    before `write_payment_dataframe_to_db` so that accounting entries and
+    pre-notifications are written with the ids of their own file.
+    Returns the payment initiation ids.
+    """
+    pain_ids = []
+    for i, pain_message in enumerate(pain_messages):
+        rows = None
+        if len(pain_messages) > 1:
+            rows = (
+                df["sepa_dd_message_identification"]
+                == pain_message.message_identification
+            )
+        pain_ids.append(
+            _upsert_payment_initiation_and_create_payment_infos(
+                conn,
+                df,
+                pain_message,
+                pain_id=pain_id if i == 0 else None,
+                rows=rows,
+            )
+        )
+    return pain_ids
+
+
 def write_payment_dataframe_to_db(
     conn: _psycopg.Connection, df: _pandas.DataFrame, *, print_progress_message=None
 ) -> None:
@@ -619,8 +666,20 @@ def write_payment_dataframe_to_db(
                     )
                     continue
                 else:
+                    # move the pre-notification to the payment initiation
+                    # and payment info of the file it ended up in
+                    pn_updates = {
+                        "payment_status": "xml_generated",
+                        "payment_initiation_id": to_int_or_none(
+                            row.get("pn_payment_initiation_id")
+                        ),
+                        "direct_debit_payment_info_id": to_int_or_none(
+                            row.get("pn_direct_debit_payment_info_id")
+                        ),
+                    }
+                    pn_updates = {k: v for k, v in pn_updates.items() if v is not None}
                     _pg.pg_update_direct_debit_pre_notification(
-                        cursor, id=pn_id, updates={"payment_status": "xml_generated"}
+                        cursor, id=pn_id, updates=pn_updates
                     )
 
             count += 1
@@ -368,16 +368,6 @@ def _compute_open_amount_cents(row: _pandas.Series) -> int:
     return max(row["amount_due_cents"] - row["amount_paid_cents"], 0)
 
 
-def _iban_to_bank_name(iban: str) -> str | None:
-    import schwifty
-
-    try:
-        return schwifty.IBAN(iban).bank_name
-    except Exception as exc:
-        _LOGGER.debug("Could not determine bank name for IBAN %r: %s", iban, str(exc))
-    return None
-
-
 def _row_to_sepa_mandat_id(row: _pandas.Series) -> str:
     if sepa_mandate_id := (row.get("additional_info") or {}).get("sepa_mandate_id"):
         return sepa_mandate_id
@@ -522,7 +512,7 @@ def _enrich_people_dataframe(
     extra_mailing_bcc: str | _collections_abc.Iterable[str] | None = None,
     skip_db_updates: bool | None = None,
 ) -> None:
-    from . import _util
+    from . import _iban, _util
 
     df["short_first_name"] = df.apply(find_short_first_name, axis=1)
     df["greeting_name"] = df.apply(
@@ -565,7 +555,7 @@ def _enrich_people_dataframe(
     )
     df["sepa_mailing_reply_to"] = None
 
-    df["sepa_bank_name"] = df["sepa_iban"].map(_iban_to_bank_name)
+    df["sepa_bank_name"] = _iban.get_iban_service().bank_name_series(df["sepa_iban"])
     df["sepa_mandate_id"] = df.apply(_row_to_sepa_mandat_id, axis=1)
     df["sepa_mandate_date"] = df["print_at"].map(lambda d: d if d else collection_date)
 
@@ -623,6 +613,33 @@ def _enrich_people_dataframe(
     )
 
 
+def _people_cte_sql(accounting_entry_where_extra: str = "") -> str:
+    """Return the ``WITH "people" AS (...)`` clause used by the people queries.
+
+    The CTE extends the ``people`` table by the array columns
+    (``tag_list``, ``note_list``, ...) that `PeopleWhere` conditions
+    may refer to.
+    """
+    return f"""
+WITH "people" AS (
+  SELECT
+    *,
+    ARRAY(SELECT "tags".name FROM taggings
+          LEFT JOIN "tags" ON taggings.tag_id = "tags".id AND taggings.taggable_type = 'Person'
+          WHERE taggings.taggable_id = people.id AND "tags".name IS NOT NULL ORDER BY "tags"."name"
+    ) AS tag_list,
+    ARRAY(SELECT "a".email FROM additional_emails "a"
+          WHERE "a".contactable_type='Person' AND "a".contactable_id = people.id AND "a".mailings = TRUE
+    ) AS additional_emails_for_mailings,
+    ARRAY(SELECT COALESCE("e".amount_cents, 0) FROM accounting_entries AS "e"
+          WHERE "e".subject_type = 'Person' AND "e".subject_id = people."id" AND COALESCE("e".amount_currency, 'EUR') = 'EUR'{accounting_entry_where_extra}
+    ) AS accounting_entries_amounts_cents,
+    ARRAY(SELECT "n".text FROM "notes" AS "n"
+          WHERE "n".subject_type = 'Person' AND "n".subject_id = people."id"
+    ) AS "note_list"
+  FROM "people")"""
+
+
 def load_people_dataframe(
     conn: _pg.PgConnectionLike | None = None,
     *,
@@ -710,23 +727,7 @@ def load_people_dataframe(
     conn = _pg.to_connection(conn, read_only=True)
     with conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
         sql_stmt = f"""
-WITH "people" AS (
-  SELECT
-    *,
-    ARRAY(SELECT "tags".name FROM taggings
-          LEFT JOIN "tags" ON taggings.tag_id = "tags".id AND taggings.taggable_type = 'Person'
-          WHERE taggings.taggable_id = people.id AND "tags".name IS NOT NULL ORDER BY "tags"."name"
-    ) AS tag_list,
-    ARRAY(SELECT "a".email FROM additional_emails "a"
-          WHERE "a".contactable_type='Person' AND "a".contactable_id = people.id AND "a".mailings = TRUE
-    ) AS additional_emails_for_mailings,
-    ARRAY(SELECT COALESCE("e".amount_cents, 0) FROM accounting_entries AS "e"
-          WHERE "e".subject_type = 'Person' AND "e".subject_id = people."id" AND COALESCE("e".amount_currency, 'EUR') = 'EUR'{accounting_entry_where_extra}
-    ) AS accounting_entries_amounts_cents,
-    ARRAY(SELECT "n".text FROM "notes" AS "n"
-          WHERE "n".subject_type = 'Person' AND "n".subject_id = people."id"
-    ) AS "note_list"
-  FROM "people")
+{_people_cte_sql(accounting_entry_where_extra)}
 SELECT
   people.id, people.primary_group_id, people.unit_code,
   people.created_at, people.updated_at,
@@ -850,6 +851,43 @@ ORDER BY people.id{limit_clause}
     return df
 
 
+def load_people_ids(
+    conn: _pg.PgConnectionLike | None = None,
+    *,
+    where: str | _people_query.PeopleWhere | None = "",
+) -> list[int]:
+    """Return the ids (in ascending order) of all people matching *where*.
+
+    Uses the same ``people`` CTE as `load_people_dataframe` but skips
+    loading and enriching the people rows.
+    """
+    import re
+    import textwrap
+
+    from . import _people_query, _pg
+
+    if isinstance(where, _people_query.PeopleWhere):
+        where = where.as_where_condition(people_table="people")
+    where_clause = f"WHERE {where}" if where else ""
+    sql_stmt = f"""
+{_people_cte_sql()}
+SELECT people.id
+FROM people
+{where_clause}
+ORDER BY people.id
+    """
+    sql_stmt = re.sub(r"\n+", "\n", textwrap.dedent(sql_stmt).strip())
+    _LOGGER.debug(
+        "load_people_ids: Fetch people ids SQL Query:\n%s",
+        textwrap.indent(sql_stmt, "  "),
+    )
+
+    conn = _pg.to_connection(conn, read_only=True)
+    with conn.cursor() as cur:
+        cur.execute(sql_stmt)  # type: ignore
+        return [row[0] for row in cur.fetchall()]
+
+
 def assert_all_people_rows_consistent(df: _pandas.DataFrame) -> None:
     import textwrap
 
@@ -3,6 +3,7 @@ from __future__ import annotations
 import collections.abc as _collections_abc
 import dataclasses as _dataclasses
 import datetime as _datetime
+import functools as _functools
 import logging as _logging
 import re as _re
 import typing as _typing
@@ -11,7 +12,10 @@ from . import _types
 
 
 if _typing.TYPE_CHECKING:
+    import pandas as _pandas
+
     from . import _role
+    from ._models import group as _group
 
 
 _LOGGER = _logging.getLogger(__name__)
@@ -148,6 +152,62 @@ class ArrayMatchExpr:
             array, *self.expr, op=self.op, join_op="AND", array_comp_func=self.func
         )
 
+    def as_mask(self, arrays: _pandas.Series, /) -> _pandas.Series | None:
+        """Evaluate `as_where_condition` for every array in *arrays*.
+
+        Returns a nullable ``"boolean"`` series (``NA`` where SQL
+        yields ``NULL``) or `None` if there is no condition.
+
+        >>> import pandas as pd
+        >>> tags = pd.Series([["A", "B"], ["B"], []])
+        >>> ArrayMatchExpr(expr="A").as_mask(tags).tolist()
+        [True, False, False]
+        >>> ArrayMatchExpr.normalize("A", negate=True).as_mask(tags).tolist()
+        [False, True, True]
+        >>> ArrayMatchExpr(expr="%b", op="ILIKE").as_mask(tags).tolist()
+        [True, True, False]
+        """
+        import pandas as pd
+
+        from . import _util
+
+        if not self.expr:
+            return None
+        op = _re.sub(r"\s+", " ", self.op.strip().upper())
+        func = self.func.upper()
+        if func not in ("ANY", "SOME", "ALL"):
+            raise ValueError(f"Unsupported array comparison function {func!r}")
+        is_like_op = op in _util._LIKE_OPS
+        neg_op = _util.negate_sql_comparison_op(op) if is_like_op else op
+
+        def eval_array(array, val) -> bool | None:
+            if is_like_op:
+                # EXISTS / NOT EXISTS over UNNEST(array), never NULL
+                elts = [] if _is_null(array) else list(array)
+                if func == "ALL":
+                    return not any(_sql_compare(e, neg_op, val) for e in elts)
+                return any(_sql_compare(e, op, val) for e in elts)
+            if _is_null(array):
+                return None
+            results = [_sql_compare(val, op, e) for e in array]
+            if func == "ALL":
+                if any(r is False for r in results):
+                    return False
+                return None if any(r is None for r in results) else True
+            if any(r is True for r in results):
+                return True
+            return None if any(r is None for r in results) else False
+
+        mask = None
+        for val in self.expr:
+            val_mask = pd.Series(
+                [eval_array(array, val) for array in arrays],
+                index=arrays.index,
+                dtype="boolean",
+            )
+            mask = val_mask if mask is None else (mask & val_mask)
+        return mask
+
     def to_out(self) -> ArrayMatchDict | list[str] | str | None:
         if not self.expr:
             return None
@@ -670,6 +730,170 @@ class PeopleWhere:
             f"AND {status_cond})"
         )
 
+    def as_mask(
+        self,
+        df: _pandas.DataFrame,
+        /,
+        *,
+        groups: _collections_abc.Iterable[_group.Group] | None = None,
+    ) -> _pandas.Series:
+        """Evaluate this condition for the people dataframe *df*.
+
+        Returns a boolean series (aligned with *df*) that selects the
+        same rows as `as_where_condition` would, including the SQL
+        ``NULL`` semantics. *df* must contain the columns referenced
+        by the condition (as returned by `load_people_dataframe`).
+        Primary groups given by name need *groups* to be resolved.
+
+        Conditions that need other tables (``raw_sql`` and
+        ``pre_notification_status``) raise a `ValueError`.
+
+        >>> import pandas as pd
+        >>> df = pd.DataFrame({"id": [1, 2, 3], "status": ["printed", None, "deregistered"]})
+        >>> PeopleWhere(exclude_deregistered=True).as_mask(df).tolist()
+        [True, False, False]
+        >>> PeopleWhere(or_=[PeopleWhere(id=3), PeopleWhere(status=False)]).as_mask(df).tolist()
+        [False, True, True]
+        """
+        import pandas as pd
+
+        mask = self.__as_mask_or_none(df, groups=groups)
+        if mask is None:
+            return pd.Series(True, index=df.index, dtype=bool)
+        return mask.fillna(False).astype(bool)
+
+    def __as_mask_or_none(
+        self,
+        df: _pandas.DataFrame,
+        *,
+        groups: _collections_abc.Iterable[_group.Group] | None,
+    ) -> _pandas.Series | None:
+        from ._models import group as _group
+
+        if self.raw_sql is not None:
+            raise ValueError("Cannot evaluate raw_sql of PeopleWhere in memory")
+        if self.pre_notification_status or self.exclude_pre_notification_status:
+            raise ValueError(
+                "Cannot evaluate pre_notification_status of PeopleWhere in memory"
+            )
+
+        masks: list[_pandas.Series | None] = []
+        if self.exclude_deregistered:
+            masks.append(
+                _not_in_mask(
+                    _mask_column(df, "status"), ["deregistration_noted", "deregistered"]
+                )
+            )
+        if self.exclude_waiting_lists:
+            masks.append(
+                _not_in_mask(
+                    _mask_column(df, "primary_group_id"),
+                    _group.Group.WAITING_LIST_GROUPS,
+                )
+            )
+        if self.role is not None:
+            payment_roles = []
+            for role in self.role:
+                payment_roles.extend(
+                    [role.regular_payer_payment_role, role.early_payer_payment_role]
+                )
+            db_payment_roles = _mask_column(df, "payment_role").map(
+                lambda r: getattr(r, "value", r)
+            )
+            masks.append(_in_mask(db_payment_roles, payment_roles))
+        for key in ("early_payer", "foto_permission"):
+            if (val := getattr(self, key)) is not None:
+                col = _mask_column(df, key).astype("boolean")
+                masks.append(col.fillna(False).eq(False) if not val else col.eq(True))
+        if self.max_print_at is not None:
+            masks.append(
+                _mask_from_values(
+                    df.index,
+                    (
+                        None if _is_null(v) else _to_date(v) <= self.max_print_at
+                        for v in _mask_column(df, "print_at")
+                    ),
+                )
+            )
+        masks.append(
+            self.__primary_group_mask(df, self.primary_group, groups, exclude=False)
+        )
+        masks.append(
+            self.__primary_group_mask(
+                df, self.exclude_primary_group, groups, exclude=True
+            )
+        )
+        for key in ["id", "sepa_status", "email", "status", "unit_code"]:
+            val = getattr(self, key, None)
+            exclude_val = getattr(self, f"exclude_{key}", None)
+            if val is None and exclude_val is None:
+                continue
+            col = _mask_column(df, key)
+            if key == "sepa_status":
+                col = col.where(col.notna(), "ok")
+            if val is not None:
+                masks.append(_in_mask(col, val))
+            if exclude_val is not None:
+                masks.append(_not_in_mask(col, exclude_val))
+        for key, col_name in [("tag", "tag_list"), ("note", "note_list")]:
+            for expr in (getattr(self, key), getattr(self, f"exclude_{key}")):
+                if expr is not None:
+                    masks.append(expr.as_mask(_mask_column(df, col_name)))
+        if self.not_ is not None:
+            not_mask = self.not_.__as_mask_or_none(df, groups=groups)
+            if not_mask is not None:
+                masks.append(~not_mask)
+        if self.and_:
+            masks.append(
+                _combine_masks(
+                    [w.__as_mask_or_none(df, groups=groups) for w in self.and_]
+                )
+            )
+        if self.or_:
+            masks.append(
+                _combine_masks(
+                    [w.__as_mask_or_none(df, groups=groups) for w in self.or_],
+                    op="OR",
+                )
+            )
+        return _combine_masks(masks)
+
+    def __primary_group_mask(
+        self,
+        df: _pandas.DataFrame,
+        val: _collections_abc.Sequence[str | int] | None,
+        groups: _collections_abc.Iterable[_group.Group] | None,
+        *,
+        exclude: bool = False,
+    ) -> _pandas.Series | None:
+        import pandas as pd
+
+        in_not_in_mask = _not_in_mask if exclude else _in_mask
+
+        if val is None:
+            return None
+        elif not val:
+            return pd.Series(exclude, index=df.index, dtype="boolean")
+        elif all(isinstance(v, int) for v in val):
+            return in_not_in_mask(_mask_column(df, "primary_group_id"), val)
+        elif groups is None:
+            raise ValueError(
+                "Cannot evaluate primary group names of PeopleWhere in memory "
+                "without groups"
+            )
+        else:
+            int_vals = {v for v in val if isinstance(v, int)}
+            str_vals = {v for v in val if not isinstance(v, int)}
+            group_ids = [
+                g.id
+                for g in groups
+                if g.id in int_vals
+                or g.name in str_vals
+                or g.short_name in str_vals
+                or g.group_code in str_vals
+            ]
+            return in_not_in_mask(_mask_column(df, "primary_group_id"), group_ids)
+
 
 _PeopleWhereLike = PeopleWhere | dict | str
 
@@ -828,3 +1052,158 @@ def _to_primary_group_list_or_none(*args) -> list[str | int] | None:
         for x in map(_normalize_group_name_or_id, _util.iter_nested_int_or_str(*args))
         if x is not None
     ]
+
+
+def _is_null(x: _typing.Any) -> bool:
+    import pandas as pd
+
+    return x is None or x is _types.NULL or (pd.api.types.is_scalar(x) and pd.isna(x))
+
+
+def _to_date(x: _typing.Any) -> _datetime.date:
+    if isinstance(x, _datetime.datetime):
+        return x.date()
+    elif isinstance(x, _datetime.date):
+        return x
+    else:
+        from . import _util
+
+        return _util.to_date(x)
+
+
+def _mask_column(df: _pandas.DataFrame, col_name: str) -> _pandas.Series:
+    if col_name not in df.columns:
+        raise ValueError(
+            f"Cannot evaluate PeopleWhere in memory, missing column {col_name!r}"
+        )
+    return df[col_name]
+
+
+def _mask_from_values(
+    index: _pandas.Index, values: _collections_abc.Iterable[bool | None]
+) -> _pandas.Series:
+    import pandas as pd
+
+    return pd.Series(list(values), index=index, dtype="boolean")
+
+
+def _combine_masks(
+    masks: _collections_abc.Iterable[_pandas.Series | None], *, op: str = "AND"
+) -> _pandas.Series | None:
+    """Combine *masks* like `combine_where` (`None` masks are skipped)."""
+    result = None
+    for mask in masks:
+        if mask is None:
+            continue
+        elif result is None:
+            result = mask
+        elif op == "AND":
+            result = result & mask
+        else:
+            result = result | mask
+    return result
+
+
+def _in_mask(
+    col: _pandas.Series, elts: _collections_abc.Iterable[_typing.Any]
+) -> _pandas.Series:
+    """Mask equivalent to `in_expr` (incl. `NULL` and `NOT_NULL`)."""
+    import pandas as pd
+
+    elts = list(elts)
+    if not elts:
+        return pd.Series(False, index=col.index, dtype="boolean")
+    elif any(x is None or x is _types.NULL for x in elts):
+        elts_wo_none = [x for x in elts if not (x is None or x is _types.NULL)]
+        is_null = col.isna().astype("boolean")
+        return (_in_mask(col, elts_wo_none) | is_null) if elts_wo_none else is_null
+    elif any(x is _types.NOT_NULL for x in elts):
+        elts_wo_not_null = [x for x in elts if x is not _types.NOT_NULL]
+        not_null = col.notna().astype("boolean")
+        if elts_wo_not_null:
+            return _in_mask(col, elts_wo_not_null) | not_null
+        return not_null
+    else:
+        return col.isin(elts).astype("boolean").mask(col.isna())
+
+
+def _not_in_mask(
+    col: _pandas.Series, elts: _collections_abc.Iterable[_typing.Any]
+) -> _pandas.Series:
+    """Mask equivalent to `not_in_expr` (incl. `NULL` and `NOT_NULL`)."""
+    import pandas as pd
+
+    elts = list(elts)
+    if not elts:
+        return pd.Series(True, index=col.index, dtype="boolean")
+    elif any(x is None or x is _types.NULL for x in elts):
+        elts_wo_none = [x for x in elts if not (x is None or x is _types.NULL)]
+        not_null = col.notna().astype("boolean")
+        if elts_wo_none:
+            return _not_in_mask(col, elts_wo_none) & not_null
+        return not_null
+    elif any(x is _types.NOT_NULL for x in elts):
+        elts_wo_not_null = [x for x in elts if x is not _types.NOT_NULL]
+        is_null = col.isna().astype("boolean")
+        if elts_wo_not_null:
+            return _not_in_mask(col, elts_wo_not_null) & is_null
+        return is_null
+    else:
+        return (~col.isin(elts)).astype("boolean").mask(col.isna())
+
+
+def _sql_compare(left: _typing.Any, op: str, right: _typing.Any) -> bool | None:
+    """Evaluate ``left op right`` with SQL semantics (`None` for ``NULL``).
+
+    >>> _sql_compare("Warteliste 2", "ILIKE", "%warteliste%")
+    True
+    >>> _sql_compare("a", "<>", None) is None
+    True
+    """
+    import operator
+
+    if _is_null(left) or _is_null(right):
+        return None
+    match op:
+        case "=":
+            return left == right
+        case "<>":
+            return left != right
+        case "<" | "<=" | ">" | ">=":
+            cmp = {"<": operator.lt, "<=": operator.le, ">": operator.gt}
+            return cmp.get(op, operator.ge)(left, right)
+        case _:
+            regex, negate, fullmatch = _sql_pattern_regex(op, str(right))
+            match = regex.fullmatch if fullmatch else regex.search
+            return (
+                (match(str(left)) is None) if negate else (match(str(left)) is not None)
+            )
+
+
+@_functools.lru_cache(maxsize=256)
+def _sql_pattern_regex(op: str, pattern: str) -> tuple[_re.Pattern, bool, bool]:
+    """Return ``(regex, negate, fullmatch)`` for the pattern operator *op*."""
+    negate = op.startswith(("NOT ", "!"))
+    base_op = op.removeprefix("NOT ").removeprefix("!")
+    flags = _re.DOTALL
+    if base_op in ("ILIKE", "~*"):
+        flags |= _re.IGNORECASE
+    if base_op in ("~", "~*"):
+        return _re.compile(pattern, flags), negate, False
+    elif base_op in ("LIKE", "ILIKE", "SIMILAR TO"):
+        parts = []
+        chars = iter(pattern)
+        for c in chars:
+            if c == "\\":
+                parts.append(_re.escape(next(chars, "\\")))
+            elif c == "%":
+                parts.append(".*")
+            elif c == "_":
+                parts.append(".")
+            elif base_op == "SIMILAR TO":
+                parts.append(c)
+            else:
+                parts.append(_re.escape(c))
+        return _re.compile("".join(parts), flags), negate, True
+    else:
+        raise ValueError(f"Unsupported comparison operator {op!r}")
@@ -390,6 +390,37 @@ def pg_select_dataframe(
     return _pandas.DataFrame(pg_select_dict_rows(conn, query))
 
 
+def pg_iter_dict_rows(
+    conn: PgConnectionLike | None,
+    query: str | _psycopg_sql.Composed | _string_templatelib.Template,
+    *,
+    cursor_name: str = "pg_iter_dict_rows",
+    itersize: int = 2000,
+) -> _collections_abc.Iterator[dict[str, _typing.Any]]:
+    """Like `pg_select_dict_rows`, but stream the rows.
+
+    The query runs in a server-side (named) cursor which is fetched
+    *itersize* rows at a time, so the result set is never held in memory
+    as a whole.  The cursor lives in the connection's current
+    transaction and is closed when the iterator is exhausted or closed.
+    """
+    import psycopg.rows
+    import psycopg.sql as _psycopg_sql
+
+    if isinstance(query, str):
+        query = _psycopg_sql.SQL(query)  # type: ignore
+    conn = to_connection(conn)
+    with conn.cursor(name=cursor_name, row_factory=psycopg.rows.dict_row) as cursor:
+        cursor.itersize = itersize
+        try:
+            cursor.execute(query)
+        except Exception:
+            query_str = _psycopg_sql.as_string(query, context=conn)
+            _LOGGER.error("failed to execute\n%s", _textwrap.indent(query_str, "  | "))
+            raise
+        yield from cursor
+
+
 def pg_select_groups_dicts_for_where(
     conn: PgConnectionLike | None,
     /,
@@ -1187,8 +1218,48 @@ WHERE {where:q}""",
     }
 
 
-def pg_insert_camt_transaction(
-    cursor,
+def pg_insert_camt_transaction(cursor, **kwargs) -> int:
+    """Insert one row into ``wsjrdp_camt_transactions``.
+
+    See `camt_transaction_insert_query` for the keyword arguments.
+    """
+    return _execute_query_fetch_id(cursor, camt_transaction_insert_query(**kwargs))
+
+
+def pg_insert_camt_transactions(
+    conn: _psycopg.Connection,
+    rows: _collections_abc.Iterable[dict],
+    *,
+    upsert: bool | None = None,
+    chunk_size: int = 500,
+) -> list[int]:
+    """Insert many rows into ``wsjrdp_camt_transactions`` in one transaction.
+
+    Each row holds the keyword arguments of `camt_transaction_insert_query`
+    (e.g. from `camt_tx_insert_kwargs`).  The rows are consumed lazily and
+    sent as multi-statement queries of *chunk_size* INSERTs each.  Returns
+    the ids in the order of *rows*.
+    """
+    import itertools
+
+    from psycopg.sql import SQL
+
+    ids = []
+    with conn.transaction(), conn.cursor() as cur:
+        for chunk in itertools.batched(rows, chunk_size):
+            query = SQL(";\n").join(
+                camt_transaction_insert_query(**row, upsert=upsert) for row in chunk
+            )
+            _LOGGER.debug(
+                "INSERT INTO wsjrdp_camt_transactions ... (%s rows)", len(chunk)
+            )
+            cur.execute(query)
+            for _ in cur.results():
+                ids.extend(row[0] for row in cur.fetchall())
+    return ids
+
+
+def camt_transaction_insert_query(
     *,
     camt_type: str,
     account_identification: str,
@@ -1196,7 +1267,7 @@ def pg_insert_camt_transaction(
     credit_debit_indication: str,
     amount_cents: int,
     amount_currency: str,
-    value_date: _datetime.date | str,
+    value_date: _datetime.date | str | None,
     description: str | None = None,
     # message
     message_identification: str | None = None,
@@ -1250,7 +1321,7 @@ def pg_insert_camt_transaction(
     additional_info: dict | None = None,
     entry_or_details: str | None = None,
     upsert: bool | None = None,
-) -> int:
+) -> _psycopg_sql.Composed:
     from . import _util
 
     matching_colval_pairs = [
@@ -1264,7 +1335,7 @@ def pg_insert_camt_transaction(
         ("credit_debit_indication", credit_debit_indication),
         ("amount_cents", amount_cents),
         ("amount_currency", amount_currency or "EUR"),
-        ("value_date", _util.to_date(value_date)),
+        ("value_date", _util.to_date_or_none(value_date)),
         ("description", description),
         # message
         ("message_identification", message_identification),
@@ -1327,14 +1398,13 @@ def pg_insert_camt_transaction(
         ("entry_or_details", entry_or_details or "entry"),
     ]
 
-    query = col_val_pairs_to_insert_or_upsert_query(
+    return col_val_pairs_to_insert_or_upsert_query(
         "wsjrdp_camt_transactions",
         matching_colval_pairs=matching_colval_pairs,
         other_colval_pairs=other_colval_pairs,
         returning="id",
         upsert=upsert,
     )
-    return _execute_query_fetch_id(cursor, query)
 
 
 def pg_insert_camt_transaction_from_tx(
@@ -1359,61 +1429,9 @@ def pg_insert_camt_transaction_from_tx(
     additional_info: dict | None = None,
     upsert: bool | None = None,
 ) -> int:
-    from . import _util
-
-    if (
-        subject_id is None
-        and subject_type in (None, "Person")
-        and (
-            (hitobito_id := _util.hitobito_id_from_sepa_mandate_id(tx.mandate_id))
-            is not None
-        )
-    ):
-        subject_id = hitobito_id
-        subject_type = "Person"
     return pg_insert_camt_transaction(
         cursor,
-        # Mandatory
-        camt_type=tx.camt_type,
-        account_identification=tx.account_identification,
-        account_servicer_reference=tx.account_servicer_reference,
-        credit_debit_indication=tx.credit_debit_indication,
-        amount_cents=tx.amount_cents,
-        amount_currency=tx.amount_currency,
-        value_date=tx.value_date,
-        description=tx.description,
-        # message
-        message_identification=tx.message_identification,
-        message_creation_date_time=tx.message_creation_date_time,
-        # Rpt / Stmt / ...
-        report_identification=tx.report_identification,
-        report_electronic_sequence_number=tx.report_electronic_sequence_number,
-        report_legal_sequence_number=tx.report_legal_sequence_number,
-        report_page_number=tx.report_page_number,
-        report_creation_date_time=tx.report_creation_date_time,
-        # Ntry
-        status=tx.status,
-        additional_entry_info=tx.additional_entry_info,
-        booking_date=tx.booking_date,
-        number_of_transactions=1,
-        # TxDtls
-        transaction_details_index=tx.transaction_details_index,
-        references=tx.references,
-        endtoend_id=tx.endtoend_id,
-        mandate_id=tx.mandate_id,
-        bank_transaction_code=tx.bank_transaction_code,
-        bank_transaction_code_dk=tx.bank_transaction_code_dk,
-        return_reason=tx.return_reason,
-        cdtr_name=tx.cdtr_name,
-        cdtr_iban=tx.cdtr_iban,
-        cdtr_bic=tx.cdtr_bic,
-        cdtr_address=tx.cdtr_address,
-        dbtr_name=tx.dbtr_name,
-        dbtr_iban=tx.dbtr_iban,
-        dbtr_bic=tx.dbtr_bic,
-        dbtr_address=tx.dbtr_address,
-        # metadata
-        entry_or_details="entry",
+        **camt_tx_insert_kwargs(tx, subject_id=subject_id, subject_type=subject_type),
         # metadata
         created_at=created_at,
         updated_at=updated_at,
@@ -1424,19 +1442,60 @@ def pg_insert_camt_transaction_from_tx(
         reversed_by_id=reversed_by_id,
         reverses_id=reverses_id,
         partially_reverses_id=partially_reverses_id,
-        subject_id=subject_id,
-        subject_type=subject_type,
         fin_account_id=fin_account_id,
         payment_initiation_id=payment_initiation_id,
         partially_reverses_payment_initiation_id=partially_reverses_payment_initiation_id,
         direct_debit_payment_info_id=direct_debit_payment_info_id,
-        ntry=tx.Ntry or None,
-        tx_dtls=tx.TxDtls or None,
         additional_info=additional_info,
         upsert=upsert,
     )
 
 
+def camt_tx_insert_kwargs(
+    tx: _camt.CamtTransactionDetails | _camt.CamtTxRecord,
+    *,
+    subject_id: int | None = None,
+    subject_type: str | None = None,
+) -> dict[str, _typing.Any]:
+    """Return the `camt_transaction_insert_query` arguments taken from *tx*.
+
+    The result only contains plain values (no references to *tx*), so it
+    can be sent to other processes.
+    """
+    from . import _camt, _util
+
+    record = tx if isinstance(tx, _camt.CamtTxRecord) else tx.to_record()
+    if (
+        subject_id is None
+        and subject_type in (None, "Person")
+        and (
+            (hitobito_id := _util.hitobito_id_from_sepa_mandate_id(record.mandate_id))
+            is not None
+        )
+    ):
+        subject_id = hitobito_id
+        subject_type = "Person"
+    kwargs = record.asdict()
+    del kwargs["is_booked"]
+    kwargs.update(
+        number_of_transactions=1,
+        entry_or_details="entry",
+        subject_id=subject_id,
+        subject_type=subject_type,
+        ntry=record.ntry or None,
+        tx_dtls=record.tx_dtls or None,
+    )
+    return kwargs
+
+
+def pg_select_fin_account_ids(conn: PgConnectionLike, /) -> dict[str, int]:
+    """Map ``account_identification`` to ``wsjrdp_fin_accounts.id``."""
+    rows = pg_select_dict_rows(
+        conn, t"""SELECT "id", "account_identification" FROM wsjrdp_fin_accounts;"""
+    )
+    return {row["account_identification"]: row["id"] for row in rows}
+
+
 def pg_insert_fin_account(
     cursor_or_connection,
     /,
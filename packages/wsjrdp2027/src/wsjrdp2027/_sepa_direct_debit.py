@@ -1,17 +1,23 @@
 from __future__ import annotations
 
+import contextlib as _contextlib
 import dataclasses as _dataclasses
 import datetime as _datetime
+import functools as _functools
+import itertools as _itertools
 import logging as _logging
 import pathlib as _pathlib
 import typing as _typing
 
-import sepaxml as _sepaxml
+from sepaxml import utils as _sepaxml_utils
 
 from . import _pg, _report_tree, _types
 
 
 if _typing.TYPE_CHECKING:
+    import collections.abc as _collections_abc
+
+    import lxml.etree as _lxml_etree
     import pandas as _pandas
     import psycopg.sql as _psycopg_sql
 
@@ -54,21 +60,70 @@ class SepaDirectDebitPayment(_typing.TypedDict, total=False):
     endtoend_id: str
 
 
+@_dataclasses.dataclass(kw_only=True, frozen=True)
+class SepaDirectDebitSplitPolicy:
+    """How `SepaDirectDebit.split` distributes payments over several files.
+
+    ``None`` means no limit.  A single payment above
+    *max_control_sum_cents* still gets a file of its own.
+    """
+
+    max_transactions: int | None = None
+    """Maximum number of transactions per file."""
+    max_control_sum_cents: int | None = None
+    """Maximum control sum per file."""
+    max_pmt_inf_transactions: int | None = None
+    """Maximum number of transactions per ``PmtInf`` block."""
+    split_by_sequence_type: bool = True
+    """Separate files per ``sepa_dd_sequence_type`` (FRST, RCUR, OOFF, FNAL)."""
+    split_by_collection_date: bool = True
+    """Separate files per collection date."""
+
+
 class SepaDirectDebit:
+    """Collect SEPA direct debit payments and write them as pain.008 XML.
+
+    Payments are kept as plain dicts grouped by sequence type and
+    collection date.  On export ``NbOfTxs``/``CtrlSum`` are computed from
+    these groups first, then the document is streamed with
+    `lxml.etree.xmlfile`, one ``PmtInf`` per group, so that no element
+    tree of the whole file is built.  The output is byte-compatible with
+    ``sepaxml.SepaDD`` (which was used before) apart from the random ids,
+    as long as ``minidom`` leaves ``"`` in text unescaped (Python 3.13+).
+    """
+
     _num_payments: int
 
     def __init__(
-        self, config: _types.SepaDirectDebitConfig, *, schema: str = "pain.008.001.02"
+        self,
+        config: _types.SepaDirectDebitConfig,
+        *,
+        schema: str = "pain.008.001.02",
+        max_pmt_inf_transactions: int | None = None,
     ) -> None:
+        from text_unidecode import unidecode
+
         raw_config: dict = config.copy()  # type: ignore
-        raw_config.pop("address_as_single_line", None)  # not to be seen by sepaxml
+        raw_config.pop("address_as_single_line", None)  # not written to the XML
         raw_config.setdefault("currency", "EUR")
-        raw_config.setdefault("batch", True)
+        raw_config.setdefault("instrument", "CORE")
         for key in ["name"]:
             if key in raw_config:
                 raw_config[key] = _german_transliterate(raw_config[key])
-
-        self._dd = _sepaxml.SepaDD(raw_config, schema=schema, clean=True)
+        required = ["name", "IBAN", "creditor_id", "currency"]
+        if schema == "pain.008.001.02":
+            required.append("BIC")
+        if missing := [key for key in required if key not in raw_config]:
+            raise ValueError(f"SEPA direct debit config is missing {missing}")
+        raw_config["name"] = unidecode(raw_config["name"])[:70]
+
+        self._raw_config = config
+        self._config = raw_config
+        self._schema = schema
+        self._max_pmt_inf_transactions = max_pmt_inf_transactions
+        self._message_identification = _sepaxml_utils.make_msg_id()
+        self._creation_date_time = _datetime.datetime.now()
+        self._batches: dict[tuple[str, str], list[SepaDirectDebitPayment]] = {}
         self._num_payments = 0
 
     @property
@@ -76,9 +131,59 @@ class SepaDirectDebit:
         """Number of payments added to this SEPA direct debit."""
         return self._num_payments
 
+    @property
+    def message_identification(self) -> str:
+        return self._message_identification
+
+    @property
+    def control_sum_cents(self) -> int:
+        return sum(p["amount"] for ps in self._batches.values() for p in ps)
+
+    @property
+    def payments(self) -> list[SepaDirectDebitPayment]:
+        """The added payments as cleaned by `add_payment`, grouped like
+        the ``PmtInf`` blocks."""
+        return [p for payments in self._batches.values() for p in payments]
+
+    def split(self, policy: SepaDirectDebitSplitPolicy) -> list[SepaDirectDebit]:
+        """Distribute the payments over new `SepaDirectDebit` objects (one
+        per file) according to *policy*, keeping their order."""
+        groups: dict[tuple[str | None, str | None], list[SepaDirectDebitPayment]] = {}
+        for (seq_type, collection_date), payments in self._batches.items():
+            key = (
+                seq_type if policy.split_by_sequence_type else None,
+                collection_date if policy.split_by_collection_date else None,
+            )
+            groups.setdefault(key, []).extend(payments)
+
+        parts: list[SepaDirectDebit] = []
+        for payments in groups.values():
+            part: SepaDirectDebit | None = None
+            part_sum = 0
+            for payment in payments:
+                if part is None or (
+                    (max_txs := policy.max_transactions) is not None
+                    and part.num_payments >= max_txs
+                ) or (
+                    (max_sum := policy.max_control_sum_cents) is not None
+                    and part_sum + payment["amount"] > max_sum
+                ):  # fmt: skip
+                    part = SepaDirectDebit(
+                        self._raw_config,
+                        schema=self._schema,
+                        max_pmt_inf_transactions=policy.max_pmt_inf_transactions,
+                    )
+                    parts.append(part)
+                    part_sum = 0
+                part.__add_raw_payment(payment)
+                part_sum += payment["amount"]
+        return parts
+
     def add_payment(
         self, payment: SepaDirectDebitPayment, *, pedantic: bool = True
     ) -> SepaDirectDebitPayment:
+        from text_unidecode import unidecode
+
         raw_payment: SepaDirectDebitPayment = payment.copy()
         raw_payment["amount"] = raw_payment.pop("amount")
 
@@ -93,13 +198,31 @@ class SepaDirectDebit:
         for key in ["name", "description"]:
             if key in raw_payment:
                 raw_payment[key] = _german_transliterate(raw_payment[key])
+        raw_payment["name"] = unidecode(raw_payment["name"])[:70]
+        raw_payment["description"] = unidecode(raw_payment["description"])[:140]
+
+        if not isinstance(raw_payment["amount"], int):
+            raise TypeError(f"Payment amount is not an int: {raw_payment['amount']!r}")
+        for key in ["mandate_date", "collection_date"]:
+            if not isinstance(raw_payment[key], _datetime.date):
+                raise TypeError(f"Payment {key} is not a date: {raw_payment[key]!r}")
+            raw_payment[key] = str(raw_payment[key])
+        if not raw_payment.get("endtoend_id", ""):
+            raw_payment["endtoend_id"] = _sepaxml_utils.make_id(self._config["name"])
+
+        self.__add_raw_payment(raw_payment)
+        return raw_payment
 
-        self._dd.add_payment(raw_payment)
+    def __add_raw_payment(self, raw_payment: SepaDirectDebitPayment) -> None:
+        batch_key = (raw_payment["type"], str(raw_payment["collection_date"]))
+        self._batches.setdefault(batch_key, []).append(raw_payment)
         self._num_payments += 1
-        return raw_payment
 
     def add_payment_from_accounting_row(
-        self, row: _pandas.Series, *, pedantic: bool = True
+        self,
+        row: _pandas.Series | _collections_abc.Mapping[str, _typing.Any],
+        *,
+        pedantic: bool = True,
     ) -> SepaDirectDebitPayment:
         payment: SepaDirectDebitPayment = {
             "name": row["sepa_name"],
@@ -120,12 +243,214 @@ class SepaDirectDebit:
         return self.export_bytes(pretty_print=pretty_print).decode("utf-8")
 
     def export_bytes(self, *, pretty_print: bool = True) -> bytes:
-        return self._dd.export(validate=True, pretty_print=pretty_print)
+        import io
 
-    def export_file(self, path: str | _pathlib.Path, pretty_print: bool = True) -> None:
-        xml_bytes = self.export_bytes(pretty_print=pretty_print)
+        buf = io.BytesIO()
+        self.write(buf, pretty_print=pretty_print)
+        xml_bytes = buf.getvalue()
+        _validate_pain_xml(xml_bytes, self._schema)
+        return xml_bytes
+
+    def export_file(
+        self,
+        path: str | _pathlib.Path,
+        pretty_print: bool = True,
+        *,
+        validate: bool = True,
+    ) -> None:
         with open(path, "wb") as f:
-            f.write(xml_bytes)
+            self.write(f, pretty_print=pretty_print)
+        if validate:
+            _validate_pain_xml(path, self._schema)
+
+    def write(self, file: _typing.BinaryIO, *, pretty_print: bool = True) -> None:
+        """Stream the pain.008 document to the binary *file*."""
+        import lxml.etree as _lxml_etree
+
+        # Pre-pass: NbOfTxs / CtrlSum of the PmtInf blocks and the message.
+        pmt_infs = [
+            (seq_type, collection_date, chunk, sum(p["amount"] for p in chunk))
+            for (seq_type, collection_date), payments in self._batches.items()
+            for chunk in _itertools.batched(
+                payments, self._max_pmt_inf_transactions or len(payments)
+            )
+        ]
+        if pretty_print:
+            file.write(b'<?xml version="1.0" encoding="utf-8"?>\n')
+        else:
+            file.write(b'<?xml version="1.0" encoding="UTF-8"?>')
+        with _lxml_etree.xmlfile(file, encoding="utf-8") as xf:
+            w = _Pain008Writer(xf, schema=self._schema, pretty_print=pretty_print)
+            with w.element("Document", nsmap=True), w.element("CstmrDrctDbtInitn"):
+                with w.element("GrpHdr"):
+                    w.leaf("MsgId", self._message_identification)
+                    w.leaf(
+                        "CreDtTm",
+                        self._creation_date_time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    )
+                    w.leaf("NbOfTxs", str(self._num_payments))
+                    ctrl_sum = sum(pmt_inf[3] for pmt_inf in pmt_infs)
+                    w.leaf("CtrlSum", _cents_to_decimal_str(ctrl_sum))
+                    with w.element("InitgPty"):
+                        w.leaf("Nm", self._config["name"])
+                        with w.path("Id", "OrgId", "Othr"):
+                            w.leaf("Id", self._config["creditor_id"])
+                for seq_type, collection_date, payments, ctrl_sum in pmt_infs:
+                    with w.element("PmtInf"):
+                        self.__write_pmt_inf_header(
+                            w,
+                            seq_type=seq_type,
+                            collection_date=collection_date,
+                            nb_of_txs=len(payments),
+                            ctrl_sum=ctrl_sum,
+                        )
+                        for payment in payments:
+                            self.__write_drct_dbt_tx_inf(w, payment)
+        if pretty_print:
+            file.write(b"\n")
+
+    def __write_pmt_inf_header(
+        self,
+        w: _Pain008Writer,
+        *,
+        seq_type: str,
+        collection_date: str,
+        nb_of_txs: int,
+        ctrl_sum: int,
+    ) -> None:
+        config = self._config
+        w.leaf("PmtInfId", _sepaxml_utils.make_id(config["name"]))
+        w.leaf("PmtMtd", "DD")
+        w.leaf("BtchBookg", "true")
+        w.leaf("NbOfTxs", str(nb_of_txs))
+        w.leaf("CtrlSum", _cents_to_decimal_str(ctrl_sum))
+        with w.element("PmtTpInf"):
+            with w.element("SvcLvl"):
+                w.leaf("Cd", "SEPA")
+            with w.element("LclInstrm"):
+                w.leaf("Cd", config["instrument"])
+            w.leaf("SeqTp", seq_type)
+        w.leaf("ReqdColltnDt", collection_date)
+        with w.element("Cdtr"):
+            w.leaf("Nm", config["name"])
+        with w.path("CdtrAcct", "Id"):
+            w.leaf("IBAN", config["IBAN"])
+        with w.path("CdtrAgt", "FinInstnId"):
+            if "BIC" in config:
+                w.leaf(w.bic_tag, config["BIC"])
+            else:
+                with w.element("Othr"):
+                    w.leaf("Id", "NOTPROVIDED")
+        w.leaf("ChrgBr", "SLEV")
+        with w.path("CdtrSchmeId", "Id", "PrvtId", "Othr"):
+            w.leaf("Id", config["creditor_id"])
+            with w.element("SchmeNm"):
+                w.leaf("Prtry", "SEPA")
+
+    def __write_drct_dbt_tx_inf(
+        self, w: _Pain008Writer, payment: SepaDirectDebitPayment
+    ) -> None:
+        with w.element("DrctDbtTxInf"):
+            with w.element("PmtId"):
+                w.leaf("EndToEndId", payment["endtoend_id"])
+            w.leaf(
+                "InstdAmt",
+                _cents_to_decimal_str(payment["amount"]),
+                Ccy=payment.get("currency", self._config["currency"]),
+            )
+            with w.path("DrctDbtTx", "MndtRltdInf"):
+                w.leaf("MndtId", payment["mandate_id"])
+                w.leaf("DtOfSgntr", str(payment["mandate_date"]))
+            with w.path("DbtrAgt", "FinInstnId"):
+                if bic := payment.get("BIC"):
+                    w.leaf(w.bic_tag, bic)
+                else:
+                    with w.element("Othr"):
+                        w.leaf("Id", "NOTPROVIDED")
+            with w.element("Dbtr"):
+                w.leaf("Nm", payment["name"])
+            with w.path("DbtrAcct", "Id"):
+                w.leaf("IBAN", payment["IBAN"])
+            with w.element("RmtInf"):
+                w.leaf("Ustrd", payment["description"])
+
+
+class _Pain008Writer:
+    """Indenting helper around `lxml.etree.xmlfile`.
+
+    With *pretty_print* the whitespace matches ``minidom.toprettyxml``
+    (tab indentation, leaf elements on a single line).
+    """
+
+    def __init__(self, xf, *, schema: str, pretty_print: bool) -> None:
+        self._xf = xf
+        self._ns = f"urn:iso:std:iso:20022:tech:xsd:{schema}"
+        self._pretty_print = pretty_print
+        self._level = 0
+        self.bic_tag = "BIC" if schema == "pain.008.001.02" else "BICFI"
+
+    def __newline(self) -> None:
+        if self._pretty_print:
+            self._xf.write("\n" + "\t" * self._level)
+
+    @_contextlib.contextmanager
+    def element(self, tag: str, *, nsmap: bool = False) -> _typing.Iterator[None]:
+        if self._level:
+            self.__newline()
+        kwargs = {"nsmap": {None: self._ns, "xsi": _XSI_NS}} if nsmap else {}
+        with self._xf.element(f"{{{self._ns}}}{tag}", **kwargs):
+            self._level += 1
+            yield
+            self._level -= 1
+            self.__newline()
+
+    @_contextlib.contextmanager
+    def path(self, *tags: str) -> _typing.Iterator[None]:
+        with _contextlib.ExitStack() as stack:
+            for tag in tags:
+                stack.enter_context(self.element(tag))
+            yield
+
+    def leaf(self, tag: str, text: str, **attrib: str) -> None:
+        self.__newline()
+        with self._xf.element(f"{{{self._ns}}}{tag}", attrib):
+            self._xf.write(text)
+
+
+_XSI_NS = "http://www.w3.org/2001/XMLSchema-instance"
+
+
+def _cents_to_decimal_str(cents: int) -> str:
+    return _sepaxml_utils.int_to_decimal_str(cents)
+
+
+@_functools.cache
+def _pain_xml_schema(schema: str) -> _lxml_etree.XMLSchema:
+    import importlib.resources
+
+    import lxml.etree as _lxml_etree
+
+    xsd = importlib.resources.files("sepaxml") / "schemas" / f"{schema}.xsd"
+    with importlib.resources.as_file(xsd) as xsd_path:
+        return _lxml_etree.XMLSchema(file=str(xsd_path))
+
+
+def _validate_pain_xml(xml: bytes | str | _pathlib.Path, schema: str) -> None:
+    """Validate *xml* (bytes or a path) against the XSD shipped with sepaxml.
+
+    Raises `sepaxml.validation.ValidationError` like ``SepaDD.export``.
+    """
+    import io
+
+    import lxml.etree as _lxml_etree
+    from sepaxml.validation import ValidationError
+
+    source = io.BytesIO(xml) if isinstance(xml, bytes) else str(xml)
+    xml_schema = _pain_xml_schema(schema)
+    if not xml_schema.validate(_lxml_etree.parse(source)):
+        raise ValidationError(
+            f"The output SEPA file contains validation errors: {xml_schema.error_log}"
+        )
 
 
 def _german_transliterate(s: str) -> str:
@@ -155,19 +480,61 @@ def write_accounting_dataframe_to_sepa_dd(
     pedantic: bool = True,
     print_progress_message=None,
 ) -> int:
+    sepa_dd_files = write_accounting_dataframe_to_sepa_dd_files(
+        df,
+        path,
+        config=config,
+        pedantic=pedantic,
+        print_progress_message=print_progress_message,
+    )
+    return sum(f.number_of_transactions for f in sepa_dd_files)
+
+
+@_dataclasses.dataclass(kw_only=True)
+class SepaDirectDebitFile:
+    path: _pathlib.Path
+    message_identification: str
+    number_of_transactions: int
+    control_sum_cents: int
+
+
+def write_accounting_dataframe_to_sepa_dd_files(
+    df: _pandas.DataFrame,
+    path: str | _pathlib.Path,
+    *,
+    config: _types.SepaDirectDebitConfig,
+    pedantic: bool = True,
+    print_progress_message=None,
+    split_policy: SepaDirectDebitSplitPolicy | None = None,
+    max_workers: int | None = None,
+) -> list[SepaDirectDebitFile]:
+    """Write the ok rows of *df* as SEPA direct debit to *path*.
+
+    With *split_policy* the payments are split into several files
+    ``<stem>_01<suffix>``, ``<stem>_02<suffix>``, ... (unless one file
+    suffices), which are rendered concurrently.
+
+    The column ``sepa_dd_message_identification`` of *df* is set to the
+    MsgId of the file a row was written to.
+    """
+    import os
+
     from . import _util
 
     if print_progress_message is None:
         print_progress_message = _util.print_progress_message
 
+    path = _pathlib.Path(path)
     dd = SepaDirectDebit(config)
 
     already_not_ok = len(df[df["payment_status"] != "ok"])
 
-    idx: int
     df_len = len(df)
     written_payments = 0
-    for i, (idx, row) in enumerate(df.iterrows()):  # type: ignore
+    endtoend_id2idx: dict[str, _typing.Hashable] = {}
+    # Plain dicts instead of DataFrame.iterrows(), which builds a Series per row.
+    rows = zip(df.index, df.to_dict(orient="records"), strict=True)
+    for i, (idx, row) in enumerate(rows):
         if row["payment_status"] != "ok":
             if row.get("open_amount_cents", 0) == 0:
                 continue  # silently skip non-ok row with amount=0
@@ -206,7 +573,8 @@ def write_accounting_dataframe_to_sepa_dd(
         )
         print_progress_message(i, df_len, progress_msg, logger=_LOGGER)
         try:
-            dd.add_payment_from_accounting_row(row, pedantic=pedantic)
+            payment = dd.add_payment_from_accounting_row(row, pedantic=pedantic)
+            endtoend_id2idx[payment["endtoend_id"]] = idx
             written_payments += 1
         except (KeyError, ValueError) as exc:
             df.at[idx, "payment_status"] = "skipped"
@@ -221,11 +589,52 @@ def write_accounting_dataframe_to_sepa_dd(
 
     if dd.num_payments == 0:
         _LOGGER.warning("[SDD] No payments added to Direct Debit => No file written")
+        return []
+
+    if split_policy is None:
+        parts, paths = [dd], [path]
     else:
-        _LOGGER.info("[SDD] Write %s", path)
-        dd.export_file(path)
+        parts = dd.split(split_policy)
+        if len(parts) == 1:
+            paths = [path]
+        else:
+            paths = [
+                path.with_stem(f"{path.stem}_{i:02d}") for i in range(1, len(parts) + 1)
+            ]
+        _LOGGER.info(
+            "[SDD] Split %s payments into %s file(s)", dd.num_payments, len(parts)
+        )
+
+    def write_part(
+        part: SepaDirectDebit, part_path: _pathlib.Path
+    ) -> SepaDirectDebitFile:
+        _LOGGER.info("[SDD] Write %s", part_path)
+        part.export_file(part_path)
+        return SepaDirectDebitFile(
+            path=part_path,
+            message_identification=part.message_identification,
+            number_of_transactions=part.num_payments,
+            control_sum_cents=part.control_sum_cents,
+        )
+
+    sepa_dd_files = _util.run_concurrently(
+        "[SDD] Write SEPA direct debit file",
+        [
+            (str(part_path), _functools.partial(write_part, part, part_path))
+            for part, part_path in zip(parts, paths, strict=True)
+        ],
+        max_workers=max_workers or os.cpu_count() or 1,
+        thread_name_prefix="sepa_dd",
+        logger=_LOGGER,
+    )
 
-    return dd.num_payments
+    for part, sepa_dd_file in zip(parts, sepa_dd_files, strict=True):
+        for payment in part.payments:
+            df.at[
+                endtoend_id2idx[payment["endtoend_id"]],
+                "sepa_dd_message_identification",
+            ] = sepa_dd_file.message_identification
+    return sepa_dd_files
 
 
 # =============================================================================
@@ -0,0 +1,162 @@
+"""On-disk snapshots of the Keycloak and Mailcow client caches.
+
+A :class:`SnapshotStore` keeps one gzip compressed JSON file per
+*kind* (``"keycloak"``, ``"mailcow"``) and *key* (server URL and realm).
+Snapshots older than the TTL are ignored.  The clients invalidate their
+snapshot on the first real write and store a fresh one on ``close()``.
+"""
+
+from __future__ import annotations
+
+import datetime as _datetime
+import hashlib as _hashlib
+import logging as _logging
+import os as _os
+import pathlib as _pathlib
+import time as _time
+import typing as _typing
+
+
+_LOGGER = _logging.getLogger(__name__)
+
+_SNAPSHOT_VERSION = 1
+
+
+class SnapshotStore:
+    """Directory with TTL-limited snapshots of client caches.
+
+    >>> import tempfile
+    >>> store = SnapshotStore(tempfile.mkdtemp(), ttl=60)
+    >>> store.save("keycloak", "https://kc|realm", {"users": []})
+    >>> store.load("keycloak", "https://kc|realm")
+    {'users': []}
+    >>> store.invalidate("keycloak", "https://kc|realm")
+    >>> store.load("keycloak", "https://kc|realm") is None
+    True
+    """
+
+    directory: _pathlib.Path
+    ttl: float
+
+    def __init__(
+        self,
+        directory: str | _pathlib.Path,
+        *,
+        ttl: float | _datetime.timedelta = 900.0,
+    ) -> None:
+        self.directory = _pathlib.Path(directory)
+        if isinstance(ttl, _datetime.timedelta):
+            ttl = ttl.total_seconds()
+        self.ttl = float(ttl)
+
+    def path(self, kind: str, key: str) -> _pathlib.Path:
+        digest = _hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+        return self.directory / f"{kind}-{digest}.json.gz"
+
+    def load(self, kind: str, key: str) -> dict[str, _typing.Any] | None:
+        """Return the snapshot data, or `None` if missing or expired."""
+        import gzip
+        import json
+
+        path = self.path(kind, key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            _LOGGER.warning(f"[snapshot] Ignore unreadable {path}: {exc}")
+            return None
+        if snapshot.get("version") != _SNAPSHOT_VERSION or snapshot.get("key") != key:
+            _LOGGER.debug(f"[snapshot] Ignore incompatible {path}")
+            return None
+        age = _time.time() - float(snapshot.get("created", 0))
+        if age > self.ttl:
+            _LOGGER.debug(f"[snapshot] Ignore expired {path} ({age:.0f}s old)")
+            return None
+        _LOGGER.debug(f"[snapshot] Use {kind} snapshot {path} ({age:.0f}s old)")
+        return snapshot["data"]
+
+    def save(self, kind: str, key: str, data: dict[str, _typing.Any]) -> None:
+        """Atomically write a snapshot readable only by the current user."""
+        import gzip
+        import json
+        import tempfile
+
+        path = self.path(kind, key)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        snapshot = {
+            "version": _SNAPSHOT_VERSION,
+            "key": key,
+            "created": _time.time(),
+            "data": data,
+        }
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, prefix=f".{kind}-")
+        try:
+            with (
+                _os.fdopen(fd, "wb") as raw,
+                gzip.GzipFile(fileobj=raw, mode="wb") as f,
+            ):
+                f.write(
+                    json.dumps(snapshot, separators=(",", ":"), default=str).encode(
+                        "utf-8"
+                    )
+                )
+            _os.replace(tmp_name, path)
+        except BaseException:
+            _pathlib.Path(tmp_name).unlink(missing_ok=True)
+            raise
+        _LOGGER.debug(f"[snapshot] Wrote {kind} snapshot {path}")
+
+    def invalidate(self, kind: str, key: str) -> None:
+        path = self.path(kind, key)
+        if path.exists():
+            _LOGGER.debug(f"[snapshot] Invalidate {kind} snapshot {path}")
+        path.unlink(missing_ok=True)
+
+
+class SnapshotState:
+    """Tracks whether a client cache may be written back as a snapshot.
+
+    Real writes invalidate the stored snapshot right away (a crash must
+    not leave a stale snapshot behind); the client writes a refreshed
+    one later.  Dry-run writes only change the in-memory cache, so a
+    cache touched by them is never saved.
+    """
+
+    store: SnapshotStore | None
+    kind: str
+    key: str
+    loaded: bool = False
+    dirty: bool = False
+    tainted: bool = False
+
+    def __init__(self, store: SnapshotStore | None, *, kind: str, key: str) -> None:
+        self.store = store
+        self.kind = kind
+        self.key = key
+
+    def load(self) -> dict[str, _typing.Any] | None:
+        if self.store is None or self.loaded:
+            return None
+        self.loaded = True
+        return self.store.load(self.kind, self.key)
+
+    def save(self, data: dict[str, _typing.Any]) -> None:
+        if self.store is None:
+            return
+        if self.tainted:
+            self.store.invalidate(self.kind, self.key)
+        else:
+            self.store.save(self.kind, self.key, data)
+            self.dirty = False
+        self.loaded = True
+
+    def mutated(self, *, dry_run: bool = False) -> None:
+        if self.store is None:
+            return
+        if dry_run:
+            self.tainted = True
+        elif not self.dirty:
+            self.dirty = True
+            self.store.invalidate(self.kind, self.key)
@@ -38,6 +38,7 @@ __all__ = [
     "log_exception_decorator",
     "merge_mail_addresses",
     "render_template",
+    "run_concurrently",
     "slurp",
     "to_date_or_none",
     "to_datetime",
@@ -1546,6 +1547,48 @@ def print_progress_message(count, size, message, *, logger=_LOGGER) -> None:
         print(f"  | ...", file=sys.stderr, flush=True)
 
 
+def run_concurrently(
+    description: str,
+    calls: _collections_abc.Sequence[tuple[str, _collections_abc.Callable[[], _T]]],
+    *,
+    max_workers: int,
+    thread_name_prefix: str = "",
+    logger: _logging.Logger | _logging.LoggerAdapter = _LOGGER,
+) -> list[_T]:
+    """Run *calls* given as ``(label, fn)`` on a bounded thread pool.
+
+    All calls are run even if some fail, failures are logged and
+    raised together as an `ExceptionGroup` in the order of *calls*.
+
+    >>> run_concurrently("square", [(str(i), lambda i=i: i * i) for i in range(4)], max_workers=2)
+    [0, 1, 4, 9]
+    """
+    import concurrent.futures
+
+    if not calls:
+        return []
+    max_workers = max(1, min(max_workers, len(calls)))
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix=thread_name_prefix
+    ) as executor:
+        futures = [executor.submit(fn) for _, fn in calls]
+    results = []
+    errors = []
+    for (label, _), future in zip(calls, futures, strict=True):
+        if (exc := future.exception()) is not None:
+            logger.error(f"{description}: {label} failed: {exc}")
+            exc.add_note(f"{description}: {label}")
+            errors.append(exc)
+        else:
+            results.append(future.result())
+    if errors:
+        raise ExceptionGroup(
+            f"{description}: {len(errors)} of {len(calls)} requests failed",
+            errors,
+        )
+    return results
+
+
 # ==============================================================================
 # Accounts
 # ==============================================================================
@@ -15,7 +15,9 @@ if _typing.TYPE_CHECKING:
     import collections.abc as _collections_abc
     import csv as _csv
 
-    from . import _context
+    import pandas as _pandas
+
+    from . import _context, _pg
     from ._models import person as _person
 
 _LOGGER = _logging.getLogger(__name__)
@@ -55,6 +57,223 @@ def moss_email_with_expected_goto(p: _person.Person, /) -> str:
         return p.moss_email
 
 
+# ======================================================================================
+# Moss users
+# ======================================================================================
+
+#: ``additional_info`` field <- column of the Moss user export.
+MOSS_USER_FIELDS: dict[str, str] = {
+    "moss_status": "status",
+    "moss_phone": "phone",
+    "moss_team": "team",
+    "moss_roles": "roles",
+}
+
+_MOSS_USERS_CSV_COLUMNS = ("name", "status", "email", "phone", "team", "role")
+
+
+@_dataclasses.dataclass(kw_only=True)
+class MossUserSyncStats:
+    """Counts of a `compute_moss_user_updates` run.
+
+    *matched*, *unmatched* and *ambiguous* count rows of the Moss
+    export, *changed* and *unchanged* count matched people.
+    """
+
+    matched: int = 0
+    unmatched: int = 0
+    ambiguous: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    per_field: dict[str, int] = _dataclasses.field(default_factory=dict)
+
+
+def read_moss_users_dataframe(
+    path: _pathlib.Path | str, /, *, encoding: str = "cp1252"
+) -> _pandas.DataFrame:
+    """Read a Moss user export into a DataFrame.
+
+    The export has the columns ``name, status, email, phone, team,
+    role`` and is Windows-1252 encoded.  Values are stripped, empty
+    values become ``<NA>`` and rows without an email are dropped.  The
+    column ``role`` is normalized to ``roles`` (whitespace-separated
+    tokens) and ``email_key`` holds the lower-cased email.
+    """
+    import pandas as _pandas
+
+    df = _pandas.read_csv(
+        path, encoding=encoding, dtype="string", keep_default_na=False
+    )
+    if missing := set(_MOSS_USERS_CSV_COLUMNS) - set(df.columns):
+        raise RuntimeError(
+            f"CSV {path} is missing column(s): {sorted(missing)} "
+            f"(found {list(df.columns)})"
+        )
+    df = df[list(_MOSS_USERS_CSV_COLUMNS)]
+    df = df.apply(lambda col: col.str.strip()).replace("", _pandas.NA)
+    df["roles"] = df.pop("role").str.split().str.join(" ").replace("", _pandas.NA)
+    df = df[df["email"].notna()].reset_index(drop=True)
+    df["email_key"] = df["email"].str.lower()
+    return df
+
+
+def load_people_for_moss_users(conn: _pg.PgConnectionLike) -> _pandas.DataFrame:
+    """Load all people with a ``moss_email`` and their `MOSS_USER_FIELDS`."""
+    import pandas as _pandas
+
+    from . import _pg
+
+    rows = _pg.pg_select_dict_rows(
+        conn,
+        t"""SELECT id,
+            additional_info->>'moss_email' AS moss_email,
+            additional_info->>'moss_status' AS moss_status,
+            additional_info->>'moss_phone' AS moss_phone,
+            additional_info->>'moss_team' AS moss_team,
+            additional_info->'moss_roles' AS moss_roles
+        FROM people WHERE additional_info->>'moss_email' IS NOT NULL""",
+    )
+    return _pandas.DataFrame(
+        rows,
+        columns=["id", "moss_email", *MOSS_USER_FIELDS],
+    )
+
+
+def compute_moss_user_updates(
+    moss_users_df: _pandas.DataFrame, people_df: _pandas.DataFrame
+) -> tuple[list[dict], MossUserSyncStats]:
+    """Compute the ``additional_info`` updates for a Moss user export.
+
+    *moss_users_df* is the result of `read_moss_users_dataframe`,
+    *people_df* needs the columns ``id``, ``moss_email`` and the keys of
+    `MOSS_USER_FIELDS` (see `load_people_for_moss_users`).  Users are
+    joined with people on the case-insensitive email in one merge, an
+    empty value in the export clears the field.  If the export lists an
+    email more than once, the last row wins.
+
+    Returns the updates in the format of
+    `WsjRdpContext.update_people_additional_info` and the stats.
+
+    >>> import pandas as pd
+    >>> users = pd.DataFrame({
+    ...     "email": ["A@x", "b@x", "c@x"], "email_key": ["a@x", "b@x", "c@x"],
+    ...     "status": ["ACTIVE", "ACTIVE", "ACTIVE"], "phone": [pd.NA] * 3,
+    ...     "team": ["T1", "T2", "T3"], "roles": ["TEAMLEAD USER", "USER", "USER"],
+    ... })
+    >>> people = pd.DataFrame({
+    ...     "id": [1, 2, 3], "moss_email": ["a@X", "B@x", "b@x"],
+    ...     "moss_status": ["INVITED", None, None], "moss_phone": ["123", None, None],
+    ...     "moss_team": ["T1", None, None], "moss_roles": [["USER"], None, None],
+    ... })
+    >>> updates, stats = compute_moss_user_updates(users, people)
+    >>> updates  # doctest: +NORMALIZE_WHITESPACE
+    [{'id': 1, 'moss_status': ['INVITED', 'ACTIVE']},
+     {'id': 1, 'moss_phone': ['123', None]},
+     {'id': 1, 'moss_roles': [['USER'], ['TEAMLEAD', 'USER']]}]
+    >>> stats  # doctest: +NORMALIZE_WHITESPACE
+    MossUserSyncStats(matched=1, unmatched=1, ambiguous=1, changed=1, unchanged=0,
+                      per_field={'moss_status': 1, 'moss_phone': 1, 'moss_roles': 1})
+    """
+    import numpy as _numpy
+    import pandas as _pandas
+
+    people = _pandas.DataFrame(
+        {
+            "id": people_df["id"],
+            "email_key": people_df["moss_email"]
+            .astype("string")
+            .str.strip()
+            .str.lower(),
+        }
+    )
+    for field in MOSS_USER_FIELDS:
+        people[f"{field}_old"] = people_df[field]
+    people = people[people["email_key"].notna() & (people["email_key"] != "")]
+
+    n_people = moss_users_df["email_key"].map(people["email_key"].value_counts())
+    n_people = n_people.fillna(0).astype(int)
+    match = _pandas.Series(
+        _numpy.select(
+            [n_people == 1, n_people > 1], ["matched", "ambiguous"], "unmatched"
+        ),
+        index=moss_users_df.index,
+    )
+    match_counts = match.groupby(match).size()
+    for email, n in zip(
+        moss_users_df.loc[match != "matched", "email"], n_people[match != "matched"]
+    ):
+        _LOGGER.warning(f"moss_email={email} matches {n} Hitobito people - skipping")
+
+    merged = (
+        moss_users_df[match == "matched"]
+        .drop_duplicates("email_key", keep="last")
+        .merge(people, on="email_key", how="inner")
+    )
+    changes = []
+    for field, column in MOSS_USER_FIELDS.items():
+        old = merged[f"{field}_old"]
+        new = merged[column].astype("string")
+        # Roles are stored as list, compare them space-joined like the export.
+        old_cmp = old.map(_roles_str) if field == "moss_roles" else old
+        changed = old_cmp.astype("string").fillna("") != new.fillna("")
+        if changed.any():
+            changes.append(
+                _pandas.DataFrame(
+                    {
+                        "id": merged.loc[changed, "id"],
+                        "field": field,
+                        "old": old[changed].astype(object),
+                        "new": new[changed].astype(object),
+                    }
+                )
+            )
+    if changes:
+        changes_df = _pandas.concat(changes).sort_index(kind="stable")
+    else:
+        changes_df = _pandas.DataFrame(columns=["id", "field", "old", "new"])
+
+    updates = []
+    for row in changes_df.itertuples(index=False):
+        old = _none_if_na(row.old)
+        new = _none_if_na(row.new)
+        if row.field == "moss_roles" and new is not None:
+            new = new.split()
+        updates.append({"id": int(row.id), row.field: [old, new]})
+
+    n_changed = changes_df["id"].nunique()
+    per_field = changes_df.groupby("field", sort=False).size()
+    stats = MossUserSyncStats(
+        matched=int(match_counts.get("matched", 0)),
+        unmatched=int(match_counts.get("unmatched", 0)),
+        ambiguous=int(match_counts.get("ambiguous", 0)),
+        changed=n_changed,
+        unchanged=len(merged) - n_changed,
+        per_field={str(k): int(v) for k, v in per_field.items()},
+    )
+    return updates, stats
+
+
+def _roles_str(obj: object) -> str | None:
+    """Space-join stored ``moss_roles``, which may be a list or a plain string.
+
+    >>> _roles_str(["TEAMLEAD", "USER"]), _roles_str(" USER  "), _roles_str(None)
+    ('TEAMLEAD USER', 'USER', None)
+    """
+    if isinstance(obj, str):
+        return " ".join(obj.split())
+    if isinstance(obj, list):
+        return " ".join(str(role) for role in obj)
+    return None
+
+
+def _none_if_na(obj: object) -> object:
+    import pandas as _pandas
+
+    if isinstance(obj, list):
+        return obj
+    return None if _pandas.isna(obj) else obj
+
+
 # ======================================================================================
 # MossBalanceMovement
 # ======================================================================================
@@ -0,0 +1,38 @@
+"""Shared ISO 20022 test data."""
+
+
+def tx(ref: str, amount: str, *ustrd: str) -> str:
+    return (
+        "<TxDtls>"
+        f"<Refs><EndToEndId>{ref}</EndToEndId></Refs>"
+        f'<Amt Ccy="EUR">{amount}</Amt>'
+        "<BkTxCd><Prtry><Cd>NTRF+166</Cd></Prtry></BkTxCd>"
+        "<RmtInf>" + "".join(f"<Ustrd>{u}</Ustrd>" for u in ustrd) + "</RmtInf>"
+        "</TxDtls>"
+    )
+
+
+def ntry(ref: str, status: str, *txs: str) -> str:
+    return (
+        "<Ntry>"
+        '<Amt Ccy="EUR">3.00</Amt><CdtDbtInd>CRDT</CdtDbtInd>'
+        f"<Sts><Cd>{status}</Cd></Sts>"
+        f"<BookgDt><Dt>2026-01-02</Dt></BookgDt><ValDt><Dt>2026-01-02</Dt></ValDt>"
+        f"<AcctSvcrRef>{ref}</AcctSvcrRef>"
+        "<NtryDtls>" + "".join(txs) + "</NtryDtls>"
+        "</Ntry>"
+    )
+
+
+CAMT052 = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Document xmlns="urn:iso:std:iso:20022:tech:xsd:camt.052.001.08">'
+    "<BkToCstmrAcctRpt>"
+    "<GrpHdr><MsgId>MSG1</MsgId><CreDtTm>2026-01-02T10:00:00</CreDtTm></GrpHdr>"
+    "<Rpt><Id>RPT1</Id><CreDtTm>2026-01-02T10:00:00</CreDtTm>"
+    "<Acct><Id><IBAN>DE02120300000000202051</IBAN></Id></Acct>"
+    + ntry("REF1", "BOOK", tx("E1", "1.00", "a", "b"), tx("E2", "2.00", "c"))
+    + ntry("REF2", "PDNG", tx("E3", "3.00", "d"))
+    + ntry("REF3", "BOOK", tx("E4", "0.50"))
+    + "</Rpt></BkToCstmrAcctRpt></Document>"
+)
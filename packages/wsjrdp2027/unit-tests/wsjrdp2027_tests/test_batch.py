@@ -2,7 +2,12 @@ import pathlib as _pathlib
 
 import pytest
 from wsjrdp2027 import PeopleQuery, PeopleWhere
-from wsjrdp2027._batch import BatchConfig, _strip_html_tags_builtin
+from wsjrdp2027._batch import (
+    BatchConfig,
+    EmlWriter,
+    PreparedEmailMessage,
+    _strip_html_tags_builtin,
+)
 
 
 _SELFDIR = _pathlib.Path(__file__).parent.resolve()
@@ -71,3 +76,94 @@ class Test_BatchConfig___init__:
         assert bc.query.get_where_condition() == WHERE
         assert bc.query.where
         assert bc.query.where.raw_sql == WHERE
+
+
+class Test_BatchConfig_select_people_dataframe:
+    @pytest.fixture
+    def superset_df(self, monkeypatch):
+        import pandas as pd
+        from wsjrdp2027 import _people
+
+        id_lists = {"a": [2, 4, 5], "b": [1, 2, 3]}
+        monkeypatch.setattr(
+            _people,
+            "load_people_ids",
+            lambda conn, *, where: id_lists[where.raw_sql],
+        )
+        return pd.DataFrame(
+            {
+                "id": [1, 2, 3, 4, 5],
+                "payment_status": "ok",
+                "payment_status_reason": "",
+                "skip_db_updates": False,
+            }
+        )
+
+    def test_limit_and_offset(self, superset_df):
+        bc = BatchConfig(query=PeopleQuery(where="a", limit=1, offset=1))
+        df = bc.select_people_dataframe(superset_df, conn=None)  # type: ignore
+        assert list(df["id"]) == [4]
+        assert list(df.index) == [0]
+
+    def test_email_only_where(self, superset_df):
+        bc = BatchConfig(query=PeopleQuery(where="a", email_only_where="b"))
+        df = bc.select_people_dataframe(superset_df, conn=None)  # type: ignore
+        assert list(df["id"]) == [2, 4, 5, 1, 3]
+        assert list(df["skip_db_updates"]) == [False, False, False, True, True]
+        assert list(df["payment_status"]) == ["ok"] * 3 + ["skipped"] * 2
+        assert list(superset_df["skip_db_updates"]) == [False] * 5
+
+
+class Test_EmlWriter:
+    @staticmethod
+    def _messages(count: int) -> list[PreparedEmailMessage]:
+        import email.message
+
+        messages = []
+        for i in range(count):
+            msg = email.message.EmailMessage()
+            msg["Subject"] = f"Message {i}"
+            msg.set_content("Hello\n" * 100)
+            messages.append(
+                PreparedEmailMessage(
+                    mailing_name="test",
+                    message=msg,
+                    summary=str(i),
+                    eml_name=f"test.{i}.eml",
+                )
+            )
+        messages.append(PreparedEmailMessage(mailing_name="test", summary="empty"))
+        return messages
+
+    def test_zip(self, tmp_path):
+        import zipfile
+
+        messages = self._messages(3)
+        with EmlWriter(tmp_path, name="test", compresslevel=9) as writer:
+            for prep_msg in messages:
+                writer.write(prep_msg)
+        assert writer.count == 3
+        assert writer.path == tmp_path / "test.zip"
+        with zipfile.ZipFile(writer.path) as zf:
+            infos = zf.infolist()
+            assert [i.filename for i in infos] == [f"test.{i}.eml" for i in range(3)]
+            assert all(i.compress_type == zipfile.ZIP_DEFLATED for i in infos)
+            assert zf.read("test.1.eml") == messages[1].eml
+        assert all(m._eml is None for m in messages)
+
+    def test_directory(self, tmp_path):
+        messages = self._messages(5)
+        with EmlWriter(tmp_path, name="test", zip_eml=False, max_workers=2) as writer:
+            for prep_msg in messages:
+                writer.write(prep_msg)
+        assert writer.count == 5
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            f"test.{i}.eml" for i in range(5)
+        ]
+        assert (tmp_path / "test.3.eml").read_bytes() == messages[3].eml
+
+    def test_only_empty_messages(self, tmp_path):
+        with EmlWriter(tmp_path / "out", name="test") as writer:
+            writer.write(PreparedEmailMessage(mailing_name="test", summary="empty"))
+        assert writer.count == 0
+        assert not (tmp_path / "out").exists()
@@ -0,0 +1,107 @@
+import dataclasses
+import datetime
+import io
+
+import lxml.etree
+from wsjrdp2027._camt import CamtMessage, camt_records_to_dataframe
+from wsjrdp2027._iso20022 import iso20022_element_to_dict, iso20022_xml_text_to_dict
+
+from wsjrdp2027_tests._iso20022_fixtures import CAMT052
+
+
+def _summary(tx) -> tuple:
+    return (
+        tx.TxDtls,
+        tx.amount_cents,
+        tx.unique_db_key,
+        tx.report.identification,
+        tx.message.GrpHdr["MsgId"],
+    )
+
+
+class Test_iso20022_element_to_dict:
+    def test_matches_xslt(self):
+        element = lxml.etree.fromstring(CAMT052.encode())
+        assert (
+            iso20022_element_to_dict(element)
+            == (iso20022_xml_text_to_dict(CAMT052)["Document"])
+        )
+
+
+class Test_CamtMessage_stream_transaction_details:
+    def test_matches_load(self):
+        message = CamtMessage.loads(CAMT052)
+        streamed = list(
+            CamtMessage.stream_transaction_details(io.BytesIO(CAMT052.encode()))
+        )
+        assert [_summary(tx) for tx in streamed] == [
+            _summary(tx) for tx in message.transaction_details
+        ]
+        assert [tx.TxDtls["RmtInf"] for tx in streamed] == [
+            {"Ustrd": ["a", "b"]},
+            {"Ustrd": "c"},
+            {"Ustrd": "d"},
+            "",
+        ]
+
+    def test_booked_only(self, tmp_path):
+        path = tmp_path / "camt052.xml"
+        path.write_text(CAMT052)
+        streamed = CamtMessage.stream_transaction_details(path, booked_only=True)
+        assert [tx.TxDtls["Refs"]["EndToEndId"] for tx in streamed] == [
+            "E1",
+            "E2",
+            "E4",
+        ]
+
+
+class Test_CamtTxRecord:
+    def test_iter_records(self):
+        message = CamtMessage.loads(CAMT052)
+        records = list(message.iter_records())
+        txs = list(message.transaction_details)
+        assert records == [tx.to_record() for tx in txs]
+        for record, tx in zip(records, txs, strict=True):
+            for field in dataclasses.fields(record):
+                if field.name == "tx_dtls":
+                    assert record.tx_dtls is tx.TxDtls
+                elif field.name == "ntry":
+                    assert record.ntry is tx.Ntry
+                elif field.name == "is_booked":
+                    assert record.is_booked is tx.entry.is_booked
+                else:
+                    assert getattr(record, field.name) == getattr(tx, field.name)
+            assert record.unique_db_key == tx.unique_db_key
+        assert not hasattr(records[0], "__dict__")
+        assert [r.endtoend_id for r in message.iter_records(booked_only=True)] == [
+            "E1",
+            "E2",
+            "E4",
+        ]
+
+    def test_stream_records(self):
+        streamed = CamtMessage.stream_records(io.BytesIO(CAMT052.encode()))
+        assert list(streamed) == list(CamtMessage.loads(CAMT052).iter_records())
+
+    def test_dataframe(self):
+        records = list(CamtMessage.loads(CAMT052).iter_records())
+        df = camt_records_to_dataframe(records)
+        assert df["amount_cents"].tolist() == [100, 200, 300, 50]
+        assert df["account_servicer_reference"].tolist() == [
+            "REF1",
+            "REF1",
+            "REF2",
+            "REF3",
+        ]
+        assert camt_records_to_dataframe([]).columns.tolist() == df.columns.tolist()
+
+    def test_missing_or_empty_value_date(self):
+        val_dt = "<ValDt><Dt>2026-01-02</Dt></ValDt>"
+        camt = CAMT052.replace(val_dt, "", 1).replace(val_dt, "<ValDt></ValDt>", 1)
+        message = CamtMessage.loads(camt)
+        records = list(message.iter_records())
+        expected = [None, None, None, datetime.date(2026, 1, 2)]
+        assert [r.value_date for r in records] == expected
+        assert [tx.value_date for tx in message.transaction_details] == [
+            r.value_date for r in records
+        ]
@@ -0,0 +1,122 @@
+import datetime
+
+import pandas as pd
+from wsjrdp2027._camt_reconciliation import (
+    RECONCILIATION_CATEGORIES,
+    reconcile_camt_transactions,
+    summarize_camt_reconciliation,
+    write_camt_reconciliation_to_xlsx,
+)
+
+
+D = datetime.date
+
+PRE_NOTIFICATIONS = pd.DataFrame(
+    [
+        {"id": 10, "subject_id": 1, "amount_cents": 5000, "collection_date": D(2026, 3, 5), "endtoend_id": "E1", "mandate_id": "M1"},
+        {"id": 11, "subject_id": 2, "amount_cents": 5000, "collection_date": D(2026, 2, 5), "endtoend_id": "E2a", "mandate_id": "M2"},
+        {"id": 12, "subject_id": 2, "amount_cents": 4000, "collection_date": D(2026, 3, 5), "endtoend_id": "E2b", "mandate_id": "M2"},
+        {"id": 13, "subject_id": 3, "amount_cents": 7000, "collection_date": D(2026, 3, 5), "endtoend_id": "E3", "mandate_id": "M3"},
+    ]
+)  # fmt: skip
+
+ACCOUNTING_ENTRIES = pd.DataFrame(
+    [
+        {"id": 100, "subject_id": 1, "amount_cents": 5000, "value_date": D(2026, 3, 5), "camt_transaction_id": 1},
+        {"id": 101, "subject_id": 2, "amount_cents": -4000, "value_date": D(2026, 3, 20), "camt_transaction_id": None},
+        {"id": 102, "subject_id": 4, "amount_cents": 1234, "value_date": D(2026, 3, 1), "camt_transaction_id": None},
+    ]
+)  # fmt: skip
+
+CAMT_TRANSACTIONS = pd.DataFrame(
+    [
+        {"id": 1, "value_date": D(2026, 3, 5), "amount_cents": 5000, "credit_debit_indication": "CRDT", "endtoend_id": "E1", "mandate_id": "M1", "subject_id": None, "return_reason": None},
+        {"id": 2, "value_date": D(2026, 3, 12), "amount_cents": -4000, "credit_debit_indication": "DBIT", "endtoend_id": None, "mandate_id": "M2", "subject_id": None, "return_reason": "MD06"},
+        {"id": 3, "value_date": D(2026, 3, 5), "amount_cents": 6500, "credit_debit_indication": "CRDT", "endtoend_id": "E3", "mandate_id": "M3", "subject_id": None, "return_reason": None},
+        {"id": 4, "value_date": D(2026, 3, 2), "amount_cents": 1234, "credit_debit_indication": "CRDT", "endtoend_id": None, "mandate_id": None, "subject_id": 4, "return_reason": None},
+        {"id": 5, "value_date": D(2026, 3, 3), "amount_cents": -999, "credit_debit_indication": "DBIT", "endtoend_id": None, "mandate_id": None, "subject_id": None, "return_reason": None},
+    ]
+)  # fmt: skip
+
+
+class Test_reconcile_camt_transactions:
+    def test_categories(self):
+        df = reconcile_camt_transactions(
+            CAMT_TRANSACTIONS, PRE_NOTIFICATIONS, ACCOUNTING_ENTRIES
+        )
+        assert df.set_index("camt_transaction_id")[
+            [
+                "category",
+                "subject_id",
+                "pre_notification_id",
+                "pre_notification_matched_by",
+                "amount_difference_cents",
+                "accounting_entry_id",
+                "accounting_entry_matched_by",
+            ]
+        ].to_dict(orient="index") == {
+            1: {
+                "category": "matched_debit",
+                "subject_id": 1,
+                "pre_notification_id": 10,
+                "pre_notification_matched_by": "endtoend_id",
+                "amount_difference_cents": 0,
+                "accounting_entry_id": 100,
+                "accounting_entry_matched_by": "camt_transaction_id",
+            },
+            2: {
+                "category": "return",
+                "subject_id": 2,
+                # latest pre-notification before the value date
+                "pre_notification_id": 12,
+                "pre_notification_matched_by": "mandate_id",
+                "amount_difference_cents": None,
+                "accounting_entry_id": 101,
+                "accounting_entry_matched_by": "subject_month_amount",
+            },
+            3: {
+                "category": "amount_mismatch",
+                "subject_id": 3,
+                "pre_notification_id": 13,
+                "pre_notification_matched_by": "endtoend_id",
+                "amount_difference_cents": -500,
+                "accounting_entry_id": None,
+                "accounting_entry_matched_by": None,
+            },
+            4: {
+                "category": "unmatched_credit",
+                "subject_id": 4,
+                "pre_notification_id": None,
+                "pre_notification_matched_by": None,
+                "amount_difference_cents": None,
+                "accounting_entry_id": 102,
+                "accounting_entry_matched_by": "subject_month_amount",
+            },
+            5: {
+                "category": "other_debit",
+                "subject_id": None,
+                "pre_notification_id": None,
+                "pre_notification_matched_by": None,
+                "amount_difference_cents": None,
+                "accounting_entry_id": None,
+                "accounting_entry_matched_by": None,
+            },
+        }
+
+    def test_empty(self):
+        df = reconcile_camt_transactions(pd.DataFrame(), None, None)
+        assert df.empty
+        assert summarize_camt_reconciliation(df)["count"].tolist() == [0] * len(
+            RECONCILIATION_CATEGORIES
+        )
+
+    def test_write_xlsx(self, tmp_path):
+        df = reconcile_camt_transactions(
+            CAMT_TRANSACTIONS, PRE_NOTIFICATIONS, ACCOUNTING_ENTRIES
+        )
+        path = tmp_path / "reconciliation.xlsx"
+        write_camt_reconciliation_to_xlsx(df, path)
+        sheets = pd.read_excel(path, sheet_name=None)
+        assert list(sheets) == ["summary", *RECONCILIATION_CATEGORIES]
+        assert sheets["summary"]["count"].tolist() == [1, 1, 1, 1, 1]
+        assert sheets["return"]["camt_transaction_id"].tolist() == [2]
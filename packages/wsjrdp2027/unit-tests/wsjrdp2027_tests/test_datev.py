@@ -0,0 +1,429 @@
+import datetime
+import decimal
+import io
+import types
+from string.templatelib import Template
+
+import pytest
+from wsjrdp2027 import _pg
+from wsjrdp2027._datev import (
+    _DATEV_EXTF_BUCHUNGSSTAPEL_COLUMNS,
+    CAMT_DATEV_SOURCE,
+    MOSS_DATEV_SOURCE,
+    DatevExtfWriter,
+    _booking_accounts_for_year,
+    _extf_header_line,
+    _format_cents_as_datev_amount,
+    _mark_datev_exported,
+    _rewrite_pre_notification_description,
+    _write_pre_notifications_extf_file,
+    write_datev_csv_for_pain_id,
+    write_datev_csvs_for_pre_notifications,
+    write_datev_csvs_for_source,
+)
+
+
+class Test_DatevExtfWriter:
+    def test_writerow(self):
+        f = io.StringIO()
+        writer = DatevExtfWriter(
+            f, fieldnames=["Umsatz (ohne Soll/Haben-Kz)", "Buchungstext", "Konto"]
+        )
+        writer.writeheader()
+        writer.writerow({"Buchungstext": 'a "b"', "Konto": 1200, "unknown": "x"})
+        writer.writerow({"Umsatz (ohne Soll/Haben-Kz)": "12,5", "Buchungstext": None})
+        assert f.getvalue().splitlines() == [
+            "Umsatz (ohne Soll/Haben-Kz);Buchungstext;Konto",
+            ';"a ""b""";1200',
+            '12,5;"";',
+        ]
+
+    def test_all_columns(self):
+        f = io.StringIO()
+        writer = DatevExtfWriter(f)
+        writer.writerow({})
+        fields = f.getvalue().rstrip("\n").split(";")
+        assert len(fields) == len(_DATEV_EXTF_BUCHUNGSSTAPEL_COLUMNS)
+        assert fields[_DATEV_EXTF_BUCHUNGSSTAPEL_COLUMNS.index("Buchungstext")] == '""'
+        assert fields[_DATEV_EXTF_BUCHUNGSSTAPEL_COLUMNS.index("Konto")] == ""
+
+    def test_unsupported_field(self):
+        with pytest.raises(RuntimeError, match="Unsupported fields"):
+            DatevExtfWriter(io.StringIO(), fieldnames=["Konto", "Bogus"])
+
+
+@pytest.mark.parametrize(
+    ("amount_cents", "expected"),
+    [(12345, "123,45"), (-12345, "123,45"), (1250, "12,50"), (5000, "50"), (5, "0,05")],
+)
+def test_format_cents_as_datev_amount(amount_cents, expected):
+    assert _format_cents_as_datev_amount(amount_cents) == expected
+
+
+def test_rewrite_pre_notification_description():
+    assert (
+        _rewrite_pre_notification_description(
+            "WSJ 2027 3. Rate Mai 2026 YP Max Mustermann (id 42)"
+        )
+        == "YP 42 Max Mustermann / 3. Rate Mai 2026"
+    )
+    assert (
+        _rewrite_pre_notification_description("Beitrag Jörg Müller YP 7")
+        == "YP 7 Jörg Müller / Beitrag"
+    )
+
+
+def test_write_pre_notifications_extf_file(tmp_path):
+    accounts = _booking_accounts_for_year(2026)
+    assert (accounts.konto, accounts.gegenkonto) == ("18000", "41030")
+    assert _booking_accounts_for_year(2025).konto == "1200"
+    header_line = _extf_header_line(
+        now=datetime.datetime(2026, 3, 1, 12, 0, 0),
+        beraternummer="1234",
+        mandantennummer="567",
+        accounts=accounts,
+        date_from=datetime.date(2026, 3, 5),
+        date_to=datetime.date(2026, 4, 5),
+        bezeichnung="Sammeleinzug 2026-03..2026-04",
+    )
+    rows = (
+        {
+            "id": i,
+            "payment_initiation_id": 9,
+            "amount_cents": 1000 * i,
+            "amount_currency": "EUR",
+            "debit_sequence_type": "RCUR",
+            "collection_date": datetime.date(2026, 3, 5),
+            "description": f"Beitrag Test YP {i}",
+        }
+        for i in range(1, 4)
+    )
+    path = tmp_path / "extf.csv"
+    assert _write_pre_notifications_extf_file(
+        path,
+        rows,
+        header_line=header_line,
+        encoding="utf-8",
+        csv_file_encoding="utf-8-sig",
+    ) == ([1, 2, 3], 6000)
+    lines = path.read_text(encoding="utf-8-sig").splitlines()
+    assert len(lines) == 2 + 3
+    assert lines[0].startswith('"EXTF";700;21;"Buchungsstapel";13;20260301120000000;')
+    assert ";20260305;20260405;" in lines[0]
+    assert lines[2].startswith(
+        '10;"S";"EUR";;;"";18000;41030;"";0503;"Einzug-2026-03-RCUR-9-1"'
+    )
+    assert path.read_bytes().count(b"\r\n") == 5
+
+
+class Test_DatevExportSource:
+    def test_camt(self):
+        row = {
+            "id": 17,
+            "value_date": datetime.date(2026, 4, 2),
+            "amount_cents": -4000,
+            "amount_currency": "EUR",
+            "account_servicer_reference": "ASR-1",
+            "description": "Rücklastschrift",
+            "return_reason": "MD06",
+            "dbtr_name": "Max Mustermann",
+            "cdtr_name": "Erika Mustermann",
+        }
+        extf_row = CAMT_DATEV_SOURCE.to_extf_row(row, encoding="utf-8")
+        assert extf_row["Umsatz (ohne Soll/Haben-Kz)"] == "40"
+        assert extf_row["Soll/Haben-Kennzeichen"] == "H"
+        assert extf_row["Belegdatum"] == "0204"
+        assert extf_row["Konto"] == "18000"
+        assert extf_row["Gegenkonto (ohne BU-Schlüssel)"] == "14600"
+        assert extf_row["Belegfeld 1"] == "CAMT-17"
+        assert (
+            extf_row["Buchungstext"]
+            == "Erika Mustermann / Rückl. MD06 / Rücklastschrift"
+        )
+        assert CAMT_DATEV_SOURCE.missing_required(extf_row) == []
+
+    def test_moss(self):
+        row = {
+            "id": 3,
+            "booking_date": datetime.date(2025, 12, 31),
+            "amount": decimal.Decimal("-12.34"),
+            "currency": "EUR",
+            "account_number": "4930",
+            "moss_balance_account": "1370",
+            "supplier_name": "Bürobedarf GmbH",
+            "reason_for_purchase": None,
+            "note": "Papier " + "x" * 80,
+            "invoice_number": None,
+            "unique_item_number": "MOSS-0003",
+            "moss_attachment_url": "https://getmoss.com/a/3",
+        }
+        extf_row = MOSS_DATEV_SOURCE.to_extf_row(row, encoding="cp1252")
+        assert extf_row["Umsatz (ohne Soll/Haben-Kz)"] == "12,34"
+        assert extf_row["Soll/Haben-Kennzeichen"] == "H"
+        assert extf_row["Konto"] == "1370"
+        assert extf_row["Gegenkonto (ohne BU-Schlüssel)"] == "4930"
+        assert extf_row["Belegfeld 1"] == "MOSS-0003"
+        assert extf_row["Buchungstext"].startswith("Bürobedarf GmbH / Papier x")
+        assert len(extf_row["Buchungstext"]) == 60
+        assert MOSS_DATEV_SOURCE.missing_required({**extf_row, "Konto": None}) == [
+            "Konto"
+        ]
+
+
+def _params(query: Template) -> dict:
+    """Return the interpolated values of *query* by expression."""
+    params = {}
+    for interpolation in query.interpolations:
+        if isinstance(interpolation.value, Template):
+            params.update(_params(interpolation.value))
+        params[interpolation.expression] = interpolation.value
+    return params
+
+
+def _is_exported(row: dict) -> bool:
+    return "datev_export" in (row.get("additional_info") or {})
+
+
+class _FakeConn:
+    """Evaluates the DATEV export queries against in-memory *rows*."""
+
+    def __init__(self, rows: list[dict]) -> None:
+        self.rows = {row["id"]: row for row in rows}
+        self.after_ids = []
+        self.rowcount = 0
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def execute(self, query: Template) -> None:
+        params = _params(query)
+        marker = params["Jsonb(marker)"].obj
+        for id in params["ids"]:
+            row = self.rows[id]
+            row["additional_info"] = (row.get("additional_info") or {}) | {
+                "datev_export": marker
+            }
+        self.rowcount = len(params["ids"])
+
+    def select(self, query: Template, **kwargs) -> list[dict]:
+        params = _params(query)
+        rows = sorted(self.rows.values(), key=lambda row: row["id"])
+        if "after_id" in params:
+            self.after_ids.append(params["after_id"])
+            rows = [
+                row
+                for row in rows
+                if row["id"] > params["after_id"] and not _is_exported(row)
+            ]
+            return rows[: params["page_size"]]
+        rows = [row for row in rows if row["payment_status"] == "xml_generated"]
+        if "pain_id" in params:
+            offset = params["offset or 0"]
+            rows = [
+                row for row in rows if row["payment_initiation_id"] == params["pain_id"]
+            ]
+            rows = rows[offset : offset + params["limit"]]
+        elif params["pain_ids"] is not None:
+            rows = [
+                row
+                for row in rows
+                if row["payment_initiation_id"] in params["pain_ids"]
+            ]
+        rows = [
+            row for row in rows if params["include_exported"] or not _is_exported(row)
+        ]
+        if any("GROUP BY" in string for string in query.strings):
+            dates = [row["collection_date"] for row in rows]
+            return [
+                {"year": year, "date_from": min(dates), "date_to": max(dates)}
+                for year in sorted({date.year for date in dates})
+            ]
+        return rows
+
+
+@pytest.fixture
+def fake_pg(monkeypatch):
+    monkeypatch.setattr(_pg, "pg_select_dict_rows", _FakeConn.select)
+    monkeypatch.setattr(
+        _pg, "pg_iter_dict_rows", lambda conn, query, **kwargs: iter(conn.select(query))
+    )
+
+
+@pytest.fixture
+def ctx(tmp_path):
+    return types.SimpleNamespace(
+        start_time=datetime.datetime(2026, 5, 1, 12, 0, 0),
+        make_out_path=lambda name: tmp_path / name,
+        config=types.SimpleNamespace(
+            datev_beraternummer="1234", datev_mandantennummer="567"
+        ),
+    )
+
+
+def _moss_row(id: int, *, account_number: str | None = "4930") -> dict:
+    return {
+        "id": id,
+        "booking_date": datetime.date(2026, 3, id),
+        "amount": decimal.Decimal(f"-{id}.00"),
+        "currency": "EUR",
+        "account_number": account_number,
+        "moss_balance_account": "1370",
+        "supplier_name": "Bürobedarf GmbH",
+        "reason_for_purchase": "Papier",
+        "note": None,
+        "invoice_number": f"R-{id}",
+        "unique_item_number": None,
+        "moss_attachment_url": None,
+    }
+
+
+def _pn_row(id: int, *, pain_id: int = 9, exported: bool = False) -> dict:
+    return {
+        "id": id,
+        "payment_status": "xml_generated",
+        "payment_initiation_id": pain_id,
+        "amount_cents": 1000 * id,
+        "amount_currency": "EUR",
+        "debit_sequence_type": "RCUR",
+        "collection_date": datetime.date(2026, 3, 5),
+        "description": f"Beitrag Test YP {id}",
+        "additional_info": {"datev_export": {"file": "old.csv"}} if exported else None,
+    }
+
+
+def _data_lines(path) -> list[str]:
+    return path.read_text(encoding="utf-8-sig").splitlines()[2:]
+
+
+class Test_mark_datev_exported:
+    def test_keeps_additional_info(self):
+        conn = _FakeConn([{"id": 1, "additional_info": {"a": 1}}, {"id": 2}])
+        _mark_datev_exported(
+            conn,  # type: ignore
+            MOSS_DATEV_SOURCE,
+            [1, 2],
+            marker={"file": "x.csv"},
+        )
+        assert conn.rowcount == 2
+        assert conn.rows[1]["additional_info"] == {
+            "a": 1,
+            "datev_export": {"file": "x.csv"},
+        }
+        assert conn.rows[2]["additional_info"] == {"datev_export": {"file": "x.csv"}}
+
+
+@pytest.mark.usefixtures("fake_pg")
+class Test_write_datev_csvs_for_source:
+    def test_pages_skips_and_marks(self, ctx):
+        rows = [_moss_row(i) for i in range(1, 6)]
+        rows[2] = _moss_row(3, account_number=None)
+        conn = _FakeConn(rows)
+
+        [export_file] = write_datev_csvs_for_source(
+            ctx=ctx,
+            conn=conn,  # type: ignore
+            source=MOSS_DATEV_SOURCE,
+            page_size=2,
+        )
+        assert conn.after_ids == [0, 2, 4]
+        assert (export_file.fiscal_year, export_file.number_of_rows) == (2026, 4)
+        assert export_file.sum_cents == -1200
+        assert len(_data_lines(export_file.path)) == 4
+        assert [id for id, row in conn.rows.items() if _is_exported(row)] == [
+            1,
+            2,
+            4,
+            5,
+        ]
+        assert conn.rows[1]["additional_info"]["datev_export"]["file"] == (
+            export_file.path.name
+        )
+
+        # only the skipped row is left and skipped again
+        conn.after_ids.clear()
+        assert (
+            write_datev_csvs_for_source(
+                ctx=ctx,
+                conn=conn,  # type: ignore
+                source=MOSS_DATEV_SOURCE,
+                page_size=2,
+            )
+            == []
+        )
+        assert conn.after_ids == [0]
+        assert not _is_exported(conn.rows[3])
+
+    def test_no_marking(self, ctx):
+        conn = _FakeConn([_moss_row(1)])
+        kwargs = dict(ctx=ctx, conn=conn, source=MOSS_DATEV_SOURCE, mark_exported=False)
+        assert len(write_datev_csvs_for_source(**kwargs)) == 1  # type: ignore
+        assert len(write_datev_csvs_for_source(**kwargs)) == 1  # type: ignore
+
+
+@pytest.mark.usefixtures("fake_pg")
+class Test_write_datev_csvs_for_pre_notifications:
+    def test_skips_exported(self, ctx):
+        conn = _FakeConn([_pn_row(1), _pn_row(2, exported=True), _pn_row(3)])
+        [path] = write_datev_csvs_for_pre_notifications(
+            ctx=ctx,
+            conn=conn,  # type: ignore
+            pain_ids=[9],
+        )
+        assert path.name == "EXTF_sammeleinzug_wsj27_2026-03_pain9_utf8.csv"
+        assert [line.split(";")[0] for line in _data_lines(path)] == ["10", "30"]
+        assert conn.rows[1]["additional_info"]["datev_export"]["file"] == path.name
+        assert conn.rows[2]["additional_info"]["datev_export"]["file"] == "old.csv"
+        assert (
+            write_datev_csvs_for_pre_notifications(
+                ctx=ctx,
+                conn=conn,  # type: ignore
+                pain_ids=[9],
+            )
+            == []
+        )
+
+    def test_include_exported_without_marking(self, ctx):
+        conn = _FakeConn([_pn_row(1), _pn_row(2, exported=True)])
+        [path] = write_datev_csvs_for_pre_notifications(
+            ctx=ctx,
+            conn=conn,  # type: ignore
+            pain_ids=[9],
+            include_exported=True,
+            mark_exported=False,
+        )
+        assert len(_data_lines(path)) == 2
+        assert not _is_exported(conn.rows[1])
+
+
+@pytest.mark.usefixtures("fake_pg")
+class Test_write_datev_csv_for_pain_id:
+    def test_paging_with_marking(self, ctx):
+        conn = _FakeConn([_pn_row(i) for i in range(1, 6)])
+        paths = [
+            write_datev_csv_for_pain_id(
+                ctx=ctx,
+                conn=conn,  # type: ignore
+                pain_id=9,
+                limit=2,
+                offset=offset,
+            )
+            for offset in [0, 2, 4]
+        ]
+        assert [len(_data_lines(path)) for path in paths] == [2, 2, 1]  # type: ignore
+        assert all(_is_exported(row) for row in conn.rows.values())
+        assert (
+            write_datev_csv_for_pain_id(
+                ctx=ctx,
+                conn=conn,  # type: ignore
+                pain_id=9,
+                limit=2,
+                offset=0,
+            )
+            is None
+        )
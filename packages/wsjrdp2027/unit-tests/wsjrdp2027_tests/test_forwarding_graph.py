@@ -0,0 +1,59 @@
+from wsjrdp2027._forwarding_graph import ForwardingGraph
+from wsjrdp2027._mailcow_client import MailcowAlias
+
+
+class Test_ForwardingGraph:
+    def test_cycle(self):
+        graph = ForwardingGraph(
+            {
+                "a@x": "b@x",
+                "b@x": "c@x,a@x",
+                "c@x": "a@x",
+                "d@x": "a@x,e@x",
+            }
+        )
+        assert graph.expand("a@x") == []
+        assert graph.expand("d@x") == ["e@x"]
+        assert graph.cycles() == [["a@x", "b@x", "c@x"]]
+        assert graph.forwarders("a@x") == {"b@x", "c@x", "d@x"}
+        assert graph.forwarders("e@x") == {"d@x"}
+
+    def test_long_chain(self):
+        n = 5000
+        graph = ForwardingGraph({f"a{i}@x": f"a{i + 1}@x" for i in range(n)})
+        assert graph.expand("a0@x") == [f"a{n}@x"]
+        assert len(graph.forwarders(f"a{n}@x")) == n
+        graph.add(f"a{n}@x", "a0@x")
+        assert graph.expand("a0@x") == []
+        assert len(graph.cycles()[0]) == n + 1
+
+    def test_keep_copy_and_sinks(self):
+        graph = ForwardingGraph(
+            {
+                "a@x": ["A@x", "b@x", "n@x"],
+                "n@x": None,
+                "c@x": "a@x",
+            }
+        )
+        assert graph.expand("c@x") == ["A@x", "b@x"]
+        assert graph.cycles() == []
+        assert graph.forwarders("n@x") == {"a@x", "c@x"}
+
+    def test_from_mailcow_aliases(self):
+        aliases = [
+            MailcowAlias({"address": "a@x", "goto": "b@x", "active": 1}),
+            MailcowAlias({"address": "b@x", "goto": "null@localhost", "active": 1}),
+            MailcowAlias({"address": "c@x", "goto": "d@x", "active": 0}),
+            MailcowAlias({"address": "k@x", "goto": "e@x", "active": "1"}),
+        ]
+        users = [
+            {"email": "k@x", "goto": "f@x"},
+            {"email": "u@x", "goto": "a@x,g@x"},
+            {"email": "v@x"},
+        ]
+        graph = ForwardingGraph.from_mailcow_aliases(aliases, keycloak_users=users)
+        assert graph.expand("a@x") == []
+        assert graph.expand("c@x") == []
+        assert graph.expand("K@x") == ["e@x"]
+        assert graph.expand("u@x") == ["g@x"]
+        assert "v@x" not in graph
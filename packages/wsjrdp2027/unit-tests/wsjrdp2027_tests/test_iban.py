@@ -0,0 +1,96 @@
+import pandas as pd
+from wsjrdp2027._iban import IbanService
+from wsjrdp2027._payment import _check_iban_bic_in_payment_dataframe
+
+
+VALID_IBAN = "DE02120300000000202051"
+VALID_IBAN_BIC = "BYLADEM1001"
+OTHER_IBAN = "DE89370400440532013000"
+BAD_CHECKSUM_IBAN = "DE02120300000000202052"
+
+
+class Test_IbanService:
+    def test_lookup(self):
+        service = IbanService()
+        info = service.lookup(VALID_IBAN)
+        assert info.valid
+        assert info.bic == VALID_IBAN_BIC
+        assert info.country_code == "DE"
+        assert info.bank_name
+        assert service.bank_name(VALID_IBAN) == info.bank_name
+        assert service.lookup(VALID_IBAN) is info
+        assert service.cache_info()["lookup"].hits == 2
+
+        bad = service.lookup(BAD_CHECKSUM_IBAN)
+        assert not bad.valid
+        assert bad.error
+        assert service.bank_name(BAD_CHECKSUM_IBAN) is None
+        assert service.lookup(None).error == "No IBAN"
+
+    def test_maxsize(self):
+        service = IbanService(maxsize=1)
+        service.lookup(VALID_IBAN)
+        service.lookup(OTHER_IBAN)
+        service.lookup(VALID_IBAN)
+        assert service.cache_info()["lookup"].currsize == 1
+        assert service.cache_info()["lookup"].misses == 3
+
+    def test_check(self):
+        service = IbanService()
+        check = service.check(VALID_IBAN, None)
+        assert (check.sepa_bic, check.sepa_bic_status) == (VALID_IBAN_BIC, "from_iban")
+        check = service.check(VALID_IBAN, "BYLADEM1001")
+        assert (check.sepa_bic_status, check.skip_reasons) == ("valid", ())
+        check = service.check(VALID_IBAN, "COBADEFFXXX")
+        assert (check.sepa_bic, check.sepa_bic_status) == (
+            VALID_IBAN_BIC,
+            "inconsistent",
+        )
+        assert check.skip_reasons == (f"sepa_bic: {check.sepa_bic_status_reason}",)
+        assert (
+            service.check(VALID_IBAN, "COBADEFFXXX", pedantic=False).skip_reasons == ()
+        )
+        check = service.check(VALID_IBAN, "XX")
+        assert check.sepa_bic_status == "invalid"
+        assert check.skip_reasons[0].startswith("sepa_bic: ")
+        check = service.check(BAD_CHECKSUM_IBAN, None)
+        assert (check.sepa_bic, check.sepa_bic_status) == (None, "not_present")
+        assert check.skip_reasons[0].startswith("sepa_iban: ")
+        assert service.check(None, VALID_IBAN_BIC).skip_reasons == ("No IBAN",)
+
+    def test_validate_series(self):
+        service = IbanService()
+        ibans = pd.Series([VALID_IBAN, VALID_IBAN, "", OTHER_IBAN], index=[3, 5, 7, 9])
+        bics = pd.Series([None, None, None, "COBADEFFXXX"], index=[3, 5, 7, 9])
+        df = service.validate_series(ibans, bics)
+        assert df.index.tolist() == [3, 5, 7, 9]
+        assert df["sepa_bic_status"].tolist() == [
+            "from_iban",
+            "from_iban",
+            "not_present",
+            "valid",
+        ]
+        assert df["skip_reasons"].tolist() == [(), (), ("No IBAN",), ()]
+        assert service.cache_info()["check"].misses == 3
+
+    def test_payment_dataframe(self):
+        df = pd.DataFrame(
+            {
+                "id": [1, 2, 3],
+                "sepa_iban": [VALID_IBAN, BAD_CHECKSUM_IBAN, VALID_IBAN],
+                "sepa_bic": ["", "", "COBADEFFXXX"],
+                "payment_status": ["ok", "ok", "ok"],
+                "payment_status_reason": ["", "", ""],
+                "sepa_bic_status": [None, None, None],
+                "sepa_bic_status_reason": ["", "", ""],
+            }
+        )
+        _check_iban_bic_in_payment_dataframe(df, pedantic=True)
+        assert df["payment_status"].tolist() == ["ok", "skipped", "skipped"]
+        assert df["sepa_bic"].tolist() == [VALID_IBAN_BIC, None, VALID_IBAN_BIC]
+        assert df["sepa_bic_status"].tolist() == [
+            "from_iban",
+            "not_present",
+            "inconsistent",
+        ]
+        assert df.at[1, "payment_status_reason"].startswith("sepa_iban: ")
@@ -0,0 +1,102 @@
+"""Tests for `wsjrdp2027._iso20022`.
+
+The benchmark compares the cached Saxon setup with creating a processor
+and compiling the stylesheet per file (as done before the cache was
+introduced).  Set ``WSJRDP_ISO20022_BENCHMARK_FILES`` to change the
+number of files, timings are only recorded as test properties, the
+assertions check that the compiled stylesheet is reused.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+import saxonche
+from wsjrdp2027 import _iso20022
+from wsjrdp2027._iso20022 import iso20022_xml_files_to_dicts, iso20022_xml_text_to_dict
+
+from wsjrdp2027_tests._iso20022_fixtures import CAMT052
+
+
+_LOGGER = logging.getLogger(__name__)
+
+NUM_FILES = int(os.environ.get("WSJRDP_ISO20022_BENCHMARK_FILES", "20"))
+
+
+def _uncached_xml_text_to_dict(xml_text: str) -> dict:
+    with saxonche.PySaxonProcessor(license=False) as proc:
+        document = proc.parse_xml(xml_text=xml_text)
+        executable = proc.new_xslt30_processor().compile_stylesheet(
+            stylesheet_text=_iso20022._ISO_20022_XML_TO_JSON_XSL
+        )
+        return json.loads(executable.transform_to_string(xdm_node=document))
+
+
+class Test_iso20022_xml_files_to_dicts:
+    def test_files(self, tmp_path):
+        paths = []
+        for i in range(3):
+            paths.append(path := tmp_path / f"camt052_{i}.xml")
+            path.write_text(CAMT052.replace("MSG1", f"MSG{i}"))
+        dicts = iso20022_xml_files_to_dicts(paths, expected_format="camt.052")
+        assert [d["sepa_schema"] for d in dicts] == ["camt.052.001.08"] * 3
+        assert [
+            d["Document"]["BkToCstmrAcctRpt"]["GrpHdr"]["MsgId"] for d in dicts
+        ] == ["MSG0", "MSG1", "MSG2"]
+
+    def test_threads(self):
+        expected = iso20022_xml_text_to_dict(CAMT052)
+        results = []
+
+        def convert():
+            for _ in range(5):
+                results.append(iso20022_xml_text_to_dict(CAMT052) == expected)
+
+        threads = [threading.Thread(target=convert) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert results == [True] * 20
+
+    def test_executable_reused(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(_iso20022, "_SAXON_THREAD_LOCAL", threading.local())
+        assert getattr(_iso20022._SAXON_THREAD_LOCAL, "executable", None) is None
+        assert getattr(_iso20022._SAXON_THREAD_LOCAL, "xpath_proc", None) is None
+        paths = []
+        for i in range(3):
+            paths.append(path := tmp_path / f"camt052_{i}.xml")
+            path.write_text(CAMT052)
+        iso20022_xml_files_to_dicts(paths)
+        executable = _iso20022._SAXON_THREAD_LOCAL.executable
+        xpath_proc = _iso20022._SAXON_THREAD_LOCAL.xpath_proc
+        processor = _iso20022._saxon_processor()
+        iso20022_xml_files_to_dicts(paths)
+        assert _iso20022._SAXON_THREAD_LOCAL.executable is executable
+        assert _iso20022._SAXON_THREAD_LOCAL.xpath_proc is xpath_proc
+        assert _iso20022._saxon_xslt_executable() is executable
+        assert _iso20022._saxon_processor() is processor
+
+    def test_benchmark(self, tmp_path, record_property):
+        paths = []
+        for i in range(NUM_FILES):
+            paths.append(path := tmp_path / f"camt052_{i}.xml")
+            path.write_text(CAMT052)
+
+        start = time.perf_counter()
+        uncached = [_uncached_xml_text_to_dict(p.read_text()) for p in paths]
+        uncached_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cached = iso20022_xml_files_to_dicts(paths)
+        cached_s = time.perf_counter() - start
+
+        assert [d["Document"] for d in cached] == [d["Document"] for d in uncached]
+        _LOGGER.info(
+            f"[benchmark] {NUM_FILES} files: uncached {uncached_s:.3f}s,"
+            f" cached {cached_s:.3f}s, speedup {uncached_s / cached_s:.1f}x"
+        )
+        record_property("iso20022_uncached_s", round(uncached_s, 4))
+        record_property("iso20022_cached_s", round(cached_s, 4))
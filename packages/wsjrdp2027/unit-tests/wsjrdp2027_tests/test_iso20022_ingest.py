@@ -0,0 +1,101 @@
+import pytest
+from wsjrdp2027._iso20022_ingest import (
+    deduplicate_camt_rows,
+    expand_iso20022_paths,
+    parse_iso20022_file,
+    parse_iso20022_files,
+)
+
+from wsjrdp2027_tests._iso20022_fixtures import CAMT052
+
+
+PAIN008 = """<?xml version="1.0" encoding="UTF-8"?>
+<Document xmlns="urn:iso:std:iso:20022:tech:xsd:pain.008.001.02">
+<CstmrDrctDbtInitn>
+<GrpHdr><MsgId>PAIN1</MsgId><CreDtTm>2026-01-01T10:00:00</CreDtTm>
+<NbOfTxs>2</NbOfTxs><CtrlSum>3.00</CtrlSum><InitgPty><Nm>rdp</Nm></InitgPty></GrpHdr>
+<PmtInf><PmtInfId>PMT1</PmtInfId>
+<DrctDbtTxInf><PmtId><EndToEndId>E1</EndToEndId></PmtId>
+<InstdAmt Ccy="EUR">1.00</InstdAmt></DrctDbtTxInf>
+<DrctDbtTxInf><PmtId><EndToEndId>E2</EndToEndId></PmtId>
+<InstdAmt Ccy="EUR">2.00</InstdAmt></DrctDbtTxInf>
+</PmtInf>
+</CstmrDrctDbtInitn>
+</Document>
+"""
+
+
+@pytest.fixture
+def xml_dir(tmp_path):
+    (tmp_path / "a_camt.xml").write_text(CAMT052)
+    # Second report of the same day repeating one entry.
+    (tmp_path / "b_camt.xml").write_text(
+        CAMT052.replace("MSG1", "MSG2").replace("REF1", "REF9")
+    )
+    (tmp_path / "c_pain.xml").write_text(PAIN008)
+    (tmp_path / "notes.txt").write_text("not xml")
+    return tmp_path
+
+
+class Test_expand_iso20022_paths:
+    def test_dir_and_glob(self, xml_dir):
+        names = [p.name for p in expand_iso20022_paths([xml_dir])]
+        assert names == ["a_camt.xml", "b_camt.xml", "c_pain.xml"]
+        paths = expand_iso20022_paths([xml_dir / "*_camt.xml", xml_dir / "a_camt.xml"])
+        assert [p.name for p in paths] == ["a_camt.xml", "b_camt.xml"]
+
+
+class Test_parse_iso20022_file:
+    def test_camt(self, xml_dir):
+        parsed = parse_iso20022_file(xml_dir / "a_camt.xml")
+        assert parsed.error is None
+        assert parsed.message_type == "camt.052"
+        assert parsed.message_identification == "MSG1"
+        # The pending entry REF2 is not booked.
+        assert [
+            (row["account_servicer_reference"], row["transaction_details_index"])
+            for row in parsed.camt_rows
+        ] == [("REF1", 0), ("REF1", 1), ("REF3", 0)]
+        assert parsed.amount_cents == 350
+
+    def test_pain(self, xml_dir):
+        parsed = parse_iso20022_file(xml_dir / "c_pain.xml")
+        assert parsed.error is None
+        assert parsed.is_pain
+        assert parsed.pain_endtoend_ids == {"E1": "PMT1", "E2": "PMT1"}
+        assert parsed.num_transactions == 2
+
+    def test_error(self, xml_dir):
+        parsed = parse_iso20022_file(xml_dir / "notes.txt")
+        assert parsed.error
+
+
+class Test_deduplicate_camt_rows:
+    def test_process_pool(self, xml_dir):
+        paths = expand_iso20022_paths([xml_dir])
+        parsed_files = list(parse_iso20022_files(paths, max_workers=2))
+        assert [p.path for p in parsed_files] == paths
+
+        first_row = parsed_files[0].camt_rows[2]
+        existing = {
+            ("camt.052", "DE02120300000000202051", "REF3", 0): first_row,
+        }
+        new_rows, summaries = deduplicate_camt_rows(parsed_files, existing=existing)
+        assert [r["account_servicer_reference"] for r in new_rows] == [
+            "REF1",
+            "REF1",
+            "REF9",
+            "REF9",
+        ]
+        assert [(s.num_new, s.num_duplicates, s.num_in_db) for s in summaries] == [
+            (2, 0, 1),
+            (2, 0, 1),
+            (0, 0, 0),
+        ]
+
+    def test_mismatch(self, xml_dir):
+        parsed = parse_iso20022_file(xml_dir / "a_camt.xml")
+        other = parse_iso20022_file(xml_dir / "a_camt.xml")
+        other.camt_rows[0]["amount_cents"] += 1
+        with pytest.raises(RuntimeError, match="Mismatch of amount_cents"):
+            deduplicate_camt_rows([parsed, other])
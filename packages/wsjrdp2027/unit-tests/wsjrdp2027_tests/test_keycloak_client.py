@@ -0,0 +1,246 @@
+import threading
+import types
+
+import keycloak
+import pytest
+from wsjrdp2027._keycloak_client import KeycloakClient, _KeycloakCache
+from wsjrdp2027._snapshot_cache import SnapshotState, SnapshotStore
+
+
+def _user(i: int, **kwargs) -> dict:
+    return {
+        "id": f"uid-{i}",
+        "username": f"user{i}",
+        "email": f"User{i}@Example.org",
+        "enabled": True,
+        "attributes": {
+            "hitobitoId": [str(i)],
+            "mossEmail": [f"moss{i}@example.org"],
+        },
+    } | kwargs
+
+
+class _FakeAdmin:
+    def __init__(self, users: list[dict]) -> None:
+        self.users = users
+        self.queries = []
+        self.updated = []
+        self.connection = types.SimpleNamespace(_refresh_if_required=lambda: None)
+
+    def get_users(self, query=None):
+        self.queries.append(query)
+        if "email" in query:
+            email = query["email"].lower()
+            return [u for u in self.users if u["email"].lower() == email]
+        first = query["first"]
+        return self.users[first : first + query["max"]]
+
+    def create_user(self, payload, exist_ok=False):
+        if any(u["email"].lower() == payload["email"].lower() for u in self.users):
+            raise keycloak.KeycloakPostError(
+                error_message="User exists with same email", response_code=409
+            )
+        raise AssertionError("unexpected create_user")
+
+    def get_group_members(self, group_id, query=None):
+        assert group_id == "gid-1"
+        return self.get_users(query)
+
+    def update_user(self, user_id, payload):
+        if not payload.get("enabled", True) and user_id == "uid-3":
+            raise RuntimeError("boom")
+        self.updated.append(user_id)
+
+
+class Test_KeycloakCache:
+    def test_indexes(self):
+        cache = _KeycloakCache()
+        cache.add_user(_user(1))
+        assert cache.get_user_by_email(" user1@example.ORG ")["id"] == "uid-1"  # type: ignore
+        assert cache.get_user_by_hitobito_id(1)["id"] == "uid-1"  # type: ignore
+        assert cache.get_user_by_moss_email("MOSS1@example.org")["id"] == "uid-1"  # type: ignore
+
+    def test_readd_drops_old_keys(self):
+        cache = _KeycloakCache()
+        cache.add_user(_user(1))
+        cache.add_user(_user(1, email="new@example.org", attributes={}))
+        assert cache.get_user_by_email("user1@example.org") is None
+        assert cache.get_user_by_hitobito_id(1) is None
+        assert cache.get_user_by_email("new@example.org")["id"] == "uid-1"  # type: ignore
+        cache.remove_user_by_id("uid-1")
+        assert cache.get_user_by_email("new@example.org") is None
+        assert cache.get_user_by_username("user1") is None
+
+
+def _client(store: SnapshotStore | None = None) -> KeycloakClient:
+    client = object.__new__(KeycloakClient)
+    client._cache = _KeycloakCache()
+    client._token_lock = threading.Lock()
+    client._admin = _FakeAdmin([_user(i) for i in range(5)])  # type: ignore
+    client._snapshot = SnapshotState(store, kind="keycloak", key="test")
+    return client
+
+
+class Test_KeycloakClient_prefetch_users:
+    @pytest.fixture
+    def client(self) -> KeycloakClient:
+        return _client()
+
+    def test_paging(self, client):
+        assert client.prefetch_users(page_size=2) == 5
+        assert [q["first"] for q in client._admin.queries] == [0, 2, 4]
+        assert client.all_users_cached
+
+    def test_lookups_use_cache_only(self, client):
+        client.prefetch_users(page_size=10)
+        n_queries = len(client._admin.queries)
+        by_email = client.get_user_or_none_by_email(
+            "user3@example.org", allow_cached=True
+        )
+        assert by_email["username"] == "user3"
+        assert (
+            client.get_user_or_none_by_hitobito_id(4, allow_cached=True)["id"]
+            == "uid-4"
+        )
+        assert client.get_user_or_none_by_username("user2", allow_cached=True)
+        assert (
+            client.get_user_or_none_by_email("x@example.org", allow_cached=True) is None
+        )
+        assert client.get_user_or_none_by_username("x", allow_cached=True) is None
+        assert client.get_user_id_or_none("x") is None
+        assert len(client._admin.queries) == n_queries
+
+    def test_update_user_refreshes_cache(self, client):
+        client.prefetch_users()
+        client.update_user(
+            "user1",
+            {"attributes": {"mossEmail": ["new@example.org"]}},
+            allow_cached=True,
+        )
+        user = client.get_user_or_none_by_moss_email(
+            "new@example.org", allow_cached=True
+        )
+        assert user["id"] == "uid-1"
+        assert (
+            client.get_user_or_none_by_moss_email(
+                "moss1@example.org", allow_cached=True
+            )
+            is None
+        )
+
+    def test_bulk_update_orders_audit_and_collects_errors(self, client):
+        client.prefetch_users()
+        audited = []
+        with pytest.raises(ExceptionGroup) as exc_info:
+            client.update_users(
+                [(f"user{i}", {"enabled": False}) for i in range(5)],
+                allow_cached=True,
+                audit=audited.append,
+            )
+        assert [s.split("(")[1].split(",")[0] for s in audited] == [
+            repr(f"user{i}") for i in range(5)
+        ]
+        assert sorted(client._admin.updated) == ["uid-0", "uid-1", "uid-2", "uid-4"]
+        assert len(exc_info.value.exceptions) == 1
+        assert not client.get_user_by_username("user1", allow_cached=True)["enabled"]
+        assert client.get_user_by_username("user3", allow_cached=True)["enabled"]
+
+
+class Test_KeycloakClient_iter_users:
+    @pytest.fixture
+    def client(self) -> KeycloakClient:
+        client = _client()
+        client._admin.users[2]["enabled"] = False
+        client._cache.add_group({"id": "gid-1", "name": "CMT", "path": "/CMT"})
+        return client
+
+    def test_pages_lazily(self, client):
+        users = client.iter_users(page_size=2)
+        assert next(users)["id"] == "uid-0"
+        assert [q["first"] for q in client._admin.queries] == [0]
+        assert [u["id"] for u in users] == [f"uid-{i}" for i in range(1, 5)]
+        assert [q["first"] for q in client._admin.queries] == [0, 2, 4]
+        assert not client.all_users_cached
+
+    def test_filters_without_cache(self, client):
+        users = client.iter_users_in_group(
+            "CMT",
+            enabled=True,
+            attributes={"hitobitoId": "3"},
+            omit_keys=["attributes"],
+            add_to_cache=False,
+        )
+        assert list(users) == [
+            {
+                "id": "uid-3",
+                "username": "user3",
+                "email": "User3@Example.org",
+                "enabled": True,
+            }
+        ]
+        assert client._cache.get_user_by_id("uid-3") is None
+
+    def test_get_users_in_group(self, client):
+        users = client.get_users_in_group("CMT", enabled=False)
+        assert [u["id"] for u in users] == ["uid-2"]
+        assert client._cache.get_user_by_id("uid-4") is not None
+
+
+class Test_KeycloakClient_snapshot:
+    def test_prefetch_uses_snapshot(self, tmp_path):
+        store = SnapshotStore(tmp_path, ttl=60)
+        assert _client(store).prefetch_users() == 5
+
+        client = _client(store)
+        assert client.prefetch_users() == 0
+        assert client._admin.queries == []
+        assert client.get_user_or_none_by_hitobito_id(3, allow_cached=True)
+
+    def test_update_invalidates_and_close_refreshes(self, tmp_path):
+        store = SnapshotStore(tmp_path, ttl=60)
+        client = _client(store)
+        client.prefetch_users()
+        client.update_user("user1", {"enabled": False}, allow_cached=True)
+        assert store.load("keycloak", "test") is None
+        client.close()
+
+        client = _client(store)
+        user = client.get_user_or_none_by_username("user1", allow_cached=True)
+        assert user is not None and not user["enabled"]
+
+    def test_dry_run_is_never_saved(self, tmp_path):
+        store = SnapshotStore(tmp_path, ttl=60)
+        client = _client(store)
+        client.prefetch_users()
+        client.delete_user_by_id("uid-2", dry_run=True)
+        client.update_user("user1", {"enabled": False}, allow_cached=True)
+        client.close()
+        assert store.load("keycloak", "test") is None
+
+    def test_miss_after_snapshot_uses_admin_api(self, tmp_path):
+        store = SnapshotStore(tmp_path, ttl=60)
+        _client(store).prefetch_users()
+        client = _client(store)
+        client._admin.users.append(_user(5))
+        assert client.prefetch_users() == 0
+        assert client.all_users_cached
+        user = client.get_user_or_none_by_email("user5@example.org", allow_cached=True)
+        assert user is not None and user["id"] == "uid-5"
+        assert client._admin.queries == [{"email": "user5@example.org"}]
+
+    def test_create_conflict_drops_complete_cache(self, tmp_path):
+        store = SnapshotStore(tmp_path, ttl=60)
+        client = _client(store)
+        client.prefetch_users()
+        client._admin.users.append(_user(5))
+        with pytest.raises(keycloak.KeycloakPostError):
+            client.create_user("user5@example.org", "secret", username="other5")
+        assert not client.all_users_cached
+        assert client.get_user_or_none_by_email("user5@example.org", allow_cached=True)
+        client.close()
+        assert store.load("keycloak", "test") is None
+
+    def test_expired(self, tmp_path):
+        _client(SnapshotStore(tmp_path, ttl=60)).prefetch_users()
+        client = _client(SnapshotStore(tmp_path, ttl=-1))
+        assert client.prefetch_users() == 5
@@ -0,0 +1,114 @@
+import pandas as pd
+import pytest
+from wsjrdp2027._keycloak_sync_plan import (
+    compute_keycloak_sync_plan,
+    keycloak_users_dataframe,
+)
+
+
+def _person(id: int, first: str, last: str, status: str = "reviewed", **info) -> dict:
+    info = {
+        "wsjrdp_role": "CMT",
+        "wsjrdp_email": f"{first}.{last}@worldscoutjamboree.de".lower(),
+        "moss_email": f"{first}.{last}@moss.example".lower(),
+        **info,
+    }
+    return {
+        "id": id,
+        "status": status,
+        "role_id_name": f"CMT {id} {first} {last}",
+        "first_name": first,
+        "last_name": last,
+        "primary_group_id": 2,
+        "additional_info": info,
+    }
+
+
+def _user(uid: str, username: str, email: str, **attributes) -> dict:
+    return {
+        "id": uid,
+        "username": username,
+        "email": email,
+        "enabled": True,
+        "attributes": {k: [v] for k, v in attributes.items()},
+    }
+
+
+class Test_compute_keycloak_sync_plan:
+    @pytest.fixture
+    def plan(self):
+        people_df = pd.DataFrame(
+            [
+                _person(1, "Anna", "Berg", keycloak_username="aberg"),
+                _person(2, "Carl", "Dorn"),
+                _person(3, "Eva", "Fink", status="deregistered"),
+                _person(4, "Gero", "Hahn"),
+            ]
+        )
+        users_df = keycloak_users_dataframe(
+            [
+                _user(
+                    "u1",
+                    "aberg",
+                    "anna.berg@worldscoutjamboree.de",
+                    hitobitoId="1",
+                    mossEmail="Anna.Berg@moss.example",
+                ),
+                _user("u3", "efink", "other@example.org", hitobitoId="3"),
+                _user(
+                    "u4",
+                    "ghahn",
+                    "Gero.Hahn@WorldScoutJamboree.de",
+                    mossEmail="gero@elsewhere.example",
+                ),
+                _user("u9", "orphan", "orphan@example.org"),
+            ]
+        )
+        return compute_keycloak_sync_plan(
+            people_df,
+            users_df,
+            keycloak_groupname="CMT",
+            group_member_ids={"u1", "u9"},
+            sync_enabled=True,
+            prune_group=True,
+        )
+
+    def test_create(self, plan):
+        assert [c["id"] for c in plan.create] == [2]
+        assert plan.create[0]["email"] == "carl.dorn@worldscoutjamboree.de"
+
+    def test_attribute_updates(self, plan):
+        assert plan.attribute_updates == [
+            {
+                "username": "aberg",
+                "attributes": {"mossEmail": ["anna.berg@moss.example"]},
+            },
+            {
+                "username": "efink",
+                "attributes": {"mossEmail": ["eva.fink@moss.example"]},
+            },
+            {"username": "ghahn", "attributes": {"hitobitoId": ["4"]}},
+        ]
+
+    def test_errors(self, plan):
+        assert plan.errors == [
+            "CMT 4 Gero Hahn: Unexpected Keycloak mossEmail='gero@elsewhere.example'"
+        ]
+
+    def test_enabled_and_groups(self, plan):
+        assert plan.disable == ["efink"]
+        assert plan.enable == []
+        assert plan.group_add == ["efink", "ghahn"]
+        assert plan.group_remove == ["orphan"]
+
+    def test_additional_info_updates(self, plan):
+        by_id = {u["id"]: u for u in plan.additional_info_updates}
+        assert sorted(by_id) == [1, 3, 4]
+        assert by_id[3]["keycloak_username"] == [None, "efink"]
+        assert by_id[1]["wsjrdp_email_is_mailbox"] == [None, True]
+        assert "keycloak_username" not in by_id[1]
+
+    def test_report(self, plan):
+        text = plan.get_description()
+        assert text.startswith("Keycloak sync plan: 4 people, 4 Keycloak users")
+        assert "Create Keycloak users — 1" in text
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import email.message
+
+import pytest
+from wsjrdp2027._batch import PreparedEmailMessage
+from wsjrdp2027._mail_client import (
+    MailClient,
+    message_as_bytes,
+    strip_bcc_headers,
+)
+from wsjrdp2027._mail_config import WsjRdpMailConfig
+from wsjrdp2027._util import get_default_email_policy
+
+
+class _FakeSmtp:
+    def __init__(self) -> None:
+        self.sendmail_calls: list[tuple] = []
+
+    def sendmail(self, from_addr, to_addrs, msg):
+        self.sendmail_calls.append((from_addr, list(to_addrs), msg))
+        return {}
+
+    def send_message(self, *args, **kwargs):
+        raise AssertionError("send_message must not be called")
+
+
+def _create_message() -> email.message.EmailMessage:
+    msg = email.message.EmailMessage(policy=get_default_email_policy())
+    msg["Subject"] = "Test"
+    msg["From"] = "Sender <sender@example.com>"
+    msg["To"] = "to@example.com"
+    msg["Bcc"] = "bcc@example.com"
+    msg["Date"] = "Sat, 17 Oct 2026 12:00:00 +0200"
+    msg.set_content("Hello\n")
+    return msg
+
+
+@pytest.fixture
+def client() -> MailClient:
+    client = MailClient(config=WsjRdpMailConfig())
+    client._smtp = _FakeSmtp()  # type: ignore
+    return client
+
+
+def test_message_as_bytes__crlf():
+    msg_bytes = message_as_bytes(_create_message())
+    assert b"\r\nBcc: bcc@example.com\r\n" in msg_bytes
+    assert b"\n" not in msg_bytes.replace(b"\r\n", b"")
+
+
+def test_strip_bcc_headers():
+    msg_bytes = message_as_bytes(_create_message())
+    stripped = strip_bcc_headers(msg_bytes)
+    assert b"bcc@example.com" not in stripped
+    assert stripped == msg_bytes.replace(b"Bcc: bcc@example.com\r\n", b"")
+
+
+def test_send_message__email_message(client):
+    msg = _create_message()
+    client.send_message(msg)
+    [(from_addr, to_addrs, msg_bytes)] = client._smtp.sendmail_calls
+    assert from_addr == "sender@example.com"
+    assert to_addrs == ["to@example.com", "bcc@example.com"]
+    assert msg_bytes == strip_bcc_headers(message_as_bytes(msg))
+
+
+def test_send_message__prepared_reuses_eml(client):
+    prepared = PreparedEmailMessage(
+        mailing_name="test", message=_create_message(), summary=""
+    )
+    prepared.eml = b"Bcc: bcc@example.com\r\nSubject: cached\r\n\r\nbody"
+    client.send_message(prepared, from_addr="envelope@example.com")
+    [(from_addr, to_addrs, msg_bytes)] = client._smtp.sendmail_calls
+    assert from_addr == "envelope@example.com"
+    assert to_addrs == ["to@example.com", "bcc@example.com"]
+    assert msg_bytes == b"Subject: cached\r\n\r\nbody"
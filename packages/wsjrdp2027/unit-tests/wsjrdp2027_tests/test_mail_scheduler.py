@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import email.message
+import smtplib
+
+import pytest
+from wsjrdp2027._mail_client import MailClient
+from wsjrdp2027._mail_config import WsjRdpMailConfig
+from wsjrdp2027._mail_scheduler import MailSendScheduler, TokenBucket
+from wsjrdp2027._util import get_default_email_policy
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _create_message(*to_addrs: str) -> email.message.EmailMessage:
+    msg = email.message.EmailMessage(policy=get_default_email_policy())
+    msg["Subject"] = "Test"
+    msg["From"] = "sender@example.com"
+    msg["To"] = list(to_addrs)
+    msg["Date"] = "Sat, 17 Oct 2026 12:00:00 +0200"
+    msg.set_content("Hello\n")
+    return msg
+
+
+class Test_TokenBucket:
+    def test_per_period(self):
+        clock = _FakeClock()
+        bucket = TokenBucket.per_period(3, 60, clock=clock)
+        for _ in range(3):
+            assert bucket.wait_time() == 0.0
+            bucket.take()
+        assert bucket.wait_time() == pytest.approx(20.0)
+        clock.now = 50.0
+        assert bucket.wait_time() == 0.0
+
+    def test_capacity_is_upper_bound(self):
+        clock = _FakeClock()
+        bucket = TokenBucket(rate=1.0, capacity=2, clock=clock)
+        clock.now = 100.0
+        bucket.take(2)
+        assert bucket.wait_time() == pytest.approx(1.0)
+
+
+class _FakeSmtpServer:
+    """State shared by all `_FakeSmtp` sessions of one test."""
+
+    def __init__(self) -> None:
+        self.responses: list[tuple[int, str]] = []
+        self.envelopes: list[list[str]] = []
+        self.connects = 0
+
+
+class _FakeSmtp:
+    """In-process stand-in for `smtplib.SMTP`.
+
+    Replies to ``DATA`` with the next entry of ``server.responses``
+    (raising like `smtplib.SMTP.sendmail` does) or accepts the
+    message. A ``421`` reply closes the session.
+    """
+
+    def __init__(self, server: _FakeSmtpServer, host: str, port: int) -> None:
+        server.connects += 1
+        self._server = server
+        self._closed = False
+
+    def ehlo(self):
+        return 250, b"fake"
+
+    def has_extn(self, name: str) -> bool:
+        return False
+
+    def login(self, user: str, password: str):
+        return 235, b"OK"
+
+    def quit(self):
+        if self._closed:
+            raise smtplib.SMTPServerDisconnected("please run connect() first")
+        self._closed = True
+
+    def sendmail(self, from_addr, to_addrs, msg):
+        if self._closed:
+            raise smtplib.SMTPServerDisconnected("please run connect() first")
+        if self._server.responses:
+            code, resp = self._server.responses.pop(0)
+            if code == 421:
+                self._closed = True
+            raise smtplib.SMTPDataError(code, resp)
+        self._server.envelopes.append(list(to_addrs))
+        return {}
+
+
+class Test_MailSendScheduler:
+    @pytest.fixture
+    def smtp_server(self, monkeypatch):
+        server = _FakeSmtpServer()
+        monkeypatch.setattr(
+            smtplib, "SMTP", lambda host, port: _FakeSmtp(server, host, port)
+        )
+        return server
+
+    def _client(self, **kwargs) -> MailClient:
+        config = WsjRdpMailConfig(smtp_server="localhost", smtp_port=25, **kwargs)
+        return MailClient(config=config)
+
+    def test_retry_on_451(self, smtp_server):
+        smtp_server.responses = [(451, "4.7.1 Try again later")] * 2
+        clock = _FakeClock()
+        with self._client(send_retry_delay=1.0) as client:
+            scheduler = MailSendScheduler(client, sleep=clock.sleep, clock=clock)
+            scheduler.send(_create_message("a@example.com"))
+        assert smtp_server.envelopes == [["a@example.com"]]
+        assert clock.sleeps == [1.0, 2.0]
+        assert scheduler.retries == 2
+        assert scheduler.reconnects == 0
+        assert scheduler.backoff_seconds == pytest.approx(3.0)
+        assert scheduler.throttled_seconds == 0.0
+
+    def test_reconnect_on_421(self, smtp_server):
+        smtp_server.responses = [(421, "4.7.0 Too many messages, closing connection")]
+        clock = _FakeClock()
+        with self._client() as client:
+            scheduler = MailSendScheduler(client, sleep=clock.sleep, clock=clock)
+            scheduler.send(_create_message("a@example.com"))
+        assert smtp_server.envelopes == [["a@example.com"]]
+        assert scheduler.reconnects == 1
+        assert smtp_server.connects == 2
+
+    def test_give_up_after_max_send_retries(self, smtp_server):
+        smtp_server.responses = [(451, "4.7.1 Try again later")] * 3
+        clock = _FakeClock()
+        with self._client(max_send_retries=2) as client:
+            scheduler = MailSendScheduler(client, sleep=clock.sleep, clock=clock)
+            with pytest.raises(smtplib.SMTPDataError):
+                scheduler.send(_create_message("a@example.com"))
+        assert smtp_server.envelopes == []
+
+    def test_permanent_error_is_not_retried(self, smtp_server):
+        smtp_server.responses = [(554, "5.7.1 Rejected")]
+        clock = _FakeClock()
+        with self._client() as client:
+            scheduler = MailSendScheduler(client, sleep=clock.sleep, clock=clock)
+            with pytest.raises(smtplib.SMTPDataError):
+                scheduler.send(_create_message("a@example.com"))
+        assert clock.sleeps == []
+
+    def test_rate_limit_and_recipient_chunks(self, smtp_server):
+        clock = _FakeClock()
+        with self._client(
+            max_messages_per_minute=2, max_recipients_per_message=2
+        ) as client:
+            scheduler = MailSendScheduler(client, sleep=clock.sleep, clock=clock)
+            scheduler.send(_create_message("a@x.org", "b@x.org", "c@x.org"))
+            scheduler.send(_create_message("d@x.org"))
+        assert smtp_server.envelopes == [
+            ["a@x.org", "b@x.org"],
+            ["c@x.org"],
+            ["d@x.org"],
+        ]
+        assert scheduler.transactions == 3
+        assert clock.sleeps == [pytest.approx(30.0)]
+        assert scheduler.throttled_seconds == pytest.approx(30.0)
+        assert scheduler.backoff_seconds == 0.0
+        assert (
+            scheduler.progress_message(3, 4) == "3/4 (75.0%) 4.0 msg/min, ETA 0:00:30"
+        )
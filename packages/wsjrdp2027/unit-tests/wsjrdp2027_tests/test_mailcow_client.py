@@ -0,0 +1,180 @@
+import pytest
+from wsjrdp2027._mailcow_client import MailcowClient, MailcowConfig, MailcowError
+from wsjrdp2027._snapshot_cache import SnapshotStore
+
+
+class _FakeResponse:
+    ok = True
+
+    def __init__(self, json) -> None:
+        self._json = json
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self):
+        return self._json
+
+
+class _FakeSession:
+    def __init__(self, aliases: list[dict]) -> None:
+        self.aliases = aliases
+        self.requests = []
+
+    def request(self, method, url, json=None, timeout=None):
+        assert timeout == 30.0
+        path = url.removeprefix("https://mail.example.org/api/v1/")
+        self.requests.append((method, path, json))
+        if path == "get/alias/all":
+            return _FakeResponse(self.aliases)
+        elif path.startswith("get/alias/"):
+            address = path.removeprefix("get/alias/")
+            return _FakeResponse([a for a in self.aliases if a["address"] == address])
+        elif path.startswith("get/"):
+            return _FakeResponse({})
+        elif path == "add/alias":
+            for address in json["address"].split(","):
+                self.aliases.append(
+                    json | {"address": address, "id": len(self.aliases) + 1}
+                )
+            return _FakeResponse([{"type": "success", "msg": "alias_added"}])
+        elif path == "edit/alias" and 99 in json["items"]:
+            return _FakeResponse([{"type": "danger", "msg": "access_denied"}])
+        elif path == "edit/alias":
+            for alias in self.aliases:
+                if alias["id"] in json["items"]:
+                    alias.update(json["attr"])
+            return _FakeResponse([{"type": "success", "msg": "alias_modified"}])
+        else:
+            items = json["items"] if isinstance(json, dict) else json
+            return _FakeResponse([{"type": "success", "msg": "ok"} for _ in items])
+
+    def close(self) -> None:
+        pass
+
+
+def _client(store: SnapshotStore | None = None) -> MailcowClient:
+    client = MailcowClient(
+        MailcowConfig(server="https://mail.example.org", api_key="secret"),
+        snapshot_store=store,
+    )
+    client.bulk_chunk_size = 2
+    client._MailcowClient__session = _FakeSession(  # type: ignore
+        [
+            {"id": 1, "address": "a@x", "goto": "old@x", "active": 1},
+            {"id": 2, "address": "b@x", "goto": "old@x", "active": 1},
+            {"id": 3, "address": "c@x", "goto": "new@x", "active": 1},
+        ]
+    )
+    return client
+
+
+@pytest.fixture
+def client() -> MailcowClient:
+    return _client()
+
+
+class Test_MailcowClient_bulk:
+    def test_add_aliases(self, client):
+        aliases = client.add_aliases(
+            {
+                "a@x": "new@x",
+                "b@x": "new@x",
+                "c@x": "new@x",
+                "d@x": "new@x",
+                "e@x": "new@x",
+                "f@x": "other@x",
+            }
+        )
+        assert [a.goto for a in aliases] == [["new@x"]] * 5 + [["other@x"]]
+        requests = [
+            (path, json)
+            for _, path, json in client._session().requests
+            if not path.startswith("get/")
+        ]
+        assert requests == [
+            ("edit/alias", {"items": [1, 2], "attr": {"goto": "new@x", "active": 1}}),
+            ("add/alias", {"address": "d@x,e@x", "goto": "new@x", "active": True}),
+            ("add/alias", {"address": "f@x", "goto": "other@x", "active": True}),
+        ]
+
+    def test_add_aliases_dry_run(self, client):
+        aliases = client.add_aliases(
+            [("d@x", "new@x"), ("e@x", "new@x")], add_goto=True, dry_run=True
+        )
+        assert len({a.id for a in aliases}) == 2
+        assert [m for m, *_ in client._session().requests] == ["GET"]
+
+    def test_edit_aliases_collects_errors(self, client):
+        client.get_alias_list()
+        client._cache.add_alias({"id": 99, "address": "z@x", "goto": "old@x"})
+        with pytest.raises(ExceptionGroup) as exc_info:
+            client.edit_aliases(["a@x", "b@x", "z@x"], active=False)
+        assert exc_info.group_contains(MailcowError)
+        edits = [json["items"] for _, path, json in client._session().requests[1:]]
+        assert edits == [[1, 2], [99]]
+        assert not client._cache.all_aliases_cached
+
+    def test_failed_edit_keeps_cache(self, client):
+        client.get_alias_list()
+        client._cache.add_alias({"id": 99, "address": "z@x", "goto": "old@x"})
+        with pytest.raises(MailcowError):
+            client.add_alias("z@x", goto="new@x")
+        assert client.get_alias_by_address("z@x").goto == ["old@x"]
+
+    def test_delete_chunks(self, client):
+        client.delete_alias([1, 2, 3])
+        assert [json for *_, json in client._session().requests] == [[1, 2], [3]]
+
+
+class Test_MailcowClient_transport:
+    def test_prefetch_and_metrics(self, client):
+        client._session().aliases = []
+        client.prefetch()
+        assert sorted(path for _, path, _ in client._session().requests) == [
+            "get/alias/all",
+            "get/domain/all",
+            "get/mailbox/all",
+        ]
+        assert client.get_mailbox_list() == []
+        client.prefetch()
+        assert len(client._session().requests) == 3
+        metrics = client.request_metrics
+        assert sorted(metrics) == ["GET get/alias", "GET get/domain", "GET get/mailbox"]
+        assert all(m.count == 1 and not m.errors for m in metrics.values())
+
+    def test_session_config(self):
+        client = MailcowClient(
+            MailcowConfig(server="https://mail.example.org", api_key="secret")
+        )
+        adapter = client._session().get_adapter("https://mail.example.org/api/v1/")
+        assert adapter.max_retries.total == 3
+        assert "POST" not in adapter.max_retries.allowed_methods
+        client.close()
+
+
+class Test_MailcowClient_snapshot:
+    def test_snapshot_hit_needs_no_request(self, tmp_path):
+        store = SnapshotStore(tmp_path, ttl=60)
+        _client(store).prefetch()
+
+        client = _client(store)
+        assert client.get_alias_by_address("a@x").id == 1
+        assert client._session().requests == []
+
+    def test_alias_created_after_snapshot(self, tmp_path):
+        store = SnapshotStore(tmp_path, ttl=60)
+        _client(store).prefetch()
+
+        client = _client(store)
+        client._session().aliases.append(
+            {"id": 4, "address": "d@x", "goto": "old@x", "active": 1}
+        )
+        assert not client._cache.all_aliases_cached
+        assert client.get_alias_by_address("d@x").id == 4
+        client.add_aliases({"d@x": "new@x"})
+        assert [
+            (path, json)
+            for _, path, json in client._session().requests
+            if not path.startswith("get/")
+        ] == [("edit/alias", {"items": [4], "attr": {"goto": "new@x", "active": 1}})]
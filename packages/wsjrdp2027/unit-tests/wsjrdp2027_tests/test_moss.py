@@ -0,0 +1,86 @@
+import pandas as pd
+import pytest
+from wsjrdp2027.moss import (
+    MossUserSyncStats,
+    compute_moss_user_updates,
+    read_moss_users_dataframe,
+)
+
+
+@pytest.fixture
+def moss_users_df(tmp_path) -> pd.DataFrame:
+    csv_path = tmp_path / "moss_users.csv"
+    csv_path.write_bytes(
+        "name,status,email,phone,team,role\n"
+        "Jörg Groß, ACTIVE ,Joerg@Example.org,,Team A,TEAMLEAD  USER\n"
+        "No Mail,ACTIVE,,,,USER\n"
+        "Eva,INVITED,eva@example.org,+49 1,,\n".encode("cp1252")
+    )
+    return read_moss_users_dataframe(csv_path)
+
+
+class Test_read_moss_users_dataframe:
+    def test_read(self, moss_users_df):
+        assert moss_users_df["name"].tolist() == ["Jörg Groß", "Eva"]
+        assert moss_users_df["status"].tolist() == ["ACTIVE", "INVITED"]
+        assert moss_users_df["email_key"].tolist() == [
+            "joerg@example.org",
+            "eva@example.org",
+        ]
+        assert moss_users_df["roles"].tolist() == ["TEAMLEAD USER", pd.NA]
+        assert moss_users_df["phone"].isna().tolist() == [True, False]
+
+    def test_missing_column(self, tmp_path):
+        csv_path = tmp_path / "moss_users.csv"
+        csv_path.write_text("name,email\nX,x@example.org\n")
+        with pytest.raises(RuntimeError, match="missing column"):
+            read_moss_users_dataframe(csv_path)
+
+
+class Test_compute_moss_user_updates:
+    def test_unchanged_and_cleared(self, moss_users_df):
+        people_df = pd.DataFrame(
+            {
+                "id": [1, 2],
+                "moss_email": ["joerg@example.org", "EVA@example.org "],
+                "moss_status": ["ACTIVE", "INVITED"],
+                "moss_phone": [None, "+49 1"],
+                "moss_team": ["Team A", "Team B"],
+                "moss_roles": [["TEAMLEAD", "USER"], ["USER"]],
+            }
+        )
+        updates, stats = compute_moss_user_updates(moss_users_df, people_df)
+        assert updates == [
+            {"id": 2, "moss_team": ["Team B", None]},
+            {"id": 2, "moss_roles": [["USER"], None]},
+        ]
+        assert stats == MossUserSyncStats(
+            matched=2,
+            changed=1,
+            unchanged=1,
+            per_field={"moss_team": 1, "moss_roles": 1},
+        )
+
+    def test_no_people(self, moss_users_df):
+        people_df = pd.DataFrame(
+            columns=["id", "moss_email", "moss_status", "moss_phone"]
+            + ["moss_team", "moss_roles"]
+        )
+        updates, stats = compute_moss_user_updates(moss_users_df, people_df)
+        assert updates == []
+        assert stats == MossUserSyncStats(unmatched=2)
+
+    def test_roles_stored_as_string(self, moss_users_df):
+        people_df = pd.DataFrame(
+            {
+                "id": [1, 2],
+                "moss_email": ["joerg@example.org", "eva@example.org"],
+                "moss_status": ["ACTIVE", "INVITED"],
+                "moss_phone": [None, "+49 1"],
+                "moss_team": ["Team A", None],
+                "moss_roles": ["TEAMLEAD USER", "USER"],
+            }
+        )
+        updates, stats = compute_moss_user_updates(moss_users_df, people_df)
+        assert updates == [{"id": 2, "moss_roles": ["USER", None]}]
+        assert stats.changed == 1 and stats.unchanged == 1
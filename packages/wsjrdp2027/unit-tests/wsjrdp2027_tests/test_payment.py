@@ -0,0 +1,114 @@
+import contextlib
+import types
+
+import pandas as pd
+from wsjrdp2027 import _pg
+from wsjrdp2027._payment import (
+    _PMT_INF_UPSERT_COLS,
+    write_payment_dataframe_to_db,
+    write_payment_initiations_to_db,
+)
+
+
+class _FakeConn:
+    def cursor(self):
+        return contextlib.nullcontext(self)
+
+
+def _pain_message(msg_id: str, endtoend_id: str):
+    pmt_inf = types.SimpleNamespace(
+        **dict.fromkeys(_PMT_INF_UPSERT_COLS),
+        direct_debit_tx_infs=[types.SimpleNamespace(endtoend_id=endtoend_id)],
+    )
+    return types.SimpleNamespace(
+        sepa_schema="pain.008.001.02",
+        message_identification=msg_id,
+        number_of_transactions=1,
+        control_sum_cents=100,
+        initiating_party_name="WSJ",
+        payment_infos=[pmt_inf],
+    )
+
+
+def _pn_row(id: int, msg_id: str) -> dict:
+    return {
+        "id": id,
+        "payment_status": "ok",
+        "pn_id": 100 + id,
+        "pn_payment_status": "pre_notified",
+        "pn_payment_initiation_id": 7,
+        "pn_author_id": 1,
+        "pn_author_type": "Person",
+        "pn_amount_cents": 100,
+        "pn_description": "Beitrag",
+        "pn_comment": "",
+        "sepa_dd_endtoend_id": f"E{id}",
+        "sepa_dd_message_identification": msg_id,
+        "sepa_dd_payment_initiation_id": 7,
+        "accounting_booking_at": pd.Timestamp("2026-03-01T12:00:00+01:00"),
+    }
+
+
+class Test_write_payment_initiations_to_db:
+    def test_split_files_own_their_rows(self, monkeypatch):
+        pain_updates = {}
+        pmt_infs = []
+        pn_updates = {}
+        entries = []
+
+        def insert_pain(conn, **kwargs):
+            return 8
+
+        def update_pain(conn, *, id, updates):
+            pain_updates[id] = updates
+
+        def insert_pmt_inf(conn, *, payment_initiation_id, **kwargs):
+            pmt_infs.append(payment_initiation_id)
+            return 20 + len(pmt_infs)
+
+        def update_pn(cursor, *, id, updates):
+            pn_updates[id] = updates
+
+        def insert_entry(cursor, **kwargs):
+            entries.append(kwargs)
+            return len(entries)
+
+        monkeypatch.setattr(_pg, "pg_insert_payment_initiation", insert_pain)
+        monkeypatch.setattr(_pg, "pg_update_payment_initiation", update_pain)
+        monkeypatch.setattr(_pg, "pg_insert_direct_debit_payment_info", insert_pmt_inf)
+        monkeypatch.setattr(_pg, "pg_update_direct_debit_pre_notification", update_pn)
+        monkeypatch.setattr(_pg, "pg_insert_accounting_entry", insert_entry)
+
+        conn = _FakeConn()
+        df = pd.DataFrame([_pn_row(1, "M1"), _pn_row(2, "M2")])
+        pain_ids = write_payment_initiations_to_db(
+            conn,  # type: ignore
+            df,
+            [_pain_message("M1", "E1"), _pain_message("M2", "E2")],  # type: ignore
+            pain_id=7,
+        )
+        write_payment_dataframe_to_db(
+            conn,  # type: ignore
+            df,
+            print_progress_message=lambda *args, **kwargs: None,
+        )
+
+        assert pain_ids == [7, 8]
+        assert pain_updates[7]["message_identification"] == "M1"
+        assert pmt_infs == [7, 8]
+        assert pn_updates == {
+            101: {
+                "payment_status": "xml_generated",
+                "payment_initiation_id": 7,
+                "direct_debit_payment_info_id": 21,
+            },
+            102: {
+                "payment_status": "xml_generated",
+                "payment_initiation_id": 8,
+                "direct_debit_payment_info_id": 22,
+            },
+        }
+        assert [
+            (e["payment_initiation_id"], e["direct_debit_payment_info_id"])
+            for e in entries
+        ] == [(7, 21), (8, 22)]
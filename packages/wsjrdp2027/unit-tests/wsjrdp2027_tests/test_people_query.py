@@ -437,6 +437,120 @@ class Test_PeopleWhere__to_dict:
         assert where.exclude_note.op == self.__extract_op(expected, "<>")
 
 
+class Test_PeopleWhere__as_mask:
+    @pytest.fixture
+    def df(self):
+        import pandas as pd
+        from wsjrdp2027 import PaymentRole
+
+        return pd.DataFrame(
+            {
+                "id": [1, 2, 3, 4],
+                "status": ["registered", "printed", None, "deregistered"],
+                "sepa_status": ["ok", None, "in_review", "ok"],
+                "email": ["a@example.com", None, "c@example.com", "d@example.com"],
+                "unit_code": [None, "000000", "123456", None],
+                "primary_group_id": [2, 5, None, 3],
+                "payment_role": [
+                    PaymentRole.REGULAR_PAYER_YP,
+                    PaymentRole.EARLY_PAYER_UL,
+                    None,
+                    "RegularPayer::Group::Unit::Member",
+                ],
+                "early_payer": [True, None, False, False],
+                "print_at": [
+                    _datetime.date(2025, 1, 1),
+                    None,
+                    _datetime.date(2025, 3, 1),
+                    _datetime.date(2024, 12, 1),
+                ],
+                "tag_list": [["A", "Warteliste 1"], ["B"], [], ["a"]],
+                "note_list": [[], ["Bitte anrufen"], [], []],
+            }
+        )
+
+    def _ids(self, where: PeopleWhere, df) -> list[int]:
+        return list(df[where.as_mask(df)]["id"])
+
+    @pytest.mark.parametrize(
+        "where,expected",
+        [
+            (PeopleWhere(), [1, 2, 3, 4]),
+            (PeopleWhere(status="printed"), [2]),
+            (PeopleWhere(status=False), [3]),
+            (PeopleWhere(status=True), [1, 2, 4]),
+            (PeopleWhere(exclude_status="printed"), [1, 4]),
+            (PeopleWhere(exclude_deregistered=True), [1, 2]),
+            (PeopleWhere(sepa_status="ok"), [1, 2, 4]),
+            (PeopleWhere(exclude_sepa_status="ok"), [3]),
+            (PeopleWhere(id=[1, 3]), [1, 3]),
+            (PeopleWhere(exclude_id=[1, 3]), [2, 4]),
+            (PeopleWhere(email=[None, "c@example.com"]), [2, 3]),
+            (PeopleWhere(unit_code=[None, "000000"]), [1, 2, 4]),
+            (PeopleWhere(exclude_unit_code="000000"), [3]),
+            (PeopleWhere(role="YP"), [1, 4]),
+            (PeopleWhere(role=["UL", "CMT"]), [2]),
+            (PeopleWhere(early_payer=True), [1]),
+            (PeopleWhere(early_payer=False), [2, 3, 4]),
+            (PeopleWhere(max_print_at="2025-01-01"), [1, 4]),
+            (PeopleWhere(primary_group_id=[2, 3]), [1, 4]),
+            (PeopleWhere(exclude_primary_group_id=[2, 3]), [2]),
+            (PeopleWhere(primary_group_id=[]), []),
+            (PeopleWhere(exclude_waiting_lists=True), [1, 4]),
+            (PeopleWhere(tag="A"), [1]),
+            (PeopleWhere(exclude_tag="A"), [2, 3, 4]),
+            (PeopleWhere(tag={"expr": "%warteliste%", "op": "ILIKE"}), [1]),
+            (PeopleWhere(tag={"expr": "a", "op": "ILIKE"}), [1, 4]),
+            (PeopleWhere(tag={"expr": "^[ab]$", "op": "~*", "func": "ALL"}), [2, 3, 4]),
+            (PeopleWhere(note="Bitte anrufen"), [2]),
+            (PeopleWhere(exclude_note={"expr": "%anrufen", "op": "LIKE"}), [1, 3, 4]),
+            (PeopleWhere(not_=PeopleWhere(status="printed")), [1, 4]),
+            (PeopleWhere(not_=PeopleWhere(early_payer=True)), [3, 4]),
+            (
+                PeopleWhere(or_=[PeopleWhere(id=1), PeopleWhere(status=False)]),
+                [1, 3],
+            ),
+            (PeopleWhere(or_=[PeopleWhere(), PeopleWhere(id=2)]), [2]),
+            (
+                PeopleWhere(and_=[PeopleWhere(sepa_status="ok"), PeopleWhere(tag="B")]),
+                [2],
+            ),
+        ],
+    )
+    def test_as_mask(self, df, where: PeopleWhere, expected: list[int]):
+        assert self._ids(where, df) == expected
+
+    def test_primary_group_names(self, df):
+        from wsjrdp2027 import Group
+
+        groups = [
+            Group(id=2, name="Unit A", description="", additional_info={}),
+            Group(
+                id=3,
+                name="Unit B",
+                short_name="B",
+                description="",
+                additional_info={"group_code": "unit-b"},
+            ),
+        ]
+        where = PeopleWhere(primary_group=["Unit A", "unit-b"])
+        assert list(df[where.as_mask(df, groups=groups)]["id"]) == [1, 4]
+        with pytest.raises(ValueError, match="without groups"):
+            where.as_mask(df)
+
+    @pytest.mark.parametrize(
+        "where",
+        [
+            PeopleWhere(raw_sql="people.id = 1"),
+            PeopleWhere(pre_notification_status="pending"),
+            PeopleWhere(foto_permission=True),
+        ],
+    )
+    def test_not_supported(self, df, where: PeopleWhere):
+        with pytest.raises(ValueError, match="Cannot evaluate"):
+            where.as_mask(df)
+
+
 @pytest.mark.time_machine(
     _datetime.datetime(2025, 8, 15, 12, 0, tzinfo=_datetime.UTC), tick=False
 )
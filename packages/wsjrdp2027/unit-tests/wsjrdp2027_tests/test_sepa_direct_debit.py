@@ -0,0 +1,229 @@
+import datetime
+import re
+
+import pandas as pd
+import pytest
+import sepaxml
+from sepaxml.validation import ValidationError
+from wsjrdp2027._pain import PainMessage
+from wsjrdp2027._sepa_direct_debit import (
+    WSJRDP_SKATBANK_DIRECT_DEBIT_CONFIG,
+    SepaDirectDebit,
+    SepaDirectDebitSplitPolicy,
+    write_accounting_dataframe_to_sepa_dd,
+    write_accounting_dataframe_to_sepa_dd_files,
+)
+
+
+def _payment(amount: int, seq_type: str, day: int, endtoend_id: str) -> dict:
+    return {
+        "name": "Jörg & <Söhne>",
+        "IBAN": "de02 1203 0000 0000 2020 51",
+        "BIC": "BYLADEM1001",
+        "amount": amount,
+        "type": seq_type,
+        "collection_date": datetime.date(2026, 3, day),
+        "mandate_id": "wsjrdp2027-42",
+        "mandate_date": datetime.date(2025, 1, 1),
+        "description": "Beitrag ä" + "x" * 150,
+        "endtoend_id": endtoend_id,
+    }
+
+
+PAYMENTS = [
+    _payment(12345, "FRST", 5, "E1"),
+    _payment(5, "RCUR", 5, "E2"),
+    _payment(100, "FRST", 5, "E3"),
+    _payment(99, "FRST", 6, "E4"),
+]
+
+
+def _without_random_ids(xml_bytes: bytes) -> bytes:
+    return re.sub(rb"<(MsgId|CreDtTm|PmtInfId)>[^<]*<", rb"<\1>X<", xml_bytes)
+
+
+def _sepaxml_export(payments, *, pretty_print: bool) -> bytes:
+    config = dict(WSJRDP_SKATBANK_DIRECT_DEBIT_CONFIG)
+    config.pop("address_as_single_line")
+    config["name"] = config["name"].replace("ä", "ae")
+    config["batch"] = True
+    dd = sepaxml.SepaDD(config, schema="pain.008.001.02", clean=True)
+    for payment in payments:
+        payment = dict(payment)
+        payment.pop("BIC")
+        payment["IBAN"] = payment["IBAN"].replace(" ", "").upper()
+        payment["name"] = payment["name"].replace("ö", "oe")
+        payment["description"] = payment["description"].replace("ä", "ae")
+        dd.add_payment(payment)
+    return dd.export(validate=True, pretty_print=pretty_print)
+
+
+class Test_SepaDirectDebit:
+    @pytest.mark.parametrize("pretty_print", [True, False])
+    def test_byte_compatible_with_sepaxml(self, pretty_print):
+        dd = SepaDirectDebit(WSJRDP_SKATBANK_DIRECT_DEBIT_CONFIG)
+        for payment in PAYMENTS:
+            dd.add_payment(payment)
+        assert _without_random_ids(
+            dd.export_bytes(pretty_print=pretty_print)
+        ) == _without_random_ids(_sepaxml_export(PAYMENTS, pretty_print=pretty_print))
+
+    @pytest.mark.parametrize("pretty_print", [True, False])
+    def test_quote_in_text(self, pretty_print):
+        # minidom (used by sepaxml for pretty_print) escapes " in text
+        # as &quot; before Python 3.13, lxml never does.
+        payments = [dict(PAYMENTS[0], name='Jörg "Jo" Meier')]
+        dd = SepaDirectDebit(WSJRDP_SKATBANK_DIRECT_DEBIT_CONFIG)
+        dd.add_payment(payments[0])
+        ours = _without_random_ids(dd.export_bytes(pretty_print=pretty_print))
+        assert b'<Nm>Joerg "Jo" Meier</Nm>' in ours
+        assert ours == _without_random_ids(
+            _sepaxml_export(payments, pretty_print=pretty_print)
+        )
+
+    def test_export_file(self, tmp_path):
+        dd = SepaDirectDebit(WSJRDP_SKATBANK_DIRECT_DEBIT_CONFIG)
+        for payment in PAYMENTS:
+            dd.add_payment(payment)
+        path = tmp_path / "pain.xml"
+        dd.export_file(path)
+        pain = PainMessage.load(path)
+        assert pain.message_identification == dd.message_identification
+        assert b"<NbOfTxs>4</NbOfTxs>" in path.read_bytes()
+        assert b"<CtrlSum>125.49</CtrlSum>" in path.read_bytes()
+
+    def test_validation_error(self):
+        dd = SepaDirectDebit(WSJRDP_SKATBANK_DIRECT_DEBIT_CONFIG)
+        dd.add_payment(_payment(100, "BOGUS", 5, "E1"))
+        with pytest.raises(ValidationError):
+            dd.export_bytes()
+
+    def test_invalid_amount(self):
+        dd = SepaDirectDebit(WSJRDP_SKATBANK_DIRECT_DEBIT_CONFIG)
+        with pytest.raises(TypeError, match="amount"):
+            dd.add_payment(_payment(1.5, "FRST", 5, "E1"))  # ty: ignore
+
+
+def _accounting_df(payments) -> pd.DataFrame:
+    rows = [
+        {
+            "id": i,
+            "payment_status": "ok",
+            "payment_status_reason": None,
+            "payment_role": "RegularPayer",
+            "sepa_name": payment["name"],
+            "sepa_iban": payment["IBAN"],
+            "sepa_bic": payment["BIC"],
+            "open_amount_cents": payment["amount"],
+            "sepa_dd_sequence_type": payment["type"],
+            "collection_date": payment["collection_date"],
+            "sepa_mandate_id": payment["mandate_id"],
+            "sepa_mandate_date": payment["mandate_date"],
+            "sepa_dd_description": payment["description"],
+            "sepa_dd_endtoend_id": payment["endtoend_id"],
+        }
+        for i, payment in enumerate(payments)
+    ]
+    return pd.DataFrame(rows, index=[10 + i for i in range(len(rows))])
+
+
+def _no_progress(*args, **kwargs):
+    pass
+
+
+class Test_SepaDirectDebit_split:
+    def test_split(self):
+        dd = SepaDirectDebit(WSJRDP_SKATBANK_DIRECT_DEBIT_CONFIG)
+        for payment in [*PAYMENTS, _payment(200, "FRST", 5, "E5")]:
+            dd.add_payment(payment)
+        parts = dd.split(SepaDirectDebitSplitPolicy(max_transactions=2))
+        assert [[p["endtoend_id"] for p in part.payments] for part in parts] == [
+            ["E1", "E3"],
+            ["E5"],
+            ["E2"],
+            ["E4"],
+        ]
+        parts = dd.split(
+            SepaDirectDebitSplitPolicy(
+                max_control_sum_cents=300, split_by_sequence_type=False
+            )
+        )
+        assert [[p["endtoend_id"] for p in part.payments] for part in parts] == [
+            ["E1"],
+            ["E3", "E5"],
+            ["E2"],
+            ["E4"],
+        ]
+        assert sum(part.control_sum_cents for part in parts) == dd.control_sum_cents
+        assert len({part.message_identification for part in parts}) == 4
+
+    def test_max_pmt_inf_transactions(self):
+        dd = SepaDirectDebit(
+            WSJRDP_SKATBANK_DIRECT_DEBIT_CONFIG, max_pmt_inf_transactions=1
+        )
+        for payment in PAYMENTS:
+            dd.add_payment(payment)
+        pain = PainMessage.loads(dd.export_bytes())
+        assert [len(p.direct_debit_tx_infs) for p in pain.payment_infos] == [1] * 4
+        assert [p.control_sum_cents for p in pain.payment_infos] == [12345, 100, 5, 99]
+        assert pain.control_sum_cents == 12549
+
+
+class Test_write_accounting_dataframe_to_sepa_dd:
+    def test_skips_rows(self, tmp_path):
+        df = _accounting_df(PAYMENTS[:3])
+        df.at[11, "sepa_iban"] = ""
+        path = tmp_path / "pain.xml"
+        assert (
+            write_accounting_dataframe_to_sepa_dd(
+                df,
+                path,
+                config=WSJRDP_SKATBANK_DIRECT_DEBIT_CONFIG,
+                print_progress_message=_no_progress,
+            )
+            == 2
+        )
+        assert df["payment_status"].tolist() == ["ok", "skipped", "ok"]
+        assert df.at[11, "payment_status_reason"] == "sepa_iban IS NULL"
+        msg_id = PainMessage.load(path).message_identification
+        assert df.at[10, "sepa_dd_message_identification"] == msg_id
+
+    def test_split_files(self, tmp_path):
+        path = tmp_path / "pain.xml"
+        policy = SepaDirectDebitSplitPolicy(max_transactions=1)
+
+        def write(df):
+            return write_accounting_dataframe_to_sepa_dd_files(
+                df,
+                path,
+                config=WSJRDP_SKATBANK_DIRECT_DEBIT_CONFIG,
+                print_progress_message=_no_progress,
+                split_policy=policy,
+                max_workers=2,
+            )
+
+        df = _accounting_df(PAYMENTS)
+        files = write(df)
+        assert [f.path.name for f in files] == [
+            "pain_01.xml",
+            "pain_02.xml",
+            "pain_03.xml",
+            "pain_04.xml",
+        ]
+        for f in files:
+            pain = PainMessage.load(f.path)
+            assert pain.message_identification == f.message_identification
+            assert pain.number_of_transactions == f.number_of_transactions == 1
+        assert df["sepa_dd_message_identification"].tolist() == [
+            files[0].message_identification,
+            files[2].message_identification,
+            files[1].message_identification,
+            files[3].message_identification,
+        ]
+
+        # A second run renders all files again with new MsgIds.
+        files2 = write(_accounting_df(PAYMENTS))
+        assert [f.path for f in files2] == [f.path for f in files]
+        assert not {f.message_identification for f in files2} & {
+            f.message_identification for f in files
+        }
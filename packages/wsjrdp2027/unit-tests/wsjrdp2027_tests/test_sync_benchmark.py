@@ -0,0 +1,216 @@
+"""Throughput of `sync_hitobito_keycloak` against in-process fake servers.
+
+The number of people (and Keycloak users) defaults to a small value to
+keep the unit tests fast, set ``WSJRDP_SYNC_BENCHMARK_PEOPLE`` (e.g.
+``5000``) and ``WSJRDP_SYNC_BENCHMARK_LATENCY`` (seconds per request)
+to benchmark realistic volumes.  Request counts and timings are
+recorded as test properties (see ``--junitxml``).
+"""
+
+import logging
+import os
+import string
+import time
+import types
+
+import pandas as pd
+import pytest
+from pytest_wsjrdp2027.fake_servers import FakeKeycloakServer, FakeMailcowServer
+from wsjrdp2027._internal import sync_hitobito_keycloak
+from wsjrdp2027._keycloak_wsjrdp_adapter import WsjRdpKeycloakAdapter
+from wsjrdp2027._mailcow_client import MailcowClient, MailcowConfig
+from wsjrdp2027._models import person as _person
+
+
+_LOGGER = logging.getLogger(__name__)
+
+NUM_PEOPLE = int(os.environ.get("WSJRDP_SYNC_BENCHMARK_PEOPLE", "300"))
+LATENCY = float(os.environ.get("WSJRDP_SYNC_BENCHMARK_LATENCY", "0"))
+PAGE_SIZE = 500
+DOMAIN = "worldscoutjamboree.de"
+
+
+def _name(i: int) -> str:
+    # Names must not contain digits, see Person.get_keycloak_username_default.
+    letters = ""
+    while True:
+        i, r = divmod(i, 26)
+        letters += string.ascii_lowercase[r]
+        if not i:
+            return letters.capitalize()
+
+
+def _people_df(n: int) -> pd.DataFrame:
+    return pd.DataFrame(
+        [
+            {
+                "id": i,
+                "status": "reviewed",
+                "role_id_name": f"CMT {i}",
+                "first_name": f"Vor{_name(i)}",
+                "last_name": f"Nach{_name(i)}",
+                "nickname": None,
+                "primary_group_id": 2,
+                "email": f"person{i}@example.org",
+                "additional_info": {"wsjrdp_role": "CMT"},
+            }
+            for i in range(1, n + 1)
+        ]
+    )
+
+
+def _fake_servers(people_df: pd.DataFrame, *, latency: float):
+    keycloak = FakeKeycloakServer(groups=["CMT"], latency=latency)
+    mailcow = FakeMailcowServer(domains=[DOMAIN], latency=latency)
+    for p in _person.iter_people(people_df):
+        username = p.get_keycloak_username_expected()
+        email = p.get_wsjrdp_email_expected()
+        assert username and email
+        p.additional_info["keycloak_username"] = username
+        user = keycloak.add_user(
+            {
+                "username": username,
+                "email": email,
+                "firstName": p.first_name,
+                "lastName": p.last_name,
+                "attributes": {
+                    "hitobitoId": [str(p.id)],
+                    "mossEmail": [p.get_moss_email_expected()],
+                },
+            }
+        )
+        keycloak.add_group_members("CMT", [user["id"]])
+        mailcow.add_mailbox({"username": email, "name": p.full_name})
+        # Two aliases per person: the mailbox keeps a copy and forwards
+        # to the private address via a second alias.
+        mailcow.add_alias({"address": email, "goto": f"{email},a{p.id}@{DOMAIN}"})
+        mailcow.add_alias({"address": f"a{p.id}@{DOMAIN}", "goto": p.email})
+    return keycloak, mailcow
+
+
+class _FakeContext:
+    dry_run = True
+    skip_email = True
+    logger = _LOGGER
+
+    def __init__(self, keycloak: FakeKeycloakServer, mailcow: FakeMailcowServer):
+        self.config = types.SimpleNamespace(
+            keycloak_url=keycloak.url,
+            keycloak_admin="admin",
+            keycloak_admin_password="secret",
+            keycloak_realm=keycloak.realm,
+            keycloak_user_realm=None,
+        )
+        self.additional_info_updates = []
+        self._keycloak = WsjRdpKeycloakAdapter(self)
+        self._mailcow = MailcowClient(
+            MailcowConfig(server=mailcow.url, api_key="secret"), dry_run=True
+        )
+
+    def snapshot_store(self):
+        return None
+
+    def keycloak(self) -> WsjRdpKeycloakAdapter:
+        return self._keycloak
+
+    def mailcow(self) -> MailcowClient:
+        return self._mailcow
+
+    def console_confirm(self, *args, **kwargs) -> bool:
+        return False
+
+    def require_approval_to_run_in_prod(self, *args, **kwargs) -> None:
+        raise AssertionError("The benchmark must not write to Keycloak")
+
+    def update_people_additional_info(self, updates, **kwargs) -> None:
+        self.additional_info_updates.extend(updates)
+
+    def close(self) -> None:
+        self._keycloak.close()
+        self._mailcow.close()
+
+
+@pytest.fixture
+def people_df() -> pd.DataFrame:
+    return _people_df(NUM_PEOPLE)
+
+
+@pytest.fixture
+def servers(people_df):
+    keycloak, mailcow = _fake_servers(people_df, latency=LATENCY)
+    with keycloak, mailcow:
+        yield keycloak, mailcow
+
+
+@pytest.fixture
+def ctx(servers):
+    ctx = _FakeContext(*servers)
+    yield ctx
+    ctx.close()
+
+
+def _report(record_property, name, elapsed_s, ctx, keycloak, mailcow) -> None:
+    stats = ctx.keycloak().cache_stats
+    lookups = stats["hits"] + stats["misses"]
+    hit_rate = stats["hits"] / lookups if lookups else 1.0
+    _LOGGER.info(
+        f"[benchmark] {name}: {NUM_PEOPLE} people in {elapsed_s:.3f}s, "
+        f"Keycloak requests: {dict(keycloak.request_counts)}, "
+        f"Mailcow requests: {dict(mailcow.request_counts)}, "
+        f"Keycloak cache hit rate: {hit_rate:.1%} of {lookups}"
+    )
+    record_property(f"{name}_wall_time_s", round(elapsed_s, 3))
+    record_property(f"{name}_keycloak_requests", keycloak.num_requests)
+    record_property(f"{name}_mailcow_requests", mailcow.num_requests)
+    record_property(f"{name}_keycloak_cache_hit_rate", round(hit_rate, 4))
+
+
+def _num_user_pages() -> int:
+    return NUM_PEOPLE // PAGE_SIZE + 1
+
+
+class Test_sync_benchmark:
+    def test_sync(self, ctx, servers, people_df, record_property):
+        keycloak, mailcow = servers
+        start = time.perf_counter()
+        assert sync_hitobito_keycloak.sync(ctx, people_df, keycloak_groupname="CMT")
+        elapsed_s = time.perf_counter() - start
+        _report(record_property, "sync", elapsed_s, ctx, keycloak, mailcow)
+
+        # The number of requests must not grow with the number of people.
+        assert keycloak.request_counts["GET users"] == _num_user_pages()
+        assert keycloak.num_requests == keycloak.request_counts["GET users"] + 1
+        assert sorted(mailcow.request_counts) == [
+            "GET get/alias",
+            "GET get/domain",
+            "GET get/mailbox",
+        ]
+        assert mailcow.num_requests == 3
+        assert ctx.keycloak().cache_stats["misses"] == 0
+
+        goto_updates = {
+            u["id"]: u["wsjrdp_email_goto"]
+            for u in ctx.additional_info_updates
+            if "wsjrdp_email_goto" in u
+        }
+        assert len(goto_updates) == NUM_PEOPLE
+        assert goto_updates[1] == [
+            None,
+            ["vorb.nachb@worldscoutjamboree.de", "person1@example.org"],
+        ]
+
+    def test_plan_sync(self, ctx, servers, people_df, record_property):
+        keycloak, mailcow = servers
+        start = time.perf_counter()
+        plan = sync_hitobito_keycloak.plan_sync(
+            ctx, people_df, keycloak_groupname="CMT"
+        )
+        elapsed_s = time.perf_counter() - start
+        _report(record_property, "plan_sync", elapsed_s, ctx, keycloak, mailcow)
+
+        assert not plan.create
+        assert keycloak.request_counts["GET users"] == _num_user_pages()
+        assert keycloak.request_counts["GET groups/{id}/members"] <= (
+            NUM_PEOPLE // 100 + 2
+        )
+        assert mailcow.num_requests == 3
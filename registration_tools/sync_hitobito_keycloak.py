@@ -28,6 +28,9 @@ class SyncOptions:
     limit: int | None = None
     status: list[str] = _dataclasses.field(default_factory=list)
     create_missing_keycloak_user: bool = True
+    plan: bool = False
+    sync_enabled: bool = False
+    prune_group: bool = False
 
 
 def _parse_args(args: _argparse.Namespace) -> SyncOptions:
@@ -50,6 +53,9 @@ def _parse_args(args: _argparse.Namespace) -> SyncOptions:
         kwargs["status"] = ["confirmed"]
     if args.create_missing_keycloak_user is not None:
         kwargs["create_missing_keycloak_user"] = bool(args.create_missing_keycloak_user)
+    kwargs["plan"] = bool(args.plan)
+    kwargs["sync_enabled"] = bool(args.sync_enabled)
+    kwargs["prune_group"] = bool(args.prune_group)
     return SyncOptions(**kwargs)  # ty: ignore
 
 
@@ -85,9 +91,63 @@ def _create_argument_parser():
         dest="create_missing_keycloak_user",
         action="store_false",
     )
+    p.add_argument(
+        "--plan",
+        action="store_true",
+        default=False,
+        help="Compute all Keycloak changes of a group at once, show them "
+        "and apply them after a single confirmation (instead of checking "
+        "person by person).",
+    )
+    p.add_argument(
+        "--sync-enabled",
+        action="store_true",
+        default=False,
+        help="With --plan: Disable Keycloak users of deregistered people "
+        "and enable all others.",
+    )
+    p.add_argument(
+        "--prune-group",
+        action="store_true",
+        default=False,
+        help="With --plan: Remove Keycloak group members without matching person.",
+    )
     return p
 
 
+def sync_group_with_plan(
+    ctx: wsjrdp2027.WsjRdpContext,
+    people: _pandas.DataFrame,
+    *,
+    groupname: str,
+    args: SyncOptions,
+) -> bool:
+    plan = ctx.plan_hitobito_keycloak_sync(
+        people,
+        keycloak_groupname=groupname,
+        sync_enabled=args.sync_enabled,
+        prune_group=args.prune_group,
+    )
+    if plan.create and args.create_missing_keycloak_user:
+        # User creation also creates mailboxes/aliases and sends the
+        # account mail, which is only done by the per person sync.
+        create_ids = {c["id"] for c in plan.create}
+        if not ctx.sync_hitobito_keycloak_mailcow(
+            people=people[people["id"].isin(create_ids)],
+            keycloak_groupname=groupname,
+            create_missing_keycloak_user=True,
+            self_name=_SELF_NAME,
+        ):
+            return False
+        plan = ctx.plan_hitobito_keycloak_sync(
+            people,
+            keycloak_groupname=groupname,
+            sync_enabled=args.sync_enabled,
+            prune_group=args.prune_group,
+        )
+    return plan.apply(ctx)
+
+
 def load_people_dataframe_for_query(
     ctx: wsjrdp2027.WsjRdpContext, *, query: wsjrdp2027.PeopleQuery
 ) -> _pandas.DataFrame:
@@ -137,7 +197,12 @@ def main(argv=None):
             )
             query = wsjrdp2027.PeopleQuery(where=where, limit=args.limit)
             people = load_people_dataframe_for_query(ctx, query=query)
-            if not ctx.sync_hitobito_keycloak_mailcow(
+            if args.plan:
+                if not sync_group_with_plan(
+                    ctx, people, groupname=groupname, args=args
+                ):
+                    return 1
+            elif not ctx.sync_hitobito_keycloak_mailcow(
                 people=people,
                 keycloak_groupname=groupname,
                 create_missing_keycloak_user=args.create_missing_keycloak_user,
@@ -41,7 +41,15 @@ def create_argument_parser():
         "Computes SEPA direct debit information if set. "
         "Setting the collection date does not imply writing of payment information.",
     )
-    p.add_argument("yaml_file")
+    g = p.add_mutually_exclusive_group(required=True)
+    g.add_argument("yaml_file", nargs="?")
+    g.add_argument(
+        "--many",
+        nargs="+",
+        metavar="YAML_FILE",
+        help="Send several mailings. The people are loaded only once for all "
+        "mailings (before any mailing is sent) and then selected per mailing.",
+    )
     return p
 
 
@@ -74,6 +82,9 @@ def main(argv=None):
         argv=argv,
         out_dir="data/mailings{{ kind | omit_unless_prod | upper | to_ext }}",
     )
+    if ctx.parsed_args.many:
+        return main_many(ctx)
+
     batch_config = wsjrdp2027.BatchConfig.from_yaml(ctx.parsed_args.yaml_file)
     batch_config = update_batch_config_from_ctx(batch_config, ctx)
 
@@ -91,5 +102,38 @@ def main(argv=None):
     _LOGGER.info("  Log file: %s", log_filename)
 
 
+def main_many(ctx: wsjrdp2027.WsjRdpContext):
+    args = ctx.parsed_args
+    batch_configs = [
+        update_batch_config_from_ctx(wsjrdp2027.BatchConfig.from_yaml(yaml_file), ctx)
+        for yaml_file in args.many
+    ]
+
+    log_filename = ctx.make_out_path("mailings__{{ filename_suffix }}.log")
+    ctx.configure_log_file(log_filename)
+
+    dfs = ctx.load_people_dataframes_for_batches(batch_configs)
+
+    out_dirs = []
+    for batch_config, df in zip(batch_configs, dfs, strict=True):
+        _LOGGER.info("")
+        _LOGGER.info("Mailing %s", batch_config.name)
+        out_dir = ctx.make_out_path(batch_config.name + "__{{ filename_suffix }}")
+        prepared_batch = batch_config.prepare(
+            df,
+            unfiltered_df=df,
+            out_dir=out_dir,
+            now=batch_config.query.now,
+        )
+        ctx.update_db_and_send_mailing(prepared_batch, zip_eml=args.zip_eml)
+        out_dirs.append(out_dir)
+
+    _LOGGER.info("")
+    _LOGGER.info("Output directories:")
+    for out_dir in out_dirs:
+        _LOGGER.info("  %s", out_dir)
+    _LOGGER.info("  Log file: %s", log_filename)
+
+
 if __name__ == "__main__":
     sys.exit(main())